@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Locale Coverage Analyzer
+
+Compute how much of the catalog is localized in every locale, per app
+container, with aggregate SQL queries (no extraction needed).
+
+Usage:
+    python3 analyze_locales.py [options]
+
+Options:
+    --locales LIST  Only these locales (default: every locale in the database)
+    --export PATH   Export the locale × app matrix (.csv or .json)
+    -v, --verbose   Verbose output
+
+Examples:
+    # Per-locale summary and output/locale_coverage.json
+    python3 analyze_locales.py
+
+    # Matrix of a few locales as CSV
+    python3 analyze_locales.py --locales en,de,ja --export output/locale_coverage.csv
+"""
+
+import sys
+import time
+import argparse
+
+try:
+    from rich.console import Console
+    from rich.table import Table
+    RICH_AVAILABLE = True
+except ImportError:
+    RICH_AVAILABLE = False
+
+from utils.db_utils import connect_db
+from utils.locale_coverage import METRICS, export_coverage, get_locale_coverage, summarize_by_locale
+from utils.multi_locale import parse_locales
+
+
+def format_coverage(value) -> str:
+    return '-' if value is None else f"{value:.1%}"
+
+
+def show_summary(summary):
+    """Print per-locale coverage of each metric"""
+    metrics = [metric for metric in METRICS if summary and f'{metric}_coverage' in summary[0]]
+    if RICH_AVAILABLE:
+        console = Console()
+        table = Table(title="Locale Coverage")
+        table.add_column("Locale", style="cyan")
+        for metric in metrics:
+            table.add_column(metric.replace('_', ' ').title(), justify="right", style="green")
+        for row in summary:
+            table.add_row(row['locale'], *(format_coverage(row[f'{metric}_coverage']) for metric in metrics))
+        console.print(table)
+    else:
+        print("Locale  " + "  ".join(f"{metric:>12}" for metric in metrics))
+        for row in summary:
+            print(f"{row['locale']:<8}" + "  ".join(
+                f"{format_coverage(row[f'{metric}_coverage']):>12}" for metric in metrics
+            ))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Analyze locale coverage of Tools-prod.sqlite"
+    )
+
+    parser.add_argument('--locales', metavar='LIST', help='Comma-separated locales (default: all)')
+    parser.add_argument('--export', metavar='PATH', default='output/locale_coverage.json',
+                        help='Export path (.csv or .json)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Verbose output')
+    parser.add_argument('--db', default='Tools-prod.sqlite', help='Database path')
+
+    args = parser.parse_args()
+
+    try:
+        locales = parse_locales(args.locales) if args.locales else None
+        conn = connect_db(args.db)
+
+        print("\n🌍 Computing locale coverage...\n")
+        start = time.perf_counter()
+        matrix = get_locale_coverage(conn, locales)
+        conn.close()
+        if args.verbose:
+            print(f"Computed {len(matrix)} locale × app rows in {time.perf_counter() - start:.2f}s")
+
+        export_coverage(matrix, args.export)
+        print(f"✅ Exported {len(matrix)} rows to {args.export}")
+
+        show_summary(summarize_by_locale(matrix))
+        print("\n✨ Done!\n")
+
+    except FileNotFoundError as e:
+        print(f"\n❌ Error: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
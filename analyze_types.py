@@ -13,6 +13,9 @@ Options:
     --enums           Extract only enum types
     --entities        Extract only entity types
     --export PATH     Export to JSON file
+    --kind KIND       With --all, only this kind (primitive, entity, enum, ...)
+    --app, --id-prefix, --limit, --offset
+                      With --all, filter the types in SQL
     -v, --verbose     Verbose output
 """
 
@@ -20,7 +23,7 @@ import sys
 import json
 import argparse
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 try:
     from rich.console import Console
@@ -30,95 +33,39 @@ try:
 except ImportError:
     RICH_AVAILABLE = False
 
+from utils.catalog import Catalog
 from utils.db_utils import (
-    connect_db,
-    get_type_count,
-    get_type_info,
-    get_entity_properties,
-    get_enum_cases,
+    QueryFilter,
+    TYPE_KINDS,
+    add_filter_arguments,
+    filter_from_args,
 )
 from utils.schema_builder import build_type_schema
 from utils.validators import parse_type_identifier
 
 
-def get_all_types(db_path: str = "Tools-prod.sqlite", verbose: bool = False) -> List[Dict[str, Any]]:
-    """Extract all types with full information"""
-    conn = connect_db(db_path)
-
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT
-            t.rowId,
-            t.id,
-            t.kind,
-            t.runtimeFlags,
-            tdr.name,
-            cm.id as container_id
-        FROM Types t
-        LEFT JOIN TypeDisplayRepresentations tdr
-            ON t.rowId = tdr.typeId
-            AND tdr.locale = 'en'
-        LEFT JOIN ContainerMetadata cm
-            ON t.sourceContainerId = cm.rowId
-        ORDER BY t.rowId
-    """)
-
+def get_all_types(
+    catalog: Catalog,
+    verbose: bool = False,
+    query_filter: Optional[QueryFilter] = None,
+) -> List[Dict[str, Any]]:
+    """Extract all types with full information (only the ones matching query_filter)"""
     types = []
-    for row in cursor.fetchall():
-        type_data = dict(row)
-
+    for type_data in catalog.types(query_filter):
         # Build full schema
-        schema = build_type_schema(conn, type_data)
+        schema = build_type_schema(catalog.conn, type_data)
 
         # Add parsed identifier info
         schema['parsed'] = parse_type_identifier(type_data['rowId'])
 
         types.append(schema)
 
-    conn.close()
     return types
 
 
-def analyze_type_usage(db_path: str = "Tools-prod.sqlite") -> Dict[str, Any]:
+def analyze_type_usage(catalog: Catalog) -> Dict[str, Any]:
     """Analyze how types are used across actions"""
-    conn = connect_db(db_path)
-
-    # Get type usage in parameters
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT
-            tpt.typeId,
-            COUNT(DISTINCT tpt.toolId) as used_in_actions,
-            COUNT(*) as total_parameter_uses
-        FROM ToolParameterTypes tpt
-        GROUP BY tpt.typeId
-        ORDER BY used_in_actions DESC
-    """)
-
-    type_usage = {}
-    for row in cursor.fetchall():
-        type_usage[row['typeId']] = {
-            'used_in_actions': row['used_in_actions'],
-            'total_parameter_uses': row['total_parameter_uses'],
-        }
-
-    # Get type usage in outputs
-    cursor.execute("""
-        SELECT
-            tot.typeIdentifier,
-            COUNT(DISTINCT tot.toolId) as used_as_output
-        FROM ToolOutputTypes tot
-        GROUP BY tot.typeIdentifier
-    """)
-
-    for row in cursor.fetchall():
-        type_id = row['typeIdentifier']
-        if type_id not in type_usage:
-            type_usage[type_id] = {'used_in_actions': 0, 'total_parameter_uses': 0}
-        type_usage[type_id]['used_as_output'] = row['used_as_output']
-
-    conn.close()
-    return type_usage
+    return catalog.type_usage()
 
 
 def main():
@@ -133,29 +80,33 @@ def main():
     parser.add_argument('--export', metavar='PATH', default='output/types_complete.json', help='Export path')
     parser.add_argument('-v', '--verbose', action='store_true', help='Verbose output')
     parser.add_argument('--db', default='Tools-prod.sqlite', help='Database path')
+    add_filter_arguments(parser, 'types')
 
     args = parser.parse_args()
+    # --enums/--entities are shorthands for --kind
+    query_filter = filter_from_args(
+        args, kind=TYPE_KINDS['enum'] if args.enums else TYPE_KINDS['entity'] if args.entities else None
+    )
 
     if not any([args.all, args.type, args.enums, args.entities]):
         parser.print_help()
         sys.exit(1)
 
+    catalog = None
     try:
+        catalog = Catalog(args.db)
         if args.all or args.enums or args.entities:
             print("\n🔍 Extracting type system...\n")
 
-            types = get_all_types(args.db, args.verbose)
+            types = get_all_types(catalog, args.verbose, query_filter)
 
-            # Filter by kind if requested
             if args.enums:
-                types = [t for t in types if t.get('kind') == 3]
                 print(f"Found {len(types)} enum types")
             elif args.entities:
-                types = [t for t in types if t.get('kind') == 2]
                 print(f"Found {len(types)} entity types")
 
             # Get usage info
-            usage = analyze_type_usage(args.db)
+            usage = analyze_type_usage(catalog)
 
             # Add usage info to each type
             for t in types:
@@ -212,14 +163,13 @@ def main():
                     console.print(table2)
 
         if args.type:
-            conn = connect_db(args.db)
-            type_info = get_type_info(conn, args.type)
+            type_info = catalog.type(args.type)
 
             if not type_info:
                 print(f"❌ Type not found: {args.type}")
                 sys.exit(1)
 
-            schema = build_type_schema(conn, type_info)
+            schema = build_type_schema(catalog.conn, type_info)
             schema['parsed'] = parse_type_identifier(args.type)
 
             if RICH_AVAILABLE:
@@ -231,8 +181,6 @@ def main():
             else:
                 print(json.dumps(schema, indent=2, default=str))
 
-            conn.close()
-
         print("\n✨ Done!\n")
 
     except FileNotFoundError as e:
@@ -244,6 +192,9 @@ def main():
             import traceback
             traceback.print_exc()
         sys.exit(1)
+    finally:
+        if catalog is not None:
+            catalog.close()
 
 
 if __name__ == '__main__':
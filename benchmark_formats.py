@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Output Format Benchmark
+
+Compare an extracted actions_complete.json with the same schemas in the
+other output formats: size on disk, gzipped size, JSON parse time and the
+time to load the usual schemas back (parse plus decoding/inflating). With
+pandas installed the columnar tables are included too. Their load time is
+load_dataframes(), and they leave out the parameters' type_info analyses.
+
+Usage:
+    python3 benchmark_formats.py [options]
+
+Options:
+    --input PATH    Extracted output (default: output/actions_complete.json)
+    --repeat N      Timed loads per format, best kept (default: 3)
+    --keep DIR      Keep the converted files in DIR (default: a temporary directory)
+    --export PATH   Also write the results as JSON
+
+Examples:
+    # Compare all formats of the current extraction
+    python3 benchmark_formats.py
+
+    # Keep the converted files for inspection
+    python3 benchmark_formats.py --keep output/formats
+"""
+
+import sys
+import gzip
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+try:
+    from rich.console import Console
+    from rich.table import Table
+    RICH_AVAILABLE = True
+except ImportError:
+    RICH_AVAILABLE = False
+
+from utils.columnar import PANDAS_AVAILABLE, export_columnar, load_dataframes, to_dataframes
+from utils.normalized_output import inflate_document, write_normalized
+from utils.string_table import decode_records, write_dictionary_encoded
+
+
+def write_formats(schemas: List[Dict[str, Any]], directory: Path) -> Dict[str, Any]:
+    """
+    Write schemas in each compared format.
+
+    Returns:
+        Format name -> (path, loader turning the parsed JSON into schemas)
+    """
+    formats = {}
+
+    compact = directory / 'actions_complete.compact.json'
+    with open(compact, 'w', encoding='utf-8') as f:
+        json.dump(schemas, f, ensure_ascii=False, separators=(',', ':'))
+    formats['compact json'] = (compact, None)
+
+    dictionary = directory / 'actions_complete.dict.json'
+    write_dictionary_encoded(schemas, str(dictionary))
+    formats['dictionary'] = (dictionary, decode_records)
+
+    for bytes_format in ('hex', 'base64', 'omit'):
+        normalized = directory / f'actions_complete.normalized.{bytes_format}.json'
+        write_normalized(schemas, str(normalized), bytes_format)
+        formats[f'normalized ({bytes_format})'] = (normalized, inflate_document)
+
+    return formats
+
+
+def best_time(call: Callable[[], Any], repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def measure(name: str, path: Path, loader, repeat: int) -> Dict[str, Any]:
+    """Size and load times of one file"""
+    data = path.read_bytes()
+
+    def parse():
+        return json.loads(data)
+
+    def load():
+        document = parse()
+        return loader(document) if loader else document
+
+    return {
+        'format': name,
+        'bytes': len(data),
+        'gzip_bytes': len(gzip.compress(data)),
+        'parse_seconds': round(best_time(parse, repeat), 4),
+        'load_seconds': round(best_time(load, repeat), 4),
+    }
+
+
+def measure_columnar(schemas: List[Dict[str, Any]], directory: Path, repeat: int) -> Dict[str, Any]:
+    """Size and load time of the columnar tables (files are compressed already)"""
+    manifest = export_columnar(to_dataframes(schemas), str(directory))
+    size = sum(path.stat().st_size for path in directory.iterdir())
+    seconds = round(best_time(lambda: load_dataframes(str(directory)), repeat), 4)
+    return {
+        'format': f"columnar ({manifest['format']})",
+        'bytes': size,
+        'gzip_bytes': size,
+        'parse_seconds': seconds,
+        'load_seconds': seconds,
+    }
+
+
+def show_results(results: List[Dict[str, Any]]):
+    """Print each format relative to the first (the input file)"""
+    reference = results[0]
+    if RICH_AVAILABLE:
+        console = Console()
+        table = Table(title="Output Formats")
+        table.add_column("Format", style="cyan")
+        table.add_column("Size", justify="right", style="green")
+        table.add_column("vs input", justify="right")
+        table.add_column("Gzipped", justify="right", style="green")
+        table.add_column("Parse (s)", justify="right")
+        table.add_column("Load (s)", justify="right")
+        for result in results:
+            table.add_row(
+                result['format'], f"{result['bytes']:,}", f"{result['bytes'] / reference['bytes']:.0%}",
+                f"{result['gzip_bytes']:,}", f"{result['parse_seconds']:.3f}", f"{result['load_seconds']:.3f}",
+            )
+        console.print(table)
+    else:
+        for result in results:
+            print(f"{result['format']:<20} {result['bytes']:>12,} ({result['bytes'] / reference['bytes']:.0%})  "
+                  f"gzip {result['gzip_bytes']:>10,}  parse {result['parse_seconds']:.3f}s  "
+                  f"load {result['load_seconds']:.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the size and load time of the output formats"
+    )
+
+    parser.add_argument('--input', default='output/actions_complete.json', help='Extracted actions_complete.json')
+    parser.add_argument('--repeat', type=int, default=3, metavar='N', help='Timed loads per format (default: 3)')
+    parser.add_argument('--keep', metavar='DIR', help='Keep the converted files in DIR')
+    parser.add_argument('--export', metavar='PATH', help='Export the results as JSON')
+
+    args = parser.parse_args()
+
+    try:
+        input_path = Path(args.input)
+        with open(input_path, 'r', encoding='utf-8') as f:
+            schemas = json.load(f)
+
+        print(f"\n📏 Comparing formats of {len(schemas)} actions...\n")
+        with tempfile.TemporaryDirectory() as temp:
+            directory = Path(args.keep or temp)
+            directory.mkdir(parents=True, exist_ok=True)
+
+            results = [measure('input', input_path, None, args.repeat)]
+            for name, (path, loader) in write_formats(schemas, directory).items():
+                results.append(measure(name, path, loader, args.repeat))
+            if PANDAS_AVAILABLE:
+                results.append(measure_columnar(schemas, directory / 'columnar', args.repeat))
+
+        show_results(results)
+
+        if args.export:
+            with open(args.export, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            print(f"✅ Exported results to {args.export}")
+
+        print("\n✨ Done!\n")
+
+    except FileNotFoundError as e:
+        print(f"\n❌ Error: {e}")
+        print("   Run extract_shortcuts_actions.py --all first")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
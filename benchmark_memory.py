@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Schema Memory Benchmark
+
+Build every action and type schema of a database and hold them in memory,
+once as the builder's dicts and once as the compact utils.schema_model
+classes, and compare the peak RSS. Each representation runs in its own
+process (peak RSS can't be reset), next to a baseline run that builds the
+same schemas without keeping them.
+
+Usage:
+    python3 benchmark_memory.py [options]
+
+Options:
+    --db PATH       Database path (default: Tools-prod.sqlite)
+    --locale CODE   Locale of the strings (default: en)
+    --export PATH   Also write the results as JSON
+
+Examples:
+    # Compare dicts and models on the full catalog
+    python3 benchmark_memory.py
+
+    # Another database, results to a file
+    python3 benchmark_memory.py --db old/Tools-prod.sqlite --export output/memory_benchmark.json
+"""
+
+import sys
+import gc
+import json
+import time
+import resource
+import argparse
+import subprocess
+from typing import Any, Dict
+
+try:
+    from rich.console import Console
+    from rich.table import Table
+    RICH_AVAILABLE = True
+except ImportError:
+    RICH_AVAILABLE = False
+
+from utils.catalog import Catalog
+from utils.schema_builder import build_action_schema, build_type_schema
+from utils.schema_model import ActionSchema, TypeSchema
+
+REPRESENTATIONS = ('baseline', 'dicts', 'models')
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / (1 << 10)
+
+
+def hold_schemas(db_path: str, locale: str, representation: str) -> Dict[str, Any]:
+    """
+    Build all schemas and keep them in one representation.
+
+    Args:
+        db_path: Database path
+        locale: Locale of the strings
+        representation: 'dicts', 'models' or 'baseline' (keep nothing)
+
+    Returns:
+        Measurement (schema counts, seconds, peak RSS in MB)
+    """
+    start = time.perf_counter()
+    held = []
+    with Catalog(db_path, locale) as catalog:
+        blob_analyses = catalog.parameter_blob_analyses()
+        for action in catalog.actions():
+            schema = build_action_schema(catalog.conn, action, locale=locale,
+                                         blob_analyses=blob_analyses, lookups=catalog, strings=catalog.strings)
+            if representation == 'dicts':
+                held.append(schema)
+            elif representation == 'models':
+                held.append(ActionSchema.from_dict(schema))
+        action_count = len(catalog.actions())
+        for type_data in catalog.types():
+            schema = build_type_schema(catalog.conn, type_data, locale)
+            if representation == 'dicts':
+                held.append(schema)
+            elif representation == 'models':
+                held.append(TypeSchema.from_dict(schema))
+        type_count = len(catalog.types())
+    gc.collect()
+
+    return {
+        'representation': representation,
+        'actions': action_count,
+        'types': type_count,
+        'held': len(held),
+        'seconds': round(time.perf_counter() - start, 2),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }
+
+
+def run_isolated(db_path: str, locale: str, representation: str) -> Dict[str, Any]:
+    """hold_schemas() in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, __file__, '--db', db_path, '--locale', locale, '--representation', representation],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def show_results(results):
+    """Print peak RSS per representation and the memory kept beyond the baseline"""
+    baseline = results[0]['peak_rss_mb']
+    if RICH_AVAILABLE:
+        console = Console()
+        table = Table(title=f"Schema Memory ({results[0]['actions']} actions, {results[0]['types']} types)")
+        table.add_column("Representation", style="cyan")
+        table.add_column("Peak RSS (MB)", justify="right", style="green")
+        table.add_column("Held (MB)", justify="right", style="green")
+        table.add_column("Seconds", justify="right")
+        for result in results:
+            table.add_row(result['representation'], f"{result['peak_rss_mb']:.1f}",
+                          f"{result['peak_rss_mb'] - baseline:.1f}", f"{result['seconds']:.2f}")
+        console.print(table)
+    else:
+        for result in results:
+            print(f"{result['representation']:<10} peak {result['peak_rss_mb']:8.1f} MB  "
+                  f"held {result['peak_rss_mb'] - baseline:8.1f} MB  {result['seconds']:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the memory of dict and model schemas"
+    )
+
+    parser.add_argument('--db', default='Tools-prod.sqlite', help='Database path')
+    parser.add_argument('--locale', default='en', help='Locale of the strings')
+    parser.add_argument('--export', metavar='PATH', help='Export the results as JSON')
+    # Measures one representation in this process (used by the comparison)
+    parser.add_argument('--representation', choices=REPRESENTATIONS, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    try:
+        if args.representation:
+            print(json.dumps(hold_schemas(args.db, args.locale, args.representation)))
+            return
+
+        print("\n📏 Measuring schema memory...\n")
+        results = [run_isolated(args.db, args.locale, representation) for representation in REPRESENTATIONS]
+        show_results(results)
+
+        dicts, models = results[1]['peak_rss_mb'] - results[0]['peak_rss_mb'], \
+            results[2]['peak_rss_mb'] - results[0]['peak_rss_mb']
+        if dicts > 0:
+            print(f"\nModels hold {models / dicts:.0%} of the dict memory")
+
+        if args.export:
+            with open(args.export, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            print(f"✅ Exported results to {args.export}")
+
+        print("\n✨ Done!\n")
+
+    except subprocess.CalledProcessError as e:
+        print(f"\n❌ Error: {e.stderr.strip() or e}")
+        sys.exit(1)
+    except FileNotFoundError as e:
+        print(f"\n❌ Error: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
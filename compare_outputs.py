@@ -1,17 +1,55 @@
 #!/usr/bin/env python3
 """
-Compare outputs between example-output and output directories to show sanitization improvements.
+Output Comparator
+
+Diff two extraction outputs record by record. Records are keyed by id (action
+id for actions_complete.json, type id for types_complete.json), hashed
+canonically so identical records are skipped. Both files are streamed, so
+two full-size catalogs never sit in memory together; --cache loads them
+through the binary cache of utils/output_cache.py instead, so repeated
+comparisons of the same files skip JSON parsing.
+
+Usage:
+    python3 compare_outputs.py [OLD] [NEW] [options]
+
+Options:
+    OLD               Old output (default: example-output/actions_complete.json)
+    NEW               New output (default: output/actions_complete.json)
+    --key FIELD       Record identity field (default: id)
+    --ids-only        Only report added/removed/changed ids, no field paths
+    --artifacts       Also compare sanitizer artifacts in type_info.strings
+    --max N           Show at most N ids/changes per section (default: 20)
+    --export FILE     Write the full diff as JSON
+    --cache           Load both files whole through (and refresh) their
+                      binary .cache files instead of streaming them
+    -v, --verbose     Show old/new values of changed fields
+
+Examples:
+    # What changed between the shipped example output and a fresh extraction
+    python3 compare_outputs.py
+
+    # Diff two type catalogs and keep the full result
+    python3 compare_outputs.py old/types_complete.json output/types_complete.json --export output/types_diff.json
 """
 
-import json
 import sys
-from collections import Counter
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
+import json
+import argparse
 import re
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable
 
-console = Console()
+try:
+    from rich.console import Console
+    from rich.table import Table
+    from rich.panel import Panel
+    RICH_AVAILABLE = True
+except ImportError:
+    RICH_AVAILABLE = False
+
+from utils.json_stream import iter_records
+from utils.output_cache import load_output
+from utils.record_diff import diff_record_streams
 
 
 def analyze_string_artifacts(strings):
@@ -95,54 +133,40 @@ def analyze_string_artifacts(strings):
     return artifacts, artifact_examples
 
 
-def compare_files(old_path, new_path):
-    """Compare two JSON files and show differences"""
+def collect_artifacts(records: Iterable[Dict[str, Any]]):
+    """Run the type_info strings of a set of actions through analyze_string_artifacts()"""
+    total_strings = 0
+    artifacts: Dict[str, int] = {}
+    examples: Dict[str, list] = {}
 
-    console.print("\n[bold cyan]Loading files...[/bold cyan]")
+    for action in records:
+        strings = []
+        for param in action.get('parameters', []):
+            strings.extend(param.get('type_info', {}).get('strings', []))
+        if not strings:
+            continue
 
-    with open(old_path) as f:
-        old_data = json.load(f)
+        total_strings += len(strings)
+        counts, found = analyze_string_artifacts(strings)
+        for name, count in counts.items():
+            artifacts[name] = artifacts.get(name, 0) + count
+        for name, values in found.items():
+            kept = examples.setdefault(name, [])
+            kept.extend(values[:3 - len(kept)])
 
-    with open(new_path) as f:
-        new_data = json.load(f)
+    if not artifacts:
+        artifacts, examples = analyze_string_artifacts([])
 
-    console.print(f"✓ Loaded {len(old_data)} actions from {old_path}")
-    console.print(f"✓ Loaded {len(new_data)} actions from {new_path}\n")
+    return total_strings, artifacts, examples
 
-    # Collect all strings from type_info
-    old_strings = []
-    new_strings = []
 
-    for action in old_data:
-        for param in action.get('parameters', []):
-            ti = param.get('type_info', {})
-            old_strings.extend(ti.get('strings', []))
+def show_artifacts(old_records: Iterable[Dict[str, Any]], new_records: Iterable[Dict[str, Any]]):
+    """Compare sanitizer artifacts in type_info.strings between two outputs"""
+    old_total, old_artifacts, old_examples = collect_artifacts(old_records)
+    new_total, new_artifacts, _ = collect_artifacts(new_records)
 
-    for action in new_data:
-        for param in action.get('parameters', []):
-            ti = param.get('type_info', {})
-            new_strings.extend(ti.get('strings', []))
-
-    # Analyze artifacts
-    old_artifacts, old_examples = analyze_string_artifacts(old_strings)
-    new_artifacts, new_examples = analyze_string_artifacts(new_strings)
-
-    # Display summary
-    console.print(Panel.fit(
-        "[bold]Sanitization Comparison Report[/bold]",
-        border_style="cyan"
-    ))
-
-    # Create comparison table
-    table = Table(title="Artifact Statistics", show_header=True)
-    table.add_column("Artifact Type", style="cyan", width=25)
-    table.add_column("Before", justify="right", style="red")
-    table.add_column("After", justify="right", style="green")
-    table.add_column("Removed", justify="right", style="yellow")
-    table.add_column("% Reduction", justify="right", style="magenta")
-
-    artifact_types = [
-        ('Total Strings', len(old_strings), len(new_strings)),
+    rows = [
+        ('Total Strings', old_total, new_total),
         ('With Artifacts', old_artifacts['total_with_artifacts'], new_artifacts['total_with_artifacts']),
         ('Leading Digit (0-9)', old_artifacts['leading_digit'], new_artifacts['leading_digit']),
         ('Leading Dash (-)', old_artifacts['leading_dash'], new_artifacts['leading_dash']),
@@ -153,83 +177,142 @@ def compare_files(old_path, new_path):
         ('Trailing Quote ("\')', old_artifacts['trailing_quote'], new_artifacts['trailing_quote']),
     ]
 
-    for name, before, after in artifact_types:
-        removed = before - after
-        if before > 0:
-            reduction = (removed / before) * 100
-        else:
-            reduction = 0
-
-        table.add_row(
-            name,
-            str(before),
-            str(after),
-            str(removed) if removed > 0 else "0",
-            f"{reduction:.1f}%" if reduction > 0 else "0%"
-        )
-
-    console.print(table)
-
-    # Show examples
-    console.print("\n[bold cyan]Examples of Removed Artifacts:[/bold cyan]\n")
-
-    examples_to_show = [
-        ('Leading Digit', old_examples['leading_digit']),
-        ('Leading Dash', old_examples['leading_dash']),
-        ('Leading Hash', old_examples['leading_hash']),
-        ('Leading Dollar', old_examples['leading_dollar']),
-        ('Leading Paren', old_examples['leading_paren']),
-        ('Trailing Asterisk', old_examples['trailing_asterisk']),
-        ('Trailing Quote', old_examples['trailing_quote']),
-    ]
-
-    for artifact_type, examples in examples_to_show:
-        if examples:
-            console.print(f"[yellow]{artifact_type}:[/yellow]")
-            for ex in examples[:3]:
-                # Find cleaned version in new data
-                cleaned = re.sub(r'^[0-9\-#$\(]+|[\*"\']$', '', ex).strip()
-                console.print(f"  [red]✗[/red] {repr(ex)} → [green]✓[/green] {repr(cleaned)}")
-            console.print()
-
-    # Overall statistics
-    console.print("\n[bold]Overall Impact:[/bold]")
-    total_removed = len(old_strings) - len(new_strings)
-    artifacts_removed = old_artifacts['total_with_artifacts'] - new_artifacts['total_with_artifacts']
-
-    if len(old_strings) > 0:
-        artifact_rate_old = (old_artifacts['total_with_artifacts'] / len(old_strings)) * 100
-        artifact_rate_new = (new_artifacts['total_with_artifacts'] / len(new_strings)) * 100 if len(new_strings) > 0 else 0
-
-        console.print(f"  • Total strings removed: [yellow]{total_removed}[/yellow]")
-        console.print(f"  • Artifacts cleaned: [yellow]{artifacts_removed}[/yellow]")
-        console.print(f"  • Artifact rate: [red]{artifact_rate_old:.1f}%[/red] → [green]{artifact_rate_new:.1f}%[/green]")
-        console.print(f"  • Improvement: [cyan]{artifact_rate_old - artifact_rate_new:.1f} percentage points[/cyan]")
-
-    # File size comparison
-    import os
-    old_size = os.path.getsize(old_path)
-    new_size = os.path.getsize(new_path)
-    size_diff = old_size - new_size
-    size_reduction = (size_diff / old_size) * 100 if old_size > 0 else 0
-
-    console.print(f"\n[bold]File Size:[/bold]")
-    console.print(f"  • Before: [red]{old_size / 1024 / 1024:.2f} MB[/red]")
-    console.print(f"  • After: [green]{new_size / 1024 / 1024:.2f} MB[/green]")
-    console.print(f"  • Reduced by: [yellow]{size_diff / 1024:.1f} KB ({size_reduction:.1f}%)[/yellow]")
-
-
-if __name__ == "__main__":
-    old_file = "example-output/actions_complete.json"
-    new_file = "output/actions_complete.json"
+    if RICH_AVAILABLE:
+        console = Console()
+        table = Table(title="Sanitizer Artifacts in type_info.strings", show_header=True)
+        table.add_column("Artifact Type", style="cyan", width=25)
+        table.add_column("Before", justify="right", style="red")
+        table.add_column("After", justify="right", style="green")
+        table.add_column("% Reduction", justify="right", style="magenta")
+        for name, before, after in rows:
+            reduction = (before - after) * 100 / before if before > 0 else 0
+            table.add_row(name, str(before), str(after), f"{reduction:.1f}%" if reduction > 0 else "0%")
+        console.print(table)
+    else:
+        print("\nSanitizer artifacts in type_info.strings (before -> after):")
+        for name, before, after in rows:
+            print(f"  {name:25s} {before:7d} -> {after:7d}")
+
+    for name, examples in old_examples.items():
+        for ex in examples[:3]:
+            cleaned = re.sub(r'^[0-9\-#$\(]+|[\*"\']$', '', ex).strip()
+            print(f"  {name}: {ex!r} -> {cleaned!r}")
+
+
+def _format_value(value: Any, width: int = 60) -> str:
+    text = json.dumps(value, ensure_ascii=False, default=str)
+    return text if len(text) <= width else text[:width - 3] + '...'
+
+
+def show_diff(diff: Dict[str, Any], max_items: int = 20, verbose: bool = False):
+    """Display a record diff"""
+    changed = diff['changed']
+    summary = (
+        f"Old: {diff['old_count']}  New: {diff['new_count']}  "
+        f"Added: {len(diff['added'])}  Removed: {len(diff['removed'])}  "
+        f"Changed: {len(changed)}  Unchanged: {diff['unchanged']}"
+    )
+
+    if RICH_AVAILABLE:
+        Console().print(Panel(summary, title=f"📊 Record Diff (keyed by {diff['key']})", border_style="cyan"))
+    else:
+        print(f"\n📊 Record diff (keyed by {diff['key']})")
+        print(f"  {summary}")
+
+    if diff['duplicate_keys']:
+        print(f"\n⚠️  {diff['duplicate_keys']} records had a duplicate {diff['key']} (last one wins)")
+
+    for label, ids in (('Added', diff['added']), ('Removed', diff['removed'])):
+        if ids:
+            print(f"\n{label} ({len(ids)}):")
+            for record_id in ids[:max_items]:
+                print(f"  {'+' if label == 'Added' else '-'} {record_id}")
+            if len(ids) > max_items:
+                print(f"  ... and {len(ids) - max_items} more")
+
+    if changed:
+        print(f"\nChanged ({len(changed)}):")
+        ids = list(changed)
+        for record_id in ids[:max_items]:
+            if isinstance(changed, dict):
+                changes = changed[record_id]
+                print(f"  ~ {record_id} ({len(changes)} fields)")
+                for change in changes[:max_items]:
+                    line = f"      {change['change']:9s} {change['path']}"
+                    if verbose:
+                        if 'old' in change:
+                            line += f"  {_format_value(change['old'])}"
+                        if 'new' in change:
+                            line += f" -> {_format_value(change['new'])}"
+                    print(line)
+                if len(changes) > max_items:
+                    print(f"      ... and {len(changes) - max_items} more")
+            else:
+                print(f"  ~ {record_id}")
+        if len(ids) > max_items:
+            print(f"  ... and {len(ids) - max_items} more")
+
+
+def record_source(path: str, use_cache: bool = False) -> Callable[[], Iterable[Dict[str, Any]]]:
+    """Callable returning the records of an output, streamed or loaded once through the cache"""
+    if not use_cache:
+        return lambda: iter_records(path)
+
+    records = load_output(path)
+    if not isinstance(records, list):
+        raise ValueError(f"Expected a list of records in {path}")
+    return lambda: records
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Diff two extraction outputs record by record",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+
+    parser.add_argument('old', nargs='?', default='example-output/actions_complete.json', help='Old output file')
+    parser.add_argument('new', nargs='?', default='output/actions_complete.json', help='New output file')
+    parser.add_argument('--key', default='id', help='Record identity field (default: id)')
+    parser.add_argument('--ids-only', action='store_true', help='Only report ids, no field-level changes')
+    parser.add_argument('--artifacts', action='store_true', help='Also compare sanitizer artifacts in type_info.strings')
+    parser.add_argument('--max', type=int, default=20, metavar='N', help='Show at most N entries per section (default: 20)')
+    parser.add_argument('--export', metavar='FILE', help='Write the full diff as JSON')
+    parser.add_argument('--cache', action='store_true', help='Load both files through their binary cache instead of streaming')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Show old/new values of changed fields')
+
+    args = parser.parse_args()
 
     try:
-        compare_files(old_file, new_file)
-        console.print("\n[bold green]✓ Comparison complete![/bold green]\n")
+        for path in (args.old, args.new):
+            if not Path(path).exists():
+                raise FileNotFoundError(f"Output not found: {path}")
+
+        old_records = record_source(args.old, args.cache)
+        new_records = record_source(args.new, args.cache)
+
+        diff = diff_record_streams(old_records, new_records, args.key, field_diffs=not args.ids_only)
+        show_diff(diff, args.max, args.verbose)
+
+        if args.artifacts:
+            show_artifacts(old_records(), new_records())
+
+        if args.export:
+            path = Path(args.export)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(diff, f, indent=2, ensure_ascii=False)
+            print(f"\n✅ Exported to {args.export}")
+
+        print("\n✨ Done!\n")
+
     except FileNotFoundError as e:
-        console.print(f"[bold red]Error: {e}[/bold red]")
-        console.print("Make sure both example-output/actions_complete.json and output/actions_complete.json exist.")
+        print(f"\n❌ Error: {e}")
         sys.exit(1)
     except Exception as e:
-        console.print(f"[bold red]Error: {e}[/bold red]")
+        print(f"\n❌ Error: {e}")
         sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -13,12 +13,33 @@ Options:
     --type TYPE_ID        Decode BLOBs for specific type
     --all-params          Decode all parameter typeInstance BLOBs
     --all-requirements    Decode all requirements BLOBs
+    --cluster             With --all-params/--all-requirements, group BLOBs by
+                          field signature and analyze one template per cluster
+    --infer-schema COLUMN Infer a schema for a BLOB column and decode it with
+                          a compiled decoder (e.g. Parameters.typeInstance)
+    --catalog             Hash every BLOB column into a content-addressed
+                          catalog and report cross-column payload reuse
+    --build-index         Decode every BLOB column once into a sidecar
+                          field-path index (<db>.fields.sqlite)
+    --query PATH[=VALUE]  Look up rows whose BLOBs contain a field path,
+                          e.g. 3.1.3=7 or field_2=17 (uses the index)
+    --column COLUMN       Restrict --query to one BLOB column
+    --index PATH          Sidecar index path
     --export DIR          Export decoded data to directory
+    --decode-workers N    Decode BLOBs in N worker processes
     -v, --verbose         Verbose output
+
+Examples:
+    # Build the field-path index, then find parameters whose typeInstance
+    # has field 3.1.3 = 7 and actions whose requirements have field_2 = 17
+    python3 decode_protobuf_fields.py --build-index
+    python3 decode_protobuf_fields.py --query 3.1.3=7 --column Parameters.typeInstance
+    python3 decode_protobuf_fields.py --query field_2=17 --column Tools.requirements
 """
 
 import sys
 import json
+import time
 import argparse
 from pathlib import Path
 from typing import Dict, Any
@@ -32,7 +53,8 @@ try:
 except ImportError:
     RICH_AVAILABLE = False
 
-from utils.db_utils import connect_db, get_action_parameters
+from utils.catalog import Catalog
+from utils.db_utils import get_blob_column, BLOB_COLUMNS
 from utils.protobuf_parser import (
     decode_protobuf_blob,
     extract_strings_from_blob,
@@ -41,32 +63,35 @@ from utils.protobuf_parser import (
     analyze_coercion_blob,
     format_blob_analysis,
 )
+from utils.blob_catalog import BlobCatalog, format_reuse_stats
+from utils.field_index import (
+    build_field_index,
+    default_index_path,
+    index_is_stale,
+    parse_field_query,
+    query_field_index,
+)
+from utils.blob_clusters import cluster_blobs, member_analysis, format_cluster_report
+from utils.blob_schema import (
+    infer_message_schema,
+    compile_decoder,
+    decode_column,
+    to_file_descriptor_proto,
+    PROTOBUF_AVAILABLE,
+)
 
 
-def decode_action_blobs(db_path: str, action_id: str, verbose: bool = False):
+def decode_action_blobs(catalog: Catalog, action_id: str, verbose: bool = False):
     """Decode all BLOBs for a specific action"""
-    conn = connect_db(db_path)
-
-    # Get action
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT
-            t.rowId,
-            t.id,
-            t.requirements,
-            t.outputTypeInstance,
-            tl.name
-        FROM Tools t
-        LEFT JOIN ToolLocalizations tl ON t.rowId = tl.toolId AND tl.locale = 'en'
-        WHERE t.id = ?
-    """, (action_id,))
-
-    row = cursor.fetchone()
-    if not row:
+    action = catalog.action(action_id)
+    if not action:
         print(f"❌ Action not found: {action_id}")
         return
 
-    action_data = dict(row)
+    row = catalog.conn.execute(
+        "SELECT requirements, outputTypeInstance FROM Tools WHERE rowId = ?", (action['rowId'],)
+    ).fetchone()
+    action_data = dict(action, **dict(row))
     tool_id = action_data['rowId']
 
     if RICH_AVAILABLE:
@@ -101,7 +126,7 @@ def decode_action_blobs(db_path: str, action_id: str, verbose: bool = False):
             print(json.dumps(analysis, indent=2))
 
     # Decode parameters
-    parameters = get_action_parameters(conn, tool_id)
+    parameters = catalog.parameters(tool_id)
 
     if parameters:
         if RICH_AVAILABLE:
@@ -120,92 +145,220 @@ def decode_action_blobs(db_path: str, action_id: str, verbose: bool = False):
                     print(f"\n{param['key']} - {param.get('name') or '(no name)'}")
                     print(format_blob_analysis(analysis))
 
-    conn.close()
 
+def _load_column_catalog(catalog: Catalog, column: str):
+    """Catalog of one BLOB column (shared through catalog) and its ranked digests"""
+    blob_catalog = catalog.blob_catalog([column])
+    return blob_catalog, blob_catalog.ranked_digests(column)
 
-def decode_all_parameter_blobs(db_path: str, limit: int = None, verbose: bool = False):
-    """Decode all parameter typeInstance BLOBs"""
-    conn = connect_db(db_path)
 
-    cursor = conn.cursor()
-    query = """
-        SELECT DISTINCT
-            p.typeInstance,
-            p.key,
-            pl.name,
-            COUNT(*) as usage_count
-        FROM Parameters p
-        LEFT JOIN ParameterLocalizations pl ON p.toolId = pl.toolId AND p.key = pl.key AND pl.locale = 'en'
-        WHERE p.typeInstance IS NOT NULL
-        GROUP BY p.typeInstance
-        ORDER BY usage_count DESC
-    """
+def decode_all_parameter_blobs(catalog: Catalog, limit: int = None, verbose: bool = False, decode_workers: int = 1):
+    """Decode all unique parameter typeInstance BLOBs"""
+    column = 'Parameters.typeInstance'
+    blob_catalog, ranked = _load_column_catalog(catalog, column)
 
     if limit:
-        query += f" LIMIT {limit}"
+        ranked = ranked[:limit]
 
-    cursor.execute(query)
+    blob_catalog.analyze([column], decode_workers, [digest for digest, _ in ranked])
 
     results = []
-    for row in cursor.fetchall():
-        blob = bytes(row['typeInstance'])
-        analysis = analyze_type_instance_blob(blob)
+    for digest, usage_count in ranked:
+        _, action_id, key, _ = blob_catalog.references_to(digest, column)[0]
+        analysis = blob_catalog.analysis(digest, column)
 
         result = {
-            'param_key': row['key'],
-            'param_name': row['name'],
-            'usage_count': row['usage_count'],
+            'digest': digest,
+            'param_key': key,
+            'param_name': catalog.parameter_name(action_id, key),
+            'usage_count': usage_count,
             'analysis': analysis,
         }
         results.append(result)
 
         if verbose:
-            print(f"\n{row['key']} ({row['usage_count']} uses)")
+            print(f"\n{key} ({usage_count} uses)")
             print(format_blob_analysis(analysis))
 
-    conn.close()
     return results
 
 
-def decode_all_requirements(db_path: str, limit: int = None, verbose: bool = False):
+def cluster_parameter_blobs(catalog: Catalog, limit: int = None, verbose: bool = False):
+    """Cluster all unique parameter typeInstance BLOBs by field signature"""
+    column = 'Parameters.typeInstance'
+    blob_catalog, ranked = _load_column_catalog(catalog, column)
+
+    result = cluster_blobs([blob_catalog.payloads[digest] for digest, _ in ranked])
+
+    for cluster in result['clusters']:
+        cluster['usage_count'] = 0
+        for member in cluster['members']:
+            digest, usage_count = ranked[member['index']]
+            _, action_id, key, _ = blob_catalog.references_to(digest, column)[0]
+            member['digest'] = digest
+            member['param_key'] = key
+            member['param_name'] = catalog.parameter_name(action_id, key)
+            member['usage_count'] = usage_count
+            cluster['usage_count'] += usage_count
+
+    if limit:
+        result['clusters'] = result['clusters'][:limit]
+
+    print(format_cluster_report(result))
+
+    if verbose:
+        for cluster in result['clusters']:
+            print(f"\n{cluster['signature']} ({cluster['size']} BLOBs, {cluster['usage_count']} uses)")
+            for member in cluster['members'][:5]:
+                analysis = member_analysis(cluster, member)
+                print(f"  {member['param_key']}: {', '.join(analysis['uti_types'] or analysis['strings'][:3])}")
+
+    return result
+
+
+def cluster_requirements(catalog: Catalog, limit: int = None, verbose: bool = False):
+    """Cluster all unique requirements BLOBs by field signature"""
+    blob_catalog, ranked = _load_column_catalog(catalog, 'Tools.requirements')
+
+    result = cluster_blobs([blob_catalog.payloads[digest] for digest, _ in ranked])
+
+    for cluster in result['clusters']:
+        cluster['usage_count'] = 0
+        for member in cluster['members']:
+            member['digest'], member['usage_count'] = ranked[member['index']]
+            cluster['usage_count'] += member['usage_count']
+
+    if limit:
+        result['clusters'] = result['clusters'][:limit]
+
+    print(format_cluster_report(result))
+
+    if verbose:
+        for cluster in result['clusters']:
+            print(f"\n{cluster['signature']} ({cluster['size']} BLOBs, {cluster['usage_count']} uses)")
+            print(f"  constant: {cluster['template']['values']}")
+
+    return result
+
+
+def decode_all_requirements(catalog: Catalog, limit: int = None, verbose: bool = False, decode_workers: int = 1):
     """Decode all unique requirements BLOBs"""
-    conn = connect_db(db_path)
-
-    cursor = conn.cursor()
-    query = """
-        SELECT DISTINCT
-            t.requirements,
-            COUNT(*) as usage_count
-        FROM Tools t
-        WHERE LENGTH(t.requirements) > 0
-        GROUP BY t.requirements
-        ORDER BY usage_count DESC
-    """
+    column = 'Tools.requirements'
+    blob_catalog, ranked = _load_column_catalog(catalog, column)
 
     if limit:
-        query += f" LIMIT {limit}"
+        ranked = ranked[:limit]
 
-    cursor.execute(query)
+    blob_catalog.analyze([column], decode_workers, [digest for digest, _ in ranked])
 
     results = []
-    for row in cursor.fetchall():
-        blob = bytes(row['requirements'])
-        analysis = analyze_requirements_blob(blob)
+    for digest, usage_count in ranked:
+        analysis = blob_catalog.analysis(digest, column)
 
         result = {
-            'usage_count': row['usage_count'],
+            'digest': digest,
+            'usage_count': usage_count,
             'analysis': analysis,
         }
         results.append(result)
 
         if verbose:
-            print(f"\nRequirements pattern ({row['usage_count']} uses):")
+            print(f"\nRequirements pattern ({usage_count} uses):")
             print(format_blob_analysis(analysis))
 
-    conn.close()
     return results
 
 
+def build_blob_catalog(catalog: Catalog, decode_workers: int = 1, analyze: bool = False, verbose: bool = False) -> BlobCatalog:
+    """Catalog every BLOB column and report cross-column payload reuse"""
+    blob_catalog = catalog.blob_catalog()
+
+    if analyze:
+        blob_catalog.analyze(workers=decode_workers)
+
+    print(format_reuse_stats(blob_catalog.reuse_stats()))
+
+    if verbose:
+        for digest in blob_catalog.digests():
+            refs = blob_catalog.references_to(digest)
+            columns = sorted({ref[0] for ref in refs})
+            if len(columns) > 1:
+                print(f"\n{digest} ({len(blob_catalog.payloads[digest])} bytes, {len(refs)} refs): {', '.join(columns)}")
+
+    return blob_catalog
+
+
+def format_schema_fields(message: Dict[str, Any], indent: int = 2) -> str:
+    """Format an inferred message schema as an indented field tree"""
+    lines = []
+    prefix = ' ' * indent
+
+    for key, field in message.get('fields', {}).items():
+        label = 'repeated ' if field['repeated'] else ''
+        line = f"{prefix}{key}: {label}{field['kind']} (presence {field['presence']:.0%})"
+        if field.get('conflicting_wire_types'):
+            line += f" [conflicting wire types: {field['conflicting_wire_types']}]"
+        lines.append(line)
+        if field['kind'] == 'message':
+            nested = format_schema_fields(field['message'], indent + 4)
+            if nested:
+                lines.append(nested)
+
+    return '\n'.join(lines)
+
+
+def infer_column_schema(catalog: Catalog, column: str, verbose: bool = False) -> Dict[str, Any]:
+    """Infer a schema for a BLOB column and decode the column with it"""
+    blobs = get_blob_column(catalog.conn, column, distinct=False)
+
+    start = time.perf_counter()
+    descriptor = infer_message_schema(blobs, column)
+    inferred = time.perf_counter()
+
+    decoder = compile_decoder(descriptor)
+    decoded = decode_column(blobs, decoder)
+    finished = time.perf_counter()
+
+    print(f"\n{column}: {descriptor['samples']} BLOBs sampled, {descriptor['malformed']} malformed")
+    print(format_schema_fields(descriptor))
+
+    if verbose:
+        print(f"\nInference: {(inferred - start) * 1000:.1f} ms")
+        print(f"Compiled decode of {len(blobs)} BLOBs: {(finished - inferred) * 1000:.1f} ms")
+
+    return {
+        'descriptor': descriptor,
+        'decoded': decoded,
+    }
+
+
+def run_field_query(db_path: str, index_path: str, expression: str, column: str = None, limit: int = None):
+    """Answer a field-path query from the sidecar index"""
+    if not Path(index_path).exists():
+        raise FileNotFoundError(f"Field index not found: {index_path} (run with --build-index first)")
+
+    if Path(db_path).exists() and index_is_stale(index_path, db_path):
+        print(f"⚠️  {index_path} was built from a different version of {db_path}; rebuild with --build-index")
+
+    path, value = parse_field_query(expression)
+
+    start = time.perf_counter()
+    matches = query_field_index(index_path, path, value, column, limit)
+    elapsed = time.perf_counter() - start
+
+    for match in matches:
+        ref = match['ref_id'] if match['ref_key'] is None else f"{match['ref_id']} [{match['ref_key']}]"
+        shown = match['value']
+        if isinstance(shown, bytes):
+            shown = '0x' + shown.hex()
+        elif shown is None:
+            shown = '(message)'
+        print(f"  {match['column']:34s} {ref}  {match['path']} = {shown}")
+
+    print(f"\n✅ {len(matches)} matching rows in {elapsed * 1000:.1f} ms")
+    return matches
+
+
 def export_decoded_data(data: Any, output_path: str):
     """Export decoded data to JSON"""
     path = Path(output_path)
@@ -227,24 +380,79 @@ def main():
     parser.add_argument('--type', metavar='ID', help='Decode BLOBs for specific type')
     parser.add_argument('--all-params', action='store_true', help='Decode all parameter typeInstance BLOBs')
     parser.add_argument('--all-requirements', action='store_true', help='Decode all requirements BLOBs')
+    parser.add_argument('--cluster', action='store_true', help='Cluster BLOBs by field signature (with --all-params/--all-requirements)')
+    parser.add_argument('--infer-schema', metavar='COLUMN', choices=list(BLOB_COLUMNS), help='Infer a schema for a BLOB column (Table.column)')
+    parser.add_argument('--catalog', action='store_true', help='Catalog unique payloads across all BLOB columns and report reuse')
+    parser.add_argument('--build-index', action='store_true', help='Build the sidecar field-path index over all BLOB columns')
+    parser.add_argument('--query', metavar='PATH[=VALUE]', help='Find rows whose BLOBs contain a field path (e.g. 3.1.3=7)')
+    parser.add_argument('--column', choices=list(BLOB_COLUMNS), help='Restrict --query to one BLOB column')
+    parser.add_argument('--index', metavar='PATH', help='Sidecar index path (default: <db>.fields.sqlite)')
     parser.add_argument('--limit', type=int, help='Limit results')
     parser.add_argument('--export', metavar='DIR', help='Export to directory')
+    parser.add_argument('--decode-workers', type=int, default=1, metavar='N', help='Decode BLOBs in N worker processes (default: 1)')
     parser.add_argument('-v', '--verbose', action='store_true', help='Verbose output')
     parser.add_argument('--db', default='Tools-prod.sqlite', help='Database path')
 
     args = parser.parse_args()
 
-    if not any([args.action, args.type, args.all_params, args.all_requirements]):
+    if not any([args.action, args.type, args.all_params, args.all_requirements, args.infer_schema, args.catalog, args.build_index, args.query]):
         parser.print_help()
         sys.exit(1)
 
+    index_path = args.index or default_index_path(args.db)
+
+    catalog = None
     try:
+        # One load shared by every report below (--build-index and --query
+        # work on the sidecar index)
+        if any([args.action, args.all_params, args.all_requirements, args.infer_schema, args.catalog]):
+            catalog = Catalog(args.db)
+
+        if args.catalog:
+            print("\n🔬 Cataloging BLOB payloads across all columns...")
+            blob_catalog = build_blob_catalog(catalog, args.decode_workers, analyze=bool(args.export), verbose=args.verbose)
+
+            if args.export:
+                export_dir = Path(args.export)
+                export_dir.mkdir(parents=True, exist_ok=True)
+                blob_catalog.save(str(export_dir / 'blob_catalog.sqlite'))
+                print(f"✅ Exported to {export_dir / 'blob_catalog.sqlite'}")
+                export_decoded_data(blob_catalog.reuse_stats(), str(export_dir / 'blob_catalog_stats.json'))
+
+            print(f"\n✅ Cataloged {len(blob_catalog.references)} BLOB references as {len(blob_catalog)} unique payloads")
+
+        if args.build_index:
+            print(f"\n🔬 Building field-path index {index_path}...")
+            stats = build_field_index(args.db, index_path, verbose=args.verbose)
+            print(
+                f"\n✅ Indexed {stats['field_values']} field values from {stats['unique_blobs']} unique BLOBs "
+                f"({stats['references']} rows, {stats['malformed']} malformed) in {stats['seconds']:.1f}s"
+            )
+
+        if args.query:
+            print(f"\n🔎 {args.query}" + (f" in {args.column}" if args.column else ""))
+            matches = run_field_query(args.db, index_path, args.query, args.column, args.limit)
+
+            if args.export:
+                export_path = Path(args.export) / 'field_query.json'
+                export_decoded_data(matches, str(export_path))
+
         if args.action:
-            decode_action_blobs(args.db, args.action, args.verbose)
+            decode_action_blobs(catalog, args.action, args.verbose)
+
+        if args.all_params and args.cluster:
+            print("\n🔬 Clustering parameter typeInstance BLOBs...")
+            results = cluster_parameter_blobs(catalog, args.limit, args.verbose)
+
+            if args.export:
+                export_path = Path(args.export) / 'parameters_clusters.json'
+                export_decoded_data(results, str(export_path))
+
+            print(f"\n✅ Clustered {results['total_blobs']} unique parameter BLOBs into {len(results['clusters'])} shapes")
 
-        if args.all_params:
+        elif args.all_params:
             print("\n🔬 Decoding all parameter typeInstance BLOBs...")
-            results = decode_all_parameter_blobs(args.db, args.limit, args.verbose)
+            results = decode_all_parameter_blobs(catalog, args.limit, args.verbose, args.decode_workers)
 
             if args.export:
                 export_path = Path(args.export) / 'parameters_decoded.json'
@@ -252,9 +460,19 @@ def main():
 
             print(f"\n✅ Decoded {len(results)} unique parameter BLOBs")
 
-        if args.all_requirements:
+        if args.all_requirements and args.cluster:
+            print("\n🔬 Clustering requirements BLOBs...")
+            results = cluster_requirements(catalog, args.limit, args.verbose)
+
+            if args.export:
+                export_path = Path(args.export) / 'requirements_clusters.json'
+                export_decoded_data(results, str(export_path))
+
+            print(f"\n✅ Clustered {results['total_blobs']} unique requirements BLOBs into {len(results['clusters'])} shapes")
+
+        elif args.all_requirements:
             print("\n🔬 Decoding all requirements BLOBs...")
-            results = decode_all_requirements(args.db, args.limit, args.verbose)
+            results = decode_all_requirements(catalog, args.limit, args.verbose, args.decode_workers)
 
             if args.export:
                 export_path = Path(args.export) / 'requirements_decoded.json'
@@ -262,6 +480,26 @@ def main():
 
             print(f"\n✅ Decoded {len(results)} unique requirements patterns")
 
+        if args.infer_schema:
+            print(f"\n🔬 Inferring schema for {args.infer_schema}...")
+            result = infer_column_schema(catalog, args.infer_schema, args.verbose)
+
+            if args.export:
+                export_dir = Path(args.export)
+                export_decoded_data(result['descriptor'], str(export_dir / f'{args.infer_schema}.schema.json'))
+                export_decoded_data(result['decoded'], str(export_dir / f'{args.infer_schema}.decoded.json'))
+
+                if PROTOBUF_AVAILABLE:
+                    from google.protobuf import descriptor_pb2
+                    descriptor_set = descriptor_pb2.FileDescriptorSet()
+                    message_name = ''.join(part[:1].upper() + part[1:] for part in args.infer_schema.split('.'))
+                    descriptor_set.file.append(to_file_descriptor_proto(result['descriptor'], message_name))
+                    desc_path = export_dir / f'{args.infer_schema}.desc'
+                    desc_path.write_bytes(descriptor_set.SerializeToString())
+                    print(f"✅ Exported to {desc_path}")
+
+            print(f"\n✅ Decoded {len(result['decoded'])} BLOBs with the inferred schema")
+
     except FileNotFoundError as e:
         print(f"\n❌ Error: {e}")
         sys.exit(1)
@@ -271,6 +509,9 @@ def main():
             import traceback
             traceback.print_exc()
         sys.exit(1)
+    finally:
+        if catalog is not None:
+            catalog.close()
 
 
 if __name__ == '__main__':
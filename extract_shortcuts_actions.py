@@ -12,9 +12,42 @@ Options:
     --all           Extract all actions to output/actions_complete.json
     --hidden        Extract only hidden actions (visibilityFlags > 0)
     --csv           Also export as CSV
+    --ndjson        Also export as NDJSON with a binary id -> offset index
+    --dictionary    Also export dictionary-encoded JSON (<name>.dict.json), each
+                    repeated identifier stored once (see utils.string_table)
+    --normalized    Also export normalized JSON (<name>.normalized.json), each
+                    distinct parameter type_info stored once by digest
+    --bytes-format FORMAT   Raw BLOB payloads in --normalized output: hex
+                            (default), base64 or omit
+    --columnar [FORMAT]     Also export relational tables (actions, parameters,
+                            types, ...) to output/columnar/: parquet if an engine
+                            is installed, else csv.gz (or feather); needs pandas
+    --stats-only    Print the summary from SQL aggregates without extracting
     --no-protobuf   Skip protobuf decoding (faster)
     --limit N       Limit to N actions (for testing)
+    --offset N      Skip the first N actions
+    --app BUNDLE_ID         Only actions of this app
+    --min-visibility N      Only actions with visibilityFlags >= N
+    --max-visibility N      Only actions with visibilityFlags <= N
+    --tool-type TYPE        Only this toolType (action, appIntent, ...)
+    --id-prefix PREFIX      Only action ids starting with PREFIX
     --locale LANG   Use specific locale (default: en)
+    --fallback [LIST]   Fill strings missing in --locale from its parent
+                        locales (en_GB -> en, zh_Hant_HK -> zh_Hant -> zh),
+                        then LIST; each schema records its strings' locales
+    --locales LIST  Extract several locales (en,de,fr,ja) in one pass, sharing
+                    the locale-independent queries and decoding; writes
+                    output/actions_complete.<locale>.json per locale
+    --fields SPEC   Only extract some fields, skipping the queries and decoding
+                    of the rest: a tier (ids, localized, parameters, blobs)
+                    and/or field names (id,name,app,parameters.key)
+    --decode-workers N  Decode protobuf BLOBs in N worker processes
+    --decode-depth N    Decode parameter BLOBs as nested messages, N levels deep
+    --incremental       With --all, rebuild only actions that changed since the
+                        previous output/actions_complete.json
+    --previous-db PATH  With --incremental, ATTACH this previous database and
+                        diff against it instead of the saved fingerprints
+                        (the manifest is still needed for its options)
     -v, --verbose   Verbose output
 
 Examples:
@@ -29,14 +62,57 @@ Examples:
 
     # Export to CSV and JSON
     python3 extract_shortcuts_actions.py --all --csv
+
+    # Also write output/actions_complete.ndjson(.idx) for random access by id
+    python3 extract_shortcuts_actions.py --all --ndjson
+
+    # Also write the compact output/actions_complete.dict.json
+    python3 extract_shortcuts_actions.py --all --dictionary
+
+    # Shared type_info blocks, payloads base64-encoded
+    python3 extract_shortcuts_actions.py --all --normalized --bytes-format base64
+
+    # Columnar tables for pandas (utils.columnar.load_dataframes('output/columnar'))
+    python3 extract_shortcuts_actions.py --all --columnar
+
+    # Summary counts only (milliseconds, no output files)
+    python3 extract_shortcuts_actions.py --stats-only
+
+    # Only the Notes actions (filters run in SQL; also apply to --hidden/--stats-only)
+    python3 extract_shortcuts_actions.py --all --app com.apple.mobilenotes
+
+    # Second page of 100 appIntent actions
+    python3 extract_shortcuts_actions.py --all --tool-type appIntent --limit 100 --offset 100
+
+    # English, German, French and Japanese catalogs in one run
+    python3 extract_shortcuts_actions.py --all --locales en,de,fr,ja
+
+    # British English, falling back to English where strings are missing
+    python3 extract_shortcuts_actions.py --all --locale en_GB --fallback
+
+    # Dashboard data only: ids, app and visibility, no per-action queries
+    python3 extract_shortcuts_actions.py --all --fields ids
+
+    # Names plus parameter keys
+    python3 extract_shortcuts_actions.py --all --fields id,name,app,parameters.key
+
+    # Decode parameter BLOBs on 8 cores
+    python3 extract_shortcuts_actions.py --all --decode-workers 8
+
+    # Expand nested protobuf messages two levels deep instead of hex dumps
+    python3 extract_shortcuts_actions.py --all --decode-depth 2
+
+    # Update output/ to a new database version, rebuilding only changed actions
+    python3 extract_shortcuts_actions.py --all --incremental --db Tools-prod.v2.sqlite
+    python3 extract_shortcuts_actions.py --all --incremental --db Tools-prod.v2.sqlite --previous-db Tools-prod.v1.sqlite
 """
 
 import sys
-import json
 import csv
 import argparse
+from dataclasses import replace
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import AbstractSet, List, Dict, Any, Optional, Tuple
 
 try:
     from rich.console import Console
@@ -49,14 +125,41 @@ except ImportError:
     RICH_AVAILABLE = False
     print("Note: Install 'rich' for better output: pip install rich")
 
+from utils.catalog import Catalog
 from utils.db_utils import (
-    connect_db,
-    get_all_actions,
+    QueryFilter,
+    add_filter_arguments,
+    filter_from_args,
     get_action_count,
-    get_hidden_actions,
+    filter_hidden_actions,
+    get_action_fingerprints,
+    get_action_summary,
+    get_parameter_type_instances,
+    locale_chain,
+    Locale,
+)
+from utils.decode_pool import decode_unique_blobs
+from utils.incremental import (
+    manifest_path_for,
+    write_manifest,
+    load_manifest,
+    check_options,
+    diff_fingerprints,
+    splice_schemas,
+    missing_from,
 )
+from utils.multi_locale import build_locale_schemas, locale_output_path, parse_locales
+from utils.record_index import write_ndjson, index_path_for
+from utils.string_table import write_dictionary_encoded
+from utils.normalized_output import BYTES_FORMATS, write_normalized
+from utils.columnar import COLUMNAR_FORMATS, export_columnar, resolve_format, to_dataframes
+from utils.json_stream import dump_json_array, iter_records
+from utils.schema_model import ActionSchema, schema_dicts
 from utils.schema_builder import (
     build_action_schema,
+    build_type_schema,
+    parse_field_selection,
+    wants_type_info,
     summarize_action_collection,
     classify_action_visibility,
 )
@@ -66,10 +169,15 @@ def extract_all_actions(
     db_path: str = "Tools-prod.sqlite",
     include_protobuf: bool = True,
     fix_localizations: bool = True,
-    locale: str = "en",
+    locale: Locale = "en",
     limit: Optional[int] = None,
-    verbose: bool = False
-) -> List[Dict[str, Any]]:
+    verbose: bool = False,
+    decode_workers: int = 1,
+    decode_depth: Optional[int] = None,
+    query_filter: Optional[QueryFilter] = None,
+    fields: Optional[AbstractSet[str]] = None,
+    catalog: Optional[Catalog] = None
+) -> List[ActionSchema]:
     """
     Extract all actions with complete schemas.
 
@@ -77,27 +185,93 @@ def extract_all_actions(
         db_path: Path to database
         include_protobuf: Whether to decode protobuf BLOBs
         fix_localizations: Whether to fix localization keys with smart parsing
-        locale: Language locale
+        locale: Language locale or fallback chain (see db_utils.locale_chain())
         limit: Maximum number of actions (None = all)
         verbose: Verbose output
+        decode_workers: Worker processes for protobuf decoding (1 = inline)
+        decode_depth: Nested message depth for parameter BLOBs (None = flat)
+        query_filter: Only extract the matching actions (limit overrides its limit)
+        fields: Only build these schema fields (see parse_field_selection())
+        catalog: Catalog to load from (default: a new one on db_path in locale)
 
     Returns:
         List of complete action schemas
     """
-    conn = connect_db(db_path)
-    total = get_action_count(conn)
+    query_filter = query_filter or QueryFilter()
+    if limit:
+        query_filter = replace(query_filter, limit=limit)
+
+    owned = catalog is None
+    catalog = catalog or Catalog(db_path, locale)
+    total = get_action_count(catalog.conn)
 
     if verbose:
         print(f"\n📊 Database contains {total} actions")
-        print(f"🌍 Extracting with locale: {locale}")
+        print(f"🌍 Extracting with locale: {locale if isinstance(locale, str) else ' → '.join(locale)}")
         print(f"🔬 Protobuf decoding: {'enabled' if include_protobuf else 'disabled'}")
         print(f"🔧 Localization fixing: {'enabled' if fix_localizations else 'disabled'}\n")
 
-    # Get all actions
-    actions_data = get_all_actions(conn, locale)
+    # Get all (matching) actions
+    actions_data = catalog.actions(query_filter)
 
-    if limit:
-        actions_data = actions_data[:limit]
+    schemas = build_schemas(
+        catalog.conn, actions_data, include_protobuf, fix_localizations, locale, verbose,
+        decode_workers, decode_depth, restrict_blobs=query_filter.is_restricted(), fields=fields, catalog=catalog,
+    )
+
+    if owned:
+        catalog.close()
+    return schemas
+
+
+def build_schemas(
+    conn,
+    actions_data: List[Dict[str, Any]],
+    include_protobuf: bool = True,
+    fix_localizations: bool = True,
+    locale: Locale = "en",
+    verbose: bool = False,
+    decode_workers: int = 1,
+    decode_depth: Optional[int] = None,
+    restrict_blobs: bool = True,
+    fields: Optional[AbstractSet[str]] = None,
+    catalog: Optional[Catalog] = None
+) -> List[ActionSchema]:
+    """
+    Build schemas for a list of actions from get_all_actions().
+
+    Args:
+        conn: Database connection
+        actions_data: Actions to build
+        include_protobuf: Whether to decode protobuf BLOBs
+        fix_localizations: Whether to fix localization keys with smart parsing
+        locale: Language locale or fallback chain
+        verbose: Verbose output
+        decode_workers: Worker processes for protobuf decoding (1 = inline)
+        decode_depth: Nested message depth for parameter BLOBs (None = flat)
+        restrict_blobs: Only pre-decode BLOBs of these actions (False = all)
+        fields: Only build these schema fields (None = all)
+        catalog: Catalog on conn to share BLOB analyses and, for unrestricted
+            runs, bulk-loaded related rows with (None = per-action queries)
+
+    Returns:
+        Complete action schemas as compact models (see utils.schema_model)
+    """
+    # Bulk-loaded related rows only pay off for (nearly) the whole catalog
+    lookups = catalog if catalog is not None and not restrict_blobs else None
+    strings = catalog.strings if catalog is not None else None
+
+    # Decode each distinct parameter BLOB once up front (across worker processes if asked)
+    blob_analyses = None
+    if include_protobuf and wants_type_info(fields) and actions_data:
+        tool_ids = [a['rowId'] for a in actions_data] if restrict_blobs else None
+        if verbose:
+            print(f"🧵 Decoding unique parameter BLOBs with {decode_workers} worker(s)")
+        if catalog is not None:
+            blob_analyses = catalog.parameter_blob_analyses(decode_workers, decode_depth, tool_ids)
+        else:
+            blobs = get_parameter_type_instances(conn, tool_ids)
+            blob_analyses = decode_unique_blobs(blobs, 'type_instance', decode_workers, options={'decode_depth': decode_depth})
 
     # Build schemas
     schemas = []
@@ -115,41 +289,206 @@ def extract_all_actions(
             task = progress.add_task("Extracting actions...", total=len(actions_data))
 
             for action_data in actions_data:
-                schema = build_action_schema(conn, action_data, include_protobuf, False, fix_localizations, locale)
-                schemas.append(schema)
+                schema = build_action_schema(conn, action_data, include_protobuf, False, fix_localizations, locale, blob_analyses, decode_depth, fields, lookups, strings)
+                schemas.append(ActionSchema.from_dict(schema))
                 progress.update(task, advance=1)
     else:
         # Simple progress without rich
         for i, action_data in enumerate(actions_data):
             if verbose and i % 100 == 0:
                 print(f"Progress: {i}/{len(actions_data)} ({i*100//len(actions_data)}%)")
-            schema = build_action_schema(conn, action_data, include_protobuf, False, fix_localizations, locale)
-            schemas.append(schema)
+            schema = build_action_schema(conn, action_data, include_protobuf, False, fix_localizations, locale, blob_analyses, decode_depth, fields, lookups, strings)
+            schemas.append(ActionSchema.from_dict(schema))
+
+    return schemas
+
+
+def select_hidden_schemas(actions_data: List[Dict[str, Any]], schemas: List[ActionSchema]) -> List[ActionSchema]:
+    """
+    Schemas of the hidden actions among already built ones.
+
+    Args:
+        actions_data: get_all_actions() rows the schemas were built from
+        schemas: Their schemas (any order)
+
+    Returns:
+        The hidden actions' schemas in get_hidden_actions() order
+    """
+    by_id = {schema.id: schema for schema in schemas}
+    return [by_id[action['id']] for action in filter_hidden_actions(actions_data)]
+
+
+def extract_locales(
+    db_path: str = "Tools-prod.sqlite",
+    locales: Tuple[str, ...] = ("en",),
+    hidden: bool = False,
+    include_protobuf: bool = True,
+    fix_localizations: bool = True,
+    verbose: bool = False,
+    decode_workers: int = 1,
+    decode_depth: Optional[int] = None,
+    query_filter: Optional[QueryFilter] = None,
+    fields: Optional[AbstractSet[str]] = None,
+    catalog: Optional[Catalog] = None
+) -> Dict[str, List[ActionSchema]]:
+    """
+    Extract actions in several locales in a single pass (see utils.multi_locale).
+
+    Args:
+        db_path: Path to database
+        locales: Locales to extract
+        hidden: Extract the hidden actions instead of all actions
+        include_protobuf: Whether to decode protobuf BLOBs
+        fix_localizations: Whether to fix localization keys with smart parsing
+        verbose: Verbose output
+        decode_workers: Worker processes for protobuf decoding (1 = inline)
+        decode_depth: Nested message depth for parameter BLOBs (None = flat)
+        query_filter: Only extract the matching actions
+        fields: Only build these schema fields (see parse_field_selection())
+        catalog: Catalog to load from (default: a new one on db_path in the first locale)
+
+    Returns:
+        Dictionary of locale -> schemas
+    """
+    query_filter = query_filter or QueryFilter()
+    owned = catalog is None
+    catalog = catalog or Catalog(db_path, locales[0])
+
+    if verbose:
+        print(f"\n📊 Database contains {get_action_count(catalog.conn)} actions")
+        print(f"🌍 Extracting locales: {', '.join(locales)}")
+
+    actions = (catalog.hidden_actions if hidden else catalog.actions)(query_filter)
+    schemas = build_locale_schemas(
+        catalog.conn, actions, list(locales), include_protobuf, fix_localizations, decode_workers, decode_depth,
+        fields, restrict=hidden or query_filter.is_restricted(), verbose=verbose, strings=catalog.strings,
+    )
 
-    conn.close()
+    if owned:
+        catalog.close()
     return schemas
 
 
-def export_to_json(schemas: List[Dict[str, Any]], output_path: str, verbose: bool = False):
+def extract_incremental(
+    db_path: str = "Tools-prod.sqlite",
+    previous_output: str = "output/actions_complete.json",
+    previous_db: Optional[str] = None,
+    include_protobuf: bool = True,
+    fix_localizations: bool = True,
+    locale: str = "en",
+    verbose: bool = False,
+    decode_workers: int = 1,
+    decode_depth: Optional[int] = None,
+    catalog: Optional[Catalog] = None
+) -> Tuple[List[ActionSchema], Dict[str, Any]]:
+    """
+    Update a previous extraction to a new database version.
+
+    Only actions whose fingerprint changed (or that are new) are rebuilt;
+    the rest are reused from the previous output and removed actions drop
+    out.
+
+    Args:
+        db_path: Path to the new database
+        previous_output: Previous actions_complete.json
+        previous_db: Previous database to ATTACH and fingerprint (default:
+            the fingerprints of the manifest written next to previous_output,
+            which is needed either way to check the options)
+        include_protobuf: Whether to decode protobuf BLOBs
+        fix_localizations: Whether to fix localization keys with smart parsing
+        locale: Language locale
+        verbose: Verbose output
+        decode_workers: Worker processes for protobuf decoding (1 = inline)
+        decode_depth: Nested message depth for parameter BLOBs (None = flat)
+        catalog: Catalog to load from (default: a new one on db_path in locale)
+
+    Returns:
+        Tuple of (schemas, changes) where changes has the fingerprints of the
+        new database and the added/removed/changed/unchanged id lists
+    """
+    if not Path(previous_output).exists():
+        raise FileNotFoundError(f"Previous output not found: {previous_output}")
+
+    # Without the manifest's options, schemas built differently would get mixed
+    manifest = load_manifest(manifest_path_for(previous_output))
+    check_options(manifest, extraction_options(include_protobuf, fix_localizations, locale, decode_depth))
+    if previous_db and not Path(previous_db).exists():
+        raise FileNotFoundError(f"Database not found: {previous_db}")
+
+    owned = catalog is None
+    catalog = catalog or Catalog(db_path, locale)
+    conn = catalog.conn
+    current = get_action_fingerprints(conn, locale)
+
+    if previous_db:
+        conn.execute("ATTACH DATABASE ? AS previous", (previous_db,))
+        previous = get_action_fingerprints(conn, locale, schema='previous')
+        conn.execute("DETACH DATABASE previous")
+    else:
+        previous = manifest['fingerprints']
+
+    changes = diff_fingerprints(previous, current)
+
+    previous_schemas = [ActionSchema.from_dict(schema) for schema in iter_records(previous_output)]
+
+    # Anything the previous output lacks (e.g. it was cut short) is rebuilt too
+    rebuild = set(changes['added']) | set(changes['changed'])
+    rebuild.update(missing_from(previous_schemas, changes['unchanged']))
+
+    if verbose:
+        print(f"\n📊 {len(current)} actions: {len(changes['added'])} added, {len(changes['changed'])} changed, "
+              f"{len(changes['removed'])} removed, {len(changes['unchanged'])} unchanged")
+
+    actions_data = catalog.actions()
+    order = [action_data['id'] for action_data in actions_data]
+    rebuilt_schemas = build_schemas(
+        conn, [a for a in actions_data if a['id'] in rebuild], include_protobuf, fix_localizations,
+        locale, verbose, decode_workers, decode_depth, catalog=catalog,
+    )
+    if owned:
+        catalog.close()
+
+    schemas = splice_schemas(previous_schemas, {schema.id: schema for schema in rebuilt_schemas}, order)
+    changes['fingerprints'] = current
+    changes['rebuilt'] = len(rebuilt_schemas)
+    return schemas, changes
+
+
+def extraction_options(
+    include_protobuf: bool,
+    fix_localizations: bool,
+    locale: str,
+    decode_depth: Optional[int]
+) -> Dict[str, Any]:
+    """Options recorded in the manifest; outputs built with other options can't be reused"""
+    return {
+        'include_protobuf': include_protobuf,
+        'fix_localizations': fix_localizations,
+        'locale': locale,
+        'decode_depth': decode_depth,
+    }
+
+
+def export_to_json(schemas: List[ActionSchema], output_path: str, verbose: bool = False):
     """Export schemas to JSON file"""
     path = Path(output_path)
     path.parent.mkdir(parents=True, exist_ok=True)
 
     with open(path, 'w', encoding='utf-8') as f:
-        json.dump(schemas, f, indent=2, ensure_ascii=False)
+        dump_json_array(schema_dicts(schemas), f, indent=2)
 
     if verbose:
         print(f"✅ Exported to {output_path} ({path.stat().st_size:,} bytes)")
 
 
-def export_to_csv(schemas: List[Dict[str, Any]], output_path: str, verbose: bool = False):
+def export_to_csv(schemas: List[ActionSchema], output_path: str, verbose: bool = False):
     """Export schemas to CSV file (flattened)"""
     path = Path(output_path)
     path.parent.mkdir(parents=True, exist_ok=True)
 
     # Flatten schema for CSV
     rows = []
-    for schema in schemas:
+    for schema in schema_dicts(schemas):
         row = {
             'id': schema.get('id'),
             'name': schema.get('name'),
@@ -178,9 +517,64 @@ def export_to_csv(schemas: List[Dict[str, Any]], output_path: str, verbose: bool
             print(f"✅ Exported to {output_path} ({len(rows)} rows)")
 
 
-def display_summary(schemas: List[Dict[str, Any]]):
-    """Display summary statistics"""
-    summary = summarize_action_collection(schemas)
+def export_to_ndjson(schemas: List[ActionSchema], output_path: str, verbose: bool = False):
+    """Export schemas to NDJSON with a sidecar offset index (see utils.record_index)"""
+    count = write_ndjson(schema_dicts(schemas), output_path)
+
+    if verbose:
+        print(f"✅ Exported to {output_path} ({count} records, index {index_path_for(output_path)})")
+
+
+def export_to_dictionary(schemas: List[ActionSchema], output_path: str, verbose: bool = False):
+    """Export schemas as dictionary-encoded JSON (see utils.string_table)"""
+    count, string_count = write_dictionary_encoded(schema_dicts(schemas), output_path)
+
+    if verbose:
+        print(f"✅ Exported to {output_path} ({count} records, {string_count:,} distinct strings, "
+              f"{Path(output_path).stat().st_size:,} bytes)")
+
+
+def export_to_normalized(schemas: List[ActionSchema], output_path: str, bytes_format: str = 'hex', verbose: bool = False):
+    """Export schemas as normalized JSON with shared type_info blocks (see utils.normalized_output)"""
+    counts = write_normalized(schema_dicts(schemas), output_path, bytes_format)
+
+    if verbose:
+        print(f"✅ Exported to {output_path} ({counts['actions']} records, {counts['parameters']:,} type_infos "
+              f"stored as {counts['type_infos']:,}, {Path(output_path).stat().st_size:,} bytes)")
+
+
+def export_to_columnar(
+    schemas: List[ActionSchema],
+    catalog: Catalog,
+    locale: Locale,
+    output_dir: str,
+    columnar_format: str = 'auto',
+    verbose: bool = False
+):
+    """Export schemas and every type as columnar tables (see utils.columnar)"""
+    type_locale = locale if isinstance(locale, str) else locale[0]
+    types = [build_type_schema(catalog.conn, type_data, type_locale) for type_data in catalog.types()]
+    manifest = export_columnar(to_dataframes(schema_dicts(schemas), types), output_dir, columnar_format)
+
+    if verbose:
+        rows = ', '.join(f"{name} {table['rows']:,}" for name, table in manifest['tables'].items())
+        print(f"✅ Exported {manifest['format']} tables to {output_dir} ({rows})")
+
+
+def display_summary(summary: Dict[str, Any]):
+    """Display summary statistics (see summarize_action_collection())"""
+
+    # Filters can match nothing; there is nothing to break down then
+    if not summary['total_count']:
+        if RICH_AVAILABLE:
+            Console().print(Panel("[bold cyan]Total Actions:[/bold cyan] 0", title="📊 Extraction Summary", border_style="blue"))
+        else:
+            print("\n" + "="*60)
+            print("📊 EXTRACTION SUMMARY")
+            print("="*60)
+            print("Total Actions:      0")
+            print("="*60 + "\n")
+        return
 
     if RICH_AVAILABLE:
         console = Console()
@@ -258,22 +652,170 @@ def main():
     parser.add_argument('--all', action='store_true', help='Extract all actions')
     parser.add_argument('--hidden', action='store_true', help='Extract only hidden actions')
     parser.add_argument('--csv', action='store_true', help='Also export as CSV')
+    parser.add_argument('--ndjson', action='store_true', help='Also export as NDJSON with an offset index')
+    parser.add_argument('--dictionary', action='store_true', help='Also export dictionary-encoded JSON (.dict.json)')
+    parser.add_argument('--normalized', action='store_true', help='Also export normalized JSON with shared type_info blocks (.normalized.json)')
+    parser.add_argument('--bytes-format', choices=BYTES_FORMATS, default='hex', help='Raw BLOB payloads in --normalized output (default: hex)')
+    parser.add_argument('--columnar', nargs='?', const='auto', choices=('auto',) + COLUMNAR_FORMATS, metavar='FORMAT',
+                        help='Also export relational tables to output/columnar/ (auto, parquet, feather, csv.gz)')
+    parser.add_argument('--stats-only', action='store_true', help='Print summary statistics from SQL aggregates only')
     parser.add_argument('--no-protobuf', action='store_true', help='Skip protobuf decoding')
     parser.add_argument('--no-fix-localizations', action='store_true', help='Disable localization key fixing (default: enabled)')
-    parser.add_argument('--limit', type=int, help='Limit number of actions (for testing)')
     parser.add_argument('--locale', default='en', help='Locale for localization (default: en)')
+    parser.add_argument('--fallback', nargs='?', const='', metavar='LIST', help="Fill strings missing in --locale from its parent locales (en_GB -> en), then LIST; records each string's locale")
+    parser.add_argument('--locales', metavar='LIST', help='Extract several locales in one pass, one output per locale (e.g. en,de,fr,ja)')
+    parser.add_argument('--fields', metavar='SPEC', help='Only extract these fields: a tier (ids, localized, parameters, blobs) and/or field names, e.g. id,name,app,parameters.key')
+    parser.add_argument('--decode-workers', type=int, default=1, metavar='N', help='Decode protobuf BLOBs in N worker processes (default: 1)')
+    parser.add_argument('--decode-depth', type=int, metavar='N', help='Decode parameter BLOBs as nested messages N levels deep')
+    parser.add_argument('--incremental', action='store_true', help='With --all, rebuild only actions changed since the previous output')
+    parser.add_argument('--previous-db', metavar='PATH', help='Previous database to diff against (default: saved fingerprints)')
     parser.add_argument('-v', '--verbose', action='store_true', help='Verbose output')
     parser.add_argument('--db', default='Tools-prod.sqlite', help='Database path')
+    add_filter_arguments(parser, 'actions')
 
     args = parser.parse_args()
+    query_filter = filter_from_args(args)
+    try:
+        fields = parse_field_selection(args.fields)
+        locales = parse_locales(args.locales) if args.locales else None
+        # A fallback chain instead of a single locale
+        locale = args.locale if args.fallback is None else \
+            locale_chain(args.locale, parse_locales(args.fallback) if args.fallback else ())
+        columnar_format = resolve_format(args.columnar) if args.columnar else None
+    except (ValueError, ImportError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    if args.stats_only:
+        try:
+            with Catalog(args.db, locale) as catalog:
+                summary = get_action_summary(catalog.conn, locale, query_filter)
+        except FileNotFoundError as e:
+            print(f"\n❌ Error: {e}")
+            print(f"   Make sure {args.db} exists in the current directory")
+            sys.exit(1)
+        display_summary(summary)
+        return
 
     # Need at least one action
     if not (args.all or args.hidden):
         parser.print_help()
         sys.exit(1)
 
+    if args.incremental and (not args.all or query_filter.is_restricted() or fields is not None or locales or args.fallback is not None):
+        print("❌ Error: --incremental requires --all and can't be combined with filters, --fields, --locales or --fallback")
+        sys.exit(1)
+
+    if locales and args.fallback is not None:
+        print("❌ Error: --fallback applies to --locale and can't be combined with --locales")
+        sys.exit(1)
+
+    output_path = 'output/actions_complete.json'
+    options = extraction_options(not args.no_protobuf, not args.no_fix_localizations, locale, args.decode_depth)
+
+    # With --all, hidden actions are picked from its schemas unless a
+    # limit or offset cut them differently
+    derive_hidden = args.all and query_filter.limit is None and query_filter.offset is None
+    hidden_schemas = None
+
+    catalog = None
     try:
-        if args.all:
+        # One load shared by every pass below
+        catalog = Catalog(args.db, locales[0] if locales else locale)
+
+        if locales:
+            all_by_locale = None
+            for hidden, name in ((False, 'actions_complete'), (True, 'hidden_actions')):
+                if not (args.hidden if hidden else args.all):
+                    continue
+
+                if hidden and derive_hidden:
+                    if args.verbose:
+                        print("\n🔍 Selecting hidden actions from the --all pass...")
+                    actions_data = catalog.actions(query_filter)
+                    by_locale = {
+                        output_locale: select_hidden_schemas(actions_data, schemas)
+                        for output_locale, schemas in all_by_locale.items()
+                    }
+                else:
+                    if args.verbose:
+                        print(f"\n🚀 Extracting {'hidden' if hidden else 'all'} actions in {len(locales)} locales...")
+                    by_locale = extract_locales(
+                        db_path=args.db,
+                        locales=tuple(locales),
+                        hidden=hidden,
+                        include_protobuf=not args.no_protobuf,
+                        fix_localizations=not args.no_fix_localizations,
+                        verbose=args.verbose,
+                        decode_workers=args.decode_workers,
+                        decode_depth=args.decode_depth,
+                        query_filter=query_filter,
+                        fields=fields,
+                        catalog=catalog,
+                    )
+                    if not hidden:
+                        all_by_locale = by_locale
+
+                for output_locale, schemas in by_locale.items():
+                    export_to_json(schemas, locale_output_path(f'output/{name}.json', output_locale), args.verbose)
+                    if args.csv:
+                        export_to_csv(schemas, locale_output_path(f'output/{name}.csv', output_locale), args.verbose)
+                    if args.ndjson:
+                        export_to_ndjson(schemas, locale_output_path(f'output/{name}.ndjson', output_locale), args.verbose)
+                    if args.dictionary:
+                        export_to_dictionary(schemas, locale_output_path(f'output/{name}.dict.json', output_locale), args.verbose)
+                    if args.normalized:
+                        export_to_normalized(schemas, locale_output_path(f'output/{name}.normalized.json', output_locale),
+                                             args.bytes_format, args.verbose)
+                    if columnar_format and not hidden:
+                        export_to_columnar(schemas, catalog, output_locale, locale_output_path('output/columnar', output_locale),
+                                           columnar_format, args.verbose)
+
+                if not hidden:
+                    # Counts don't depend on the locale; app names are the first locale's
+                    if fields is None:
+                        display_summary(summarize_action_collection(schema_dicts(by_locale[locales[0]])))
+                    else:
+                        display_summary(get_action_summary(catalog.conn, locales[0], query_filter))
+
+        elif args.all and args.incremental:
+            if args.verbose:
+                print("\n🚀 Updating previous extraction incrementally...")
+
+            schemas, changes = extract_incremental(
+                db_path=args.db,
+                previous_output=output_path,
+                previous_db=args.previous_db,
+                include_protobuf=not args.no_protobuf,
+                fix_localizations=not args.no_fix_localizations,
+                locale=locale,
+                verbose=args.verbose,
+                decode_workers=args.decode_workers,
+                decode_depth=args.decode_depth,
+                catalog=catalog,
+            )
+
+            export_to_json(schemas, output_path, args.verbose)
+            write_manifest(manifest_path_for(output_path), changes['fingerprints'], options, args.db)
+
+            if args.csv:
+                export_to_csv(schemas, 'output/actions_complete.csv', args.verbose)
+            if args.ndjson:
+                export_to_ndjson(schemas, 'output/actions_complete.ndjson', args.verbose)
+            if args.dictionary:
+                export_to_dictionary(schemas, 'output/actions_complete.dict.json', args.verbose)
+            if args.normalized:
+                export_to_normalized(schemas, 'output/actions_complete.normalized.json', args.bytes_format, args.verbose)
+            if columnar_format:
+                export_to_columnar(schemas, catalog, locale, 'output/columnar', columnar_format, args.verbose)
+
+            print(f"\n✅ Rebuilt {changes['rebuilt']} of {len(schemas)} actions "
+                  f"({len(changes['added'])} added, {len(changes['changed'])} changed, {len(changes['removed'])} removed)")
+
+            if args.hidden:
+                hidden_schemas = select_hidden_schemas(catalog.actions(), schemas)
+
+        elif args.all:
             if args.verbose:
                 print("\n🚀 Extracting all actions...")
 
@@ -281,41 +823,77 @@ def main():
                 db_path=args.db,
                 include_protobuf=not args.no_protobuf,
                 fix_localizations=not args.no_fix_localizations,
-                locale=args.locale,
-                limit=args.limit,
+                locale=locale,
                 verbose=args.verbose,
+                decode_workers=args.decode_workers,
+                decode_depth=args.decode_depth,
+                query_filter=query_filter,
+                fields=fields,
+                catalog=catalog,
             )
 
             # Export JSON
-            export_to_json(schemas, 'output/actions_complete.json', args.verbose)
+            export_to_json(schemas, output_path, args.verbose)
+
+            # Fingerprint manifest for later --incremental runs (full extractions only)
+            if not query_filter.is_restricted() and fields is None and isinstance(locale, str):
+                write_manifest(manifest_path_for(output_path), get_action_fingerprints(catalog.conn, locale), options, args.db)
 
             # Export CSV if requested
             if args.csv:
                 export_to_csv(schemas, 'output/actions_complete.csv', args.verbose)
 
-            # Display summary
-            display_summary(schemas)
-
-        if args.hidden:
-            if args.verbose:
-                print("\n🔍 Extracting hidden actions...")
-
-            conn = connect_db(args.db)
-            hidden_data = get_hidden_actions(conn, args.locale)
-            conn.close()
-
-            hidden_schemas = []
-            conn = connect_db(args.db)
-            for action_data in hidden_data:
-                schema = build_action_schema(conn, action_data, not args.no_protobuf, False, not args.no_fix_localizations, args.locale)
-                hidden_schemas.append(schema)
-            conn.close()
+            # Export NDJSON + offset index if requested
+            if args.ndjson:
+                export_to_ndjson(schemas, 'output/actions_complete.ndjson', args.verbose)
+
+            # Export dictionary-encoded JSON if requested
+            if args.dictionary:
+                export_to_dictionary(schemas, 'output/actions_complete.dict.json', args.verbose)
+
+            # Export normalized JSON if requested
+            if args.normalized:
+                export_to_normalized(schemas, 'output/actions_complete.normalized.json', args.bytes_format, args.verbose)
+
+            # Export columnar tables if requested
+            if columnar_format:
+                export_to_columnar(schemas, catalog, locale, 'output/columnar', columnar_format, args.verbose)
+
+            if args.hidden and derive_hidden:
+                hidden_schemas = select_hidden_schemas(catalog.actions(query_filter), schemas)
+
+            # Display summary (from SQL if the schemas lack fields it counts)
+            if fields is None:
+                display_summary(summarize_action_collection(schema_dicts(schemas)))
+            else:
+                display_summary(get_action_summary(catalog.conn, locale, query_filter))
+
+        if args.hidden and not locales:
+            if hidden_schemas is not None:
+                if args.verbose:
+                    print("\n🔍 Selected hidden actions from the --all pass")
+            else:
+                if args.verbose:
+                    print("\n🔍 Extracting hidden actions...")
+
+                # BLOB analyses and related rows of an --all pass are reused
+                hidden_schemas = build_schemas(
+                    catalog.conn, catalog.hidden_actions(query_filter), not args.no_protobuf, not args.no_fix_localizations,
+                    locale, args.verbose, args.decode_workers, args.decode_depth,
+                    restrict_blobs=query_filter.is_restricted(), fields=fields, catalog=catalog,
+                )
 
             # Export
             export_to_json(hidden_schemas, 'output/hidden_actions.json', args.verbose)
 
             if args.csv:
                 export_to_csv(hidden_schemas, 'output/hidden_actions.csv', args.verbose)
+            if args.ndjson:
+                export_to_ndjson(hidden_schemas, 'output/hidden_actions.ndjson', args.verbose)
+            if args.dictionary:
+                export_to_dictionary(hidden_schemas, 'output/hidden_actions.dict.json', args.verbose)
+            if args.normalized:
+                export_to_normalized(hidden_schemas, 'output/hidden_actions.normalized.json', args.bytes_format, args.verbose)
 
             if args.verbose:
                 print(f"\n✅ Found {len(hidden_schemas)} hidden actions")
@@ -332,6 +910,9 @@ def main():
             import traceback
             traceback.print_exc()
         sys.exit(1)
+    finally:
+        if catalog is not None:
+            catalog.close()
 
 
 if __name__ == '__main__':
@@ -11,13 +11,18 @@ Options:
     --level N       Show actions with visibility >= N (default: all > 0)
     --experimental  Show only experimental actions (flags 13-15)
     --details       Show full details for each action
+    --stats-only    Only count actions per visibility level (SQL GROUP BY)
+    --app, --tool-type, --id-prefix, --max-visibility, --limit, --offset
+                    Filter the actions in SQL (see extract_shortcuts_actions.py)
     -v, --verbose   Verbose output
 """
 
 import sys
 import json
 import argparse
+from dataclasses import replace
 from pathlib import Path
+from typing import Optional
 
 try:
     from rich.console import Console
@@ -28,17 +33,28 @@ try:
 except ImportError:
     RICH_AVAILABLE = False
 
-from utils.db_utils import connect_db, get_hidden_actions, get_action_parameters
+from utils.catalog import Catalog
+from utils.db_utils import (
+    QueryFilter,
+    add_filter_arguments,
+    filter_from_args,
+    get_visibility_counts,
+)
 from utils.schema_builder import build_action_schema, classify_action_visibility
 
 
-def analyze_hidden_actions(db_path: str = "Tools-prod.sqlite", min_visibility: int = 1, verbose: bool = False):
-    """Analyze hidden actions"""
-    conn = connect_db(db_path)
-    hidden_data = get_hidden_actions(conn)
-
-    # Filter by minimum visibility
-    filtered = [a for a in hidden_data if a['visibilityFlags'] >= min_visibility]
+def analyze_hidden_actions(
+    catalog: Catalog,
+    min_visibility: int = 1,
+    verbose: bool = False,
+    query_filter: Optional[QueryFilter] = None,
+):
+    """Analyze hidden actions (min_visibility overrides the filter's)"""
+    query_filter = replace(query_filter or QueryFilter(), min_visibility=min_visibility)
+    # All hidden actions are visibility >= 1 anyway, and loaded once
+    if query_filter == QueryFilter(min_visibility=1):
+        query_filter = None
+    filtered = catalog.hidden_actions(query_filter)
 
     # Group by visibility level
     by_visibility = {}
@@ -115,41 +131,43 @@ def analyze_hidden_actions(db_path: str = "Tools-prod.sqlite", min_visibility: i
             if len(actions) > 10:
                 print(f"  ... and {len(actions)-10} more\n")
 
-    conn.close()
     return filtered
 
 
-def show_action_details(db_path: str, action_id: str):
+def show_visibility_counts(
+    catalog: Catalog,
+    min_visibility: int = 1,
+    query_filter: Optional[QueryFilter] = None,
+):
+    """Show how many hidden actions each visibility level has, without fetching them"""
+    counts = get_visibility_counts(catalog.conn, replace(query_filter or QueryFilter(), min_visibility=min_visibility))
+
+    if RICH_AVAILABLE:
+        console = Console()
+        table = Table(title=f"Hidden Actions by Visibility Level ({sum(counts.values())} total)", show_header=True)
+        table.add_column("Flags", justify="right", style="cyan")
+        table.add_column("Level", style="yellow")
+        table.add_column("Count", justify="right", style="green")
+        for vis_flags, count in counts.items():
+            table.add_row(str(vis_flags), classify_action_visibility(vis_flags)['level'], str(count))
+        console.print(table)
+    else:
+        print(f"\nTotal Hidden Actions: {sum(counts.values())}\n")
+        for vis_flags, count in counts.items():
+            print(f"  {vis_flags:3d}  {classify_action_visibility(vis_flags)['level']:20s} {count:5d}")
+
+    return counts
+
+
+def show_action_details(catalog: Catalog, action_id: str):
     """Show full details for a specific action"""
-    conn = connect_db(db_path)
-
-    # Get action
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT
-            t.rowId,
-            t.id,
-            t.toolType,
-            t.flags,
-            t.visibilityFlags,
-            tl.name,
-            tl.descriptionSummary,
-            cm.id as container_id
-        FROM Tools t
-        LEFT JOIN ToolLocalizations tl ON t.rowId = tl.toolId AND tl.locale = 'en'
-        LEFT JOIN ContainerMetadata cm ON t.sourceContainerId = cm.rowId
-        WHERE t.id = ?
-    """, (action_id,))
-
-    row = cursor.fetchone()
-    if not row:
+    action_data = catalog.action(action_id)
+    if not action_data:
         print(f"❌ Action not found: {action_id}")
         return
 
-    action_data = dict(row)
-
     # Get parameters
-    parameters = get_action_parameters(conn, action_data['rowId'])
+    parameters = catalog.parameters(action_data['rowId'])
 
     if RICH_AVAILABLE:
         console = Console()
@@ -196,8 +214,6 @@ def show_action_details(db_path: str, action_id: str):
         for param in parameters:
             print(f"  - {param['key']}: {param.get('name') or '(no name)'}")
 
-    conn.close()
-
 
 def main():
     parser = argparse.ArgumentParser(
@@ -208,18 +224,25 @@ def main():
     parser.add_argument('--level', type=int, default=1, help='Minimum visibility level (default: 1)')
     parser.add_argument('--experimental', action='store_true', help='Show only experimental (13-15)')
     parser.add_argument('--details', metavar='ACTION_ID', help='Show details for specific action')
+    parser.add_argument('--stats-only', action='store_true', help='Only count actions per visibility level')
     parser.add_argument('-v', '--verbose', action='store_true', help='Verbose output')
     parser.add_argument('--db', default='Tools-prod.sqlite', help='Database path')
     parser.add_argument('--export', metavar='FILE', help='Export to JSON file')
+    add_filter_arguments(parser, 'actions', skip=('min_visibility',))
 
     args = parser.parse_args()
+    query_filter = filter_from_args(args)
 
+    catalog = None
     try:
+        catalog = Catalog(args.db)
         if args.details:
-            show_action_details(args.db, args.details)
+            show_action_details(catalog, args.details)
+        elif args.stats_only:
+            show_visibility_counts(catalog, 13 if args.experimental else args.level, query_filter)
         else:
             min_vis = 13 if args.experimental else args.level
-            hidden_actions = analyze_hidden_actions(args.db, min_vis, args.verbose)
+            hidden_actions = analyze_hidden_actions(catalog, min_vis, args.verbose, query_filter)
 
             if args.export:
                 export_path = Path(args.export)
@@ -237,6 +260,9 @@ def main():
             import traceback
             traceback.print_exc()
         sys.exit(1)
+    finally:
+        if catalog is not None:
+            catalog.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,35 @@
+"""Minimal Tools-prod databases for the tests"""
+
+import sqlite3
+
+
+SCHEMA = """
+    CREATE TABLE Tools(rowId INTEGER PRIMARY KEY, id TEXT, toolType TEXT, flags INT, visibilityFlags INT,
+        deprecationReplacementId TEXT, sourceActionProvider TEXT, sourceContainerId INT);
+    CREATE TABLE ToolLocalizations(toolId INT, locale TEXT, localizationUsage TEXT, name TEXT,
+        descriptionSummary TEXT, descriptionNote TEXT, deprecationMessage TEXT);
+    CREATE TABLE ContainerMetadata(rowId INTEGER PRIMARY KEY, id TEXT);
+    CREATE TABLE ContainerMetadataLocalizations(containerId INT, locale TEXT, name TEXT);
+    CREATE TABLE Parameters(toolId INT, key TEXT, sortOrder INT, flags INT, typeInstance BLOB, relationships BLOB);
+    CREATE TABLE ParameterLocalizations(toolId INT, key TEXT, locale TEXT, name TEXT, description TEXT);
+    CREATE TABLE ToolParameterTypes(toolId INT, key TEXT, typeId TEXT);
+    CREATE TABLE ToolOutputTypes(toolId INT, typeIdentifier TEXT);
+    CREATE TABLE Categories(toolId INT, locale TEXT, category TEXT);
+    CREATE TABLE SearchKeywords(toolId INT, locale TEXT, keyword TEXT, `order` INT);
+"""
+
+
+def make_db(first_row_id=1):
+    """Two actions, with row IDs starting at first_row_id"""
+    conn = sqlite3.connect(':memory:')
+    conn.executescript(SCHEMA)
+    conn.execute("INSERT INTO ContainerMetadata VALUES (1, 'com.apple.shortcuts')")
+    for offset, action_id in enumerate(['is.workflow.actions.a', 'is.workflow.actions.b']):
+        row_id = first_row_id + offset
+        conn.execute("INSERT INTO Tools VALUES (?, ?, 'action', 0, 0, NULL, NULL, 1)", (row_id, action_id))
+        conn.execute("INSERT INTO ToolLocalizations VALUES (?, 'en', 'display', ?, 'Does things', NULL, NULL)",
+                     (row_id, action_id.upper()))
+        conn.execute("INSERT INTO Parameters VALUES (?, 'input', 0, 0, x'0a01', NULL)", (row_id,))
+        conn.execute("INSERT INTO ToolParameterTypes VALUES (?, 'input', 'public.text')", (row_id,))
+        conn.execute("INSERT INTO SearchKeywords VALUES (?, 'en', 'text', 0)", (row_id,))
+    return conn
@@ -0,0 +1,79 @@
+"""Shared fixtures"""
+
+import sqlite3
+
+import pytest
+
+from catalog_db import make_db
+from wire_format import field, type_instance
+
+
+@pytest.fixture
+def blob_db(tmp_path):
+    """Minimal database with BLOBs in every BLOB column"""
+    path = tmp_path / 'Tools-prod.sqlite'
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE Tools(rowId INTEGER PRIMARY KEY, id TEXT, requirements BLOB, outputTypeInstance BLOB);
+        CREATE TABLE Parameters(toolId INT, key TEXT, typeInstance BLOB, relationships BLOB);
+        CREATE TABLE ParameterLocalizations(toolId INT, key TEXT, locale TEXT, name TEXT, description TEXT);
+        CREATE TABLE Types(rowId TEXT PRIMARY KEY, runtimeRequirements BLOB) WITHOUT ROWID;
+        CREATE TABLE TypeCoercions(sourceTypeId TEXT, targetTypeId TEXT, coercionDefinition BLOB);
+    """)
+    conn.executemany("INSERT INTO Tools VALUES (?, ?, ?, ?)", [
+        (1, 'is.workflow.actions.a', field(2, 0, 17), None),
+        (2, 'is.workflow.actions.b', field(2, 0, 3), b''),
+    ])
+    conn.executemany("INSERT INTO Parameters VALUES (?, ?, ?, ?)", [
+        (1, 'input', type_instance(b'public.image'), None),
+        (2, 'input', type_instance(b'public.image'), None),
+        (2, 'folder', type_instance(b'public.folder'), None),
+    ])
+    conn.execute("INSERT INTO Types VALUES ('NoteEntity', ?)", (field(2, 0, 17),))
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+@pytest.fixture
+def catalog_conn():
+    """make_db() plus hidden, deprecated, parameterless and app-less actions"""
+    conn = make_db()
+    conn.row_factory = sqlite3.Row
+    conn.execute("INSERT INTO ContainerMetadataLocalizations VALUES (1, 'en', 'Shortcuts')")
+    conn.executemany("INSERT INTO Tools VALUES (?, ?, ?, 0, ?, ?, NULL, ?)", [
+        (10, 'com.apple.notes.create', 'appIntent', 3, None, 1),
+        (11, 'is.workflow.actions.old', 'action', 15, 'is.workflow.actions.b', 1),
+        (12, 'is.workflow.actions.empty', 'action', 3, '', None),
+        (13, 'app.thirdparty.intent', 'appIntent', 0, None, 2),
+    ])
+    conn.execute("INSERT INTO ContainerMetadata VALUES (2, 'app.thirdparty')")
+    conn.executemany("INSERT INTO Parameters VALUES (?, ?, 0, 0, NULL, NULL)", [
+        (10, 'title'), (10, 'body'), (10, 'folder'), (11, 'input'),
+    ])
+    return conn
+
+
+@pytest.fixture
+def localized_conn(catalog_conn):
+    """catalog_conn with German and partial French strings"""
+    conn = catalog_conn
+    conn.executemany("INSERT INTO ToolLocalizations VALUES (?, ?, ?, ?, ?, NULL, NULL)", [
+        (1, 'de', 'display', 'Aktion A', 'Macht Dinge'),
+        (10, 'de', 'display', 'Notiz erstellen', None),
+        (10, 'fr', 'display', 'Créer une note', 'PARAM_DESCRIPTION'),
+        (1, 'de', 'other', 'Ignored usage', None),
+    ])
+    conn.executemany("INSERT INTO ParameterLocalizations VALUES (?, ?, ?, ?, ?)", [
+        (10, 'title', 'en', 'Title', None),
+        (10, 'title', 'de', 'Titel', 'Der Titel'),
+        (1, 'input', 'fr', 'Entrée', None),
+    ])
+    conn.execute("INSERT INTO ContainerMetadataLocalizations VALUES (1, 'de', 'Kurzbefehle')")
+    conn.executemany("INSERT INTO Categories VALUES (?, ?, ?)", [
+        (10, 'en', 'Notes'), (10, 'de', 'Notizen'), (10, 'en', 'Documents'),
+    ])
+    conn.executemany("INSERT INTO SearchKeywords VALUES (?, ?, ?, ?)", [
+        (1, 'de', 'zwei', 2), (1, 'de', 'eins', 1),
+    ])
+    return conn
@@ -0,0 +1,66 @@
+"""Tests for SQL-aggregate summaries"""
+
+import pytest
+
+from utils.db_utils import QueryFilter, get_action_summary, get_all_actions, get_hidden_actions, get_visibility_counts
+from utils.schema_builder import build_action_schema, summarize_action_collection
+from extract_shortcuts_actions import display_summary
+
+
+@pytest.fixture
+def conn(catalog_conn):
+    return catalog_conn
+
+
+def summarize_schemas(conn, limit=None):
+    actions = get_all_actions(conn)
+    if limit:
+        actions = actions[:limit]
+    return summarize_action_collection(
+        [build_action_schema(conn, action, include_protobuf=False) for action in actions]
+    )
+
+
+class TestActionSummary:
+    """Test that aggregate queries match summarize_action_collection()"""
+
+    @pytest.mark.parametrize('limit', [None, 3])
+    def test_matches_schema_summary(self, conn, limit):
+        summary = get_action_summary(conn, query_filter=QueryFilter(limit=limit))
+        expected = summarize_schemas(conn, limit)
+        assert summary == expected
+        # Same first-seen group order as well
+        assert [list(summary[key]) for key in ('by_type', 'by_visibility', 'by_app')] == \
+            [list(expected[key]) for key in ('by_type', 'by_visibility', 'by_app')]
+
+    def test_counts(self, conn):
+        summary = get_action_summary(conn)
+        assert summary['total_count'] == 6
+        assert summary['hidden_count'] == 3
+        assert summary['deprecated_count'] == 1
+        assert (summary['with_parameters'], summary['parameter_count']) == (4, 6)
+        assert summary['by_app'] == {'Shortcuts': 4, None: 2}
+
+    def test_no_matches(self, conn, capsys):
+        """Should summarize and display a filter that matches no actions"""
+        summary = get_action_summary(conn, query_filter=QueryFilter(app_bundle='com.example.none'))
+        assert summary['total_count'] == 0 and summary['by_type'] == {}
+        display_summary(summary)
+        assert 'Total Actions' in capsys.readouterr().out
+
+    def test_visibility_counts(self, conn):
+        """Should match grouping get_hidden_actions() in Python"""
+        for level in (1, 4):
+            expected = {}
+            for action in get_hidden_actions(conn):
+                if action['visibilityFlags'] >= level:
+                    expected[action['visibilityFlags']] = expected.get(action['visibilityFlags'], 0) + 1
+            assert get_visibility_counts(conn, QueryFilter(min_visibility=level)) == dict(sorted(expected.items()))
+
+    def test_visibility_counts_ignore_localizations(self, conn):
+        """Should count each action once whatever its localization rows"""
+        before = get_visibility_counts(conn)
+        conn.executemany("INSERT INTO ToolLocalizations VALUES (10, 'en', 'display', ?, NULL, NULL, NULL)",
+                         [('Create Note',), ('New Note',)])
+        conn.execute("INSERT INTO ContainerMetadataLocalizations VALUES (1, 'en', 'Shortcuts (copy)')")
+        assert get_visibility_counts(conn) == before
@@ -0,0 +1,69 @@
+"""Tests for the content-addressed BLOB catalog"""
+
+import sqlite3
+
+from utils.blob_catalog import BlobCatalog, blob_digest
+from wire_format import field, type_instance
+
+
+def load_catalog(db_path, columns=None):
+    conn = sqlite3.connect(db_path)
+    catalog = BlobCatalog.from_db(conn, columns)
+    conn.close()
+    return catalog
+
+
+class TestBlobCatalog:
+    """Test cataloging, analysis and reuse statistics"""
+
+    def test_unique_payloads(self, blob_db):
+        """Should store each distinct payload once, across columns"""
+        catalog = load_catalog(blob_db)
+        assert len(catalog.references) == 6
+        assert len(catalog) == 4
+
+        shared = blob_digest(field(2, 0, 17))
+        assert [(ref[0], ref[1]) for ref in catalog.references_to(shared)] == [
+            ('Tools.requirements', 'is.workflow.actions.a'),
+            ('Types.runtimeRequirements', 'NoteEntity'),
+        ]
+
+    def test_ranked_digests(self, blob_db):
+        """Should rank a column's payloads by usage"""
+        catalog = load_catalog(blob_db, ['Parameters.typeInstance'])
+        assert catalog.ranked_digests('Parameters.typeInstance') == [
+            (blob_digest(type_instance(b'public.image')), 2),
+            (blob_digest(type_instance(b'public.folder')), 1),
+        ]
+
+    def test_analyze_once_per_payload(self, blob_db):
+        """Should run each analyzer once per distinct payload"""
+        catalog = load_catalog(blob_db)
+        catalog.analyze()
+
+        image = blob_digest(type_instance(b'public.image'))
+        assert catalog.analysis(image, 'Parameters.typeInstance')['uti_types'] == ['public.image']
+        # Tools.requirements and Types.runtimeRequirements share the requirements analyzer
+        assert len([key for key in catalog.analyses if key[0] == 'requirements']) == 2
+
+    def test_reuse_stats(self, blob_db):
+        """Should report per-column dedup and cross-column sharing"""
+        stats = load_catalog(blob_db).reuse_stats()
+        assert stats['references'] == 6
+        assert stats['unique_payloads'] == 4
+        assert stats['columns']['Parameters.typeInstance']['references'] == 3
+        assert stats['columns']['Parameters.typeInstance']['unique_payloads'] == 2
+        assert stats['shared_between'] == {'Tools.requirements + Types.runtimeRequirements': 1}
+
+    def test_save_and_load(self, blob_db, tmp_path):
+        """Should round-trip payloads, references and analyses"""
+        catalog = load_catalog(blob_db)
+        catalog.analyze(['Tools.requirements'])
+        path = str(tmp_path / 'catalog.sqlite')
+        catalog.save(path)
+
+        loaded = BlobCatalog.load(path)
+        assert loaded.payloads == catalog.payloads
+        assert loaded.references == catalog.references
+        assert loaded.analyses.keys() == catalog.analyses.keys()
+        assert loaded.reuse_stats() == catalog.reuse_stats()
@@ -0,0 +1,63 @@
+"""Tests for structural BLOB clustering"""
+
+from utils.blob_clusters import cluster_blobs, blob_signature, member_analysis, MALFORMED_SIGNATURE
+from utils.protobuf_parser import analyze_type_instance_blob
+from wire_format import type_instance
+
+
+BLOBS = [
+    type_instance(b'public.folder'),
+    type_instance(b'public.image'),
+    type_instance(b'public.image', 9, 10),
+    type_instance(b'com.apple.Notes.NoteEntity'),
+]
+
+
+class TestBlobSignature:
+    """Test tag-sequence fingerprints"""
+
+    def test_nested_signature(self):
+        """Should descend into nested messages but not into strings"""
+        signature, leaves = blob_signature(BLOBS[0])
+        assert signature == '3:2{1:2{1:2,3:0},4:2}'
+        assert [path for path, _, _ in leaves] == ['3.1.1', '3.1.3', '3.4']
+
+    def test_payload_does_not_affect_signature(self):
+        """Should give BLOBs with the same shape the same signature"""
+        assert blob_signature(BLOBS[0])[0] == blob_signature(BLOBS[3])[0]
+        assert blob_signature(BLOBS[0])[0] != blob_signature(BLOBS[2])[0]
+
+    def test_malformed(self):
+        """Should put malformed BLOBs under a dedicated signature"""
+        assert blob_signature(b'\x1a\xff')[0] == MALFORMED_SIGNATURE
+
+
+class TestClusterBlobs:
+    """Test clustering and template analysis"""
+
+    def test_cluster_sizes(self):
+        """Should group BLOBs by shape, largest cluster first"""
+        result = cluster_blobs(BLOBS)
+        assert [c['size'] for c in result['clusters']] == [3, 1]
+        assert result['total_blobs'] == 4
+
+    def test_constant_and_variable_fields(self):
+        """Should separate fields that never change from ones that do"""
+        cluster = cluster_blobs(BLOBS)['clusters'][0]
+        assert cluster['variable_fields'] == ['3.1.1']
+        assert cluster['constant_fields'] == ['3.1.3', '3.4']
+        assert cluster['template']['values']['3.1.3'] == 7
+
+    def test_distinct_payloads_analyzed_once(self):
+        """Should run string analysis once per distinct payload"""
+        result = cluster_blobs(BLOBS)
+        # Three distinct UTIs plus each cluster's constant bytes payload
+        assert result['analysis_calls'] == 4
+
+    def test_member_analysis_matches_heuristic(self):
+        """Should recover the UTIs the per-BLOB analyzer finds"""
+        result = cluster_blobs(BLOBS)
+        for cluster in result['clusters']:
+            for member in cluster['members']:
+                expected = analyze_type_instance_blob(BLOBS[member['index']])['uti_types']
+                assert member_analysis(cluster, member)['uti_types'] == expected
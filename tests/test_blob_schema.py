@@ -0,0 +1,80 @@
+"""Tests for BLOB schema inference and compiled decoders"""
+
+import pytest
+from utils.blob_schema import infer_message_schema, compile_decoder, decode_column
+from wire_format import field, type_instance
+
+
+BLOBS = [
+    type_instance(b'public.folder'),
+    type_instance(b'public.image', 9, 10),
+    type_instance(b'com.apple.Notes.NoteEntity'),
+]
+
+
+class TestInferMessageSchema:
+    """Test schema inference over a column of BLOBs"""
+
+    def test_nested_structure(self):
+        """Should explore nested messages and classify strings and bytes"""
+        descriptor = infer_message_schema(BLOBS)
+        outer = descriptor['fields']['3']
+        assert outer['kind'] == 'message'
+        assert outer['message']['fields']['4']['kind'] == 'bytes'
+        inner = outer['message']['fields']['1']['message']['fields']
+        assert inner['1']['kind'] == 'string'
+        assert inner['3']['kind'] == 'varint'
+
+    def test_repeated_and_presence(self):
+        """Should mark fields seen more than once per message as repeated"""
+        descriptor = infer_message_schema(BLOBS)
+        assert descriptor['fields']['5']['repeated'] is True
+        assert descriptor['fields']['5']['presence'] == pytest.approx(1 / 3, abs=1e-3)
+        assert descriptor['fields']['3']['repeated'] is False
+
+    def test_malformed_blobs_counted(self):
+        """Should skip BLOBs that are not wire format"""
+        descriptor = infer_message_schema(BLOBS + [b'\x0a\xff'])
+        assert descriptor['samples'] == 3
+        assert descriptor['malformed'] == 1
+
+
+class TestCompiledDecoder:
+    """Test decoders compiled from inferred schemas"""
+
+    def test_repeated_fields_kept(self):
+        """Should keep every occurrence of repeated fields"""
+        decode = compile_decoder(infer_message_schema(BLOBS))
+        decoded = decode(BLOBS[1])
+        assert decoded['field_5'] == [9, 10]
+        assert decoded['field_3']['field_1']['field_1'] == 'public.image'
+        assert decoded['field_3']['field_4'] == 'fffe01'
+
+    def test_unknown_fields(self):
+        """Should record fields missing from the schema"""
+        decode = compile_decoder(infer_message_schema(BLOBS))
+        decoded = decode(BLOBS[0] + field(9, 0, 3))
+        assert decoded['_unknown'] == [{'field': 9, 'wire_type': 0, 'value': 3}]
+
+    def test_malformed_fallback(self):
+        """Should fall back to heuristic decoding for malformed BLOBs"""
+        decode = compile_decoder(infer_message_schema(BLOBS))
+        results = decode_column([BLOBS[0], b'\x1a\xff'], decode)
+        assert 'field_3' in results[0]
+        assert 'parse_error' in results[1]
+
+
+def test_file_descriptor_proto():
+    """Should emit a descriptor that protobuf can parse BLOBs with"""
+    pytest.importorskip('google.protobuf')
+    from google.protobuf import descriptor_pool, message_factory
+    from utils.blob_schema import to_file_descriptor_proto
+
+    pool = descriptor_pool.DescriptorPool()
+    pool.Add(to_file_descriptor_proto(infer_message_schema(BLOBS), 'TypeInstance'))
+    message_class = message_factory.GetMessageClass(pool.FindMessageTypeByName('shortcuts.inferred.TypeInstance'))
+
+    message = message_class()
+    message.ParseFromString(BLOBS[1])
+    assert list(message.field_5) == [9, 10]
+    assert message.field_3.field_1.field_1 == b'public.image'
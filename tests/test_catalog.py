@@ -0,0 +1,120 @@
+"""Tests for the shared Catalog"""
+
+import sqlite3
+
+import pytest
+
+from utils.blob_catalog import BlobCatalog
+from utils.catalog import Catalog
+from utils.db_utils import QueryFilter, get_action_parameters, get_all_actions, get_hidden_actions
+from utils.schema_builder import DatabaseLookups, build_action_schema
+from wire_format import type_instance
+
+
+@pytest.fixture
+def db_path(localized_conn, tmp_path):
+    """localized_conn on disk, with types and parameter BLOBs"""
+    localized_conn.executescript("""
+        CREATE TABLE Types(rowId TEXT PRIMARY KEY, id BLOB, kind INT, runtimeFlags INT,
+            runtimeRequirements BLOB, sourceContainerId INT) WITHOUT ROWID;
+        CREATE TABLE TypeDisplayRepresentations(typeId TEXT, locale TEXT, name TEXT);
+        INSERT INTO Types VALUES ('NoteFolder', NULL, 3, 0, NULL, 1), ('string', NULL, 1, 0, NULL, NULL);
+        INSERT INTO TypeDisplayRepresentations VALUES ('NoteFolder', 'en', 'Folder');
+        INSERT INTO ToolParameterTypes VALUES (10, 'folder', 'NoteFolder');
+        INSERT INTO ToolOutputTypes VALUES (11, 'NoteFolder');
+    """)
+    localized_conn.execute("UPDATE Parameters SET typeInstance = ? WHERE key = 'title'", (type_instance(b'public.text'),))
+    localized_conn.commit()
+    path = tmp_path / 'Tools-prod.sqlite'
+    target = sqlite3.connect(path)
+    localized_conn.backup(target)
+    target.close()
+    return str(path)
+
+
+@pytest.fixture
+def catalog(db_path):
+    with Catalog(db_path) as catalog:
+        yield catalog
+
+
+def count_queries(catalog, call):
+    statements = []
+    catalog.conn.set_trace_callback(statements.append)
+    try:
+        call()
+    finally:
+        catalog.conn.set_trace_callback(None)
+    return len(statements)
+
+
+class TestCatalog:
+    """Test indexed accessors against the per-query functions"""
+
+    def test_actions_load_once(self, catalog):
+        assert catalog.actions() == get_all_actions(catalog.conn)
+        assert count_queries(catalog, lambda: (catalog.actions(), catalog.action('is.workflow.actions.a'))) == 0
+        # Filtered requests go to SQL
+        assert [a['id'] for a in catalog.actions(QueryFilter(tool_type='appIntent'))] == \
+            ['app.thirdparty.intent', 'com.apple.notes.create']
+
+    def test_indexes(self, catalog):
+        assert catalog.action('com.apple.notes.create')['rowId'] == 10
+        assert catalog.action('missing') is None
+        assert [a['id'] for a in catalog.actions_by_app('app.thirdparty')] == ['app.thirdparty.intent']
+        assert [a['id'] for a in catalog.actions_by_app(None)] == ['is.workflow.actions.empty']
+        assert [a['id'] for a in catalog.actions_by_visibility(3)] == \
+            ['com.apple.notes.create', 'is.workflow.actions.empty']
+        assert [a['id'] for a in catalog.actions_using_type('NoteFolder')] == \
+            ['com.apple.notes.create', 'is.workflow.actions.old']
+
+    def test_hidden_actions(self, catalog):
+        assert catalog.hidden_actions() == get_hidden_actions(catalog.conn)
+        assert catalog.hidden_actions(QueryFilter(min_visibility=15)) == \
+            get_hidden_actions(catalog.conn, query_filter=QueryFilter(min_visibility=15))
+
+    @pytest.mark.parametrize('locale', ['en', 'de', ('de', 'en')])
+    def test_lookups_match_database(self, db_path, locale):
+        with Catalog(db_path, locale) as catalog:
+            database = DatabaseLookups(catalog.conn)
+            for action in catalog.actions():
+                tool_id = action['rowId']
+                assert catalog.parameters(tool_id) == get_action_parameters(catalog.conn, tool_id, locale)
+                assert catalog.categories(tool_id) == database.categories(tool_id, locale)
+                assert catalog.keywords(tool_id) == database.keywords(tool_id, locale)
+                assert build_action_schema(catalog.conn, action, locale=locale, lookups=catalog) == \
+                    build_action_schema(catalog.conn, action, locale=locale)
+
+    def test_other_locale_lookups(self, catalog):
+        """Locales other than the catalog's are queried per action"""
+        assert catalog.parameters(10, 'de') == get_action_parameters(catalog.conn, 10, 'de')
+        assert catalog.parameter_name('com.apple.notes.create', 'title') == 'Title'
+
+    def test_types(self, catalog):
+        assert [t['rowId'] for t in catalog.types()] == ['NoteFolder', 'string']
+        assert catalog.type('NoteFolder')['name'] == 'Folder'
+        assert catalog.type('missing') is None
+        assert [t['rowId'] for t in catalog.types_by_kind(1)] == ['string']
+        assert catalog.type_usage()['NoteFolder'] == {'used_in_actions': 1, 'total_parameter_uses': 1, 'used_as_output': 1}
+
+    def test_blobs_decoded_once(self, catalog):
+        analyses = catalog.parameter_blob_analyses()
+        assert set(analyses) == {b'\x0a\x01', type_instance(b'public.text')}
+        # Later requests, even for some actions only, reuse the analyses
+        assert count_queries(catalog, lambda: catalog.parameter_blob_analyses(tool_ids=[10])) == 0
+        column = ['Parameters.typeInstance']
+        assert catalog.blob_catalog(column) is catalog.blob_catalog(column)
+
+    def test_blob_catalog_subset(self, blob_db):
+        column = ['Parameters.typeInstance']
+        with Catalog(blob_db) as catalog:
+            everything = catalog.blob_catalog()
+            # Served from the all-columns catalog, restricted to the column
+            assert count_queries(catalog, lambda: catalog.blob_catalog(column)) == 0
+            subset = catalog.blob_catalog(column)
+            assert subset is catalog.blob_catalog(column)
+            assert {ref[0] for ref in everything.references} > set(column)
+            direct = BlobCatalog.from_db(catalog.conn, column)
+            assert subset.references == direct.references
+            assert list(subset.payloads) == list(direct.payloads)
+            assert subset.reuse_stats() == direct.reuse_stats()
@@ -0,0 +1,73 @@
+"""Tests for the columnar export"""
+
+import pytest
+
+from utils.columnar import TABLES, export_columnar, load_dataframes, parquet_engine, table_rows, to_dataframes
+from utils.db_utils import get_all_actions
+from utils.schema_builder import build_action_schema, parse_field_selection
+
+pd = pytest.importorskip('pandas')
+
+TYPES = [
+    {'id': 'NoteFolder', 'name': 'Folder', 'name_with_determiner': 'a Folder', 'kind': 3, 'kind_name': 'enum',
+     'runtime_flags': 0, 'container_id': 'com.apple.mobilenotes',
+     'enum_cases': [{'id': 'all', 'title': 'All', 'subtitle': None}, {'id': '007', 'title': 'Bond', 'subtitle': 'Agent'}]},
+    {'id': 'Note', 'name': 'Note', 'name_with_determiner': None, 'kind': 2, 'kind_name': 'entity',
+     'runtime_flags': 1, 'container_id': 'com.apple.mobilenotes',
+     'properties': [{'id': 'title', 'displayName': 'Title'}]},
+]
+
+
+@pytest.fixture
+def schemas(localized_conn):
+    return [build_action_schema(localized_conn, action) for action in get_all_actions(localized_conn)]
+
+
+class TestColumnar:
+    """Test the tables and their round trip through files"""
+
+    def test_tables(self, schemas):
+        frames = to_dataframes(schemas, TYPES)
+        assert list(frames) == list(TABLES)
+        for name, frame in frames.items():
+            assert list(frame.columns) == list(TABLES[name])
+
+        actions = frames['actions'].set_index('id')
+        assert len(actions) == len(schemas)
+        assert actions.loc['com.apple.notes.create', 'parameter_count'] == 3
+        assert actions.loc['is.workflow.actions.old', 'deprecation_replacement_id'] == 'is.workflow.actions.b'
+
+        params = frames['parameters']
+        assert params[params['action_id'] == 'com.apple.notes.create']['key'].tolist() == ['title', 'body', 'folder']
+        assert frames['categories'][frames['categories']['action_id'] == 'com.apple.notes.create']['category'].tolist() == \
+            ['Notes', 'Documents']
+        assert frames['enum_cases']['id'].tolist() == ['all', '007']
+        assert frames['entity_properties']['display_name'].tolist() == ['Title']
+
+    def test_dictionary_encoded_columns(self, schemas):
+        frames = to_dataframes(schemas)
+        assert isinstance(frames['actions']['app_bundle_id'].dtype, pd.CategoricalDtype)
+        assert isinstance(frames['parameter_accepted_types']['type_id'].dtype, pd.CategoricalDtype)
+        assert frames['actions']['visibility_flags'].dtype == 'Int64'
+
+    def test_projected_schemas(self, localized_conn):
+        fields = parse_field_selection('ids')
+        rows = table_rows([build_action_schema(localized_conn, a, fields=fields) for a in get_all_actions(localized_conn)])
+        assert rows['parameters'] == [] and rows['actions'][0]['name'] is None
+        assert rows['actions'][0]['parameter_count'] is None
+
+    @pytest.mark.parametrize('columnar_format', ['auto', 'csv.gz'])
+    def test_round_trip(self, schemas, tmp_path, columnar_format):
+        frames = to_dataframes(schemas, TYPES)
+        manifest = export_columnar(frames, str(tmp_path), columnar_format)
+        assert manifest['format'] == ('parquet' if columnar_format == 'auto' and parquet_engine() else 'csv.gz')
+        assert manifest['tables']['actions']['rows'] == len(schemas)
+
+        loaded = load_dataframes(str(tmp_path))
+        for name, frame in frames.items():
+            pd.testing.assert_frame_equal(loaded[name], frame, check_categorical=False)
+        assert list(load_dataframes(str(tmp_path), ['types'])) == ['types']
+
+    def test_unknown_format(self, schemas, tmp_path):
+        with pytest.raises(ValueError):
+            export_columnar(to_dataframes(schemas), str(tmp_path), 'xlsx')
@@ -0,0 +1,47 @@
+"""Tests for the shared-memory BLOB decode pool"""
+
+import pytest
+from utils.decode_pool import decode_blobs, decode_unique_blobs
+from utils.protobuf_parser import analyze_type_instance_blob, analyze_requirements_blob
+
+
+BLOBS = [
+    b'\x0a\x0dpublic.folder',
+    b'\x10\x11\x18\x01',
+    b'\x0a\x0dpublic.folder',  # duplicate
+    b'\x1a\x0f\x0a\x0dpublic.image',
+    b'',
+    b'\x0a\x1acom.apple.Notes.NoteEntity',
+]
+
+
+class TestDecodePool:
+    """Parallel decoding must match in-process decoding"""
+
+    def test_serial_matches_analyzer(self):
+        """Should run the named analyzer on each BLOB"""
+        results = decode_blobs(BLOBS, 'type_instance', workers=1)
+        assert results[0] == analyze_type_instance_blob(BLOBS[0])
+        assert results[4] == {}
+
+    def test_parallel_matches_serial(self):
+        """Should gather worker results back in input order"""
+        serial = decode_blobs(BLOBS, 'type_instance', workers=1)
+        parallel = decode_blobs(BLOBS, 'type_instance', workers=2, chunk_size=1)
+        assert parallel == serial
+
+    def test_parallel_requirements(self):
+        """Should honour the analyzer kind in worker processes"""
+        parallel = decode_blobs(BLOBS, 'requirements', workers=2)
+        assert parallel[1] == analyze_requirements_blob(BLOBS[1])
+
+    def test_duplicates_decoded_once(self):
+        """Should key results by distinct BLOB"""
+        analyses = decode_unique_blobs(BLOBS, 'type_instance', workers=2)
+        assert len(analyses) == 4
+        assert list(analyses) == [BLOBS[0], BLOBS[1], BLOBS[3], BLOBS[5]]
+
+    def test_unknown_analyzer(self):
+        """Should reject unknown analyzer names"""
+        with pytest.raises(ValueError):
+            decode_blobs(BLOBS, 'nope')
@@ -0,0 +1,100 @@
+"""Tests for the sidecar field-path index"""
+
+import sqlite3
+
+import pytest
+
+from utils.field_index import (
+    ANY_VALUE,
+    build_field_index,
+    index_is_stale,
+    iter_field_paths,
+    parse_field_query,
+    query_field_index,
+)
+from wire_format import type_instance
+
+
+class TestIterFieldPaths:
+    """Test field path extraction"""
+
+    def test_paths(self):
+        """Should record messages, strings, varints and raw bytes by dotted path"""
+        paths = list(iter_field_paths(type_instance(b'public.image', 9)))
+        assert ('3', 2, None) in paths
+        assert ('3.1.1', 2, 'public.image') in paths
+        assert ('3.1.3', 0, 7) in paths
+        assert ('3.4', 2, b'\xff\xfe\x01') in paths
+        assert ('5', 0, 9) in paths
+
+    def test_malformed(self):
+        """Should raise ValueError for malformed BLOBs"""
+        with pytest.raises(ValueError):
+            list(iter_field_paths(b'\x1a\xff'))
+
+
+class TestParseFieldQuery:
+    """Test query expression parsing"""
+
+    @pytest.mark.parametrize('expression, expected', [
+        ('3.1.3=7', ('3.1.3', 7)),
+        ('field_2 = 17', ('2', 17)),
+        ('3.1.1=public.image', ('3.1.1', 'public.image')),
+        ('3.1.1="42"', ('3.1.1', '42')),
+        ('3.4=0xfffe01', ('3.4', b'\xff\xfe\x01')),
+        ('field_3.field_1', ('3.1', ANY_VALUE)),
+    ])
+    def test_expressions(self, expression, expected):
+        assert parse_field_query(expression) == expected
+
+    def test_invalid_path(self):
+        with pytest.raises(ValueError):
+            parse_field_query('name=7')
+
+
+class TestFieldIndex:
+    """Test building and querying the sidecar index"""
+
+    def test_build_stats(self, blob_db, tmp_path):
+        """Should decode each distinct BLOB once across all columns"""
+        stats = build_field_index(blob_db, str(tmp_path / 'index.sqlite'))
+        assert stats['references'] == 6
+        # field(2, 0, 17) is shared by Tools.requirements and Types.runtimeRequirements
+        assert stats['unique_blobs'] == 4
+        assert stats['malformed'] == 0
+
+    def test_value_query(self, blob_db, tmp_path):
+        """Should find every row holding a field value, across columns"""
+        index_path = str(tmp_path / 'index.sqlite')
+        build_field_index(blob_db, index_path)
+
+        matches = query_field_index(index_path, '2', 17)
+        assert [(m['column'], m['ref_id']) for m in matches] == [
+            ('Tools.requirements', 'is.workflow.actions.a'),
+            ('Types.runtimeRequirements', 'NoteEntity'),
+        ]
+
+        matches = query_field_index(index_path, '3.1.1', 'public.image', column='Parameters.typeInstance')
+        assert [(m['ref_id'], m['ref_key']) for m in matches] == [
+            ('is.workflow.actions.a', 'input'),
+            ('is.workflow.actions.b', 'input'),
+        ]
+
+    def test_presence_query(self, blob_db, tmp_path):
+        """Should match nested message paths regardless of value"""
+        index_path = str(tmp_path / 'index.sqlite')
+        build_field_index(blob_db, index_path)
+        assert len(query_field_index(index_path, '3.1')) == 3
+        assert len(query_field_index(index_path, '3.1', limit=2)) == 2
+
+    def test_stale_index(self, blob_db, tmp_path):
+        """Should notice when the database changed after the build"""
+        index_path = str(tmp_path / 'index.sqlite')
+        build_field_index(blob_db, index_path)
+        assert not index_is_stale(index_path, blob_db)
+
+        conn = sqlite3.connect(blob_db)
+        conn.execute("INSERT INTO Tools VALUES (3, 'is.workflow.actions.c', NULL, NULL)")
+        conn.commit()
+        conn.close()
+        assert index_is_stale(index_path, blob_db)
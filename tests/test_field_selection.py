@@ -0,0 +1,66 @@
+"""Tests for field projection in build_action_schema()"""
+
+import pytest
+
+from utils.db_utils import get_all_actions
+from utils.schema_builder import FIELD_TIERS, build_action_schema, parse_field_selection, wants_type_info
+
+
+@pytest.fixture
+def conn(catalog_conn):
+    return catalog_conn
+
+
+def project(schema, fields):
+    """Reference projection of a full schema"""
+    projected = {key: value for key, value in schema.items() if key in fields}
+    if 'parameters' in projected:
+        projected['parameters'] = [
+            {key: value for key, value in param.items() if f'parameters.{key}' in fields}
+            for param in projected['parameters']
+        ]
+    return projected
+
+
+def traced_queries(conn, action, fields):
+    """SQL statements build_action_schema() runs for an action"""
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        build_action_schema(conn, action, fields=fields)
+    finally:
+        conn.set_trace_callback(None)
+    return statements
+
+
+class TestFieldSelection:
+    """Test projected schemas and the queries they skip"""
+
+    @pytest.mark.parametrize('spec', ['ids', 'localized', 'parameters', 'blobs', 'id,name,app,parameters.key'])
+    def test_matches_projected_full_schema(self, conn, spec):
+        fields = parse_field_selection(spec)
+        for action in get_all_actions(conn):
+            assert build_action_schema(conn, action, fields=fields) == \
+                project(build_action_schema(conn, action), fields)
+
+    def test_blobs_tier_is_everything(self, conn):
+        for action in get_all_actions(conn):
+            assert build_action_schema(conn, action, fields=FIELD_TIERS['blobs']) == build_action_schema(conn, action)
+
+    def test_skips_queries(self, conn):
+        action = next(a for a in get_all_actions(conn) if a['id'] == 'com.apple.notes.create')
+        assert traced_queries(conn, action, parse_field_selection('ids')) == []
+
+        statements = traced_queries(conn, action, parse_field_selection('parameters.key'))
+        assert len(statements) == 1 and 'FROM Parameters' in statements[0]
+        # One accepted-types query per parameter on top of that
+        assert len(traced_queries(conn, action, parse_field_selection('parameters.accepted_types'))) == 4
+
+    def test_parse(self):
+        assert parse_field_selection(None) is None
+        assert parse_field_selection('name') == {'id', 'name'}
+        assert parse_field_selection('parameters.key') == {'id', 'parameters', 'parameters.key'}
+        assert parse_field_selection('ids,keywords') == FIELD_TIERS['ids'] | {'keywords'}
+        assert not wants_type_info(FIELD_TIERS['parameters'])
+        with pytest.raises(ValueError, match='Unknown field: parameters.bogus'):
+            parse_field_selection('id,parameters.bogus')
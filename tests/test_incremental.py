@@ -0,0 +1,141 @@
+"""Tests for incremental extraction helpers"""
+
+import pytest
+
+from utils.db_utils import get_action_fingerprints
+from utils.incremental import (
+    check_options,
+    diff_fingerprints,
+    load_manifest,
+    manifest_path_for,
+    missing_from,
+    splice_schemas,
+    write_manifest,
+)
+from utils.schema_model import ActionSchema
+from catalog_db import make_db
+
+
+class TestActionFingerprints:
+    """Test per-action fingerprints"""
+
+    def test_ignores_row_ids(self):
+        """Should give identical content the same fingerprint across versions"""
+        assert get_action_fingerprints(make_db(1)) == get_action_fingerprints(make_db(100))
+
+    @pytest.mark.parametrize('statement', [
+        "UPDATE ToolLocalizations SET name = 'Renamed' WHERE toolId = 1",
+        "UPDATE Parameters SET typeInstance = x'0a02' WHERE toolId = 1",
+        "INSERT INTO ToolParameterTypes VALUES (1, 'input', 'public.image')",
+        "INSERT INTO Categories VALUES (1, 'en', 'Text')",
+        "UPDATE Tools SET visibilityFlags = 3 WHERE rowId = 1",
+    ])
+    def test_detects_changes(self, statement):
+        """Should change only the fingerprint of the modified action"""
+        conn = make_db()
+        before = get_action_fingerprints(conn)
+        conn.execute(statement)
+        after = get_action_fingerprints(conn)
+        assert after['is.workflow.actions.a'] != before['is.workflow.actions.a']
+        assert after['is.workflow.actions.b'] == before['is.workflow.actions.b']
+
+    @pytest.mark.parametrize('statement', [
+        "UPDATE SearchKeywords SET `order` = 2 - `order` WHERE toolId = 1",
+        "UPDATE Parameters SET sortOrder = 1 - sortOrder WHERE toolId = 1",
+    ])
+    def test_detects_reordering(self, statement):
+        """Should change when the order the builder sorts a list by does"""
+        conn = make_db()
+        conn.execute("INSERT INTO SearchKeywords VALUES (1, 'en', 'more', 1)")
+        conn.execute("INSERT INTO Parameters VALUES (1, 'extra', 1, 0, NULL, NULL)")
+        before = get_action_fingerprints(conn)
+        conn.execute(statement)
+        assert get_action_fingerprints(conn)['is.workflow.actions.a'] != before['is.workflow.actions.a']
+
+    def test_ignores_storage_order(self):
+        """Should hash unordered lists by content, not by where rows are stored"""
+        forward, backward = make_db(), make_db()
+        rows = [('Text',), ('Media',)]
+        forward.executemany("INSERT INTO Categories VALUES (1, 'en', ?)", rows)
+        backward.executemany("INSERT INTO Categories VALUES (1, 'en', ?)", rows[::-1])
+        assert get_action_fingerprints(forward) == get_action_fingerprints(backward)
+
+    @pytest.mark.parametrize('statement', [
+        "UPDATE TypeDisplayRepresentations SET name = 'Renamed'",
+        "UPDATE EnumerationCases SET title = 'Everything'",
+        "INSERT INTO EntityProperties VALUES ('NoteFolder', 'color')",
+    ])
+    def test_detects_type_changes(self, statement):
+        """Should change the fingerprints of the actions using a changed type"""
+        conn = make_db()
+        conn.executescript("""
+            CREATE TABLE Types(rowId TEXT PRIMARY KEY, kind INT, runtimeFlags INT) WITHOUT ROWID;
+            CREATE TABLE TypeDisplayRepresentations(typeId TEXT, locale TEXT, name TEXT);
+            CREATE TABLE EnumerationCases(typeId TEXT, locale TEXT, id TEXT, title TEXT, subtitle TEXT);
+            CREATE TABLE EntityProperties(typeId TEXT, id TEXT);
+            CREATE TABLE EntityPropertyLocalizations(typeId TEXT, propertyId TEXT, locale TEXT, displayName TEXT);
+            INSERT INTO Types VALUES ('NoteFolder', 3, 0);
+            INSERT INTO TypeDisplayRepresentations VALUES ('NoteFolder', 'en', 'Folder');
+            INSERT INTO EnumerationCases VALUES ('NoteFolder', 'en', 'all', 'All', NULL);
+            INSERT INTO ToolOutputTypes VALUES (1, 'NoteFolder');
+        """)
+        before = get_action_fingerprints(conn)
+        conn.execute(statement)
+        after = get_action_fingerprints(conn)
+        assert after['is.workflow.actions.a'] != before['is.workflow.actions.a']
+        assert after['is.workflow.actions.b'] == before['is.workflow.actions.b']
+
+    def test_other_locales_ignored(self):
+        """Should not depend on strings of other locales"""
+        conn = make_db()
+        before = get_action_fingerprints(conn)
+        conn.execute("INSERT INTO ToolLocalizations VALUES (1, 'de', 'display', 'Aktion', NULL, NULL, NULL)")
+        assert get_action_fingerprints(conn) == before
+
+    def test_attached_schema(self, tmp_path):
+        """Should fingerprint an ATTACHed database"""
+        path = str(tmp_path / 'previous.sqlite')
+        previous = make_db()
+        previous.commit()
+        previous.execute("VACUUM INTO ?", (path,))
+
+        conn = make_db(50)
+        conn.execute("ATTACH DATABASE ? AS previous", (path,))
+        assert get_action_fingerprints(conn, schema='previous') == get_action_fingerprints(conn)
+
+        with pytest.raises(ValueError):
+            get_action_fingerprints(conn, schema='previous; DROP TABLE Tools')
+
+
+class TestIncrementalHelpers:
+    """Test diffing, splicing and manifests"""
+
+    def test_diff_fingerprints(self):
+        changes = diff_fingerprints({'a': '1', 'b': '2', 'c': '3'}, {'b': '2', 'c': '4', 'd': '5'})
+        assert changes == {'added': ['d'], 'removed': ['a'], 'changed': ['c'], 'unchanged': ['b']}
+
+    def test_splice_schemas(self):
+        """Should replace rebuilt schemas, drop removed ones and follow the new order"""
+        previous = [ActionSchema(id='a', flags=1), ActionSchema(id='b', flags=1), ActionSchema(id='c', flags=1)]
+        rebuilt = {'c': ActionSchema(id='c', flags=2), 'aa': ActionSchema(id='aa', flags=2)}
+        spliced = splice_schemas(previous, rebuilt, ['aa', 'b', 'c'])
+        assert spliced == [ActionSchema(id='aa', flags=2), ActionSchema(id='b', flags=1), ActionSchema(id='c', flags=2)]
+        assert missing_from(previous, ['b', 'x']) == ['x']
+
+    def test_manifest_round_trip(self, tmp_path):
+        output_path = str(tmp_path / 'actions_complete.json')
+        manifest_path = manifest_path_for(output_path)
+        assert manifest_path.endswith('actions_complete.manifest.json')
+
+        options = {'locale': 'en', 'include_protobuf': True}
+        write_manifest(manifest_path, {'a': '1'}, options, 'Tools-prod.sqlite')
+        manifest = load_manifest(manifest_path)
+        assert manifest['fingerprints'] == {'a': '1'}
+
+        check_options(manifest, options)
+        with pytest.raises(ValueError):
+            check_options(manifest, {'locale': 'de', 'include_protobuf': True})
+
+    def test_missing_manifest(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_manifest(str(tmp_path / 'missing.manifest.json'))
@@ -0,0 +1,62 @@
+"""Tests for incremental JSON record streaming"""
+
+import io
+import json
+
+import pytest
+
+from utils.json_stream import dump_json_array, iter_json_array, iter_records
+
+
+RECORDS = [
+    {'id': 'a', 'name': 'Ä "quoted" ]', 'parameters': [{'key': 'x', 'flags': 0}]},
+    {'id': 'b', 'name': None, 'values': [1, 2.5, True, {'nested': []}]},
+    {'id': 'c'},
+]
+
+
+class TestIterJsonArray:
+    """Test chunked array parsing"""
+
+    @pytest.mark.parametrize('chunk_size', [1, 5, 64, 1 << 16])
+    def test_chunk_sizes(self, chunk_size):
+        """Should yield the same records whatever the chunk boundaries"""
+        text = json.dumps(RECORDS, indent=2, ensure_ascii=False)
+        assert list(iter_json_array(io.StringIO(text), chunk_size)) == RECORDS
+
+    def test_scalars_split_across_chunks(self):
+        """Should not cut numbers at chunk boundaries"""
+        assert list(iter_json_array(io.StringIO('[12345, 678, -1.5e3]'), 2)) == [12345, 678, -1500.0]
+
+    def test_empty(self):
+        assert list(iter_json_array(io.StringIO(' [ ] '))) == []
+
+    @pytest.mark.parametrize('text', ['{"id": 1}', '[1 2]', '[1,', '[1] 2', '[{"id": }]'])
+    def test_malformed(self, text):
+        with pytest.raises(ValueError):
+            list(iter_json_array(io.StringIO(text), 2))
+
+
+class TestIterRecords:
+    """Test format detection"""
+
+    def test_json_array_file(self, tmp_path):
+        path = tmp_path / 'actions.json'
+        path.write_text(json.dumps(RECORDS), encoding='utf-8')
+        assert list(iter_records(str(path))) == RECORDS
+
+    def test_ndjson_file(self, tmp_path):
+        path = tmp_path / 'actions.ndjson'
+        path.write_text('\n'.join(json.dumps(r) for r in RECORDS) + '\n\n', encoding='utf-8')
+        assert list(iter_records(str(path))) == RECORDS
+
+
+class TestDumpJsonArray:
+    """Test incremental array writing"""
+
+    @pytest.mark.parametrize('records', [RECORDS, [], [[]], ['line\nbreak']])
+    def test_matches_json_dump(self, records):
+        """Should write exactly what json.dump() writes"""
+        stream = io.StringIO()
+        assert dump_json_array(iter(records), stream) == len(records)
+        assert stream.getvalue() == json.dumps(records, indent=2, ensure_ascii=False)
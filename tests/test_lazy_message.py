@@ -0,0 +1,108 @@
+"""Tests for lazy protobuf message trees"""
+
+import pytest
+
+from utils.lazy_message import LazyMessage, decode_message_tree
+from utils.protobuf_parser import analyze_type_instance_blob
+from wire_format import field, type_instance
+
+
+BLOB = type_instance(b'public.image', 9, 10)
+
+
+class TestLazyMessage:
+    """Test on-demand field access"""
+
+    def test_decodes_on_first_access(self):
+        """Should not scan the BLOB until a field is read"""
+        message = LazyMessage(BLOB)
+        assert not message.is_decoded
+        assert message.field_numbers() == [3, 5]
+        assert message.is_decoded
+
+    def test_nested_access(self):
+        """Should return child messages that decode lazily themselves"""
+        message = LazyMessage(BLOB)
+        child = message[3]
+        assert isinstance(child, LazyMessage)
+        assert not child.is_decoded
+        assert child[1][1] == 'public.image'
+        assert child[1][3] == 7
+        assert message[3] is child
+
+    def test_zero_copy(self):
+        """Should expose nested payloads as views of the original buffer"""
+        message = LazyMessage(BLOB)
+        raw = message[3][4]
+        assert isinstance(raw, memoryview)
+        assert raw.obj is message.raw.obj
+        assert bytes(raw) == b'\xff\xfe\x01'
+
+    def test_repeated_fields(self):
+        """Should keep every occurrence, last one winning for singular access"""
+        message = LazyMessage(BLOB)
+        assert message.get_all(5) == [9, 10]
+        assert message[5] == 10
+        assert message.get(6, 'missing') == 'missing'
+        assert 6 not in message
+
+    def test_malformed(self):
+        """Should raise ValueError when a malformed BLOB is read"""
+        message = LazyMessage(b'\x1a\xff')
+        with pytest.raises(ValueError):
+            message.field_numbers()
+
+
+class TestToDict:
+    """Test depth-limited serialization"""
+
+    def test_depth_limit(self):
+        """Should collapse messages below the requested depth"""
+        message = LazyMessage(BLOB)
+        assert message.to_dict(1, 'size') == {'field_3': {'bytes': 23}, 'field_5': [9, 10]}
+        assert message.to_dict(3)['field_3']['field_1'] == {'field_1': 'public.image', 'field_3': 7}
+
+    def test_depth_limit_after_access(self):
+        """Should honor the depth limit for fields that were already read"""
+        message = LazyMessage(BLOB)
+        message[3][1][1]
+        assert message.to_dict(1, 'size')['field_3'] == {'bytes': 23}
+        assert message.to_dict(2, 'size')['field_3']['field_1'] == {'bytes': 16}
+
+    @pytest.mark.parametrize('bytes_format, expected', [
+        ('size', {'bytes': 3}),
+        ('hex', 'fffe01'),
+        ('base64', '//4B'),
+    ])
+    def test_bytes_formats(self, bytes_format, expected):
+        """Should render opaque payloads in the requested format"""
+        fields = LazyMessage(BLOB).to_dict(2, bytes_format)
+        assert fields['field_3']['field_4'] == expected
+
+    def test_keeps_payload_by_default(self):
+        """Should render opaque payloads and collapsed messages as hex by default"""
+        fields = LazyMessage(BLOB).to_dict(2)
+        assert fields['field_3']['field_4'] == 'fffe01'
+        assert bytes.fromhex(fields['field_3']['field_1']) == bytes(LazyMessage(BLOB)[3][1].raw)
+
+    def test_omit_bytes(self):
+        """Should drop opaque payloads entirely with 'omit'"""
+        fields = LazyMessage(field(1, 2, b'\xff\xfe\x01') + field(2, 0, 5)).to_dict(1, 'omit')
+        assert fields == {'field_2': 5}
+
+
+class TestDecodeMessageTree:
+    """Test the analyzer-facing wrapper"""
+
+    def test_parse_error(self):
+        """Should report malformed BLOBs instead of raising"""
+        result = decode_message_tree(b'\x1a\xff')
+        assert result['fields'] == {}
+        assert 'parse_error' in result
+
+    def test_type_instance_analysis(self):
+        """Should replace the flat decoding when a depth is requested"""
+        analysis = analyze_type_instance_blob(BLOB, decode_depth=2)
+        assert analysis['uti_types'] == ['public.image']
+        assert analysis['decoded']['depth'] == 2
+        assert analysis['decoded']['fields']['field_3']['field_4'] == 'fffe01'
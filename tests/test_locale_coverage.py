@@ -0,0 +1,75 @@
+"""Tests for the locale × app coverage matrix"""
+
+import csv
+import json
+
+import pytest
+
+from utils.locale_coverage import discover_locales, export_coverage, get_locale_coverage, summarize_by_locale
+
+
+@pytest.fixture
+def conn(localized_conn):
+    return localized_conn
+
+
+def cell(matrix, locale, app):
+    return next(row for row in matrix if (row['locale'], row['app']) == (locale, app))
+
+
+class TestLocaleCoverage:
+    """Test coverage counts against the fixture's strings"""
+
+    def test_discover_locales(self, conn):
+        assert discover_locales(conn) == ['de', 'en', 'fr']
+
+    def test_matrix(self, conn):
+        matrix = get_locale_coverage(conn)
+        assert [(row['locale'], row['app']) for row in matrix[:3]] == \
+            [('de', 'app.thirdparty'), ('de', 'com.apple.shortcuts'), ('de', None)]
+
+        de = cell(matrix, 'de', 'com.apple.shortcuts')
+        # Actions 1, 2, 10, 11 in the app; 1 and 10 in German ('other' usage ignored)
+        assert (de['actions_total'], de['actions_localized'], de['actions_coverage']) == (4, 2, 0.5)
+        assert (de['parameters_total'], de['parameters_localized']) == (6, 1)
+        assert (de['categories_total'], de['categories_localized'], de['categories_coverage']) == (1, 1, 1.0)
+        assert (de['keywords_total'], de['keywords_localized']) == (2, 1)
+
+        fr = cell(matrix, 'fr', 'com.apple.shortcuts')
+        assert (fr['actions_localized'], fr['parameters_localized'], fr['categories_localized']) == (1, 1, 0)
+        # No keyword rows in the third-party app at all
+        assert cell(matrix, 'en', 'app.thirdparty')['keywords_coverage'] is None
+        # The fixture has no EnumerationCases table
+        assert 'enum_cases_total' not in de
+
+    def test_enum_cases(self, conn):
+        conn.executescript("""
+            CREATE TABLE Types(rowId TEXT PRIMARY KEY, kind INT, sourceContainerId INT) WITHOUT ROWID;
+            CREATE TABLE EnumerationCases(typeId TEXT, locale TEXT, id TEXT, title TEXT, subtitle TEXT);
+            INSERT INTO Types VALUES ('NoteFolder', 3, 1);
+            INSERT INTO EnumerationCases VALUES
+                ('NoteFolder', 'en', 'a', 'All', NULL), ('NoteFolder', 'en', 'b', 'Recent', NULL),
+                ('NoteFolder', 'ja', 'a', 'すべて', NULL), ('NoteFolder', 'ja', 'b', NULL, NULL);
+        """)
+        assert 'ja' in discover_locales(conn)
+        matrix = get_locale_coverage(conn, ['en', 'ja'])
+        assert cell(matrix, 'ja', 'com.apple.shortcuts')['enum_cases_coverage'] == 0.5
+        assert cell(matrix, 'en', 'com.apple.shortcuts')['enum_cases_coverage'] == 1.0
+        assert cell(matrix, 'ja', 'com.apple.shortcuts')['actions_localized'] == 0
+
+    def test_summary(self, conn):
+        matrix = get_locale_coverage(conn, ['de'])
+        (summary,) = summarize_by_locale(matrix)
+        assert summary['actions_total'] == sum(row['actions_total'] for row in matrix) == 6
+        assert summary['actions_coverage'] == round(2 / 6, 4)
+
+    def test_export(self, conn, tmp_path):
+        matrix = get_locale_coverage(conn)
+        export_coverage(matrix, str(tmp_path / 'coverage.json'))
+        assert json.loads((tmp_path / 'coverage.json').read_text()) == matrix
+
+        export_coverage(matrix, str(tmp_path / 'coverage.csv'))
+        with open(tmp_path / 'coverage.csv', newline='') as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == len(matrix)
+        assert rows[0]['actions_localized'] == str(matrix[0]['actions_localized'])
@@ -0,0 +1,88 @@
+"""Tests for locale fallback chains resolved in SQL"""
+
+import pytest
+
+from utils.db_utils import (
+    get_action_parameters,
+    get_action_summary,
+    get_all_actions,
+    get_hidden_actions,
+    get_localized_list,
+    locale_chain,
+)
+from utils.schema_builder import build_action_schema, summarize_action_collection
+
+CHAIN = ('de_AT', 'de', 'en')
+
+
+@pytest.fixture
+def conn(localized_conn):
+    """localized_conn with a few Austrian German strings"""
+    localized_conn.execute(
+        "INSERT INTO ToolLocalizations VALUES (10, 'de_AT', 'display', 'Notiz anlegen', NULL, NULL, NULL)"
+    )
+    localized_conn.execute("INSERT INTO Categories VALUES (1, 'de_AT', 'Skripte')")
+    return localized_conn
+
+
+def by_id(rows):
+    return {row['id']: row for row in rows}
+
+
+class TestLocaleFallback:
+    """Test per-string resolution along a chain"""
+
+    def test_locale_chain(self):
+        assert locale_chain('en') == ('en',)
+        assert locale_chain('en_GB') == ('en_GB', 'en')
+        assert locale_chain('zh_Hant_HK') == ('zh_Hant_HK', 'zh_Hant', 'zh')
+        assert locale_chain('pt-BR', ['en', 'pt']) == ('pt-BR', 'pt', 'en')
+
+    def test_resolves_each_string(self, conn):
+        actions = by_id(get_all_actions(conn, CHAIN))
+        notes = actions['com.apple.notes.create']
+        # Name from de_AT, description only exists in en
+        assert (notes['name'], notes['name_locale']) == ('Notiz anlegen', 'de_AT')
+        assert notes['descriptionSummary_locale'] is None
+        assert (notes['app_name'], notes['app_name_locale']) == ('Kurzbefehle', 'de')
+        action_a = actions['is.workflow.actions.a']
+        assert (action_a['name'], action_a['descriptionSummary']) == ('Aktion A', 'Macht Dinge')
+        assert action_a['descriptionSummary_locale'] == 'de'
+        b = actions['is.workflow.actions.b']
+        assert (b['name'], b['name_locale']) == ('IS.WORKFLOW.ACTIONS.B', 'en')
+
+    def test_single_locale_chain_matches_locale(self, conn):
+        """A one-locale chain should only add the *_locale entries"""
+        for fetch in (get_all_actions, get_hidden_actions):
+            chained = fetch(conn, ('en',))
+            plain = fetch(conn, 'en')
+            assert [{k: v for k, v in row.items() if not k.endswith('_locale')} for row in chained] == plain
+
+    def test_parameters(self, conn):
+        params = {p['key']: p for p in get_action_parameters(conn, 10, CHAIN)}
+        assert (params['title']['name'], params['title']['name_locale']) == ('Titel', 'de')
+        assert params['title']['description_locale'] == 'de'
+        assert params['body']['name_locale'] is None
+        assert [p['key'] for p in get_action_parameters(conn, 10, CHAIN)] == \
+            [p['key'] for p in get_action_parameters(conn, 10, 'en')]
+
+    def test_lists_come_from_one_locale(self, conn):
+        assert get_localized_list(conn, 'Categories', 10, CHAIN) == (['Notizen'], 'de')
+        assert get_localized_list(conn, 'Categories', 1, CHAIN) == (['Skripte'], 'de_AT')
+        assert get_localized_list(conn, 'SearchKeywords', 1, CHAIN) == (['eins', 'zwei'], 'de')
+        assert get_localized_list(conn, 'SearchKeywords', 2, CHAIN) == (['text'], 'en')
+        assert get_localized_list(conn, 'Categories', 2, CHAIN) == ([], None)
+
+    def test_schema_records_locales(self, conn):
+        action = by_id(get_all_actions(conn, CHAIN))['com.apple.notes.create']
+        schema = build_action_schema(conn, action, locale=CHAIN)
+        assert schema['string_locales']['name'] == 'de_AT'
+        assert schema['string_locales']['categories'] == 'de'
+        assert schema['parameters'][0]['string_locales'] == {'name': 'de', 'description': 'de'}
+        # Single locales keep the original format
+        plain = build_action_schema(conn, by_id(get_all_actions(conn))['com.apple.notes.create'])
+        assert 'string_locales' not in plain
+
+    def test_summary(self, conn):
+        schemas = [build_action_schema(conn, action, locale=CHAIN) for action in get_all_actions(conn, CHAIN)]
+        assert get_action_summary(conn, CHAIN) == summarize_action_collection(schemas)
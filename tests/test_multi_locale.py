@@ -0,0 +1,64 @@
+"""Tests for single-pass multi-locale extraction"""
+
+import pytest
+
+from utils.db_utils import get_all_actions, get_hidden_actions
+from utils.multi_locale import build_locale_schemas, locale_output_path, parse_locales
+from utils.schema_builder import build_action_schema, parse_field_selection
+from utils.schema_model import schema_dicts
+
+
+@pytest.fixture
+def conn(localized_conn):
+    return localized_conn
+
+
+LOCALES = ['en', 'de', 'fr']
+
+
+def per_locale_schemas(conn, locale, hidden=False, fields=None):
+    """What a separate --locale run builds"""
+    actions = (get_hidden_actions if hidden else get_all_actions)(conn, locale)
+    return [build_action_schema(conn, action, locale=locale, fields=fields) for action in actions]
+
+
+class TestMultiLocale:
+    """Test that one pass matches one run per locale"""
+
+    @pytest.mark.parametrize('restrict', [False, True])
+    def test_matches_per_locale_runs(self, conn, restrict):
+        by_locale = build_locale_schemas(conn, get_all_actions(conn, 'en'), LOCALES, restrict=restrict)
+        assert list(by_locale) == LOCALES
+        for locale in LOCALES:
+            assert list(schema_dicts(by_locale[locale])) == per_locale_schemas(conn, locale)
+
+    def test_hidden_actions(self, conn):
+        by_locale = build_locale_schemas(conn, get_hidden_actions(conn, 'de'), LOCALES)
+        for locale in LOCALES:
+            assert list(schema_dicts(by_locale[locale])) == per_locale_schemas(conn, locale, hidden=True)
+
+    def test_with_fields(self, conn):
+        fields = parse_field_selection('localized,parameters.name')
+        by_locale = build_locale_schemas(conn, get_all_actions(conn, 'en'), LOCALES, fields=fields)
+        for locale in LOCALES:
+            assert list(schema_dicts(by_locale[locale])) == per_locale_schemas(conn, locale, fields=fields)
+
+    def test_localized_values(self, conn):
+        by_locale = build_locale_schemas(conn, get_all_actions(conn, 'en'), ['de', 'fr'])
+        notes = {locale: next(s for s in schema_dicts(schemas) if s['id'] == 'com.apple.notes.create')
+                 for locale, schemas in by_locale.items()}
+        assert notes['de']['name'] == 'Notiz erstellen'
+        assert notes['de']['categories'] == ['Notizen']
+        assert (notes['de']['app']['name'], notes['fr']['app']['name']) == ('Kurzbefehle', None)
+        assert notes['fr']['description_metadata']['is_synthetic']
+        keywords = next(s for s in by_locale['de'] if s.id == 'is.workflow.actions.a').keywords
+        assert keywords == ('eins', 'zwei')
+
+    def test_parse_locales(self):
+        assert parse_locales('en, de,fr,') == ['en', 'de', 'fr']
+        for spec in ('', 'en,en'):
+            with pytest.raises(ValueError):
+                parse_locales(spec)
+
+    def test_output_path(self):
+        assert locale_output_path('output/actions_complete.json', 'de') == 'output/actions_complete.de.json'
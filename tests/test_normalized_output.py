@@ -0,0 +1,81 @@
+"""Tests for the normalized output with shared type_info blocks"""
+
+import json
+
+import pytest
+
+from utils.db_utils import get_all_actions
+from utils.normalized_output import (
+    inflate_document,
+    load_normalized,
+    normalize_schemas,
+    type_info_digest,
+    write_normalized,
+)
+from utils.schema_builder import build_action_schema, parse_field_selection
+from wire_format import type_instance
+
+
+@pytest.fixture
+def conn(catalog_conn):
+    """catalog_conn with one BLOB shared by three parameters and another by one"""
+    catalog_conn.execute("UPDATE Parameters SET typeInstance = ? WHERE toolId = 10", (type_instance(b'public.text'),))
+    catalog_conn.execute("UPDATE Parameters SET typeInstance = ? WHERE toolId = 11", (type_instance(b'public.image'),))
+    return catalog_conn
+
+
+def build_all(conn, **kwargs):
+    return [build_action_schema(conn, action, **kwargs) for action in get_all_actions(conn)]
+
+
+def round_trip(document):
+    return inflate_document(json.loads(json.dumps(document)))
+
+
+class TestNormalizedOutput:
+    """Test the type_infos table and the inflated schemas"""
+
+    @pytest.mark.parametrize('kwargs', [{}, {'decode_depth': 2}, {'fields': parse_field_selection('id,name')}])
+    def test_round_trip(self, conn, kwargs):
+        schemas = build_all(conn, **kwargs)
+        assert round_trip(normalize_schemas(schemas)) == schemas
+
+    def test_shared_blocks(self, conn):
+        schemas = build_all(conn)
+        document = normalize_schemas(schemas)
+        (text_param, *_) = next(s for s in document['actions'] if s['id'] == 'com.apple.notes.create')['parameters']
+        # make_db()'s x'0a01' parameters, public.text and public.image
+        assert len(document['type_infos']) == 3
+        assert document['type_infos'][text_param['type_info']]['uti_types'] == ['public.text']
+        assert text_param['type_info'] == type_info_digest(
+            next(s for s in schemas if s['id'] == 'com.apple.notes.create')['parameters'][0]['type_info']
+        )
+
+    def test_base64_payloads(self, conn):
+        schemas = build_all(conn)
+        document = normalize_schemas(schemas, 'base64')
+        payloads = [info['decoded']['fields']['field_3_bytes'] for info in document['type_infos'].values()
+                    if 'field_3_bytes' in info['decoded']['fields']]
+        assert payloads and not any(payload.startswith('0a') for payload in payloads)
+        assert round_trip(document) == schemas
+
+    def test_omitted_payloads(self, conn):
+        document = normalize_schemas(build_all(conn), 'omit')
+        for info in document['type_infos'].values():
+            assert not any(key.endswith('_bytes') for key in info['decoded']['fields'])
+        # Digests still name the full analyses
+        inflated = next(s for s in round_trip(document) if s['id'] == 'com.apple.notes.create')
+        assert inflated['parameters'][0]['type_info']['decoded']['raw_size'] > 0
+
+    def test_file(self, conn, tmp_path):
+        schemas = build_all(conn)
+        path = str(tmp_path / 'actions_complete.normalized.json')
+        counts = write_normalized(schemas, path)
+        assert counts == {'actions': len(schemas), 'parameters': 6, 'type_infos': 3}
+        assert load_normalized(path) == schemas
+
+    def test_errors(self, conn):
+        with pytest.raises(ValueError):
+            normalize_schemas([], 'size')
+        with pytest.raises(ValueError):
+            inflate_document({'actions': []})
@@ -0,0 +1,76 @@
+"""Tests for the binary cache of parsed outputs"""
+
+import json
+import os
+
+import pytest
+
+from utils.output_cache import cache_path_for, cache_status, clear_cache, load_output
+
+
+SCHEMAS = [
+    {'id': 'is.workflow.actions.gettext', 'name': 'Text', 'parameters': [{'key': 'WFTextActionText'}]},
+    {'id': 'is.workflow.actions.alert', 'name': 'Show Alert', 'visibility_flags': 0, 'score': 87.5},
+]
+
+
+@pytest.fixture
+def output_path(tmp_path):
+    path = tmp_path / 'actions_complete.json'
+    path.write_text(json.dumps(SCHEMAS, indent=2), encoding='utf-8')
+    return str(path)
+
+
+class TestLoadOutput:
+    """Test cache creation, reuse and invalidation"""
+
+    def test_builds_then_reuses_cache(self, output_path):
+        assert cache_status(output_path) == 'missing'
+        assert load_output(output_path) == SCHEMAS
+        assert cache_status(output_path) == 'fresh'
+        assert load_output(output_path) == SCHEMAS
+
+    def test_touched_file_keeps_cache(self, output_path):
+        """Should accept a new mtime when the content hash still matches"""
+        load_output(output_path)
+        stat = os.stat(output_path)
+        os.utime(output_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+        assert cache_status(output_path) == 'touched'
+        assert load_output(output_path) == SCHEMAS
+        assert cache_status(output_path) == 'fresh'
+
+    def test_changed_content_rebuilds(self, output_path):
+        """Should notice same-size edits through the content hash"""
+        load_output(output_path)
+        with open(output_path, 'r+', encoding='utf-8') as f:
+            text = f.read().replace('Show Alert', 'Show Alarm')
+            f.seek(0)
+            f.write(text)
+        stat = os.stat(output_path)
+        os.utime(output_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+        assert cache_status(output_path) == 'stale'
+        assert load_output(output_path)[1]['name'] == 'Show Alarm'
+        assert cache_status(output_path) == 'fresh'
+
+    def test_corrupt_cache_rebuilds(self, output_path):
+        load_output(output_path)
+        with open(cache_path_for(output_path), 'r+b') as f:
+            f.seek(-4, os.SEEK_END)
+            f.truncate()
+        assert load_output(output_path) == SCHEMAS
+
+    def test_ndjson(self, tmp_path):
+        path = tmp_path / 'actions_complete.ndjson'
+        path.write_text(''.join(json.dumps(schema) + '\n' for schema in SCHEMAS), encoding='utf-8')
+        assert load_output(str(path)) == SCHEMAS
+        assert load_output(str(path)) == SCHEMAS
+
+    def test_no_cache(self, output_path):
+        assert load_output(output_path, use_cache=False) == SCHEMAS
+        assert not os.path.exists(cache_path_for(output_path))
+        assert not clear_cache(output_path)
+
+    def test_missing_output(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_output(str(tmp_path / 'missing.json'))
@@ -0,0 +1,87 @@
+"""Tests for filters pushed down into SQL"""
+
+import argparse
+
+import pytest
+
+from utils.db_utils import (
+    ACTION_FILTER_COLUMNS,
+    TYPE_FILTER_COLUMNS,
+    QueryFilter,
+    add_filter_arguments,
+    filter_from_args,
+    filter_hidden_actions,
+    get_all_actions,
+    get_hidden_actions,
+)
+
+
+@pytest.fixture
+def conn(catalog_conn):
+    return catalog_conn
+
+
+def python_filter(actions, query_filter):
+    """Reference implementation of QueryFilter over fetched actions"""
+    selected = [
+        action for action in actions
+        if (query_filter.app_bundle is None or action['container_id'] == query_filter.app_bundle)
+        and (query_filter.min_visibility is None or action['visibilityFlags'] >= query_filter.min_visibility)
+        and (query_filter.max_visibility is None or action['visibilityFlags'] <= query_filter.max_visibility)
+        and (query_filter.tool_type is None or action['toolType'] == query_filter.tool_type)
+        and (query_filter.id_prefix is None or action['id'].startswith(query_filter.id_prefix))
+    ]
+    start = query_filter.offset or 0
+    return selected[start:None if query_filter.limit is None else start + query_filter.limit]
+
+
+FILTERS = [
+    QueryFilter(),
+    QueryFilter(app_bundle='com.apple.shortcuts'),
+    QueryFilter(min_visibility=3, max_visibility=14),
+    QueryFilter(tool_type='appIntent'),
+    QueryFilter(id_prefix='is.workflow.actions.'),
+    QueryFilter(id_prefix='is.workflow.actions.o', limit=5),
+    QueryFilter(limit=2, offset=1),
+    QueryFilter(offset=3),
+]
+
+
+class TestQueryFilter:
+    """Test that SQL filtering matches filtering in Python"""
+
+    @pytest.mark.parametrize('query_filter', FILTERS)
+    def test_all_actions(self, conn, query_filter):
+        expected = python_filter(get_all_actions(conn), query_filter)
+        assert [a['id'] for a in get_all_actions(conn, query_filter=query_filter)] == [a['id'] for a in expected]
+
+    @pytest.mark.parametrize('query_filter', FILTERS)
+    def test_hidden_actions(self, conn, query_filter):
+        expected = python_filter(get_hidden_actions(conn), query_filter)
+        assert [a['id'] for a in get_hidden_actions(conn, query_filter=query_filter)] == [a['id'] for a in expected]
+
+    @pytest.mark.parametrize('query_filter', [f for f in FILTERS if f.limit is None and f.offset is None])
+    def test_hidden_from_all_actions(self, conn, query_filter):
+        """Hidden rows picked from all-action rows should match the SQL query"""
+        assert filter_hidden_actions(get_all_actions(conn, query_filter=query_filter)) == \
+            get_hidden_actions(conn, query_filter=query_filter)
+
+    def test_unrestricted(self):
+        assert not QueryFilter().is_restricted()
+        assert QueryFilter(offset=0).is_restricted()
+        assert QueryFilter().compile(ACTION_FILTER_COLUMNS) == ('', '', [])
+
+    def test_inapplicable_field(self):
+        with pytest.raises(ValueError, match='--tool-type'):
+            QueryFilter(tool_type='action').where_clause(TYPE_FILTER_COLUMNS)
+        with pytest.raises(ValueError, match='--kind'):
+            QueryFilter(kind=3).where_clause(ACTION_FILTER_COLUMNS)
+
+    def test_from_args(self):
+        parser = argparse.ArgumentParser()
+        add_filter_arguments(parser, 'types')
+        args = parser.parse_args(['--kind', 'enum', '--app', 'com.apple.Music', '--limit', '10'])
+        assert filter_from_args(args) == QueryFilter(app_bundle='com.apple.Music', kind=3, limit=10)
+        assert filter_from_args(args, kind=2, limit=None) == QueryFilter(app_bundle='com.apple.Music', kind=2, limit=10)
+        with pytest.raises(SystemExit):
+            parser.parse_args(['--tool-type', 'action'])
@@ -0,0 +1,94 @@
+"""Tests for the record-hash structural diff"""
+
+import json
+
+from utils.record_diff import canonical_hash, diff_files, diff_record_streams, diff_values
+
+
+OLD = [
+    {'id': 'a', 'name': 'Alpha', 'parameters': [{'key': 'x', 'name': 'X'}, {'key': 'y', 'name': 'Y'}]},
+    {'id': 'b', 'name': 'Beta', 'keywords': ['one', 'two']},
+    {'id': 'c', 'name': 'Gamma'},
+]
+NEW = [
+    {'id': 'a', 'parameters': [{'key': 'y', 'name': 'Y'}, {'key': 'x', 'name': 'X2'}], 'name': 'Alpha'},
+    {'id': 'b', 'name': 'Beta', 'keywords': ['one']},
+    {'id': 'd', 'name': 'Delta'},
+]
+
+
+class TestCanonicalHash:
+    def test_key_order_independent(self):
+        assert canonical_hash({'a': 1, 'b': [1, 2]}) == canonical_hash({'b': [1, 2], 'a': 1})
+        assert canonical_hash([1, 2]) != canonical_hash([2, 1])
+
+
+class TestDiffValues:
+    """Test field-level change paths"""
+
+    def test_keyed_lists(self):
+        """Should match list elements by key and report their new order"""
+        changes = diff_values(OLD[0], NEW[0])
+        assert changes == [
+            {'path': 'parameters', 'change': 'reordered', 'old': ['x', 'y'], 'new': ['y', 'x']},
+            {'path': 'parameters[x].name', 'change': 'changed', 'old': 'X', 'new': 'X2'},
+        ]
+
+    def test_reorder_only(self):
+        """Should not count additions and removals as reordering"""
+        old = {'parameters': [{'key': 'x'}, {'key': 'y'}]}
+        assert [c['change'] for c in diff_values(old, {'parameters': [{'key': 'y'}, {'key': 'x'}]})] == ['reordered']
+        assert [c['change'] for c in diff_values(old, {'parameters': [{'key': 'z'}, {'key': 'y'}]})] == \
+            ['removed', 'added']
+
+    def test_scalar_lists(self):
+        """Should report a changed scalar list as one change"""
+        assert diff_values(OLD[1], NEW[1]) == [
+            {'path': 'keywords', 'change': 'changed', 'old': ['one', 'two'], 'new': ['one']},
+        ]
+
+    def test_added_and_removed_fields(self):
+        changes = diff_values({'a': 1, 'b': 2}, {'b': 2, 'c': 3})
+        assert changes == [
+            {'path': 'a', 'change': 'removed', 'old': 1},
+            {'path': 'c', 'change': 'added', 'new': 3},
+        ]
+
+    def test_positional_lists(self):
+        """Should fall back to positions when elements have no identity"""
+        changes = diff_values({'v': [{'n': 1}]}, {'v': [{'n': 2}, {'n': 3}]})
+        assert [c['path'] for c in changes] == ['v[0].n', 'v[1]']
+
+
+class TestDiffStreams:
+    """Test the two-pass streaming diff"""
+
+    def test_sets(self):
+        diff = diff_record_streams(lambda: iter(OLD), lambda: iter(NEW))
+        assert diff['added'] == ['d']
+        assert diff['removed'] == ['c']
+        assert list(diff['changed']) == ['a', 'b']
+        assert diff['unchanged'] == 0
+
+    def test_ids_only(self):
+        """Should skip the second pass when field diffs aren't wanted"""
+        calls = []
+
+        def old_records():
+            calls.append('old')
+            return iter(OLD)
+
+        diff = diff_record_streams(old_records, lambda: iter(NEW), field_diffs=False)
+        assert diff['changed'] == ['a', 'b']
+        assert calls == ['old']
+
+    def test_identical_files(self, tmp_path):
+        """Should settle identical records by hash, whatever the formatting"""
+        old_path = tmp_path / 'old.json'
+        new_path = tmp_path / 'new.ndjson'
+        old_path.write_text(json.dumps(OLD, indent=2), encoding='utf-8')
+        new_path.write_text('\n'.join(json.dumps(r, sort_keys=True) for r in OLD), encoding='utf-8')
+
+        diff = diff_files(str(old_path), str(new_path))
+        assert diff['unchanged'] == 3
+        assert not diff['added'] and not diff['removed'] and not diff['changed']
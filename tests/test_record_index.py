@@ -0,0 +1,82 @@
+"""Tests for indexed NDJSON exports"""
+
+import json
+
+import pytest
+
+from utils.json_stream import iter_records
+from utils.record_index import RecordIndex, index_path_for, write_ndjson
+
+
+RECORDS = [
+    {'id': 'is.workflow.actions.gettext', 'name': 'Text'},
+    {'id': 'com.apple.mobilenotes.SharingExtension', 'name': 'Notes ✓'},
+    {'id': 'is.workflow.actions.alert', 'name': 'Show Alert'},
+    {'id': 'is.workflow.actions.getvariable', 'parameters': [{'key': 'WFVariable'}]},
+]
+
+
+@pytest.fixture
+def ndjson_path(tmp_path):
+    path = str(tmp_path / 'actions_complete.ndjson')
+    write_ndjson(RECORDS, path)
+    return path
+
+
+class TestWriteNdjson:
+    """Test the NDJSON export itself"""
+
+    def test_lines_in_output_order(self, ndjson_path):
+        """Should keep output order and stay readable by iter_records"""
+        assert list(iter_records(ndjson_path)) == RECORDS
+        assert index_path_for(ndjson_path).endswith('actions_complete.ndjson.idx')
+
+    def test_duplicate_ids(self, tmp_path):
+        with pytest.raises(ValueError):
+            write_ndjson([{'id': 'a'}, {'id': 'a'}], str(tmp_path / 'dup.ndjson'))
+
+
+class TestRecordIndex:
+    """Test random access through the offset index"""
+
+    def test_get(self, ndjson_path):
+        with RecordIndex(ndjson_path) as index:
+            assert len(index) == 4
+            assert index.get('com.apple.mobilenotes.SharingExtension') == RECORDS[1]
+            assert 'is.workflow.actions.alert' in index
+            assert index.get('is.workflow.actions.missing') is None
+
+    def test_range_and_prefix(self, ndjson_path):
+        """Should return id ranges in sorted order"""
+        with RecordIndex(ndjson_path) as index:
+            assert list(index.ids()) == sorted(record['id'] for record in RECORDS)
+            assert [r['id'] for r in index.range('is.workflow.actions.b', 'is.workflow.actions.getz')] == [
+                'is.workflow.actions.gettext',
+                'is.workflow.actions.getvariable',
+            ]
+            assert [r['id'] for r in index.prefix('is.workflow.actions.get')] == [
+                'is.workflow.actions.gettext',
+                'is.workflow.actions.getvariable',
+            ]
+            assert len(list(index.range())) == 4
+
+    def test_empty(self, tmp_path):
+        path = str(tmp_path / 'empty.ndjson')
+        write_ndjson([], path)
+        with RecordIndex(path) as index:
+            assert len(index) == 0
+            assert index.get('a') is None
+            assert list(index.range()) == []
+
+    def test_stale_index(self, ndjson_path):
+        """Should refuse an index that no longer matches its data file"""
+        with open(ndjson_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'id': 'extra'}) + '\n')
+        with pytest.raises(ValueError):
+            RecordIndex(ndjson_path)
+
+    def test_missing_index(self, tmp_path):
+        path = tmp_path / 'plain.ndjson'
+        path.write_text('{"id": "a"}\n')
+        with pytest.raises(FileNotFoundError):
+            RecordIndex(str(path))
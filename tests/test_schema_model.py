@@ -0,0 +1,72 @@
+"""Tests for the compact schema model"""
+
+import json
+
+import pytest
+
+from utils.db_utils import get_all_actions
+from utils.schema_builder import build_action_schema, build_type_schema, parse_field_selection
+from utils.schema_model import MISSING, NOT_SYNTHETIC, ActionSchema, LocalizationMeta, TypeSchema, schema_dicts
+
+
+@pytest.fixture
+def conn(localized_conn):
+    return localized_conn
+
+
+def build_all(conn, **kwargs):
+    return [build_action_schema(conn, action, **kwargs) for action in get_all_actions(conn, kwargs.get('locale', 'en'))]
+
+
+class TestSchemaModel:
+    """Test that models give back the builder's dicts exactly"""
+
+    @pytest.mark.parametrize('kwargs', [
+        {},
+        {'locale': 'fr'},
+        {'locale': ('fr', 'de', 'en')},
+        {'fix_localizations': False},
+        {'fields': parse_field_selection('ids,parameters.key')},
+    ])
+    def test_round_trip(self, conn, kwargs):
+        for schema in build_all(conn, **kwargs):
+            # Same keys in the same order, so the JSON output is unchanged
+            assert json.dumps(ActionSchema.from_dict(schema).to_dict()) == json.dumps(schema)
+
+    def test_shared_metadata(self, conn):
+        models = [ActionSchema.from_dict(schema) for schema in build_all(conn, locale='fr')]
+        plain = [model for model in models if not model.name_metadata.is_synthetic]
+        assert plain and all(model.name_metadata is NOT_SYNTHETIC for model in plain)
+
+        synthetic = LocalizationMeta.from_dict(
+            {'is_synthetic': True, 'original_key': 'PARAM_DESCRIPTION', 'confidence': 0.9, 'source': 'key'}
+        )
+        assert synthetic is not NOT_SYNTHETIC
+        assert synthetic.to_dict()['original_key'] == 'PARAM_DESCRIPTION'
+
+    def test_projection_leaves_fields_missing(self, conn):
+        (schema, *_) = build_all(conn, fields=parse_field_selection('id,name'))
+        model = ActionSchema.from_dict(schema)
+        assert model.parameters is MISSING and model.app is MISSING
+        assert list(model.to_dict()) == ['id', 'name']
+
+    def test_schema_dicts(self, conn):
+        schemas = build_all(conn)
+        assert list(schema_dicts(ActionSchema.from_dict(schema) for schema in schemas)) == schemas
+
+    def test_no_instance_dict(self, conn):
+        model = next(model for model in map(ActionSchema.from_dict, build_all(conn)) if model.parameters)
+        assert not hasattr(model, '__dict__')
+        assert not hasattr(model.parameters[0], '__dict__')
+
+    def test_type_schema(self, conn):
+        conn.executescript("""
+            CREATE TABLE EntityProperties(typeId TEXT, key TEXT);
+            CREATE TABLE EnumerationCases(typeId TEXT, locale TEXT, id TEXT, title TEXT, subtitle TEXT);
+        """)
+        for type_data in [
+            {'rowId': 'string', 'name': 'Text', 'kind': 1, 'runtimeFlags': 0},
+            {'rowId': 'NoteFolder', 'name': 'Folder', 'kind': 3, 'runtimeFlags': 0, 'container_id': 'x'},
+        ]:
+            schema = build_type_schema(conn, type_data)
+            assert json.dumps(TypeSchema.from_dict(schema).to_dict()) == json.dumps(schema)
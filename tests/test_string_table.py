@@ -0,0 +1,99 @@
+"""Tests for string interning and dictionary-encoded output"""
+
+import json
+
+import pytest
+
+from utils.db_utils import get_all_actions
+from utils.schema_builder import build_action_schema, parse_field_selection
+from utils.string_table import (
+    StringTable,
+    decode_records,
+    encode_records,
+    load_dictionary_encoded,
+    write_dictionary_encoded,
+)
+from wire_format import type_instance
+
+
+@pytest.fixture
+def conn(localized_conn):
+    return localized_conn
+
+
+def build_all(conn, **kwargs):
+    locale = kwargs.get('locale', 'en')
+    return [build_action_schema(conn, action, **kwargs) for action in get_all_actions(conn, locale)]
+
+
+class TestStringTable:
+    """Test interning and the schemas built through a table"""
+
+    def test_intern(self):
+        table = StringTable(['a'])
+        first, second = ''.join(['str', 'ing']), ''.join(['stri', 'ng'])
+        assert first is not second
+        assert table.intern(first) is table.intern(second)
+        assert table.intern(None) is None
+        assert table.strings == ['a', 'string'] and table.index('a') == 0
+        assert 'string' in table and len(table) == 2
+
+    @pytest.mark.parametrize('locale', ['en', ('fr', 'de', 'en')])
+    def test_builder_output_unchanged(self, conn, locale):
+        table = StringTable()
+        assert build_all(conn, locale=locale, strings=table) == build_all(conn, locale=locale)
+
+    def test_builder_shares_values(self, conn):
+        table = StringTable()
+        schemas = build_all(conn, strings=table)
+        bundle_ids = [s['app']['bundle_id'] for s in schemas if s['app']['bundle_id'] == 'com.apple.shortcuts']
+        assert len(bundle_ids) > 1
+        assert all(bundle_id is table.intern('com.apple.shortcuts') for bundle_id in bundle_ids)
+
+    def test_builder_shares_type_info_strings(self, conn):
+        # Different BLOBs, so each parameter gets its own analysis
+        conn.execute("UPDATE Parameters SET typeInstance = ?", (type_instance(b'public.image', 1),))
+        conn.execute("UPDATE Parameters SET typeInstance = ? WHERE rowid = 1", (type_instance(b'public.image', 2),))
+        table = StringTable()
+        schemas = build_all(conn, include_protobuf=True, strings=table)
+        assert schemas == build_all(conn, include_protobuf=True)
+        type_infos = [p['type_info'] for s in schemas for p in s['parameters']]
+        utis = [uti for type_info in type_infos for uti in type_info['uti_types']]
+        assert len({id(type_info) for type_info in type_infos}) > 1 and len(utis) > 1
+        assert all(uti is table.intern('public.image') for uti in utis)
+        assert all(s is table.intern(s) for type_info in type_infos for s in type_info['strings'])
+
+
+class TestDictionaryEncoding:
+    """Test that encoded documents decode to the original records"""
+
+    @pytest.mark.parametrize('kwargs', [
+        {},
+        {'locale': ('fr', 'de', 'en')},
+        {'fields': parse_field_selection('ids,parameters.key')},
+    ])
+    def test_round_trip(self, conn, kwargs):
+        schemas = build_all(conn, **kwargs)
+        document = json.loads(json.dumps(encode_records(schemas)))
+        assert decode_records(document) == schemas
+
+    def test_strings_stored_once(self, conn):
+        document = encode_records(build_all(conn))
+        assert len(document['strings']) == len(set(document['strings']))
+        encoded = next(r for r in document['records'] if r['id'] == 'com.apple.notes.create')
+        assert document['strings'][encoded['app']['bundle_id']] == 'com.apple.shortcuts'
+        # Fields outside the encoded paths keep their values
+        assert isinstance(encoded['id'], str)
+
+    def test_file(self, conn, tmp_path):
+        schemas = build_all(conn)
+        path = str(tmp_path / 'actions_complete.dict.json')
+        count, _ = write_dictionary_encoded(schemas, path)
+        assert count == len(schemas)
+        assert load_dictionary_encoded(path) == schemas
+
+    def test_rejects_other_documents(self):
+        with pytest.raises(ValueError):
+            decode_records({'records': []})
+        with pytest.raises(ValueError):
+            decode_records({'format': 'dictionary', 'version': 99, 'fields': [], 'strings': [], 'records': []})
@@ -0,0 +1,66 @@
+"""Tests for the persistent validation cache"""
+
+import json
+import sqlite3
+
+from utils.validation_cache import ValidationCache, default_cache_path, input_hash
+from utils.validators import generate_validation_report, validate_action_schema
+
+
+SCHEMAS = [
+    {'id': 'is.workflow.actions.a', 'name': 'ACTION_TITLE', 'parameters': [{'key': 'p', 'name': 'Input'}]},
+    {'id': 'is.workflow.actions.b', 'name': 'Show Alert', 'categories': ['Scripting'], 'type_info': {'hex': '0a01'}},
+]
+
+
+class TestValidationCache:
+    """Test result reuse and invalidation"""
+
+    def test_reuses_results(self, tmp_path):
+        path = str(tmp_path / 'actions_complete.validation.sqlite')
+        with ValidationCache(path) as cache:
+            first = [cache.validate(schema) for schema in SCHEMAS]
+            assert (cache.hits, cache.misses) == (0, 2)
+
+        with ValidationCache(path) as cache:
+            second = [cache.validate(schema) for schema in SCHEMAS]
+            assert (cache.hits, cache.misses) == (2, 0)
+        assert first == second == [validate_action_schema(schema) for schema in SCHEMAS]
+
+    def test_input_hash_ignores_unvalidated_fields(self):
+        """Should only depend on what validate_action_schema() reads"""
+        schema = SCHEMAS[1]
+        assert input_hash(schema) == input_hash(dict(schema, id='other', type_info={}))
+        assert input_hash(schema) != input_hash(dict(schema, name='Show Alerts'))
+        assert input_hash(schema) != input_hash(dict(schema, categories=[]))
+
+    def test_validator_version_change(self, tmp_path):
+        """Should discard results of a different validator version"""
+        path = str(tmp_path / 'cache.sqlite')
+        with ValidationCache(path, version='1') as cache:
+            cache.validate(SCHEMAS[0])
+        with ValidationCache(path, version='2') as cache:
+            assert len(cache) == 0
+            cache.validate(SCHEMAS[0])
+            assert cache.misses == 1
+
+    def test_prunes_unused_results(self, tmp_path):
+        path = str(tmp_path / 'cache.sqlite')
+        with ValidationCache(path) as cache:
+            for schema in SCHEMAS:
+                cache.validate(schema)
+        with ValidationCache(path) as cache:
+            cache.validate(SCHEMAS[1])
+
+        count = sqlite3.connect(path).execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        assert count == 1
+
+    def test_report_unchanged(self, tmp_path):
+        path = str(tmp_path / 'cache.sqlite')
+        expected = json.dumps(generate_validation_report(SCHEMAS))
+        for _ in range(2):
+            with ValidationCache(path) as cache:
+                assert json.dumps(generate_validation_report(SCHEMAS, cache.validate)) == expected
+
+    def test_default_cache_path(self):
+        assert default_cache_path('output/actions_complete.json') == 'output/actions_complete.validation.sqlite'
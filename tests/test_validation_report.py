@@ -0,0 +1,100 @@
+"""Tests for the mergeable validation report"""
+
+import io
+import json
+
+import pytest
+
+from utils.json_stream import iter_json_array
+from utils.validate_pool import validate_output_file
+from utils.validators import ValidationReport, generate_validation_report
+
+
+def make_schema(index, poor=False):
+    """Action schema; poor ones have a localization key for every string"""
+    if poor:
+        return {
+            'id': f'is.workflow.actions.poor{index}',
+            'name': 'ACTION_TITLE',
+            'description_summary': 'ACTION_DESCRIPTION',
+            'parameters': [{'key': 'p', 'name': 'PARAM_TITLE', 'description': 'PARAM_DESCRIPTION'}] * 2,
+        }
+    return {
+        'id': f'is.workflow.actions.good{index}',
+        'name': f'Action {index}',
+        'description_summary': 'Does something useful',
+        'parameters': [{'key': 'p', 'name': 'Input', 'accepted_types': ['com.apple.Music.LibraryItemEntity']}],
+        'categories': ['Scripting'],
+    }
+
+
+SCHEMAS = [make_schema(index, poor=index % 3 == 0) for index in range(75)]
+
+
+class TestValidationReport:
+    """Test accumulating and merging reports"""
+
+    def test_report_contents(self):
+        report = generate_validation_report(SCHEMAS)
+        assert report['total_schemas'] == 75
+        assert report['schemas_with_issues'] == 25
+        assert report['quality_scores']['poor'] == 25
+        assert report['warnings_by_type'] == {'complex_type': 50}
+        # Capped at the first 20 problematic actions, in input order
+        assert [action['id'] for action in report['problematic_actions']] == [
+            f'is.workflow.actions.poor{index}' for index in range(0, 60, 3)
+        ]
+
+    def test_merge_matches_sequential(self):
+        """Should give the same report however the input is split"""
+        expected = json.dumps(generate_validation_report(SCHEMAS))
+        for size in (1, 7, 40, 75):
+            parts = []
+            for start in range(0, len(SCHEMAS), size):
+                part = ValidationReport()
+                for schema in SCHEMAS[start:start + size]:
+                    part.add(schema)
+                parts.append(part)
+
+            merged = ValidationReport()
+            for part in parts:
+                merged = merged.merge(part)
+            assert json.dumps(merged.to_dict()) == expected
+
+    def test_merge_is_associative(self):
+        a, b, c = ValidationReport(), ValidationReport(), ValidationReport()
+        for report, schemas in ((a, SCHEMAS[:30]), (b, SCHEMAS[30:31]), (c, SCHEMAS[31:])):
+            for schema in schemas:
+                report.add(schema)
+        assert a.merge(b).merge(c).to_dict() == a.merge(b.merge(c)).to_dict()
+
+    def test_streamed_input(self):
+        """Should accept a record stream instead of a list"""
+        stream = io.StringIO(json.dumps(SCHEMAS, indent=2))
+        assert generate_validation_report(iter_json_array(stream, 128)) == generate_validation_report(SCHEMAS)
+
+    def test_empty(self):
+        report = generate_validation_report([])
+        assert report['total_schemas'] == 0
+        assert report['average_quality'] == 0.0
+
+
+class TestParallelValidation:
+    """Test validation across worker processes"""
+
+    @pytest.mark.parametrize('workers,chunk_size', [(1, None), (2, None), (3, 7), (4, 1)])
+    def test_independent_of_workers(self, tmp_path, workers, chunk_size):
+        """Should give the sequential report for any worker count and chunking"""
+        path = tmp_path / 'actions_complete.json'
+        path.write_text(json.dumps(SCHEMAS), encoding='utf-8')
+        report = validate_output_file(str(path), workers, chunk_size)
+        assert json.dumps(report) == json.dumps(generate_validation_report(SCHEMAS))
+
+    @pytest.mark.parametrize('workers,chunk_size', [(1, None), (2, None), (3, 2)])
+    def test_streamed(self, tmp_path, workers, chunk_size):
+        """Should give the same report when streaming the file instead of caching it"""
+        path = tmp_path / 'actions_complete.json'
+        path.write_text(json.dumps(SCHEMAS), encoding='utf-8')
+        report = validate_output_file(str(path), workers, chunk_size, use_cache=False)
+        assert json.dumps(report) == json.dumps(generate_validation_report(SCHEMAS))
+        assert not (tmp_path / 'actions_complete.json.cache').exists()
@@ -0,0 +1,31 @@
+"""Helpers for building protobuf wire-format test BLOBs"""
+
+
+def varint(n):
+    """Encode an unsigned varint"""
+    out = bytearray()
+    while True:
+        b = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(b | 0x80)
+        else:
+            out.append(b)
+            return bytes(out)
+
+
+def field(number, wire_type, payload):
+    """Encode one varint (wire type 0) or length-delimited (wire type 2) field"""
+    tag = varint((number << 3) | wire_type)
+    if wire_type == 0:
+        return tag + varint(payload)
+    return tag + varint(len(payload)) + payload
+
+
+def type_instance(uti, *extras):
+    """Build a typeInstance-shaped BLOB with optional repeated field 5 values"""
+    inner = field(1, 2, uti) + field(3, 0, 7)
+    blob = field(3, 2, field(1, 2, inner) + field(4, 2, b'\xff\xfe\x01'))
+    for value in extras:
+        blob += field(5, 0, value)
+    return blob
@@ -0,0 +1,311 @@
+"""Content-addressed catalog of the protobuf BLOBs in every BLOB column
+
+The same payload is stored many times over: thousands of parameters share a
+handful of typeInstance BLOBs, and some payloads appear in more than one
+column. BlobCatalog hashes every BLOB of every column once, keeps each
+distinct payload a single time under its digest and records which rows
+reference it. Decoders then run once per payload (and per analyzer), and the
+reference lists give usage counts and cross-column reuse for free.
+
+Sidecar layout (see BlobCatalog.save()):
+    payloads  (digest, size, blob)                    one row per distinct BLOB
+    blob_refs (digest, column_name, ref_id, ref_key)  rows holding each BLOB
+    analyses  (digest, kind, analysis)                analyzer output as JSON
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .db_utils import get_blob_references, BLOB_COLUMNS
+from .decode_pool import decode_unique_blobs
+
+
+# Analyzer (see decode_pool.ANALYZERS) that fits each column's contents
+COLUMN_ANALYZERS: Dict[str, str] = {
+    'Parameters.typeInstance': 'type_instance',
+    'Parameters.relationships': 'raw',
+    'Tools.requirements': 'requirements',
+    'Tools.outputTypeInstance': 'raw',
+    'Types.runtimeRequirements': 'requirements',
+    'TypeCoercions.coercionDefinition': 'coercion',
+}
+
+CATALOG_SCHEMA = """
+    CREATE TABLE payloads (digest TEXT PRIMARY KEY, size INTEGER, blob BLOB);
+    CREATE TABLE blob_refs (digest TEXT, column_name TEXT, ref_id TEXT, ref_key TEXT);
+    CREATE TABLE analyses (digest TEXT, kind TEXT, analysis TEXT, PRIMARY KEY (digest, kind));
+    CREATE INDEX idx_blob_refs_digest ON blob_refs(digest, column_name);
+"""
+
+# A reference is (column, ref_id, ref_key, digest); see db_utils.get_blob_references()
+Reference = Tuple[str, str, Optional[str], str]
+
+
+def blob_digest(blob: bytes) -> str:
+    """Content address of a BLOB (128-bit BLAKE2b, hex)"""
+    return hashlib.blake2b(blob, digest_size=16).hexdigest()
+
+
+class BlobCatalog:
+    """
+    Distinct BLOB payloads keyed by digest, with the rows referencing them.
+
+    Attributes:
+        payloads: digest -> BLOB, in first-seen order
+        references: every (column, ref_id, ref_key, digest), in load order
+        analyses: (kind, digest) -> analyzer output
+    """
+
+    def __init__(self):
+        self.payloads: Dict[str, bytes] = {}
+        self.references: List[Reference] = []
+        self.analyses: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._digests: Dict[bytes, str] = {}
+        self._by_digest: Dict[str, List[Reference]] = {}
+
+    @classmethod
+    def from_db(cls, conn: sqlite3.Connection, columns: Optional[Iterable[str]] = None) -> 'BlobCatalog':
+        """
+        Hash every non-empty BLOB of the given columns.
+
+        Args:
+            conn: Database connection
+            columns: BLOB columns to catalog (default: all of BLOB_COLUMNS)
+
+        Returns:
+            Populated catalog
+        """
+        catalog = cls()
+        for column in columns or BLOB_COLUMNS:
+            for ref_id, ref_key, blob in get_blob_references(conn, column):
+                catalog.add(column, ref_id, ref_key, blob)
+        return catalog
+
+    def add(self, column: str, ref_id: str, ref_key: Optional[str], blob: bytes) -> str:
+        """Record one row's BLOB and return its digest"""
+        digest = self._digests.get(blob)
+        if digest is None:
+            # Identical bytes only get hashed once per catalog
+            digest = self._digests[blob] = blob_digest(blob)
+            self.payloads[digest] = blob
+            self._by_digest[digest] = []
+
+        reference = (column, ref_id, ref_key, digest)
+        self.references.append(reference)
+        self._by_digest[digest].append(reference)
+        return digest
+
+    def subset(self, columns: Iterable[str]) -> 'BlobCatalog':
+        """
+        Catalog of only some columns' references, without hashing again.
+
+        The subset holds the payloads those references point at, in the
+        order from_db() would give, and shares self.analyses, so analyses
+        run on either catalog are visible to both.
+        """
+        subset = BlobCatalog()
+        subset.analyses = self.analyses
+        for column in columns:
+            for reference in self.references:
+                if reference[0] != column:
+                    continue
+                digest = reference[3]
+                if digest not in subset.payloads:
+                    blob = self.payloads[digest]
+                    subset.payloads[digest] = blob
+                    subset._digests[blob] = digest
+                    subset._by_digest[digest] = []
+                subset.references.append(reference)
+                subset._by_digest[digest].append(reference)
+        return subset
+
+    def __len__(self) -> int:
+        return len(self.payloads)
+
+    def digests(self, column: Optional[str] = None) -> List[str]:
+        """Distinct digests (of one column), in first-seen order"""
+        if column is None:
+            return list(self.payloads)
+        return list(dict.fromkeys(ref[3] for ref in self.references if ref[0] == column))
+
+    def references_to(self, digest: str, column: Optional[str] = None) -> List[Reference]:
+        """Rows referencing a payload (optionally only from one column)"""
+        refs = self._by_digest.get(digest, [])
+        if column is None:
+            return list(refs)
+        return [ref for ref in refs if ref[0] == column]
+
+    def ranked_digests(self, column: str) -> List[Tuple[str, int]]:
+        """Digests of a column with their usage counts, most used first"""
+        counts: Dict[str, int] = {}
+        for ref in self.references:
+            if ref[0] == column:
+                counts[ref[3]] = counts.get(ref[3], 0) + 1
+        return sorted(counts.items(), key=lambda item: -item[1])
+
+    def analyze(
+        self,
+        columns: Optional[Iterable[str]] = None,
+        workers: int = 1,
+        digests: Optional[Iterable[str]] = None,
+    ) -> None:
+        """
+        Run each column's analyzer once per distinct payload.
+
+        A payload shared by two columns with the same analyzer is decoded
+        once; results land in self.analyses under (kind, digest).
+
+        Args:
+            columns: Columns to analyze (default: every column in the catalog)
+            workers: Worker processes for decoding (see decode_pool)
+            digests: Restrict to these payloads
+        """
+        wanted = set(digests) if digests is not None else None
+        pending: Dict[str, Dict[str, None]] = {}
+
+        for column in columns or dict.fromkeys(ref[0] for ref in self.references):
+            kind = COLUMN_ANALYZERS[column]
+            for digest in self.digests(column):
+                if (kind, digest) in self.analyses or (wanted is not None and digest not in wanted):
+                    continue
+                pending.setdefault(kind, {})[digest] = None
+
+        for kind, kind_digests in pending.items():
+            results = decode_unique_blobs([self.payloads[d] for d in kind_digests], kind, workers)
+            for digest in kind_digests:
+                self.analyses[(kind, digest)] = results[self.payloads[digest]]
+
+    def analysis(self, digest: str, column: str) -> Optional[Dict[str, Any]]:
+        """A payload's analysis with the analyzer of the given column (None if not run)"""
+        return self.analyses.get((COLUMN_ANALYZERS[column], digest))
+
+    def reuse_stats(self) -> Dict[str, Any]:
+        """
+        Summarize how much the payloads are reused.
+
+        Returns:
+            Dictionary with overall and per-column reference/payload counts and
+            byte totals, plus the payloads shared between columns
+        """
+        columns: Dict[str, Dict[str, Any]] = {}
+        columns_by_digest: Dict[str, List[str]] = {}
+
+        for column, _, _, digest in self.references:
+            size = len(self.payloads[digest])
+            stats = columns.setdefault(column, {'references': 0, 'unique_payloads': 0, 'total_bytes': 0, 'unique_bytes': 0})
+            stats['references'] += 1
+            stats['total_bytes'] += size
+
+            seen_in = columns_by_digest.setdefault(digest, [])
+            if column not in seen_in:
+                seen_in.append(column)
+                stats['unique_payloads'] += 1
+                stats['unique_bytes'] += size
+
+        shared_between: Dict[str, int] = {}
+        for seen_in in columns_by_digest.values():
+            if len(seen_in) > 1:
+                label = ' + '.join(sorted(seen_in))
+                shared_between[label] = shared_between.get(label, 0) + 1
+
+        return {
+            'references': len(self.references),
+            'unique_payloads': len(self.payloads),
+            'total_bytes': sum(stats['total_bytes'] for stats in columns.values()),
+            'unique_bytes': sum(len(blob) for blob in self.payloads.values()),
+            'columns': columns,
+            'shared_payloads': sum(shared_between.values()),
+            'shared_between': shared_between,
+        }
+
+    def save(self, path: str) -> None:
+        """
+        Write the catalog to a sidecar SQLite database, replacing it.
+
+        Args:
+            path: Sidecar database path
+        """
+        if os.path.exists(path):
+            os.remove(path)
+
+        conn = sqlite3.connect(path)
+        with conn:
+            conn.executescript(CATALOG_SCHEMA)
+            conn.executemany(
+                "INSERT INTO payloads VALUES (?, ?, ?)",
+                [(digest, len(blob), blob) for digest, blob in self.payloads.items()],
+            )
+            conn.executemany(
+                "INSERT INTO blob_refs VALUES (?, ?, ?, ?)",
+                [(digest, column, ref_id, ref_key) for column, ref_id, ref_key, digest in self.references],
+            )
+            conn.executemany(
+                "INSERT INTO analyses VALUES (?, ?, ?)",
+                [
+                    (digest, kind, json.dumps(analysis, default=str))
+                    for (kind, digest), analysis in self.analyses.items()
+                ],
+            )
+        conn.close()
+
+    @classmethod
+    def load(cls, path: str) -> 'BlobCatalog':
+        """
+        Read a catalog written by save().
+
+        Args:
+            path: Sidecar database path
+
+        Returns:
+            Catalog with payloads, references and stored analyses
+        """
+        conn = sqlite3.connect(path)
+        catalog = cls()
+
+        for digest, blob in conn.execute("SELECT digest, blob FROM payloads ORDER BY rowid"):
+            blob = bytes(blob)
+            catalog.payloads[digest] = blob
+            catalog._digests[blob] = digest
+            catalog._by_digest[digest] = []
+
+        for digest, column, ref_id, ref_key in conn.execute(
+            "SELECT digest, column_name, ref_id, ref_key FROM blob_refs ORDER BY rowid"
+        ):
+            reference = (column, ref_id, ref_key, digest)
+            catalog.references.append(reference)
+            catalog._by_digest[digest].append(reference)
+
+        for digest, kind, analysis in conn.execute("SELECT digest, kind, analysis FROM analyses"):
+            catalog.analyses[(kind, digest)] = json.loads(analysis)
+
+        conn.close()
+        return catalog
+
+
+def format_reuse_stats(stats: Dict[str, Any]) -> str:
+    """
+    Format BlobCatalog.reuse_stats() for human-readable display.
+
+    Args:
+        stats: Reuse statistics
+
+    Returns:
+        Formatted string
+    """
+    lines = [
+        f"{stats['references']} BLOB references -> {stats['unique_payloads']} unique payloads "
+        f"({stats['total_bytes']:,} -> {stats['unique_bytes']:,} bytes)"
+    ]
+    for column, column_stats in stats['columns'].items():
+        lines.append(
+            f"  {column:34s} {column_stats['references']:7d} refs  {column_stats['unique_payloads']:6d} unique  "
+            f"{column_stats['total_bytes']:>10,} -> {column_stats['unique_bytes']:,} bytes"
+        )
+    if stats['shared_between']:
+        lines.append(f"  {stats['shared_payloads']} payloads appear in more than one column:")
+        for label, count in sorted(stats['shared_between'].items(), key=lambda item: -item[1]):
+            lines.append(f"    {count:6d}  {label}")
+    return '\n'.join(lines)
@@ -0,0 +1,246 @@
+"""Structural clustering of protobuf BLOBs by field signature
+
+Parameter typeInstance and requirements BLOBs come in a small number of
+shapes: the same field-number/wire-type layout with different payloads.
+This module fingerprints each BLOB by its (nested) tag sequence in one cheap
+pass, groups BLOBs with identical fingerprints, and runs the expensive string
+analysis (sanitizing, UTI detection) once per cluster for the parts that
+never change and once per distinct value for the parts that do.
+
+Corpus-wide decoding cost then scales with the number of shapes and distinct
+payloads rather than the number of rows.
+"""
+
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from .protobuf_parser import (
+    WIRE_LENGTH_DELIMITED,
+    iter_wire_fields,
+    is_text_payload,
+    is_wire_message,
+    extract_strings_from_blob,
+    is_uti_like,
+)
+
+
+# A leaf is a non-message field value: (path, wire_type, value)
+Leaf = Tuple[str, int, Any]
+
+MALFORMED_SIGNATURE = '!malformed'
+
+
+def _flatten(data: bytes, path: str, depth: int, max_depth: int, leaves: List[Leaf]) -> str:
+    """Collect leaves of a message and return its signature string"""
+    parts = []
+    for number, wire_type, value in iter_wire_fields(data):
+        field_path = f"{path}.{number}" if path else str(number)
+        if (
+            wire_type == WIRE_LENGTH_DELIMITED
+            and depth < max_depth
+            and not is_text_payload(value)
+            and is_wire_message(value)
+        ):
+            nested = _flatten(value, field_path, depth + 1, max_depth, leaves)
+            parts.append(f"{number}:{wire_type}{{{nested}}}")
+        else:
+            parts.append(f"{number}:{wire_type}")
+            leaves.append((field_path, wire_type, value))
+    return ','.join(parts)
+
+
+def blob_signature(blob: bytes, max_depth: int = 4) -> Tuple[str, List[Leaf]]:
+    """
+    Fingerprint a BLOB by its tag sequence.
+
+    Length-delimited payloads that parse as messages are descended into (up
+    to max_depth), so BLOBs that wrap everything in one outer field still
+    separate by inner shape.
+
+    Args:
+        blob: Protobuf BLOB
+        max_depth: Maximum nesting depth to descend into
+
+    Returns:
+        Tuple of (signature, leaves). Signatures look like
+        '3:2{1:2{1:2,3:0},4:2}'; malformed BLOBs get MALFORMED_SIGNATURE and
+        a single leaf holding the whole BLOB.
+    """
+    leaves: List[Leaf] = []
+    try:
+        return _flatten(blob, '', 1, max_depth, leaves), leaves
+    except ValueError:
+        return MALFORMED_SIGNATURE, [('', WIRE_LENGTH_DELIMITED, blob)]
+
+
+def _leaf_labels(leaves: List[Leaf]) -> List[str]:
+    """Label leaves by path, disambiguating repeated fields with #N"""
+    totals = Counter(path for path, _, _ in leaves)
+    seen = Counter()
+    labels = []
+    for path, _, _ in leaves:
+        if totals[path] > 1:
+            labels.append(f"{path}#{seen[path]}")
+            seen[path] += 1
+        else:
+            labels.append(path)
+    return labels
+
+
+def _display_value(wire_type: int, value: Any) -> Any:
+    """JSON-friendly form of a leaf value"""
+    if isinstance(value, int):
+        return value
+    if wire_type == WIRE_LENGTH_DELIMITED and is_text_payload(value):
+        return bytes(value).decode('utf-8')
+    return bytes(value).hex()
+
+
+class _PayloadAnalyzer:
+    """Memoized string/UTI extraction for leaf payloads"""
+
+    def __init__(self):
+        self.cache: Dict[bytes, Dict[str, List[str]]] = {}
+        self.calls = 0
+
+    def analyze(self, values: List[Any]) -> Dict[str, List[str]]:
+        strings: List[str] = []
+        for value in values:
+            if isinstance(value, int):
+                continue
+            value = bytes(value)
+            if value not in self.cache:
+                self.calls += 1
+                self.cache[value] = extract_strings_from_blob(value)
+            for s in self.cache[value]:
+                if s not in strings:
+                    strings.append(s)
+        return {
+            'strings': strings,
+            'uti_types': [s for s in strings if is_uti_like(s)],
+        }
+
+
+def cluster_blobs(blobs: List[bytes], max_depth: int = 4) -> Dict[str, Any]:
+    """
+    Group BLOBs by signature and analyze each cluster's template once.
+
+    Args:
+        blobs: BLOBs to cluster (index positions are used as member ids)
+        max_depth: Maximum nesting depth for signatures
+
+    Returns:
+        Dictionary with:
+            - clusters: list sorted by size (largest first), each with
+              signature, size, member indices, constant/variable field
+              labels, the template analysis and per-member analyses of the
+              variable fields
+            - total_blobs: number of BLOBs clustered
+            - analysis_calls: expensive string extractions performed
+    """
+    groups: Dict[str, List[Tuple[int, List[Leaf]]]] = {}
+    for index, blob in enumerate(blobs):
+        signature, leaves = blob_signature(bytes(blob), max_depth)
+        groups.setdefault(signature, []).append((index, leaves))
+
+    analyzer = _PayloadAnalyzer()
+    clusters = []
+
+    for signature, members in groups.items():
+        first_leaves = members[0][1]
+        labels = _leaf_labels(first_leaves)
+
+        # A leaf position is constant when every member carries the same value
+        if signature == MALFORMED_SIGNATURE:
+            constant = [False]
+        else:
+            constant = [
+                all(leaves[i][2] == first_leaves[i][2] for _, leaves in members)
+                for i in range(len(first_leaves))
+            ]
+
+        template_values = [leaf[2] for leaf, fixed in zip(first_leaves, constant) if fixed]
+        template = analyzer.analyze(template_values)
+        template['values'] = {
+            label: _display_value(leaf[1], leaf[2])
+            for label, leaf, fixed in zip(labels, first_leaves, constant) if fixed
+        }
+
+        variable_labels = [label for label, fixed in zip(labels, constant) if not fixed]
+        member_results = []
+        for index, leaves in members:
+            variable = [leaf for leaf, fixed in zip(leaves, constant) if not fixed]
+            result = {'index': index}
+            result.update(analyzer.analyze([leaf[2] for leaf in variable]))
+            result['values'] = {
+                label: _display_value(leaf[1], leaf[2])
+                for label, leaf in zip(variable_labels, variable)
+            }
+            member_results.append(result)
+
+        clusters.append({
+            'signature': signature,
+            'size': len(members),
+            'constant_fields': [label for label, fixed in zip(labels, constant) if fixed],
+            'variable_fields': variable_labels,
+            'template': template,
+            'members': member_results,
+        })
+
+    clusters.sort(key=lambda c: (-c['size'], c['signature']))
+
+    return {
+        'clusters': clusters,
+        'total_blobs': len(blobs),
+        'analysis_calls': analyzer.calls,
+    }
+
+
+def member_analysis(cluster: Dict[str, Any], member: Dict[str, Any]) -> Dict[str, List[str]]:
+    """
+    Combine a cluster template with one member's variable-field analysis.
+
+    Args:
+        cluster: Cluster from cluster_blobs()
+        member: One of the cluster's members
+
+    Returns:
+        Dictionary with the member's strings and uti_types
+    """
+    strings = list(cluster['template']['strings'])
+    for s in member['strings']:
+        if s not in strings:
+            strings.append(s)
+    return {
+        'strings': strings,
+        'uti_types': [s for s in strings if is_uti_like(s)],
+    }
+
+
+def format_cluster_report(result: Dict[str, Any], limit: Optional[int] = None) -> str:
+    """
+    Format cluster sizes for human-readable display.
+
+    Args:
+        result: Result of cluster_blobs()
+        limit: Show at most this many clusters
+
+    Returns:
+        Formatted string
+    """
+    clusters = result['clusters']
+    lines = [
+        f"{result['total_blobs']} BLOBs in {len(clusters)} clusters "
+        f"({result['analysis_calls']} string analyses)"
+    ]
+    for cluster in clusters[:limit]:
+        signature = cluster['signature']
+        if len(signature) > 60:
+            signature = signature[:60] + "..."
+        lines.append(
+            f"  {cluster['size']:6d}  {signature}  "
+            f"({len(cluster['variable_fields'])} variable / {len(cluster['constant_fields'])} constant fields)"
+        )
+        if cluster['template']['uti_types']:
+            lines.append(f"          template UTIs: {', '.join(cluster['template']['uti_types'])}")
+    return '\n'.join(lines)
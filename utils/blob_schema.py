@@ -0,0 +1,396 @@
+"""Schema inference and compiled decoders for protobuf BLOB columns
+
+decode_protobuf_blob() looks at every BLOB in isolation: repeated fields
+overwrite each other and nested messages are left as hex. The BLOBs of one
+column share a message type, though, so sampling the whole column gives a
+stable schema. This module infers that schema as a JSON-serialisable
+descriptor and compiles a decoder specialised for it.
+
+Descriptor format:
+    {
+        'name': 'Parameters.typeInstance',
+        'samples': 4512,
+        'malformed': 0,
+        'fields': {
+            '3': {
+                'number': 3,
+                'wire_type': 2,
+                'kind': 'message',      # varint/fixed64/fixed32/string/bytes/message
+                'repeated': False,
+                'presence': 1.0,        # fraction of messages containing the field
+                'message': {'fields': {...}},
+            },
+        },
+    }
+"""
+
+import struct
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .protobuf_parser import (
+    WIRE_VARINT,
+    WIRE_64BIT,
+    WIRE_LENGTH_DELIMITED,
+    WIRE_32BIT,
+    read_varint,
+    iter_wire_fields,
+    is_text_payload,
+    is_wire_message,
+    decode_protobuf_blob,
+)
+
+try:
+    from google.protobuf import descriptor_pb2
+    PROTOBUF_AVAILABLE = True
+except ImportError:
+    PROTOBUF_AVAILABLE = False
+
+
+# Kind used for each wire type when the payload needs no classification
+_FIXED_KINDS = {
+    WIRE_VARINT: 'varint',
+    WIRE_64BIT: 'fixed64',
+    WIRE_32BIT: 'fixed32',
+}
+
+
+def _classify_payloads(payloads: List[Any], allow_message: bool) -> str:
+    """Pick string, message or bytes for every payload seen for one field"""
+    non_empty = [p for p in payloads if len(p)]
+    if not non_empty:
+        return 'bytes'
+    if all(is_text_payload(p) for p in non_empty):
+        return 'string'
+    if allow_message and all(is_wire_message(p) for p in non_empty):
+        return 'message'
+    return 'bytes'
+
+
+def _infer_level(messages: List[Any], depth: int, max_depth: int) -> Dict[str, Any]:
+    """Infer the fields of one message level from well-formed samples"""
+    stats: Dict[int, Dict[str, Any]] = {}
+
+    for message in messages:
+        counts = Counter()
+        for number, wire_type, value in iter_wire_fields(message):
+            field_stats = stats.setdefault(number, {
+                'wire_types': Counter(),
+                'messages': 0,
+                'max_count': 0,
+                'payloads': [],
+            })
+            field_stats['wire_types'][wire_type] += 1
+            if wire_type == WIRE_LENGTH_DELIMITED:
+                field_stats['payloads'].append(value)
+            counts[number] += 1
+
+        for number, count in counts.items():
+            stats[number]['messages'] += 1
+            stats[number]['max_count'] = max(stats[number]['max_count'], count)
+
+    fields = {}
+    for number in sorted(stats):
+        field_stats = stats[number]
+        wire_type = field_stats['wire_types'].most_common(1)[0][0]
+
+        entry = {
+            'number': number,
+            'wire_type': wire_type,
+            'kind': _FIXED_KINDS.get(wire_type),
+            'repeated': field_stats['max_count'] > 1,
+            'presence': round(field_stats['messages'] / len(messages), 4) if messages else 0.0,
+        }
+
+        conflicts = sorted(w for w in field_stats['wire_types'] if w != wire_type)
+        if conflicts:
+            entry['conflicting_wire_types'] = conflicts
+
+        if wire_type == WIRE_LENGTH_DELIMITED:
+            entry['kind'] = _classify_payloads(field_stats['payloads'], depth < max_depth)
+            if entry['kind'] == 'message':
+                nested = [p for p in field_stats['payloads'] if len(p)]
+                entry['message'] = _infer_level(nested, depth + 1, max_depth)
+
+        fields[str(number)] = entry
+
+    return {'fields': fields}
+
+
+def infer_message_schema(
+    blobs: Iterable[bytes],
+    name: str = 'Blob',
+    max_depth: int = 8,
+    sample_size: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Infer a message schema from the BLOBs of one column.
+
+    Args:
+        blobs: BLOBs of a single column
+        name: Descriptor name (e.g. 'Parameters.typeInstance')
+        max_depth: Maximum nesting depth to explore
+        sample_size: Only sample the first N BLOBs (None = all)
+
+    Returns:
+        Descriptor dictionary (see module docstring)
+    """
+    samples = []
+    malformed = 0
+
+    for blob in blobs:
+        if sample_size is not None and len(samples) + malformed >= sample_size:
+            break
+        if not blob:
+            continue
+        blob = bytes(blob)
+        if is_wire_message(blob):
+            samples.append(memoryview(blob))
+        else:
+            malformed += 1
+
+    descriptor = {
+        'name': name,
+        'samples': len(samples),
+        'malformed': malformed,
+    }
+    descriptor.update(_infer_level(samples, 1, max_depth))
+    return descriptor
+
+
+def _skip_unknown(data: bytes, pos: int, tag: int, out: Dict[str, Any]) -> int:
+    """Consume a field the schema does not describe, recording it under '_unknown'"""
+    number = tag >> 3
+    wire_type = tag & 0x07
+
+    if wire_type == WIRE_VARINT:
+        value, pos = read_varint(data, pos)
+    elif wire_type == WIRE_LENGTH_DELIMITED:
+        length, pos = read_varint(data, pos)
+        if pos + length > len(data):
+            raise ValueError("Length-delimited field overruns buffer")
+        value = data[pos:pos + length].hex()
+        pos += length
+    elif wire_type in (WIRE_64BIT, WIRE_32BIT):
+        size = 8 if wire_type == WIRE_64BIT else 4
+        if pos + size > len(data):
+            raise ValueError("Truncated fixed-width field")
+        value = data[pos:pos + size].hex()
+        pos += size
+    else:
+        raise ValueError(f"Unsupported wire type {wire_type}")
+
+    out.setdefault('_unknown', []).append({
+        'field': number,
+        'wire_type': wire_type,
+        'value': value,
+    })
+    return pos
+
+
+class _DecoderCompiler:
+    """Generates Python source for one decode function per message level"""
+
+    def __init__(self):
+        self.functions: List[str] = []
+
+    def emit(self, message: Dict[str, Any]) -> str:
+        name = f"_decode_{len(self.functions)}"
+        self.functions.append('')  # reserve the slot before nested messages
+        index = len(self.functions) - 1
+
+        lines = [
+            f"def {name}(data):",
+            "    out = {}",
+            "    pos = 0",
+            "    end = len(data)",
+            "    while pos < end:",
+            "        tag = data[pos]",
+            "        pos += 1",
+            "        if tag & 0x80:",
+            "            tag, pos = _read_varint(data, pos - 1)",
+        ]
+
+        keyword = 'if'
+        for key, field in message.get('fields', {}).items():
+            tag = (field['number'] << 3) | field['wire_type']
+            lines.append(f"        {keyword} tag == {tag}:")
+            lines.extend(self._read_value(field))
+            out_key = f"field_{key}"
+            if field['repeated']:
+                lines.append(f"            if {out_key!r} in out:")
+                lines.append(f"                out[{out_key!r}].append(value)")
+                lines.append("            else:")
+                lines.append(f"                out[{out_key!r}] = [value]")
+            else:
+                lines.append(f"            out[{out_key!r}] = value")
+            keyword = 'elif'
+
+        if keyword == 'if':
+            lines.append("        pos = _skip_unknown(data, pos, tag, out)")
+        else:
+            lines.append("        else:")
+            lines.append("            pos = _skip_unknown(data, pos, tag, out)")
+        lines.append("    return out")
+
+        self.functions[index] = '\n'.join(lines)
+        return name
+
+    def _read_value(self, field: Dict[str, Any]) -> List[str]:
+        kind = field['kind']
+        indent = ' ' * 12
+
+        if kind == 'varint':
+            return [f"{indent}value, pos = _read_varint(data, pos)"]
+        if kind == 'fixed64':
+            return [
+                f"{indent}if pos + 8 > end:",
+                f"{indent}    raise ValueError('Truncated 64-bit field')",
+                f"{indent}value = _unpack_double(data, pos)[0]",
+                f"{indent}pos += 8",
+            ]
+        if kind == 'fixed32':
+            return [
+                f"{indent}if pos + 4 > end:",
+                f"{indent}    raise ValueError('Truncated 32-bit field')",
+                f"{indent}value = _unpack_float(data, pos)[0]",
+                f"{indent}pos += 4",
+            ]
+
+        lines = [
+            f"{indent}length, pos = _read_varint(data, pos)",
+            f"{indent}if pos + length > end:",
+            f"{indent}    raise ValueError('Length-delimited field overruns buffer')",
+        ]
+        payload = "data[pos:pos + length]"
+        if kind == 'string':
+            lines.append(f"{indent}value = {payload}.decode('utf-8', 'replace')")
+        elif kind == 'message':
+            nested = self.emit(field['message'])
+            lines.append(f"{indent}value = {nested}({payload})")
+        else:
+            lines.append(f"{indent}value = {payload}.hex()")
+        lines.append(f"{indent}pos += length")
+        return lines
+
+
+def compile_decoder(descriptor: Dict[str, Any]) -> Callable[[bytes], Dict[str, Any]]:
+    """
+    Compile a decoder specialised for an inferred schema.
+
+    The decoder dispatches on precomputed tag values, so it does no
+    per-field guessing. Repeated fields decode to lists, nested messages
+    to dictionaries and fields the schema does not know about are kept
+    under '_unknown'.
+
+    Args:
+        descriptor: Descriptor from infer_message_schema()
+
+    Returns:
+        Function taking a BLOB and returning {'field_N': value, ...};
+        raises ValueError on malformed input. The generated source is
+        available as the function's `source` attribute.
+    """
+    compiler = _DecoderCompiler()
+    root = compiler.emit(descriptor)
+    source = '\n\n\n'.join(compiler.functions)
+
+    namespace = {
+        '_read_varint': read_varint,
+        '_skip_unknown': _skip_unknown,
+        '_unpack_double': struct.Struct('<d').unpack_from,
+        '_unpack_float': struct.Struct('<f').unpack_from,
+    }
+    exec(compile(source, f"<blob decoder {descriptor.get('name', 'Blob')}>", 'exec'), namespace)
+    decode_message = namespace[root]
+
+    def decode(blob: bytes) -> Dict[str, Any]:
+        return decode_message(bytes(blob))
+
+    decode.source = source
+    return decode
+
+
+def decode_column(blobs: Iterable[bytes], decoder: Callable[[bytes], Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Decode every BLOB of a column with a compiled decoder.
+
+    BLOBs the decoder rejects fall back to decode_protobuf_blob() with the
+    error recorded under 'parse_error'.
+
+    Args:
+        blobs: BLOBs to decode
+        decoder: Function from compile_decoder()
+
+    Returns:
+        List of decoded messages aligned with blobs
+    """
+    results = []
+    for blob in blobs:
+        try:
+            results.append(decoder(blob))
+        except (ValueError, IndexError) as e:
+            fallback = decode_protobuf_blob(bytes(blob))
+            fallback['parse_error'] = str(e)
+            results.append(fallback)
+    return results
+
+
+def to_file_descriptor_proto(descriptor: Dict[str, Any], message_name: str = 'Blob', package: str = 'shortcuts.inferred'):
+    """
+    Convert an inferred schema to a protobuf FileDescriptorProto.
+
+    The serialized result can be used with `protoc --decode` or loaded into
+    a descriptor pool. Requires the `protobuf` package.
+
+    Args:
+        descriptor: Descriptor from infer_message_schema()
+        message_name: Name of the top-level message
+        package: Proto package name
+
+    Returns:
+        google.protobuf.descriptor_pb2.FileDescriptorProto
+
+    Raises:
+        ImportError: If protobuf is not installed
+    """
+    if not PROTOBUF_AVAILABLE:
+        raise ImportError("protobuf is required for descriptor export: pip install protobuf")
+
+    field_types = {
+        'varint': descriptor_pb2.FieldDescriptorProto.TYPE_UINT64,
+        'fixed64': descriptor_pb2.FieldDescriptorProto.TYPE_DOUBLE,
+        'fixed32': descriptor_pb2.FieldDescriptorProto.TYPE_FLOAT,
+        # Strings are declared as bytes so non-UTF-8 outliers still parse
+        'string': descriptor_pb2.FieldDescriptorProto.TYPE_BYTES,
+        'bytes': descriptor_pb2.FieldDescriptorProto.TYPE_BYTES,
+        'message': descriptor_pb2.FieldDescriptorProto.TYPE_MESSAGE,
+    }
+
+    def fill(message_proto, message: Dict[str, Any], type_path: str):
+        for key, field in message.get('fields', {}).items():
+            field_proto = message_proto.field.add()
+            field_proto.name = f"field_{key}"
+            field_proto.number = field['number']
+            field_proto.type = field_types[field['kind']]
+            field_proto.label = (
+                descriptor_pb2.FieldDescriptorProto.LABEL_REPEATED if field['repeated']
+                else descriptor_pb2.FieldDescriptorProto.LABEL_OPTIONAL
+            )
+            if field['kind'] == 'message':
+                nested_name = f"Field{key}"
+                nested_proto = message_proto.nested_type.add()
+                nested_proto.name = nested_name
+                fill(nested_proto, field['message'], f"{type_path}.{nested_name}")
+                field_proto.type_name = f"{type_path}.{nested_name}"
+
+    file_proto = descriptor_pb2.FileDescriptorProto()
+    file_proto.name = f"{package.replace('.', '/')}/{message_name.lower()}.proto"
+    file_proto.package = package
+    file_proto.syntax = 'proto2'
+
+    message_proto = file_proto.message_type.add()
+    message_proto.name = message_name
+    fill(message_proto, descriptor, f".{package}.{message_name}")
+
+    return file_proto
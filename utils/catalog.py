@@ -0,0 +1,273 @@
+"""One database load shared by every analysis
+
+Each script used to open its own connection and re-run overlapping queries:
+the extractor fetched the hidden actions and decoded their BLOBs again after
+the --all pass, the type analyzer reconnected for usage counts, and every
+BLOB report re-hashed its column. A Catalog holds one connection and loads
+each part (actions, parameters, types, BLOB catalogs and analyses) on first
+use, a single time, with indexed accessors over the results.
+
+A Catalog also answers build_action_schema()'s lookups (see
+schema_builder.DatabaseLookups) from its bulk-loaded rows.
+
+Example:
+    with Catalog('Tools-prod.sqlite') as catalog:
+        notes = catalog.actions_by_app('com.apple.mobilenotes')
+        hidden = catalog.hidden_actions()
+        accepting_files = catalog.actions_using_type('public.file-url')
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .blob_catalog import BlobCatalog
+from .db_utils import (
+    BLOB_COLUMNS,
+    Locale,
+    QueryFilter,
+    connect_db,
+    filter_hidden_actions,
+    get_all_actions,
+    get_bulk_localized_lists,
+    get_bulk_output_types,
+    get_bulk_parameter_types,
+    get_bulk_parameters,
+    get_hidden_actions,
+    get_parameter_type_instances,
+    get_type_usage,
+    get_types,
+)
+from .decode_pool import decode_unique_blobs
+from .schema_builder import DatabaseLookups
+from .string_table import StringTable
+
+
+def _is_full(query_filter: Optional[QueryFilter]) -> bool:
+    return query_filter is None or not query_filter.is_restricted()
+
+
+class Catalog:
+    """
+    Lazily loaded view of a Tools-prod.sqlite database.
+
+    Unfiltered actions, hidden actions and types are loaded once and
+    indexed; filtered requests go to SQL (see QueryFilter). Strings are in
+    locale, which may be a fallback chain (see db_utils.locale_chain()).
+
+    Attributes:
+        db_path: Database path
+        locale: Locale or fallback chain of the strings
+        conn: The connection every query runs on
+        strings: Per-run string table schemas built from the catalog
+            intern their identifiers through
+    """
+
+    def __init__(self, db_path: str = "Tools-prod.sqlite", locale: Locale = "en"):
+        """
+        Args:
+            db_path: Database path
+            locale: Locale or fallback chain of the strings
+
+        Raises:
+            FileNotFoundError: If the database doesn't exist
+        """
+        self.db_path = db_path
+        self.locale = locale
+        self.conn = connect_db(db_path)
+        self.strings = StringTable()
+        self._database_lookups = DatabaseLookups(self.conn)
+        self._loaded: Dict[str, Any] = {}
+        self._blob_catalogs: Dict[Tuple[str, ...], BlobCatalog] = {}
+        self._blob_analyses: Dict[Optional[int], Dict[bytes, Dict[str, Any]]] = {}
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self) -> 'Catalog':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _load(self, name: str, loader):
+        """Result of loader(), computed on the first request for name"""
+        if name not in self._loaded:
+            self._loaded[name] = loader()
+        return self._loaded[name]
+
+    # Actions
+
+    def actions(self, query_filter: Optional[QueryFilter] = None) -> List[Dict[str, Any]]:
+        """get_all_actions() rows, ordered by id"""
+        if not _is_full(query_filter):
+            return get_all_actions(self.conn, self.locale, query_filter)
+        return self._load('actions', lambda: get_all_actions(self.conn, self.locale))
+
+    def hidden_actions(self, query_filter: Optional[QueryFilter] = None) -> List[Dict[str, Any]]:
+        """get_hidden_actions() rows, most hidden first"""
+        if not _is_full(query_filter):
+            return get_hidden_actions(self.conn, self.locale, query_filter)
+        return self._load('hidden_actions', lambda: filter_hidden_actions(self.actions()))
+
+    def _action_index(self) -> Dict[str, Dict[Any, Any]]:
+        def build():
+            index: Dict[str, Dict[Any, Any]] = {'id': {}, 'app': {}, 'visibility': {}}
+            for action in self.actions():
+                index['id'][action['id']] = action
+                index['app'].setdefault(action['container_id'], []).append(action)
+                index['visibility'].setdefault(action['visibilityFlags'], []).append(action)
+            return index
+        return self._load('action_index', build)
+
+    def action(self, action_id: str) -> Optional[Dict[str, Any]]:
+        """Action with this identifier, or None"""
+        return self._action_index()['id'].get(action_id)
+
+    def actions_by_app(self, bundle_id: Optional[str]) -> List[Dict[str, Any]]:
+        """Actions of an app container (None = actions without one)"""
+        return list(self._action_index()['app'].get(bundle_id, []))
+
+    def actions_by_visibility(self, visibility_flags: int) -> List[Dict[str, Any]]:
+        """Actions with exactly these visibility flags"""
+        return list(self._action_index()['visibility'].get(visibility_flags, []))
+
+    def actions_using_type(self, type_id: str) -> List[Dict[str, Any]]:
+        """Actions with a parameter accepting the type or returning it"""
+        def build():
+            users: Dict[str, set] = {}
+            for (tool_id, _), type_ids in self._parameter_types().items():
+                for used in type_ids:
+                    users.setdefault(used, set()).add(tool_id)
+            for tool_id, type_ids in self._output_types().items():
+                for used in type_ids:
+                    users.setdefault(used, set()).add(tool_id)
+            return users
+        tool_ids = self._load('type_users', build).get(type_id, set())
+        return [action for action in self.actions() if action['rowId'] in tool_ids]
+
+    # build_action_schema() lookups, answered from bulk queries in the
+    # catalog's own locale and per action otherwise
+
+    def _parameters(self) -> Dict[int, List[Dict[str, Any]]]:
+        def build():
+            parameters = {}
+            for tool_id, params in get_bulk_parameters(self.conn, [self.locale]).items():
+                parameters[tool_id] = [
+                    dict({key: value for key, value in param.items() if key != 'localized'},
+                         **param['localized'][self.locale])
+                    for param in params
+                ]
+            return parameters
+        return self._load('parameters', build)
+
+    def _parameter_types(self) -> Dict[Tuple[int, str], List[str]]:
+        return self._load('parameter_types', lambda: get_bulk_parameter_types(self.conn))
+
+    def _output_types(self) -> Dict[int, List[str]]:
+        return self._load('output_types', lambda: get_bulk_output_types(self.conn))
+
+    def _localized_list(self, table: str, tool_id: int) -> Tuple[List[str], Optional[str]]:
+        values = list(self._load(table, lambda: get_bulk_localized_lists(self.conn, table, [self.locale]))
+                      .get((tool_id, self.locale), []))
+        return values, self.locale if values else None
+
+    def _is_bulk_locale(self, locale: Optional[Locale]) -> bool:
+        # Bulk queries take plain locales; chains are resolved per action
+        return isinstance(self.locale, str) and locale in (None, self.locale)
+
+    def parameters(self, tool_id: int, locale: Optional[Locale] = None) -> List[Dict[str, Any]]:
+        """get_action_parameters() of an action (locale defaults to the catalog's)"""
+        if not self._is_bulk_locale(locale):
+            return self._database_lookups.parameters(tool_id, locale or self.locale)
+        return [dict(param) for param in self._parameters().get(tool_id, [])]
+
+    def parameter_types(self, tool_id: int, key: str) -> List[str]:
+        return list(self._parameter_types().get((tool_id, key), []))
+
+    def output_types(self, tool_id: int) -> List[str]:
+        return list(self._output_types().get(tool_id, []))
+
+    def categories(self, tool_id: int, locale: Optional[Locale] = None) -> Tuple[List[str], Optional[str]]:
+        """Categories and the locale they are in"""
+        if not self._is_bulk_locale(locale):
+            return self._database_lookups.categories(tool_id, locale or self.locale)
+        return self._localized_list('Categories', tool_id)
+
+    def keywords(self, tool_id: int, locale: Optional[Locale] = None) -> Tuple[List[str], Optional[str]]:
+        """Search keywords and the locale they are in"""
+        if not self._is_bulk_locale(locale):
+            return self._database_lookups.keywords(tool_id, locale or self.locale)
+        return self._localized_list('SearchKeywords', tool_id)
+
+    def parameter_name(self, action_id: str, key: str) -> Optional[str]:
+        """Localized name of an action's parameter"""
+        action = self.action(action_id)
+        if action is None:
+            return None
+        return next((param['name'] for param in self.parameters(action['rowId']) if param['key'] == key), None)
+
+    # Types
+
+    def types(self, query_filter: Optional[QueryFilter] = None) -> List[Dict[str, Any]]:
+        """get_types() rows, ordered by identifier"""
+        if not _is_full(query_filter):
+            return get_types(self.conn, query_filter)
+        return self._load('types', lambda: get_types(self.conn))
+
+    def type(self, type_id: str) -> Optional[Dict[str, Any]]:
+        """Type with this identifier (as get_type_info() returns it), or None"""
+        return self._load('type_index', lambda: {t['rowId']: t for t in self.types()}).get(type_id)
+
+    def types_by_kind(self, kind: int) -> List[Dict[str, Any]]:
+        """Types of a kind (see db_utils.TYPE_KINDS)"""
+        return [type_info for type_info in self.types() if type_info['kind'] == kind]
+
+    def type_usage(self) -> Dict[str, Dict[str, int]]:
+        """get_type_usage() counts"""
+        return self._load('type_usage', lambda: get_type_usage(self.conn))
+
+    # BLOBs
+
+    def blob_catalog(self, columns: Optional[Iterable[str]] = None) -> BlobCatalog:
+        """
+        BlobCatalog of some BLOB columns (default: all), hashed once.
+
+        Once all columns are cataloged, requests for fewer columns get a
+        subset of that catalog (only their references and payloads) without
+        hashing again. Analyses run on either are kept for later requests.
+        """
+        key = tuple(columns or BLOB_COLUMNS)
+        if key not in self._blob_catalogs:
+            everything = self._blob_catalogs.get(tuple(BLOB_COLUMNS))
+            if everything is not None:
+                self._blob_catalogs[key] = everything.subset(key)
+            else:
+                self._blob_catalogs[key] = BlobCatalog.from_db(self.conn, key)
+        return self._blob_catalogs[key]
+
+    def parameter_blob_analyses(
+        self,
+        decode_workers: int = 1,
+        decode_depth: Optional[int] = None,
+        tool_ids: Optional[List[int]] = None,
+    ) -> Dict[bytes, Dict[str, Any]]:
+        """
+        Analyses of the distinct parameter typeInstance BLOBs.
+
+        Analyses of every BLOB are kept per decode depth, and later
+        requests (for any actions) get them without decoding again.
+
+        Args:
+            decode_workers: Worker processes for decoding (1 = inline)
+            decode_depth: Nested message depth (None = flat)
+            tool_ids: Only the BLOBs of these actions (None = all)
+
+        Returns:
+            Dictionary of BLOB -> analysis
+        """
+        if decode_depth in self._blob_analyses:
+            return self._blob_analyses[decode_depth]
+        blobs = get_parameter_type_instances(self.conn, tool_ids)
+        analyses = decode_unique_blobs(blobs, 'type_instance', decode_workers, options={'decode_depth': decode_depth})
+        if tool_ids is None:
+            self._blob_analyses[decode_depth] = analyses
+        return analyses
@@ -0,0 +1,338 @@
+"""Relational, columnar export of actions and types
+
+export_to_csv() flattens the top-level action fields into one wide CSV.
+Analytics over parameters, accepted types or enum cases still has to
+walk the nested JSON.
+
+to_dataframes() splits action and type schemas into one pandas DataFrame
+per relation:
+
+    actions                   one row per action (app and deprecation flattened)
+    parameters                (action_id, key, ...) per parameter
+    parameter_accepted_types  (action_id, parameter_key, position, type_id)
+    output_types              (action_id, position, type_id)
+    categories                (action_id, position, category)
+    keywords                  (action_id, position, keyword)
+    types                     one row per type
+    enum_cases                (type_id, id, title, subtitle)
+    entity_properties         (type_id, id, display_name)
+
+Columns have fixed dtypes (TABLES). Repeated strings (ids referenced
+from other tables, type ids, bundle ids, categories) are categoricals,
+so each distinct value is stored once.
+
+export_columnar() writes one file per table plus a columnar.json manifest:
+Parquet when a Parquet engine (pyarrow or fastparquet) is installed,
+otherwise gzipped CSV (Feather on request, which needs pyarrow).
+load_dataframes() reads them back with the same dtypes. CSV can't tell
+empty strings from nulls; both load as null.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+COLUMNAR_FORMATS = ('parquet', 'feather', 'csv.gz')
+MANIFEST_NAME = 'columnar.json'
+
+# Table -> column -> pandas dtype, in column order
+TABLES: Dict[str, Dict[str, str]] = {
+    'actions': {
+        'id': 'string',
+        'name': 'string',
+        'name_is_synthetic': 'boolean',
+        'description_summary': 'string',
+        'description_is_synthetic': 'boolean',
+        'description_note': 'string',
+        'type': 'category',
+        'flags': 'Int64',
+        'visibility_flags': 'Int64',
+        'hidden': 'boolean',
+        'source_provider': 'category',
+        'app_bundle_id': 'category',
+        'app_name': 'category',
+        'deprecation_replacement_id': 'string',
+        'deprecation_message': 'string',
+        'parameter_count': 'Int64',
+    },
+    'parameters': {
+        'action_id': 'category',
+        'key': 'category',
+        'name': 'string',
+        'name_is_synthetic': 'boolean',
+        'description': 'string',
+        'description_is_synthetic': 'boolean',
+        'sort_order': 'Int64',
+        'flags': 'Int64',
+    },
+    'parameter_accepted_types': {
+        'action_id': 'category',
+        'parameter_key': 'category',
+        'position': 'Int64',
+        'type_id': 'category',
+    },
+    'output_types': {
+        'action_id': 'category',
+        'position': 'Int64',
+        'type_id': 'category',
+    },
+    'categories': {
+        'action_id': 'category',
+        'position': 'Int64',
+        'category': 'category',
+    },
+    'keywords': {
+        'action_id': 'category',
+        'position': 'Int64',
+        'keyword': 'category',
+    },
+    'types': {
+        'id': 'string',
+        'name': 'string',
+        'name_with_determiner': 'string',
+        'kind': 'Int64',
+        'kind_name': 'category',
+        'runtime_flags': 'Int64',
+        'container_id': 'category',
+    },
+    'enum_cases': {
+        'type_id': 'category',
+        'id': 'string',
+        'title': 'string',
+        'subtitle': 'string',
+    },
+    'entity_properties': {
+        'type_id': 'category',
+        'id': 'string',
+        'display_name': 'string',
+    },
+}
+
+
+def _require_pandas():
+    if not PANDAS_AVAILABLE:
+        raise ImportError("pandas is required for the columnar export: pip install pandas")
+
+
+def _is_synthetic(metadata: Optional[Dict[str, Any]]) -> Optional[bool]:
+    return None if metadata is None else bool(metadata.get('is_synthetic'))
+
+
+def _positions(rows: List[Dict[str, Any]], values: Iterable[str], column: str, **keys: Any):
+    for position, value in enumerate(values):
+        rows.append(dict(keys, position=position, **{column: value}))
+
+
+def table_rows(
+    actions: Iterable[Dict[str, Any]],
+    types: Iterable[Dict[str, Any]] = (),
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Split schemas into the rows of each table.
+
+    Schemas projected with --fields just leave the missing columns null
+    (and the tables of missing lists empty).
+
+    Args:
+        actions: Schemas from build_action_schema()
+        types: Schemas from build_type_schema()
+
+    Returns:
+        Dictionary of table name -> rows
+    """
+    rows: Dict[str, List[Dict[str, Any]]] = {name: [] for name in TABLES}
+
+    for action in actions:
+        action_id = action['id']
+        app = action.get('app') or {}
+        deprecation = action.get('deprecation') or {}
+        parameters = action.get('parameters', [])
+        rows['actions'].append({
+            'id': action_id,
+            'name': action.get('name'),
+            'name_is_synthetic': _is_synthetic(action.get('name_metadata')),
+            'description_summary': action.get('description_summary'),
+            'description_is_synthetic': _is_synthetic(action.get('description_metadata')),
+            'description_note': action.get('description_note'),
+            'type': action.get('type'),
+            'flags': action.get('flags'),
+            'visibility_flags': action.get('visibility_flags'),
+            'hidden': action.get('hidden'),
+            'source_provider': action.get('source_provider'),
+            'app_bundle_id': app.get('bundle_id'),
+            'app_name': app.get('name'),
+            'deprecation_replacement_id': deprecation.get('replacement_id'),
+            'deprecation_message': deprecation.get('message'),
+            'parameter_count': len(parameters) if 'parameters' in action else None,
+        })
+
+        for param in parameters:
+            rows['parameters'].append({
+                'action_id': action_id,
+                'key': param.get('key'),
+                'name': param.get('name'),
+                'name_is_synthetic': _is_synthetic(param.get('name_metadata')),
+                'description': param.get('description'),
+                'description_is_synthetic': _is_synthetic(param.get('description_metadata')),
+                'sort_order': param.get('sort_order'),
+                'flags': param.get('flags'),
+            })
+            _positions(rows['parameter_accepted_types'], param.get('accepted_types', []), 'type_id',
+                       action_id=action_id, parameter_key=param.get('key'))
+
+        _positions(rows['output_types'], action.get('output_types', []), 'type_id', action_id=action_id)
+        _positions(rows['categories'], action.get('categories', []), 'category', action_id=action_id)
+        _positions(rows['keywords'], action.get('keywords', []), 'keyword', action_id=action_id)
+
+    for type_schema in types:
+        type_id = type_schema['id']
+        rows['types'].append({column: type_schema.get(column) for column in TABLES['types']})
+        for case in type_schema.get('enum_cases', []):
+            rows['enum_cases'].append({
+                'type_id': type_id,
+                'id': case.get('id'),
+                'title': case.get('title'),
+                'subtitle': case.get('subtitle'),
+            })
+        for prop in type_schema.get('properties', []):
+            rows['entity_properties'].append({
+                'type_id': type_id,
+                'id': prop.get('id'),
+                'display_name': prop.get('displayName'),
+            })
+
+    return rows
+
+
+def _frame(name: str, rows: List[Dict[str, Any]]) -> 'pd.DataFrame':
+    """DataFrame of a table's rows with the table's dtypes"""
+    columns = TABLES[name]
+    data = {column: [row.get(column) for row in rows] for column in columns}
+    return pd.DataFrame(data, columns=list(columns)).astype(columns)
+
+
+def to_dataframes(
+    actions: Iterable[Dict[str, Any]],
+    types: Iterable[Dict[str, Any]] = (),
+) -> Dict[str, 'pd.DataFrame']:
+    """
+    One DataFrame per table (see TABLES) from action and type schemas.
+
+    Raises:
+        ImportError: If pandas is not installed
+    """
+    _require_pandas()
+    return {name: _frame(name, rows) for name, rows in table_rows(actions, types).items()}
+
+
+def parquet_engine() -> Optional[str]:
+    """Installed Parquet engine for pandas, or None"""
+    for engine in ('pyarrow', 'fastparquet'):
+        try:
+            __import__(engine)
+            return engine
+        except ImportError:
+            continue
+    return None
+
+
+def resolve_format(columnar_format: str = 'auto') -> str:
+    """
+    Concrete format for 'auto' (Parquet if possible, else gzipped CSV).
+
+    Raises:
+        ValueError: If the format is unknown
+        ImportError: If pandas or the format's engine is not installed
+    """
+    _require_pandas()
+    if columnar_format == 'auto':
+        return 'parquet' if parquet_engine() else 'csv.gz'
+    if columnar_format not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unknown columnar format: {columnar_format} (expected auto or one of {', '.join(COLUMNAR_FORMATS)})")
+    if columnar_format == 'parquet' and parquet_engine() is None:
+        raise ImportError("Parquet needs pyarrow or fastparquet: pip install pyarrow")
+    if columnar_format == 'feather' and parquet_engine() != 'pyarrow':
+        raise ImportError("Feather needs pyarrow: pip install pyarrow")
+    return columnar_format
+
+
+def export_columnar(
+    frames: Dict[str, 'pd.DataFrame'],
+    directory: str,
+    columnar_format: str = 'auto',
+) -> Dict[str, Any]:
+    """
+    Write each table to directory, plus a columnar.json manifest.
+
+    Args:
+        frames: Tables from to_dataframes()
+        directory: Output directory (created if missing)
+        columnar_format: 'auto', 'parquet', 'feather' or 'csv.gz'
+
+    Returns:
+        The manifest (format, and file and row count per table)
+
+    Raises:
+        ImportError: If pandas or the format's engine is not installed
+        ValueError: If the format is unknown
+    """
+    _require_pandas()
+    columnar_format = resolve_format(columnar_format)
+    output = Path(directory)
+    output.mkdir(parents=True, exist_ok=True)
+
+    tables = {}
+    for name, frame in frames.items():
+        file_name = f"{name}.{columnar_format}"
+        path = output / file_name
+        if columnar_format == 'parquet':
+            frame.to_parquet(path, index=False)
+        elif columnar_format == 'feather':
+            frame.reset_index(drop=True).to_feather(path)
+        else:
+            frame.to_csv(path, index=False, compression='gzip')
+        tables[name] = {'file': file_name, 'rows': len(frame)}
+
+    manifest = {'format': columnar_format, 'tables': tables}
+    with open(output / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_dataframes(directory: str, tables: Optional[Iterable[str]] = None) -> Dict[str, 'pd.DataFrame']:
+    """
+    Tables written by export_columnar(), with their dtypes.
+
+    Args:
+        directory: Export directory
+        tables: Only these tables (None = all)
+
+    Raises:
+        ImportError: If pandas or the format's engine is not installed
+        FileNotFoundError: If the directory has no manifest
+    """
+    _require_pandas()
+    output = Path(directory)
+    with open(output / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    columnar_format = resolve_format(manifest['format'])
+
+    frames = {}
+    for name in (tables or manifest['tables']):
+        path = output / manifest['tables'][name]['file']
+        dtypes = TABLES[name]
+        if columnar_format == 'parquet':
+            frame = pd.read_parquet(path)
+        elif columnar_format == 'feather':
+            frame = pd.read_feather(path)
+        else:
+            # Typed on read, so numeric-looking strings stay strings
+            frame = pd.read_csv(path, compression='gzip', dtype=dtypes, keep_default_na=False, na_values=[''])
+        frames[name] = frame.astype(dtypes)
+    return frames
@@ -1,8 +1,344 @@
 """Database utility functions for accessing Tools-prod.sqlite"""
 
+import argparse
+import hashlib
 import sqlite3
+from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Sequence, Tuple, Union
+
+
+# Every protobuf BLOB column in Tools-prod.sqlite, as 'Table.column' -> (table, column)
+BLOB_COLUMNS: Dict[str, Tuple[str, str]] = {
+    'Parameters.typeInstance': ('Parameters', 'typeInstance'),
+    'Parameters.relationships': ('Parameters', 'relationships'),
+    'Tools.requirements': ('Tools', 'requirements'),
+    'Tools.outputTypeInstance': ('Tools', 'outputTypeInstance'),
+    'Types.runtimeRequirements': ('Types', 'runtimeRequirements'),
+    'TypeCoercions.coercionDefinition': ('TypeCoercions', 'coercionDefinition'),
+}
+
+# How a row holding each BLOB column is identified: (ref_id, ref_key, blob).
+# ref_id is the action or type identifier; ref_key narrows it down further
+# (parameter key, coercion target type) where the table needs it.
+_BLOB_REFERENCE_QUERIES: Dict[str, str] = {
+    'Parameters.typeInstance': """
+        SELECT t.id, p.key, p.typeInstance
+        FROM Parameters p JOIN Tools t ON t.rowId = p.toolId
+        WHERE LENGTH(p.typeInstance) > 0
+    """,
+    'Parameters.relationships': """
+        SELECT t.id, p.key, p.relationships
+        FROM Parameters p JOIN Tools t ON t.rowId = p.toolId
+        WHERE LENGTH(p.relationships) > 0
+    """,
+    'Tools.requirements': """
+        SELECT id, NULL, requirements FROM Tools WHERE LENGTH(requirements) > 0
+    """,
+    'Tools.outputTypeInstance': """
+        SELECT id, NULL, outputTypeInstance FROM Tools WHERE LENGTH(outputTypeInstance) > 0
+    """,
+    'Types.runtimeRequirements': """
+        SELECT rowId, NULL, runtimeRequirements FROM Types WHERE LENGTH(runtimeRequirements) > 0
+    """,
+    'TypeCoercions.coercionDefinition': """
+        SELECT sourceTypeId, targetTypeId, coercionDefinition
+        FROM TypeCoercions WHERE LENGTH(coercionDefinition) > 0
+    """,
+}
+
+
+# Types.kind values (see schema_builder.build_type_schema())
+TYPE_KINDS: Dict[str, int] = {
+    'primitive': 1,
+    'entity': 2,
+    'enum': 3,
+    'object': 4,
+    'array': 6,
+    'special': 8,
+}
+
+# SQL expression each filter field applies to, per query family
+ACTION_FILTER_COLUMNS: Dict[str, str] = {
+    'app_bundle': 'cm.id',
+    'visibility': 't.visibilityFlags',
+    'tool_type': 't.toolType',
+    'id': 't.id',
+}
+TYPE_FILTER_COLUMNS: Dict[str, str] = {
+    'app_bundle': 'cm.id',
+    'kind': 't.kind',
+    'id': 't.rowId',
+}
+
+
+@dataclass
+class QueryFilter:
+    """
+    Row filter pushed down into the action and type queries.
+
+    Every field is optional; unset fields don't restrict anything. The
+    filter compiles to a WHERE condition and a LIMIT/OFFSET clause, so a
+    filtered run only reads (and builds schemas for) the rows it returns.
+    """
+
+    app_bundle: Optional[str] = None
+    min_visibility: Optional[int] = None
+    max_visibility: Optional[int] = None
+    tool_type: Optional[str] = None
+    kind: Optional[int] = None
+    id_prefix: Optional[str] = None
+    limit: Optional[int] = None
+    offset: Optional[int] = None
+
+    def is_restricted(self) -> bool:
+        """True if the filter can drop any row"""
+        return any(getattr(self, f.name) is not None for f in fields(self))
+
+    def where_clause(self, columns: Dict[str, str]) -> Tuple[str, List[Any]]:
+        """
+        Compile the row conditions.
+
+        Args:
+            columns: Filter field -> SQL expression (ACTION_FILTER_COLUMNS
+                or TYPE_FILTER_COLUMNS)
+
+        Returns:
+            (condition joined with AND, or '' if unrestricted; parameters)
+
+        Raises:
+            ValueError: If a set field doesn't apply to these columns
+        """
+        conditions: List[str] = []
+        params: List[Any] = []
+
+        def column(name: str, option: str) -> str:
+            if name not in columns:
+                raise ValueError(f"Filter {option} doesn't apply here")
+            return columns[name]
+
+        if self.app_bundle is not None:
+            conditions.append(f"{column('app_bundle', '--app')} = ?")
+            params.append(self.app_bundle)
+        if self.min_visibility is not None:
+            conditions.append(f"{column('visibility', '--min-visibility')} >= ?")
+            params.append(self.min_visibility)
+        if self.max_visibility is not None:
+            conditions.append(f"{column('visibility', '--max-visibility')} <= ?")
+            params.append(self.max_visibility)
+        if self.tool_type is not None:
+            conditions.append(f"{column('tool_type', '--tool-type')} = ?")
+            params.append(self.tool_type)
+        if self.kind is not None:
+            conditions.append(f"{column('kind', '--kind')} = ?")
+            params.append(self.kind)
+        if self.id_prefix:
+            # A range instead of LIKE: case-sensitive, no escaping and able to use the id index
+            id_column = column('id', '--id-prefix')
+            successor = self.id_prefix[:-1] + chr(ord(self.id_prefix[-1]) + 1) \
+                if ord(self.id_prefix[-1]) < 0x10FFFF else None
+            if successor is None:
+                conditions.append(f"substr({id_column}, 1, ?) = ?")
+                params.extend([len(self.id_prefix), self.id_prefix])
+            else:
+                conditions.append(f"{id_column} >= ? AND {id_column} < ?")
+                params.extend([self.id_prefix, successor])
+
+        return ' AND '.join(conditions), params
+
+    def limit_clause(self) -> Tuple[str, List[Any]]:
+        """Compile limit/offset ('' if neither is set)"""
+        if self.limit is None and not self.offset:
+            return '', []
+        return 'LIMIT ? OFFSET ?', [-1 if self.limit is None else self.limit, self.offset or 0]
+
+    def compile(self, columns: Dict[str, str], base_condition: str = '') -> Tuple[str, str, List[Any]]:
+        """
+        Compile to ready-to-use clauses.
+
+        Args:
+            columns: See where_clause()
+            base_condition: Condition the query always applies (e.g.
+                't.visibilityFlags > 0')
+
+        Returns:
+            ('WHERE ...' or '', 'LIMIT ...' or '', parameters for both in order)
+        """
+        condition, params = self.where_clause(columns)
+        condition = ' AND '.join(part for part in (base_condition, condition) if part)
+        limit_sql, limit_params = self.limit_clause()
+        return (f"WHERE {condition}" if condition else ''), limit_sql, params + limit_params
+
+
+# Command-line options of each filter field, and the query families they apply to
+_FILTER_OPTIONS = {
+    'app_bundle': (('--app',), dict(metavar='BUNDLE_ID', help='Only this app (container bundle id)'), ('actions', 'types')),
+    'min_visibility': (('--min-visibility',), dict(type=int, metavar='N', help='Only visibilityFlags >= N'), ('actions',)),
+    'max_visibility': (('--max-visibility',), dict(type=int, metavar='N', help='Only visibilityFlags <= N'), ('actions',)),
+    'tool_type': (('--tool-type',), dict(metavar='TYPE', help='Only this toolType (e.g. action, appIntent)'), ('actions',)),
+    'kind': (('--kind',), dict(metavar='KIND', help=f"Only this type kind ({', '.join(TYPE_KINDS)} or a number)"), ('types',)),
+    'id_prefix': (('--id-prefix',), dict(metavar='PREFIX', help='Only ids starting with PREFIX'), ('actions', 'types')),
+    'limit': (('--limit',), dict(type=int, metavar='N', help='At most N rows'), ('actions', 'types')),
+    'offset': (('--offset',), dict(type=int, metavar='N', help='Skip the first N rows'), ('actions', 'types')),
+}
+
+
+def parse_type_kind(value: str) -> int:
+    """Type kind from a name ('enum') or number ('3')"""
+    if value.isdigit():
+        return int(value)
+    if value.lower() not in TYPE_KINDS:
+        raise argparse.ArgumentTypeError(f"unknown type kind: {value} (expected one of {', '.join(TYPE_KINDS)})")
+    return TYPE_KINDS[value.lower()]
+
+
+def add_filter_arguments(parser: argparse.ArgumentParser, target: str = 'actions', skip: Tuple[str, ...] = ()):
+    """
+    Add the QueryFilter options that apply to a query family.
+
+    Args:
+        parser: Parser to extend
+        target: 'actions' or 'types'
+        skip: Filter fields the script sets by other means
+    """
+    group = parser.add_argument_group('filters')
+    for name, (flags, options, targets) in _FILTER_OPTIONS.items():
+        if target in targets and name not in skip:
+            if name == 'kind':
+                options = dict(options, type=parse_type_kind)
+            group.add_argument(*flags, dest=name, **options)
+
+
+def filter_from_args(args: argparse.Namespace, **overrides) -> QueryFilter:
+    """
+    Build a QueryFilter from parsed add_filter_arguments() options.
+
+    Args:
+        args: Parsed arguments
+        **overrides: Fields to set regardless of the options (None values ignored)
+
+    Returns:
+        Query filter
+    """
+    values = {f.name: getattr(args, f.name, None) for f in fields(QueryFilter)}
+    values.update({name: value for name, value in overrides.items() if value is not None})
+    return QueryFilter(**values)
+
+
+# Localized columns fetched by get_all_actions()/get_action_parameters()
+ACTION_STRING_COLUMNS = ('name', 'descriptionSummary', 'descriptionNote', 'deprecationMessage')
+PARAMETER_STRING_COLUMNS = ('name', 'description')
+
+# Localized list tables: table -> (value column, ORDER BY column or None)
+LOCALIZED_LIST_TABLES: Dict[str, Tuple[str, Optional[str]]] = {
+    'Categories': ('category', None),
+    'SearchKeywords': ('keyword', '`order`'),
+}
+
+# A locale ('en_GB') or a fallback chain of locales (('en_GB', 'en')) for the localized queries
+Locale = Union[str, Tuple[str, ...]]
+
+
+def locale_chain(locale: str, fallbacks: Sequence[str] = ()) -> Tuple[str, ...]:
+    """
+    Fallback chain of a locale: itself, its parent locales, then fallbacks.
+
+    Example:
+        locale_chain('zh_Hant_HK')  -> ('zh_Hant_HK', 'zh_Hant', 'zh')
+        locale_chain('en_GB', ['fr'])  -> ('en_GB', 'en', 'fr')
+
+    Args:
+        locale: Most specific locale
+        fallbacks: Locales to try after the parents
+
+    Returns:
+        Chain of distinct locales, most preferred first
+    """
+    chain = [locale]
+    while max(chain[-1].rfind('_'), chain[-1].rfind('-')) > 0:
+        chain.append(chain[-1][:max(chain[-1].rfind('_'), chain[-1].rfind('-'))])
+    chain.extend(fallback for fallback in fallbacks if fallback not in chain)
+    return tuple(dict.fromkeys(chain))
+
+
+def _chain_table(chain: Tuple[str, ...]) -> Tuple[str, List[Any]]:
+    """Subquery of (locale, rank) rows for a fallback chain"""
+    rows = ' UNION ALL '.join('SELECT ? AS locale, ? AS rank' for _ in chain)
+    return f"({rows})", [value for rank, locale in enumerate(chain) for value in (locale, rank)]
+
+
+def _localized_join(
+    table: str,
+    alias: str,
+    on: str,
+    columns: Dict[str, str],
+    locale: Locale,
+    condition: str = '',
+) -> Tuple[str, List[Any], str]:
+    """
+    LEFT JOIN of a localization table in a locale or along a fallback chain.
+
+    With a single locale this is a plain join on the locale column. With a
+    chain, the table is joined once per locale (alias0, alias1, ...), each
+    join as selective as the single-locale one, and every column is the
+    COALESCE of its values in chain order; <name>_locale records which
+    locale that was.
+
+    Args:
+        table: Localization table
+        alias: Alias of the joined table
+        on: Join condition with {alias} for the alias (e.g. 't.rowId = {alias}.toolId')
+        columns: Localized column -> name to select it as
+        locale: Locale or fallback chain
+        condition: Extra condition on the table's rows, with {alias}
+
+    Returns:
+        (JOIN clauses, their parameters, select list of the columns starting
+        with ', ' or '' without columns)
+    """
+    chained = not isinstance(locale, str)
+    chain = locale if chained else (locale,)
+    aliases = [f"{alias}{index}" for index in range(len(chain))] if chained else [alias]
+
+    joins = []
+    for join_alias in aliases:
+        extra = f" AND {condition.format(alias=join_alias)}" if condition else ''
+        joins.append(f"LEFT JOIN {table} {join_alias} ON {on.format(alias=join_alias)} AND {join_alias}.locale = ?{extra}")
+
+    selects = []
+    for column, name in columns.items():
+        if not chained:
+            selects.append(f"{alias}.{column} AS {name}")
+            continue
+        values = ', '.join(f"{a}.{column}" for a in aliases)
+        selects.append(f"COALESCE({values}, NULL) AS {name}")
+        sources = ' '.join(f"WHEN {a}.{column} IS NOT NULL THEN {a}.locale" for a in aliases)
+        selects.append(f"CASE {sources} END AS {name}_locale")
+
+    select = ''.join(f",\n            {expression}" for expression in selects)
+    return '\n        '.join(joins), list(chain), select
+
+
+def _action_string_joins(locale: Locale, columns: Tuple[str, ...] = ACTION_STRING_COLUMNS) -> Tuple[str, List[Any], str, str]:
+    """
+    ToolLocalizations/ContainerMetadata joins of the action queries.
+
+    Returns:
+        (joins, their parameters, select list of the action strings in
+        columns, select list of the app name); select lists start with ', '
+    """
+    tl_join, tl_params, tl_select = _localized_join(
+        'ToolLocalizations', 'tl', 't.rowId = {alias}.toolId',
+        {column: column for column in columns}, locale, "{alias}.localizationUsage = 'display'",
+    )
+    cml_join, cml_params, cml_select = _localized_join(
+        'ContainerMetadataLocalizations', 'cml', 'cm.rowId = {alias}.containerId', {'name': 'app_name'}, locale,
+    )
+    joins = f"""{tl_join}
+        LEFT JOIN ContainerMetadata cm
+            ON t.sourceContainerId = cm.rowId
+        {cml_join}"""
+    return joins, [*tl_params, *cml_params], tl_select, cml_select
 
 
 def connect_db(db_path: str = "Tools-prod.sqlite") -> sqlite3.Connection:
@@ -41,19 +377,18 @@ def get_type_count(conn: sqlite3.Connection) -> int:
     return cursor.fetchone()[0]
 
 
-def get_all_actions(conn: sqlite3.Connection, locale: str = "en") -> List[Dict[str, Any]]:
-    """
-    Get all actions with their basic information.
-
-    Args:
-        conn: Database connection
-        locale: Language locale (default: 'en')
-
-    Returns:
-        List of action dictionaries
-    """
+def _select_actions(
+    conn: sqlite3.Connection,
+    locale: Locale,
+    query_filter: Optional[QueryFilter],
+    base_condition: str,
+    order_by: str,
+) -> List[Dict[str, Any]]:
+    """Action rows of get_all_actions() and get_hidden_actions()"""
+    where_sql, limit_sql, filter_params = (query_filter or QueryFilter()).compile(ACTION_FILTER_COLUMNS, base_condition)
+    joins, join_params, string_select, app_select = _action_string_joins(locale)
     cursor = conn.cursor()
-    cursor.execute("""
+    cursor.execute(f"""
         SELECT
             t.rowId,
             t.id,
@@ -61,25 +396,14 @@ def get_all_actions(conn: sqlite3.Connection, locale: str = "en") -> List[Dict[s
             t.flags,
             t.visibilityFlags,
             t.deprecationReplacementId,
-            t.sourceActionProvider,
-            tl.name,
-            tl.descriptionSummary,
-            tl.descriptionNote,
-            tl.deprecationMessage,
-            cm.id as container_id,
-            cml.name as app_name
+            t.sourceActionProvider{string_select},
+            cm.id as container_id{app_select}
         FROM Tools t
-        LEFT JOIN ToolLocalizations tl
-            ON t.rowId = tl.toolId
-            AND tl.locale = ?
-            AND tl.localizationUsage = 'display'
-        LEFT JOIN ContainerMetadata cm
-            ON t.sourceContainerId = cm.rowId
-        LEFT JOIN ContainerMetadataLocalizations cml
-            ON cm.rowId = cml.containerId
-            AND cml.locale = ?
-        ORDER BY t.id
-    """, (locale, locale))
+        {joins}
+        {where_sql}
+        ORDER BY {order_by}
+        {limit_sql}
+    """, (*join_params, *filter_params))
 
     actions = []
     for row in cursor.fetchall():
@@ -88,36 +412,56 @@ def get_all_actions(conn: sqlite3.Connection, locale: str = "en") -> List[Dict[s
     return actions
 
 
-def get_action_parameters(conn: sqlite3.Connection, tool_id: int, locale: str = "en") -> List[Dict[str, Any]]:
+def get_all_actions(
+    conn: sqlite3.Connection,
+    locale: Locale = "en",
+    query_filter: Optional[QueryFilter] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Get all actions with their basic information.
+
+    Args:
+        conn: Database connection
+        locale: Language locale (default: 'en'), or a fallback chain
+            (see locale_chain()); with a chain each string has a
+            <column>_locale entry naming the locale it came from
+        query_filter: Only return the matching actions (applied in SQL)
+
+    Returns:
+        List of action dictionaries
+    """
+    return _select_actions(conn, locale, query_filter, '', 't.id')
+
+
+def get_action_parameters(conn: sqlite3.Connection, tool_id: int, locale: Locale = "en") -> List[Dict[str, Any]]:
     """
     Get all parameters for a specific action.
 
     Args:
         conn: Database connection
         tool_id: Action row ID
-        locale: Language locale
+        locale: Language locale or fallback chain (see get_all_actions())
 
     Returns:
         List of parameter dictionaries
     """
+    join, join_params, string_select = _localized_join(
+        'ParameterLocalizations', 'pl', 'p.toolId = {alias}.toolId AND p.key = {alias}.key',
+        {column: column for column in PARAMETER_STRING_COLUMNS}, locale,
+    )
     cursor = conn.cursor()
-    cursor.execute("""
+    cursor.execute(f"""
         SELECT
             p.key,
             p.sortOrder,
             p.flags,
             p.typeInstance,
-            p.relationships,
-            pl.name,
-            pl.description
+            p.relationships{string_select}
         FROM Parameters p
-        LEFT JOIN ParameterLocalizations pl
-            ON p.toolId = pl.toolId
-            AND p.key = pl.key
-            AND pl.locale = ?
+        {join}
         WHERE p.toolId = ?
         ORDER BY p.sortOrder
-    """, (locale, tool_id))
+    """, (*join_params, tool_id))
 
     parameters = []
     for row in cursor.fetchall():
@@ -173,73 +517,231 @@ def get_action_output_types(conn: sqlite3.Connection, tool_id: int) -> List[str]
     return [row[0] for row in cursor.fetchall()]
 
 
-def get_action_categories(conn: sqlite3.Connection, tool_id: int, locale: str = "en") -> List[str]:
-    """Get categories for an action"""
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT category
-        FROM Categories
-        WHERE toolId = ? AND locale = ?
-    """, (tool_id, locale))
+def get_localized_list(
+    conn: sqlite3.Connection,
+    table: str,
+    tool_id: int,
+    locale: Locale = "en",
+) -> Tuple[List[str], Optional[str]]:
+    """
+    Get an action's categories or search keywords, with the locale they are in.
 
-    return [row[0] for row in cursor.fetchall()]
+    With a fallback chain the whole list comes from the first locale of the
+    chain that has any rows (ranked with a window function), so lists
+    never mix languages.
 
+    Args:
+        conn: Database connection
+        table: 'Categories' or 'SearchKeywords'
+        tool_id: Action row ID
+        locale: Language locale or fallback chain
 
-def get_action_keywords(conn: sqlite3.Connection, tool_id: int, locale: str = "en") -> List[str]:
-    """Get search keywords for an action"""
+    Returns:
+        (values, their locale or None if there are none)
+
+    Raises:
+        ValueError: If the table isn't a localized list table
+    """
+    if table not in LOCALIZED_LIST_TABLES:
+        raise ValueError(f"Unknown localized list table: {table} (expected one of {', '.join(LOCALIZED_LIST_TABLES)})")
+
+    column, order = LOCALIZED_LIST_TABLES[table]
+    order_sql = f"ORDER BY {order}" if order else ''
     cursor = conn.cursor()
-    cursor.execute("""
-        SELECT keyword
-        FROM SearchKeywords
-        WHERE toolId = ? AND locale = ?
-        ORDER BY `order`
-    """, (tool_id, locale))
 
-    return [row[0] for row in cursor.fetchall()]
+    if isinstance(locale, str):
+        cursor.execute(f"""
+            SELECT {column}
+            FROM {table}
+            WHERE toolId = ? AND locale = ?
+            {order_sql}
+        """, (tool_id, locale))
+        values = [row[0] for row in cursor.fetchall()]
+        return values, locale if values else None
 
+    chain_sql, chain_params = _chain_table(locale)
+    cursor.execute(f"""
+        SELECT value, locale
+        FROM (
+            SELECT
+                l.{column} AS value,
+                {f"l.{order} AS sort_key," if order else ''}
+                chain.locale,
+                chain.rank,
+                MIN(chain.rank) OVER () AS best_rank
+            FROM {table} l
+            JOIN {chain_sql} chain ON l.locale = chain.locale
+            WHERE l.toolId = ?
+        )
+        WHERE rank = best_rank
+        {"ORDER BY sort_key" if order else ''}
+    """, (*chain_params, tool_id))
+    rows = cursor.fetchall()
+    return [row[0] for row in rows], rows[0][1] if rows else None
+
+
+def get_action_categories(conn: sqlite3.Connection, tool_id: int, locale: Locale = "en") -> List[str]:
+    """Get categories for an action"""
+    return get_localized_list(conn, 'Categories', tool_id, locale)[0]
+
+
+def get_action_keywords(conn: sqlite3.Connection, tool_id: int, locale: Locale = "en") -> List[str]:
+    """Get search keywords for an action"""
+    return get_localized_list(conn, 'SearchKeywords', tool_id, locale)[0]
 
-def get_hidden_actions(conn: sqlite3.Connection, locale: str = "en") -> List[Dict[str, Any]]:
+
+def get_hidden_actions(
+    conn: sqlite3.Connection,
+    locale: Locale = "en",
+    query_filter: Optional[QueryFilter] = None,
+) -> List[Dict[str, Any]]:
     """
     Get all actions with non-zero visibility flags (potentially hidden).
 
+    Rows are the get_all_actions() ones, most hidden first.
+
     Args:
         conn: Database connection
-        locale: Language locale
+        locale: Language locale or fallback chain (see get_all_actions())
+        query_filter: Only return the matching actions (applied in SQL)
 
     Returns:
         List of hidden action dictionaries
     """
+    return _select_actions(conn, locale, query_filter, 't.visibilityFlags > 0', 't.visibilityFlags DESC, t.id')
+
+
+def filter_hidden_actions(actions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    get_hidden_actions() rows picked from get_all_actions() rows.
+
+    With the same locale and a filter without limit or offset, gives what
+    get_hidden_actions() would return, in the same order.
+    """
+    hidden = [action for action in actions if action['visibilityFlags'] > 0]
+    # Matches ORDER BY visibilityFlags DESC, id (BINARY collation = code point order)
+    hidden.sort(key=lambda action: (-action['visibilityFlags'], action['id']))
+    return hidden
+
+
+def get_action_summary(
+    conn: sqlite3.Connection,
+    locale: Locale = "en",
+    query_filter: Optional[QueryFilter] = None,
+) -> Dict[str, Any]:
+    """
+    Summary statistics of all actions, computed with aggregate queries.
+
+    Gives the same dictionary as schema_builder.summarize_action_collection()
+    over the schemas of get_all_actions() with the same filter, without
+    building them: rows are counted over the same joins, groups come out
+    in first-seen order and parameters are counted as
+    get_action_parameters() returns them.
+
+    Args:
+        conn: Database connection
+        locale: Language locale or fallback chain (app names)
+        query_filter: Only summarize the matching actions
+
+    Returns:
+        Summary statistics
+    """
+    where_sql, limit_sql, filter_params = (query_filter or QueryFilter()).compile(ACTION_FILTER_COLUMNS)
+    joins, join_params, _, app_select = _action_string_joins(locale, ())
+    pl_join, pl_params, _ = _localized_join(
+        'ParameterLocalizations', 'pl', 'p.toolId = {alias}.toolId AND p.key = {alias}.key', {}, locale,
+    )
     cursor = conn.cursor()
-    cursor.execute("""
+    cursor.execute("DROP TABLE IF EXISTS temp.summary_actions")
+    cursor.execute(f"""
+        CREATE TEMP TABLE summary_actions AS
         SELECT
+            ROW_NUMBER() OVER (ORDER BY t.id) AS position,
             t.rowId,
-            t.id,
             t.toolType,
             t.visibilityFlags,
-            t.flags,
-            tl.name,
-            tl.descriptionSummary,
-            cm.id as container_id,
-            cml.name as app_name
+            COALESCE(t.deprecationReplacementId, '') != '' AS deprecated{app_select}
         FROM Tools t
-        LEFT JOIN ToolLocalizations tl
-            ON t.rowId = tl.toolId
-            AND tl.locale = ?
-            AND tl.localizationUsage = 'display'
-        LEFT JOIN ContainerMetadata cm
-            ON t.sourceContainerId = cm.rowId
-        LEFT JOIN ContainerMetadataLocalizations cml
-            ON cm.rowId = cml.containerId
-            AND cml.locale = ?
-        WHERE t.visibilityFlags > 0
-        ORDER BY t.visibilityFlags DESC, t.id
-    """, (locale, locale))
+        {joins}
+        {where_sql}
+        ORDER BY t.id
+        {limit_sql}
+    """, (*join_params, *filter_params))
 
-    actions = []
-    for row in cursor.fetchall():
-        actions.append(dict(row))
+    def grouped(column: str) -> Dict[Any, int]:
+        cursor.execute(f"""
+            SELECT {column}, COUNT(*) FROM summary_actions
+            GROUP BY {column}
+            ORDER BY MIN(position)
+        """)
+        return {row[0]: row[1] for row in cursor.fetchall()}
 
-    return actions
+    cursor.execute(f"""
+        WITH parameter_counts AS (
+            SELECT p.toolId, COUNT(*) AS n
+            FROM Parameters p
+            {pl_join}
+            GROUP BY p.toolId
+        )
+        SELECT
+            COUNT(*),
+            COALESCE(SUM(a.visibilityFlags > 0), 0),
+            COALESCE(SUM(a.deprecated), 0),
+            COUNT(pc.n),
+            COALESCE(SUM(pc.n), 0)
+        FROM summary_actions a
+        LEFT JOIN parameter_counts pc ON pc.toolId = a.rowId
+    """, pl_params)
+    total, hidden, deprecated, with_parameters, parameter_count = cursor.fetchone()
+
+    summary = {
+        'total_count': total,
+        'by_type': grouped('toolType'),
+        'by_visibility': grouped('visibilityFlags'),
+        'by_app': grouped('app_name'),
+        'hidden_count': hidden,
+        'deprecated_count': deprecated,
+        'with_parameters': with_parameters,
+        'parameter_count': parameter_count,
+    }
+    cursor.execute("DROP TABLE temp.summary_actions")
+    return summary
+
+
+def get_visibility_counts(conn: sqlite3.Connection, query_filter: Optional[QueryFilter] = None) -> Dict[int, int]:
+    """
+    Number of actions per visibility level, as grouped by find_hidden_actions.py.
+
+    Counts the actions get_hidden_actions() would return with the same
+    filter, without fetching them. Only ContainerMetadata is joined (for
+    the app filter), so localization rows can't inflate the counts.
+
+    Args:
+        conn: Database connection
+        query_filter: Only count the matching actions
+
+    Returns:
+        Dictionary of visibilityFlags -> action count, in ascending order
+    """
+    where_sql, limit_sql, filter_params = (query_filter or QueryFilter()).compile(
+        ACTION_FILTER_COLUMNS, 't.visibilityFlags > 0'
+    )
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT visibilityFlags, COUNT(*)
+        FROM (
+            SELECT t.visibilityFlags
+            FROM Tools t
+            LEFT JOIN ContainerMetadata cm
+                ON t.sourceContainerId = cm.rowId
+            {where_sql}
+            ORDER BY t.visibilityFlags DESC, t.id
+            {limit_sql}
+        )
+        GROUP BY visibilityFlags
+        ORDER BY visibilityFlags
+    """, filter_params)
+    return {row[0]: row[1] for row in cursor.fetchall()}
 
 
 def get_type_info(conn: sqlite3.Connection, type_id: str) -> Optional[Dict[str, Any]]:
@@ -284,6 +786,92 @@ def get_type_info(conn: sqlite3.Connection, type_id: str) -> Optional[Dict[str,
     return None
 
 
+def get_types(conn: sqlite3.Connection, query_filter: Optional[QueryFilter] = None) -> List[Dict[str, Any]]:
+    """
+    Get all types (only the ones matching query_filter), ordered by identifier.
+
+    Args:
+        conn: Database connection
+        query_filter: Only return the matching types
+
+    Returns:
+        List of get_type_info() dictionaries
+    """
+    where_sql, limit_sql, filter_params = (query_filter or QueryFilter()).compile(TYPE_FILTER_COLUMNS)
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT
+            t.rowId,
+            t.id,
+            t.kind,
+            t.runtimeFlags,
+            t.runtimeRequirements,
+            tdr.name,
+            cm.id as container_id
+        FROM Types t
+        LEFT JOIN TypeDisplayRepresentations tdr
+            ON t.rowId = tdr.typeId
+            AND tdr.locale = 'en'
+        LEFT JOIN ContainerMetadata cm
+            ON t.sourceContainerId = cm.rowId
+        {where_sql}
+        ORDER BY t.rowId
+        {limit_sql}
+    """, filter_params)
+
+    types = []
+    for row in cursor.fetchall():
+        type_info = dict(row)
+        type_info['id'] = bytes(type_info['id']) if type_info['id'] else type_info['id']
+        type_info['runtimeRequirements'] = bytes(type_info['runtimeRequirements']) \
+            if type_info['runtimeRequirements'] else type_info['runtimeRequirements']
+        types.append(type_info)
+    return types
+
+
+def get_type_usage(conn: sqlite3.Connection) -> Dict[str, Dict[str, int]]:
+    """
+    How often each type is accepted by parameters and returned by actions.
+
+    Returns:
+        Dictionary of type identifier -> {'used_in_actions',
+        'total_parameter_uses'} plus 'used_as_output' for output types
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT
+            tpt.typeId,
+            COUNT(DISTINCT tpt.toolId) as used_in_actions,
+            COUNT(*) as total_parameter_uses
+        FROM ToolParameterTypes tpt
+        GROUP BY tpt.typeId
+        ORDER BY used_in_actions DESC
+    """)
+
+    type_usage = {}
+    for row in cursor.fetchall():
+        type_usage[row['typeId']] = {
+            'used_in_actions': row['used_in_actions'],
+            'total_parameter_uses': row['total_parameter_uses'],
+        }
+
+    cursor.execute("""
+        SELECT
+            tot.typeIdentifier,
+            COUNT(DISTINCT tot.toolId) as used_as_output
+        FROM ToolOutputTypes tot
+        GROUP BY tot.typeIdentifier
+    """)
+
+    for row in cursor.fetchall():
+        type_id = row['typeIdentifier']
+        if type_id not in type_usage:
+            type_usage[type_id] = {'used_in_actions': 0, 'total_parameter_uses': 0}
+        type_usage[type_id]['used_as_output'] = row['used_as_output']
+
+    return type_usage
+
+
 def get_entity_properties(conn: sqlite3.Connection, type_id: str, locale: str = "en") -> List[Dict[str, Any]]:
     """Get properties for an entity type"""
     cursor = conn.cursor()
@@ -325,3 +913,476 @@ def get_enum_cases(conn: sqlite3.Connection, type_id: str, locale: str = "en") -
         cases.append(dict(row))
 
     return cases
+
+
+def get_parameter_type_instances(conn: sqlite3.Connection, tool_ids: Optional[List[int]] = None) -> List[bytes]:
+    """
+    Get the distinct parameter typeInstance BLOBs.
+
+    Args:
+        conn: Database connection
+        tool_ids: Restrict to parameters of these action row IDs (None = all)
+
+    Returns:
+        List of unique typeInstance BLOBs
+    """
+    cursor = conn.cursor()
+    query = """
+        SELECT DISTINCT typeInstance
+        FROM Parameters
+        WHERE typeInstance IS NOT NULL
+    """
+    params: List[Any] = []
+
+    if tool_ids is not None:
+        if not tool_ids:
+            return []
+        query += f" AND toolId IN ({', '.join('?' for _ in tool_ids)})"
+        params.extend(tool_ids)
+
+    cursor.execute(query, params)
+    return [bytes(row[0]) for row in cursor.fetchall()]
+
+
+def _tool_id_condition(column: str, tool_ids: Optional[List[int]]) -> Tuple[str, List[Any]]:
+    """' AND column IN (...)' restricting a bulk query to some actions ('' for all)"""
+    if tool_ids is None:
+        return '', []
+    return f" AND {column} IN ({', '.join('?' for _ in tool_ids)})", list(tool_ids)
+
+
+def _locale_pivot(alias: str, columns: Tuple[str, ...], locales: List[str]) -> Tuple[str, List[Any]]:
+    """SELECT list pivoting per-locale rows into <column>_<locale index> columns"""
+    select = []
+    params: List[Any] = []
+    for index, locale in enumerate(locales):
+        for column in columns:
+            select.append(f"MAX(CASE WHEN {alias}.locale = ? THEN {alias}.{column} END) AS {column}_{index}")
+            params.append(locale)
+    return ',\n            '.join(select), params
+
+
+def _unpivot(row: sqlite3.Row, columns: Tuple[str, ...], locales: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Per-locale values of a _locale_pivot() row"""
+    return {
+        locale: {column: row[f"{column}_{index}"] for column in columns}
+        for index, locale in enumerate(locales)
+    }
+
+
+def get_bulk_action_strings(
+    conn: sqlite3.Connection,
+    locales: List[str],
+    tool_ids: Optional[List[int]] = None,
+) -> Dict[int, Dict[str, Dict[str, Any]]]:
+    """
+    Display strings of many actions in several locales, in one pivoted query.
+
+    Args:
+        conn: Database connection
+        locales: Locales to fetch
+        tool_ids: Restrict to these action row IDs (None = all)
+
+    Returns:
+        Dictionary of action row ID -> locale -> ACTION_STRING_COLUMNS values
+        (actions without any of the locales are missing)
+    """
+    pivot, params = _locale_pivot('tl', ACTION_STRING_COLUMNS, locales)
+    id_sql, id_params = _tool_id_condition('tl.toolId', tool_ids)
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT
+            tl.toolId,
+            {pivot}
+        FROM ToolLocalizations tl
+        WHERE tl.localizationUsage = 'display'
+            AND tl.locale IN ({', '.join('?' for _ in locales)}){id_sql}
+        GROUP BY tl.toolId
+    """, (*params, *locales, *id_params))
+
+    return {row['toolId']: _unpivot(row, ACTION_STRING_COLUMNS, locales) for row in cursor.fetchall()}
+
+
+def get_bulk_app_names(conn: sqlite3.Connection, locales: List[str]) -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    Localized app names in several locales, in one pivoted query.
+
+    Args:
+        conn: Database connection
+        locales: Locales to fetch
+
+    Returns:
+        Dictionary of container bundle id -> locale -> name
+    """
+    pivot, params = _locale_pivot('cml', ('name',), locales)
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT
+            cm.id,
+            {pivot}
+        FROM ContainerMetadata cm
+        JOIN ContainerMetadataLocalizations cml
+            ON cm.rowId = cml.containerId
+        WHERE cml.locale IN ({', '.join('?' for _ in locales)})
+        GROUP BY cm.rowId
+    """, (*params, *locales))
+
+    return {
+        row['id']: {locale: row[f"name_{index}"] for index, locale in enumerate(locales)}
+        for row in cursor.fetchall()
+    }
+
+
+def get_bulk_parameters(
+    conn: sqlite3.Connection,
+    locales: List[str],
+    tool_ids: Optional[List[int]] = None,
+) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Parameters of many actions with their strings in several locales.
+
+    Each parameter is a get_action_parameters() dictionary without name and
+    description, plus 'localized': locale -> PARAMETER_STRING_COLUMNS values.
+
+    Args:
+        conn: Database connection
+        locales: Locales to fetch
+        tool_ids: Restrict to these action row IDs (None = all)
+
+    Returns:
+        Dictionary of action row ID -> parameters in sortOrder
+    """
+    pivot, params = _locale_pivot('pl', PARAMETER_STRING_COLUMNS, locales)
+    pivoted = ', '.join(
+        f"strings.{column}_{index}" for index in range(len(locales)) for column in PARAMETER_STRING_COLUMNS
+    )
+    strings_id_sql, strings_id_params = _tool_id_condition('pl.toolId', tool_ids)
+    id_sql, id_params = _tool_id_condition('p.toolId', tool_ids)
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        WITH strings AS (
+            SELECT
+                pl.toolId,
+                pl.key,
+                {pivot}
+            FROM ParameterLocalizations pl
+            WHERE pl.locale IN ({', '.join('?' for _ in locales)}){strings_id_sql}
+            GROUP BY pl.toolId, pl.key
+        )
+        SELECT
+            p.toolId,
+            p.key,
+            p.sortOrder,
+            p.flags,
+            p.typeInstance,
+            p.relationships,
+            {pivoted}
+        FROM Parameters p
+        LEFT JOIN strings
+            ON p.toolId = strings.toolId
+            AND p.key = strings.key
+        WHERE 1{id_sql}
+        ORDER BY p.toolId, p.sortOrder
+    """, (*params, *locales, *strings_id_params, *id_params))
+
+    parameters: Dict[int, List[Dict[str, Any]]] = {}
+    for row in cursor.fetchall():
+        parameters.setdefault(row['toolId'], []).append({
+            'key': row['key'],
+            'sortOrder': row['sortOrder'],
+            'flags': row['flags'],
+            'typeInstance': bytes(row['typeInstance']) if row['typeInstance'] else None,
+            'relationships': bytes(row['relationships']) if row['relationships'] else None,
+            'localized': _unpivot(row, PARAMETER_STRING_COLUMNS, locales),
+        })
+    return parameters
+
+
+def get_bulk_parameter_types(
+    conn: sqlite3.Connection,
+    tool_ids: Optional[List[int]] = None,
+) -> Dict[Tuple[int, str], List[str]]:
+    """
+    Accepted types of many parameters (see get_parameter_types()).
+
+    Args:
+        conn: Database connection
+        tool_ids: Restrict to these action row IDs (None = all)
+
+    Returns:
+        Dictionary of (action row ID, parameter key) -> type identifiers
+    """
+    id_sql, id_params = _tool_id_condition('toolId', tool_ids)
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT toolId, key, typeId FROM ToolParameterTypes WHERE 1{id_sql}", id_params)
+
+    types: Dict[Tuple[int, str], List[str]] = {}
+    for tool_id, key, type_id in cursor.fetchall():
+        types.setdefault((tool_id, key), []).append(type_id)
+    return types
+
+
+def get_bulk_output_types(conn: sqlite3.Connection, tool_ids: Optional[List[int]] = None) -> Dict[int, List[str]]:
+    """
+    Output types of many actions (see get_action_output_types()).
+
+    Args:
+        conn: Database connection
+        tool_ids: Restrict to these action row IDs (None = all)
+
+    Returns:
+        Dictionary of action row ID -> output type identifiers
+    """
+    id_sql, id_params = _tool_id_condition('toolId', tool_ids)
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT toolId, typeIdentifier FROM ToolOutputTypes WHERE 1{id_sql}", id_params)
+
+    types: Dict[int, List[str]] = {}
+    for tool_id, type_id in cursor.fetchall():
+        types.setdefault(tool_id, []).append(type_id)
+    return types
+
+
+def get_bulk_localized_lists(
+    conn: sqlite3.Connection,
+    table: str,
+    locales: List[str],
+    tool_ids: Optional[List[int]] = None,
+) -> Dict[Tuple[int, str], List[str]]:
+    """
+    Categories or search keywords of many actions in several locales.
+
+    Lists keep the order get_action_categories()/get_action_keywords() return.
+
+    Args:
+        conn: Database connection
+        table: 'Categories' or 'SearchKeywords'
+        locales: Locales to fetch
+        tool_ids: Restrict to these action row IDs (None = all)
+
+    Returns:
+        Dictionary of (action row ID, locale) -> values
+
+    Raises:
+        ValueError: If the table isn't a localized list table
+    """
+    if table not in LOCALIZED_LIST_TABLES:
+        raise ValueError(f"Unknown localized list table: {table} (expected one of {', '.join(LOCALIZED_LIST_TABLES)})")
+
+    column, order = LOCALIZED_LIST_TABLES[table]
+    order_sql = f" ORDER BY toolId, locale, {order}" if order else ''
+    id_sql, id_params = _tool_id_condition('toolId', tool_ids)
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT toolId, locale, {column}
+        FROM {table}
+        WHERE locale IN ({', '.join('?' for _ in locales)}){id_sql}{order_sql}
+    """, (*locales, *id_params))
+
+    values: Dict[Tuple[int, str], List[str]] = {}
+    for tool_id, locale, value in cursor.fetchall():
+        values.setdefault((tool_id, locale), []).append(value)
+    return values
+
+
+def get_blob_column(conn: sqlite3.Connection, column: str, distinct: bool = True) -> List[bytes]:
+    """
+    Get the non-empty BLOBs stored in one protobuf column.
+
+    Args:
+        conn: Database connection
+        column: Column name from BLOB_COLUMNS (e.g. 'Parameters.typeInstance')
+        distinct: Return each unique BLOB once
+
+    Returns:
+        List of BLOBs
+
+    Raises:
+        ValueError: If the column is not a known BLOB column
+    """
+    if column not in BLOB_COLUMNS:
+        raise ValueError(f"Unknown BLOB column: {column} (expected one of {', '.join(BLOB_COLUMNS)})")
+
+    table, col = BLOB_COLUMNS[column]
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT {'DISTINCT ' if distinct else ''}{col}
+        FROM {table}
+        WHERE LENGTH({col}) > 0
+    """)
+
+    return [bytes(row[0]) for row in cursor.fetchall()]
+
+
+def get_blob_references(conn: sqlite3.Connection, column: str) -> List[Tuple[str, Optional[str], bytes]]:
+    """
+    Get every non-empty BLOB in a protobuf column with the row it belongs to.
+
+    Args:
+        conn: Database connection
+        column: Column name from BLOB_COLUMNS (e.g. 'Tools.requirements')
+
+    Returns:
+        List of (ref_id, ref_key, blob) tuples. ref_id is the action id for
+        Tools/Parameters columns, the type id for Types and the source type
+        id for TypeCoercions; ref_key is the parameter key or the coercion
+        target type (None otherwise).
+
+    Raises:
+        ValueError: If the column is not a known BLOB column
+    """
+    if column not in BLOB_COLUMNS:
+        raise ValueError(f"Unknown BLOB column: {column} (expected one of {', '.join(BLOB_COLUMNS)})")
+
+    cursor = conn.cursor()
+    cursor.execute(_BLOB_REFERENCE_QUERIES[column])
+
+    return [(row[0], row[1], bytes(row[2])) for row in cursor.fetchall()]
+
+
+def _fingerprint(data: Optional[str]) -> str:
+    """Hash the concatenated row data of one action"""
+    return hashlib.blake2b((data or '').encode('utf-8'), digest_size=16).hexdigest()
+
+
+# Rows an action's fingerprint covers besides its Tools row: (name, tables
+# the part needs, query of toolId/item/sort_key rows, item order within an
+# action). Orders only use content columns: the builder's order where it
+# has one (parameters by sortOrder, keywords by order), then the row itself.
+# type_refs is every type an action accepts or outputs. Parts of missing
+# type tables are left out, as in locale_coverage.
+_FINGERPRINT_PARTS: Tuple[Tuple[str, Tuple[str, ...], str, str], ...] = (
+    ('localizations', ('ToolLocalizations',), """
+        SELECT toolId, NULL AS sort_key,
+            quote(localizationUsage) || ',' || quote(name) || ',' || quote(descriptionSummary)
+            || ',' || quote(descriptionNote) || ',' || quote(deprecationMessage) AS item
+        FROM {schema}.ToolLocalizations
+        WHERE locale = :locale
+    """, 'item'),
+    ('parameters', ('Parameters', 'ParameterLocalizations'), """
+        SELECT p.toolId AS toolId, p.sortOrder AS sort_key,
+            quote(p.key) || ',' || quote(p.sortOrder) || ',' || quote(p.flags)
+            || ',' || quote(p.typeInstance) || ',' || quote(p.relationships)
+            || ',' || quote(pl.name) || ',' || quote(pl.description) AS item
+        FROM {schema}.Parameters p
+        LEFT JOIN {schema}.ParameterLocalizations pl
+            ON p.toolId = pl.toolId AND p.key = pl.key AND pl.locale = :locale
+    """, 'sort_key, item'),
+    ('parameter_types', ('ToolParameterTypes',), """
+        SELECT toolId, NULL AS sort_key, quote(key) || ',' || quote(typeId) AS item
+        FROM {schema}.ToolParameterTypes
+    """, 'item'),
+    ('output_types', ('ToolOutputTypes',), """
+        SELECT toolId, NULL AS sort_key, quote(typeIdentifier) AS item
+        FROM {schema}.ToolOutputTypes
+    """, 'item'),
+    ('categories', ('Categories',), """
+        SELECT toolId, NULL AS sort_key, quote(category) AS item
+        FROM {schema}.Categories
+        WHERE locale = :locale
+    """, 'item'),
+    ('keywords', ('SearchKeywords',), """
+        SELECT toolId, `order` AS sort_key, quote(keyword) || ',' || quote(`order`) AS item
+        FROM {schema}.SearchKeywords
+        WHERE locale = :locale
+    """, 'sort_key, item'),
+    ('types', ('Types', 'TypeDisplayRepresentations'), """
+        SELECT r.toolId, NULL AS sort_key,
+            quote(ty.rowId) || ',' || quote(ty.kind) || ',' || quote(ty.runtimeFlags) || ',' || quote(tdr.name) AS item
+        FROM type_refs r
+        JOIN {schema}.Types ty ON ty.rowId = r.typeId
+        LEFT JOIN {schema}.TypeDisplayRepresentations tdr ON tdr.typeId = ty.rowId AND tdr.locale = :locale
+    """, 'item'),
+    ('enum_cases', ('EnumerationCases',), """
+        SELECT r.toolId, NULL AS sort_key,
+            quote(ec.typeId) || ',' || quote(ec.id) || ',' || quote(ec.title) || ',' || quote(ec.subtitle) AS item
+        FROM type_refs r
+        JOIN {schema}.EnumerationCases ec ON ec.typeId = r.typeId AND ec.locale = :locale
+    """, 'item'),
+    ('entity_properties', ('EntityProperties', 'EntityPropertyLocalizations'), """
+        SELECT r.toolId, NULL AS sort_key,
+            quote(ep.typeId) || ',' || quote(ep.id) || ',' || quote(epl.displayName) AS item
+        FROM type_refs r
+        JOIN {schema}.EntityProperties ep ON ep.typeId = r.typeId
+        LEFT JOIN {schema}.EntityPropertyLocalizations epl
+            ON ep.id = epl.propertyId AND ep.typeId = epl.typeId AND epl.locale = :locale
+    """, 'item'),
+)
+
+
+def get_action_fingerprints(conn: sqlite3.Connection, locale: str = "en", schema: str = "main") -> Dict[str, str]:
+    """
+    Fingerprint every action by the rows its schema is built from.
+
+    The fingerprint covers the Tools row, its localizations, app container,
+    parameters (with localizations and accepted types), output types,
+    categories, keywords, and the types it accepts or outputs (names, enum
+    cases and entity properties, where those tables exist). Row IDs are left
+    out, so the same action in two database versions gets the same
+    fingerprint unless its content changed.
+
+    Each part is concatenated per action in SQL. group_concat() only takes
+    an ORDER BY from SQLite 3.44 on, so it runs as a window function over
+    rows ordered by content. The concatenated string of each action is then
+    hashed by the fingerprint() function registered on the connection.
+
+    Args:
+        conn: Database connection
+        locale: Language locale
+        schema: Database to read ('main' or the name of an ATTACHed database)
+
+    Returns:
+        Dictionary of action id -> fingerprint
+
+    Raises:
+        ValueError: If schema is not a plain identifier
+    """
+    if not schema.isidentifier():
+        raise ValueError(f"Invalid schema name: {schema}")
+
+    tables = {row[0] for row in conn.execute(f"SELECT name FROM {schema}.sqlite_master WHERE type = 'table'")}
+    ctes = [f"""type_refs AS (
+            SELECT toolId, typeId FROM {schema}.ToolParameterTypes
+            UNION
+            SELECT toolId, typeIdentifier FROM {schema}.ToolOutputTypes
+        )"""]
+    joins = []
+    parts = []
+    for name, required, query, order in _FINGERPRINT_PARTS:
+        if not all(table in tables for table in required):
+            parts.append("''")
+            continue
+        ctes.append(f"""{name} AS (
+            SELECT toolId, data FROM (
+                SELECT toolId, group_concat(item, '|') OVER rows_in_order AS data,
+                    row_number() OVER rows_in_order AS position
+                FROM ({query.format(schema=schema)})
+                WINDOW rows_in_order AS (
+                    PARTITION BY toolId ORDER BY {order}
+                    ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+                )
+            ) WHERE position = 1
+        )""")
+        joins.append(f"LEFT JOIN {name} ON {name}.toolId = t.rowId")
+        parts.append(f"ifnull({name}.data, '')")
+
+    conn.create_function('fingerprint', 1, _fingerprint, deterministic=True)
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        WITH
+        {', '.join(ctes)}
+        SELECT
+            t.id,
+            fingerprint(
+                quote(t.toolType) || ',' || quote(t.flags) || ',' || quote(t.visibilityFlags)
+                || ',' || quote(t.deprecationReplacementId) || ',' || quote(t.sourceActionProvider)
+                || ',' || quote(cm.id) || ',' || quote(cml.name)
+                || '#' || {" || '#' || ".join(parts)}
+            )
+        FROM {schema}.Tools t
+        LEFT JOIN {schema}.ContainerMetadata cm ON t.sourceContainerId = cm.rowId
+        LEFT JOIN {schema}.ContainerMetadataLocalizations cml ON cm.rowId = cml.containerId AND cml.locale = :locale
+        {' '.join(joins)}
+    """, {'locale': locale})
+
+    return {row[0]: row[1] for row in cursor.fetchall()}
@@ -0,0 +1,194 @@
+"""Process-pool decoding of protobuf BLOBs backed by shared memory
+
+BLOB analysis is pure Python and CPU-bound, so a single process is limited by
+the GIL. This module packs the deduplicated BLOBs of a run into one
+multiprocessing.shared_memory segment and lets worker processes analyze
+index ranges of it directly. Only the segment name crosses the process
+boundary on the way in; the decoded results are gathered back in order.
+
+Segment layout (native byte order):
+    [count: Q][offsets: Q * (count + 1)][payload bytes ...]
+
+BLOB i lives at payload[offsets[i]:offsets[i + 1]].
+"""
+
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .protobuf_parser import (
+    decode_protobuf_blob,
+    analyze_requirements_blob,
+    analyze_type_instance_blob,
+    analyze_coercion_blob,
+)
+
+
+# Analyzer registry. Workers look analyzers up by name so that nothing but a
+# short string has to be pickled to tell them what to run.
+ANALYZERS = {
+    'type_instance': analyze_type_instance_blob,
+    'requirements': analyze_requirements_blob,
+    'coercion': analyze_coercion_blob,
+    'raw': decode_protobuf_blob,
+}
+
+_WORD = 8  # sizeof(Q)
+
+# Per-worker state, set once by _init_worker. The segment itself is only
+# attached while a range is decoded, so every handle is closed again.
+_worker_shm_name: Optional[str] = None
+_worker_offsets: List[int] = []
+_worker_payload_start = 0
+_worker_analyzer = None
+_worker_options: Dict[str, Any] = {}
+
+
+def _pack_blobs(blobs: List[bytes]) -> shared_memory.SharedMemory:
+    """Copy BLOBs into a new shared memory segment using the layout above"""
+    count = len(blobs)
+    header_size = _WORD * (count + 2)
+    total = header_size + sum(len(b) for b in blobs)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(total, 1))
+
+    header = shm.buf[:header_size].cast('Q')
+    try:
+        header[0] = count
+        position = 0
+        for i, blob in enumerate(blobs):
+            header[i + 1] = position
+            position += len(blob)
+        header[count + 1] = position
+    finally:
+        header.release()
+
+    position = header_size
+    for blob in blobs:
+        shm.buf[position:position + len(blob)] = blob
+        position += len(blob)
+
+    return shm
+
+
+def _init_worker(shm_name: str, kind: str, options: Dict[str, Any]):
+    """Attach a worker process to the shared segment"""
+    global _worker_shm_name, _worker_offsets, _worker_payload_start, _worker_analyzer, _worker_options
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        count_view = shm.buf[:_WORD].cast('Q')
+        count = count_view[0]
+        count_view.release()
+
+        offsets_view = shm.buf[_WORD:_WORD * (count + 2)].cast('Q')
+        _worker_offsets = offsets_view.tolist()
+        offsets_view.release()
+    finally:
+        shm.close()
+
+    _worker_shm_name = shm_name
+
+    _worker_payload_start = _WORD * (count + 2)
+    _worker_analyzer = ANALYZERS[kind]
+    _worker_options = options
+
+
+def _decode_range(bounds: Tuple[int, int]) -> List[Dict[str, Any]]:
+    """Analyze BLOBs [start, end) of the shared segment"""
+    start, end = bounds
+    base = _worker_payload_start
+
+    shm = shared_memory.SharedMemory(name=_worker_shm_name)
+    try:
+        blobs = [bytes(shm.buf[base + _worker_offsets[i]:base + _worker_offsets[i + 1]]) for i in range(start, end)]
+    finally:
+        shm.close()
+    return [_worker_analyzer(blob, **_worker_options) for blob in blobs]
+
+
+def chunk_ranges(count: int, workers: int, chunk_size: Optional[int]) -> List[Tuple[int, int]]:
+    """Split [0, count) into contiguous ranges"""
+    if not chunk_size:
+        # A few chunks per worker keeps the pool busy when BLOB sizes vary
+        chunk_size = max(1, -(-count // (workers * 4)))
+    return [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+
+
+def decode_unique_blobs(
+    blobs: Iterable[bytes],
+    kind: str = 'type_instance',
+    workers: int = 1,
+    chunk_size: Optional[int] = None,
+    options: Optional[Dict[str, Any]] = None,
+) -> Dict[bytes, Dict[str, Any]]:
+    """
+    Analyze each distinct BLOB once, optionally across worker processes.
+
+    Args:
+        blobs: BLOBs to analyze (duplicates and empty values are skipped)
+        kind: Analyzer to run, one of ANALYZERS
+        workers: Number of worker processes (<= 1 decodes in-process)
+        chunk_size: BLOBs per task (default: derived from workers)
+        options: Keyword arguments passed to the analyzer
+
+    Returns:
+        Dictionary of BLOB -> analysis, in first-seen order
+    """
+    if kind not in ANALYZERS:
+        raise ValueError(f"Unknown analyzer: {kind} (expected one of {', '.join(ANALYZERS)})")
+
+    unique = list(dict.fromkeys(bytes(b) for b in blobs if b))
+    options = options or {}
+
+    if workers <= 1 or len(unique) < 2:
+        analyzer = ANALYZERS[kind]
+        return {blob: analyzer(blob, **options) for blob in unique}
+
+    shm = _pack_blobs(unique)
+    try:
+        ranges = chunk_ranges(len(unique), workers, chunk_size)
+        with multiprocessing.Pool(
+            processes=min(workers, len(ranges)),
+            initializer=_init_worker,
+            initargs=(shm.name, kind, options),
+        ) as pool:
+            # map() returns chunks in submission order
+            chunks = pool.map(_decode_range, ranges)
+    finally:
+        shm.close()
+        shm.unlink()
+
+    analyses = {}
+    index = 0
+    for chunk in chunks:
+        for analysis in chunk:
+            analyses[unique[index]] = analysis
+            index += 1
+    return analyses
+
+
+def decode_blobs(
+    blobs: List[bytes],
+    kind: str = 'type_instance',
+    workers: int = 1,
+    chunk_size: Optional[int] = None,
+    options: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Analyze a list of BLOBs, returning results in input order.
+
+    Duplicate BLOBs are decoded once and share the same analysis dictionary.
+
+    Args:
+        blobs: BLOBs to analyze
+        kind: Analyzer to run, one of ANALYZERS
+        workers: Number of worker processes (<= 1 decodes in-process)
+        chunk_size: BLOBs per task (default: derived from workers)
+        options: Keyword arguments passed to the analyzer
+
+    Returns:
+        List of analyses aligned with blobs (empty BLOBs map to {})
+    """
+    analyses = decode_unique_blobs(blobs, kind, workers, chunk_size, options)
+    return [analyses.get(bytes(b), {}) if b else {} for b in blobs]
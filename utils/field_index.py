@@ -0,0 +1,276 @@
+"""Corpus-wide field-path index over decoded protobuf BLOBs
+
+Finding "every parameter whose typeInstance has field 3.1.3 = 7" otherwise
+means decoding every BLOB in the database. build_field_index() decodes each
+distinct BLOB of every BLOB column once and records its (field path, wire
+type, value) triples in a sidecar SQLite database, next to the BLOB catalog
+(see utils.blob_catalog) that maps each payload to the rows referencing it.
+query_field_index() then answers such lookups with one indexed join.
+
+Sidecar layout (on top of the catalog's payloads/blob_refs/analyses):
+    index_info   (key, value)                        source DB fingerprint
+    field_values (digest, path, wire_type, value)    decoded fields
+
+Paths are dotted field numbers ('3.1.3'). Nested messages get a row of
+their own with a NULL value so that presence queries work at any level.
+"""
+
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .db_utils import connect_db
+from .blob_catalog import BlobCatalog
+from .protobuf_parser import (
+    WIRE_VARINT,
+    WIRE_LENGTH_DELIMITED,
+    iter_wire_fields,
+    is_text_payload,
+    is_wire_message,
+)
+
+
+INDEX_SCHEMA = """
+    CREATE TABLE index_info (key TEXT PRIMARY KEY, value TEXT);
+    CREATE TABLE field_values (digest TEXT, path TEXT, wire_type INTEGER, value);
+"""
+
+# Created after the bulk insert, which is considerably faster than
+# maintaining it row by row
+INDEX_INDEXES = """
+    CREATE INDEX idx_field_values_path_value ON field_values(path, value);
+"""
+
+# Sentinel for "any value" (presence) queries
+ANY_VALUE = object()
+
+
+def default_index_path(db_path: str) -> str:
+    """Sidecar index path for a database (Tools-prod.sqlite -> Tools-prod.fields.sqlite)"""
+    path = Path(db_path)
+    return str(path.with_name(f"{path.stem}.fields.sqlite"))
+
+
+def _db_fingerprint(db_path: str) -> Dict[str, str]:
+    """Identify a database file version by size and modification time"""
+    stat = os.stat(db_path)
+    return {
+        'source_size': str(stat.st_size),
+        'source_mtime_ns': str(stat.st_mtime_ns),
+    }
+
+
+def iter_field_paths(blob: bytes, max_depth: int = 8) -> Iterator[Tuple[str, int, Any]]:
+    """
+    Walk a BLOB and yield every field with its dotted path.
+
+    Args:
+        blob: Protobuf BLOB
+        max_depth: Maximum nesting depth to descend into
+
+    Yields:
+        (path, wire_type, value) where value is an int for varints, a str for
+        printable payloads, None for nested messages and bytes otherwise
+
+    Raises:
+        ValueError: If the top-level BLOB is malformed
+    """
+    stack = [('', memoryview(blob), 1)]
+    while stack:
+        prefix, data, depth = stack.pop()
+        for number, wire_type, value in iter_wire_fields(data):
+            path = f"{prefix}.{number}" if prefix else str(number)
+            if wire_type == WIRE_VARINT:
+                yield path, wire_type, value
+            elif wire_type != WIRE_LENGTH_DELIMITED:
+                yield path, wire_type, bytes(value)
+            elif is_text_payload(value):
+                yield path, wire_type, bytes(value).decode('utf-8')
+            elif depth < max_depth and is_wire_message(value):
+                yield path, wire_type, None
+                stack.append((path, value, depth + 1))
+            else:
+                yield path, wire_type, bytes(value)
+
+
+def build_field_index(
+    db_path: str,
+    index_path: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    verbose: bool = False,
+) -> Dict[str, Any]:
+    """
+    Decode every BLOB column once and (re)build the sidecar field index.
+
+    Args:
+        db_path: Path to Tools-prod.sqlite
+        index_path: Sidecar database path (default: default_index_path())
+        columns: BLOB columns to index (default: all of db_utils.BLOB_COLUMNS)
+        verbose: Print per-column progress
+
+    Returns:
+        Statistics dictionary (index_path, references, unique_blobs,
+        field_values, malformed, seconds)
+    """
+    start = time.perf_counter()
+    index_path = index_path or default_index_path(db_path)
+
+    conn = connect_db(db_path)
+    catalog = BlobCatalog.from_db(conn, columns)
+    conn.close()
+
+    catalog.save(index_path)
+
+    index = sqlite3.connect(index_path)
+    stats = {
+        'index_path': index_path,
+        'references': len(catalog.references),
+        'unique_blobs': len(catalog),
+        'field_values': 0,
+        'malformed': 0,
+    }
+
+    with index:
+        index.executescript(INDEX_SCHEMA)
+
+        for digest, blob in catalog.payloads.items():
+            try:
+                # The same field value can repeat within a BLOB; index it once
+                values = list(dict.fromkeys(iter_field_paths(blob)))
+            except ValueError:
+                stats['malformed'] += 1
+                continue
+            index.executemany(
+                "INSERT INTO field_values VALUES (?, ?, ?, ?)",
+                [(digest, path, wire_type, value) for path, wire_type, value in values],
+            )
+            stats['field_values'] += len(values)
+
+        if verbose:
+            for column, column_stats in catalog.reuse_stats()['columns'].items():
+                print(f"  {column}: {column_stats['references']} rows, {column_stats['unique_payloads']} unique BLOBs")
+
+        info = _db_fingerprint(db_path)
+        info['source_path'] = os.path.abspath(db_path)
+        info['built_at'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        index.executemany("INSERT INTO index_info VALUES (?, ?)", info.items())
+        index.executescript(INDEX_INDEXES)
+
+    index.close()
+
+    stats['seconds'] = time.perf_counter() - start
+    return stats
+
+
+def index_is_stale(index_path: str, db_path: str) -> bool:
+    """
+    Check whether an index was built from a different version of the database.
+
+    Args:
+        index_path: Sidecar database path
+        db_path: Path to Tools-prod.sqlite
+
+    Returns:
+        True if the database size or modification time changed since the build
+    """
+    index = sqlite3.connect(index_path)
+    info = dict(index.execute("SELECT key, value FROM index_info").fetchall())
+    index.close()
+
+    current = _db_fingerprint(db_path)
+    return any(info.get(key) != value for key, value in current.items())
+
+
+def parse_field_query(expression: str) -> Tuple[str, Any]:
+    """
+    Parse a 'PATH[=VALUE]' query expression.
+
+    Paths may be dotted field numbers ('3.1.3') or decode_protobuf_blob()
+    style names ('field_3.field_1.field_3'). Values are integers, 0x-prefixed
+    hex for raw bytes, or strings (optionally quoted).
+
+    Args:
+        expression: Query expression
+
+    Returns:
+        Tuple of (path, value), value being ANY_VALUE for presence queries
+
+    Raises:
+        ValueError: If the path is not a dotted list of field numbers
+    """
+    path, sep, raw_value = expression.partition('=')
+    parts = [part.strip().removeprefix('field_') for part in path.strip().split('.')]
+    if not all(part.isdigit() for part in parts):
+        raise ValueError(f"Invalid field path: {path!r} (expected e.g. 3.1.3 or field_3.field_1)")
+    path = '.'.join(str(int(part)) for part in parts)
+
+    if not sep:
+        return path, ANY_VALUE
+
+    raw_value = raw_value.strip()
+    if len(raw_value) >= 2 and raw_value[0] == raw_value[-1] and raw_value[0] in '"\'':
+        return path, raw_value[1:-1]
+    if raw_value.lower().startswith('0x'):
+        return path, bytes.fromhex(raw_value[2:])
+    try:
+        return path, int(raw_value)
+    except ValueError:
+        return path, raw_value
+
+
+def query_field_index(
+    index_path: str,
+    path: str,
+    value: Any = ANY_VALUE,
+    column: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Find the rows whose BLOBs contain a field path (with a given value).
+
+    Args:
+        index_path: Sidecar database built by build_field_index()
+        path: Dotted field path (see parse_field_query())
+        value: Value to match, or ANY_VALUE for presence
+        column: Restrict to one BLOB column (e.g. 'Tools.requirements')
+        limit: Maximum number of matches
+
+    Returns:
+        List of matches with column, ref_id, ref_key, path, wire_type, value
+        and the payload digest, ordered by column and ref_id
+    """
+    query = """
+        SELECT DISTINCT r.column_name, r.ref_id, r.ref_key, f.path, f.wire_type, f.value, f.digest
+        FROM field_values f
+        JOIN blob_refs r ON r.digest = f.digest
+        WHERE f.path = ?
+    """
+    params: List[Any] = [path]
+
+    if value is not ANY_VALUE:
+        query += " AND f.value = ?"
+        params.append(value)
+
+    if column:
+        query += " AND r.column_name = ?"
+        params.append(column)
+
+    query += " ORDER BY r.column_name, r.ref_id, r.ref_key"
+
+    if limit:
+        query += " LIMIT ?"
+        params.append(limit)
+
+    index = sqlite3.connect(index_path)
+    index.row_factory = sqlite3.Row
+    rows = index.execute(query, params).fetchall()
+    index.close()
+
+    matches = []
+    for row in rows:
+        match = dict(row)
+        match['column'] = match.pop('column_name')
+        matches.append(match)
+    return matches
@@ -0,0 +1,142 @@
+"""Incremental extraction between Tools-prod database versions
+
+A full extraction writes a manifest next to actions_complete.json holding
+one fingerprint per action (see db_utils.get_action_fingerprints()) and the
+options the output was built with. The next run fingerprints the new
+database, compares, rebuilds only added and changed actions and splices
+them into the previous output; removed actions drop out.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .schema_model import ActionSchema
+
+MANIFEST_VERSION = 1
+
+
+def manifest_path_for(output_path: str) -> str:
+    """Manifest path for an output file (actions_complete.json -> actions_complete.manifest.json)"""
+    path = Path(output_path)
+    return str(path.with_name(f"{path.stem}.manifest.json"))
+
+
+def write_manifest(path: str, fingerprints: Dict[str, str], options: Dict[str, Any], db_path: str):
+    """
+    Write the fingerprint manifest of an extraction.
+
+    Args:
+        path: Manifest path
+        fingerprints: Action id -> fingerprint of the extracted database
+        options: Extraction options the output depends on
+        db_path: Database the output was extracted from
+    """
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'source': str(db_path),
+        'options': options,
+        'fingerprints': fingerprints,
+    }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    """
+    Load a fingerprint manifest.
+
+    Args:
+        path: Manifest path
+
+    Returns:
+        Manifest dictionary
+
+    Raises:
+        FileNotFoundError: If the manifest doesn't exist
+        ValueError: If the manifest was written by an incompatible version
+    """
+    if not Path(path).exists():
+        raise FileNotFoundError(f"Manifest not found: {path} (run a full --all extraction first)")
+
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported manifest version in {path}: {manifest.get('version')}")
+
+    return manifest
+
+
+def check_options(manifest: Dict[str, Any], options: Dict[str, Any]):
+    """
+    Make sure the previous output was built with the same options.
+
+    Raises:
+        ValueError: If any option differs
+    """
+    previous = manifest.get('options', {})
+    differing = sorted(key for key in set(previous) | set(options) if previous.get(key) != options.get(key))
+    if differing:
+        raise ValueError(
+            f"Previous output was extracted with different options ({', '.join(differing)}); "
+            f"run a full extraction instead"
+        )
+
+
+def diff_fingerprints(previous: Dict[str, str], current: Dict[str, str]) -> Dict[str, List[str]]:
+    """
+    Compare two fingerprint maps.
+
+    Args:
+        previous: Action id -> fingerprint of the previous database
+        current: Action id -> fingerprint of the current database
+
+    Returns:
+        Dictionary with sorted 'added', 'removed', 'changed' and 'unchanged' id lists
+    """
+    added = [action_id for action_id in current if action_id not in previous]
+    removed = [action_id for action_id in previous if action_id not in current]
+    changed = []
+    unchanged = []
+    for action_id, fingerprint in current.items():
+        if action_id in previous:
+            (unchanged if previous[action_id] == fingerprint else changed).append(action_id)
+
+    return {
+        'added': sorted(added),
+        'removed': sorted(removed),
+        'changed': sorted(changed),
+        'unchanged': sorted(unchanged),
+    }
+
+
+def splice_schemas(
+    previous: List[ActionSchema],
+    rebuilt: Dict[str, ActionSchema],
+    order: List[str],
+) -> List[ActionSchema]:
+    """
+    Merge rebuilt schemas into the previous output.
+
+    Args:
+        previous: Schemas of the previous output
+        rebuilt: Action id -> freshly built schema
+        order: Action ids of the current database in output order; ids
+            missing from it (removed actions) are dropped
+
+    Returns:
+        Schemas in the given order
+
+    Raises:
+        KeyError: If an action is neither rebuilt nor in the previous output
+    """
+    previous_by_id: Dict[str, ActionSchema] = {schema.id: schema for schema in previous}
+    return [rebuilt[action_id] if action_id in rebuilt else previous_by_id[action_id] for action_id in order]
+
+
+def missing_from(previous: List[ActionSchema], action_ids: List[str]) -> List[str]:
+    """Action ids that have no schema in the previous output"""
+    present = {schema.id for schema in previous}
+    return [action_id for action_id in action_ids if action_id not in present]
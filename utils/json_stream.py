@@ -0,0 +1,183 @@
+"""Incremental reading of large JSON outputs, one record at a time
+
+The extractor writes top-level JSON arrays of records (actions_complete.json,
+types_complete.json) that run to hundreds of megabytes. json.load() has to
+hold the whole document plus every parsed record at once; iter_records()
+instead reads the file in chunks and yields each top-level element as soon
+as it is complete, so memory stays proportional to the largest record.
+Newline-delimited JSON (one record per line) is read the same way.
+
+dump_json_array() is the writing side: it serializes records one at a time
+into the same text json.dump(records, indent=...) would produce.
+"""
+
+import json
+from typing import Any, Iterable, Iterator, TextIO
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',]}'
+
+
+class _ChunkReader:
+    """Character buffer over a text stream with on-demand refills"""
+
+    def __init__(self, stream: TextIO, chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append at least one more chunk (doubling for large records); False at EOF"""
+        if self.eof:
+            return False
+        # Drop consumed text so the buffer only ever holds the current record
+        if self.pos:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        chunk = self.stream.read(max(self.chunk_size, len(self.buffer)))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at EOF), without consuming it"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def decode(self, decoder: json.JSONDecoder) -> Any:
+        """Decode one complete JSON value at the current position"""
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # A number cut at the buffer edge ('12' of '123', '-1' of '-1.5')
+            # parses fine on its own; only accept it once a delimiter follows
+            if (
+                self.buffer[self.pos] not in '{["'
+                and (end == len(self.buffer) or self.buffer[end] not in _DELIMITERS)
+                and self.fill()
+            ):
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(stream: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array one by one.
+
+    Args:
+        stream: Text stream positioned at the array
+        chunk_size: Characters to read per refill
+
+    Yields:
+        Each array element, fully parsed
+
+    Raises:
+        ValueError: If the document is not a well-formed JSON array
+    """
+    reader = _ChunkReader(stream, chunk_size)
+    decoder = json.JSONDecoder()
+
+    if reader.peek() != '[':
+        raise ValueError("Expected a JSON array")
+    reader.pos += 1
+
+    if reader.peek() == ']':
+        reader.pos += 1
+    else:
+        while True:
+            if reader.peek() == '':
+                raise ValueError("Unexpected end of JSON array")
+            yield reader.decode(decoder)
+
+            separator = reader.peek()
+            reader.pos += 1
+            if separator == ']':
+                break
+            if separator != ',':
+                raise ValueError(f"Expected ',' or ']' in JSON array, found {separator!r}")
+
+    if reader.peek() != '':
+        raise ValueError("Unexpected data after JSON array")
+
+
+def iter_ndjson(stream: TextIO) -> Iterator[Any]:
+    """
+    Yield the records of a newline-delimited JSON stream (blank lines skipped).
+
+    Args:
+        stream: Text stream
+
+    Yields:
+        Each parsed line
+    """
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_records(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Stream the records of a JSON array file or an NDJSON file.
+
+    The format is detected from the first non-whitespace character: '['
+    means a JSON array, anything else newline-delimited records.
+
+    Args:
+        path: File path
+        chunk_size: Characters to read per refill (JSON arrays only)
+
+    Yields:
+        Each record
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        first = ''
+        while True:
+            char = f.read(1)
+            if not char or char not in _WHITESPACE:
+                first = char
+                break
+        f.seek(0)
+
+        if first == '[':
+            yield from iter_json_array(f, chunk_size)
+        else:
+            yield from iter_ndjson(f)
+
+
+def dump_json_array(records: Iterable[Any], stream: TextIO, indent: int = 2) -> int:
+    """
+    Write records as an indented JSON array without holding them all.
+
+    Args:
+        records: Records to write
+        stream: Text stream to write to
+        indent: Indentation, as for json.dump()
+
+    Returns:
+        Number of records written
+    """
+    prefix = '\n' + ' ' * indent
+    count = 0
+    for record in records:
+        # Strings never hold raw newlines, so every line break is indentation
+        text = json.dumps(record, indent=indent, ensure_ascii=False).replace('\n', prefix)
+        stream.write(('[' if count == 0 else ',') + prefix + text)
+        count += 1
+    stream.write('\n]' if count else '[]')
+    return count
@@ -0,0 +1,204 @@
+"""Lazy protobuf message tree over a BLOB
+
+decode_protobuf_blob() hex-encodes every length-delimited field that is not
+a printable string, so nested messages are never explored and their payload
+doubles in size in the JSON output. LazyMessage instead wraps the BLOB in a
+memoryview and only walks a (sub)message when one of its fields is read or
+when it is serialized down to a requested depth. Raw payloads stay
+zero-copy slices of the original buffer until something asks for them.
+"""
+
+import base64
+import struct
+from typing import Any, Dict, List, Optional
+
+from .protobuf_parser import (
+    WIRE_VARINT,
+    WIRE_64BIT,
+    WIRE_LENGTH_DELIMITED,
+    WIRE_32BIT,
+    Buffer,
+    iter_wire_fields,
+    is_text_payload,
+    is_wire_message,
+)
+
+
+# How to_dict() renders raw bytes and messages below the requested depth.
+# 'hex' keeps the payload, like the flat decoding; 'size' and 'omit' drop it.
+BYTES_FORMATS = ('hex', 'base64', 'size', 'omit')
+
+
+class LazyMessage:
+    """
+    Read-only view of a protobuf message that decodes on demand.
+
+    Field values are interpreted as:
+        varint           -> int
+        64-bit / 32-bit  -> float (little-endian double / float)
+        length-delimited -> str for printable UTF-8, LazyMessage for payloads
+                            that parse as a message, memoryview otherwise
+    """
+
+    __slots__ = ('_data', '_fields')
+
+    def __init__(self, data: Buffer):
+        self._data = data if isinstance(data, memoryview) else memoryview(data)
+        self._fields: Optional[Dict[int, List[List[Any]]]] = None
+
+    def _scan(self) -> Dict[int, List[List[Any]]]:
+        """Index top-level fields on first use (raises ValueError if malformed)"""
+        if self._fields is None:
+            fields: Dict[int, List[List[Any]]] = {}
+            for number, wire_type, value in iter_wire_fields(self._data):
+                # [wire_type, raw value, interpreted value once computed]
+                fields.setdefault(number, []).append([wire_type, value, _PENDING])
+            self._fields = fields
+        return self._fields
+
+    def _value(self, entry: List[Any]) -> Any:
+        """Interpret a field entry, caching the result (and any child message)"""
+        if entry[2] is _PENDING:
+            entry[2] = _interpret(entry[0], entry[1])
+        return entry[2]
+
+    @staticmethod
+    def _is_text(entry: List[Any]) -> bool:
+        """Whether a length-delimited entry is text, using the cache when possible"""
+        if entry[2] is _PENDING:
+            return is_text_payload(entry[1])
+        return isinstance(entry[2], str)
+
+    @property
+    def raw(self) -> memoryview:
+        """The message bytes as a zero-copy view"""
+        return self._data
+
+    @property
+    def is_decoded(self) -> bool:
+        """Whether the top-level fields have been indexed yet"""
+        return self._fields is not None
+
+    def field_numbers(self) -> List[int]:
+        """Field numbers present, in order of first appearance"""
+        return list(self._scan())
+
+    def __len__(self) -> int:
+        return len(self._scan())
+
+    def __contains__(self, number: int) -> bool:
+        return number in self._scan()
+
+    def __getitem__(self, number: int) -> Any:
+        """Value of a singular field (last occurrence wins, as in protobuf)"""
+        return self._value(self._scan()[number][-1])
+
+    def get(self, number: int, default: Any = None) -> Any:
+        """Value of a singular field, or default if absent"""
+        if number not in self._scan():
+            return default
+        return self[number]
+
+    def get_all(self, number: int) -> List[Any]:
+        """All values of a (repeated) field"""
+        return [self._value(entry) for entry in self._scan().get(number, [])]
+
+    def wire_type(self, number: int) -> int:
+        """Wire type of a field's last occurrence"""
+        return self._scan()[number][-1][0]
+
+    def to_dict(self, depth: int = 1, bytes_format: str = 'hex') -> Dict[str, Any]:
+        """
+        Serialize the message, expanding nested messages down to depth.
+
+        Args:
+            depth: Message levels to expand (1 = this message only)
+            bytes_format: Rendering of raw bytes and of messages below depth:
+                'hex' (default), 'base64', 'size' ({'bytes': N}) or 'omit'
+
+        Returns:
+            Dictionary of 'field_N' -> value (lists for repeated fields)
+        """
+        if bytes_format not in BYTES_FORMATS:
+            raise ValueError(f"Unknown bytes format: {bytes_format} (expected one of {', '.join(BYTES_FORMATS)})")
+
+        result = {}
+        for number, occurrences in self._scan().items():
+            values = []
+            for entry in occurrences:
+                if entry[0] == WIRE_LENGTH_DELIMITED and depth <= 1 and not self._is_text(entry):
+                    # Below the requested depth: don't expand (or even detect) messages
+                    rendered = _render_bytes(entry[1], bytes_format)
+                else:
+                    value = self._value(entry)
+                    if isinstance(value, LazyMessage):
+                        rendered = value.to_dict(depth - 1, bytes_format)
+                    elif isinstance(value, memoryview):
+                        rendered = _render_bytes(value, bytes_format)
+                    else:
+                        rendered = value
+                if rendered is not _OMIT:
+                    values.append(rendered)
+
+            if values:
+                result[f"field_{number}"] = values[0] if len(values) == 1 else values
+
+        return result
+
+    def __repr__(self) -> str:
+        state = f"{len(self._fields)} fields" if self._fields is not None else "not decoded"
+        return f"<LazyMessage {len(self._data)} bytes, {state}>"
+
+
+_OMIT = object()
+_PENDING = object()
+
+
+def _interpret(wire_type: int, value: Any) -> Any:
+    """Turn a raw field value into a Python value or child LazyMessage"""
+    if wire_type == WIRE_VARINT:
+        return value
+    if wire_type == WIRE_64BIT:
+        return struct.unpack('<d', value)[0]
+    if wire_type == WIRE_32BIT:
+        return struct.unpack('<f', value)[0]
+    if is_text_payload(value):
+        return bytes(value).decode('utf-8')
+    if is_wire_message(value):
+        return LazyMessage(value)
+    return value
+
+
+def _render_bytes(data: memoryview, bytes_format: str) -> Any:
+    """Render an opaque payload according to bytes_format"""
+    if bytes_format == 'size':
+        return {'bytes': len(data)}
+    if bytes_format == 'hex':
+        return data.hex()
+    if bytes_format == 'base64':
+        return base64.b64encode(data).decode('ascii')
+    return _OMIT
+
+
+def decode_message_tree(blob: bytes, depth: int = 1, bytes_format: str = 'hex') -> Dict[str, Any]:
+    """
+    Decode a BLOB as a message tree down to a given depth.
+
+    Args:
+        blob: Protobuf BLOB
+        depth: Message levels to expand
+        bytes_format: See LazyMessage.to_dict()
+
+    Returns:
+        Dictionary with raw_size, depth and fields (or parse_error)
+    """
+    result = {
+        'raw_size': len(blob),
+        'depth': depth,
+        'fields': {},
+    }
+    try:
+        result['fields'] = LazyMessage(blob).to_dict(depth, bytes_format)
+    except ValueError as e:
+        result['parse_error'] = str(e)
+    return result
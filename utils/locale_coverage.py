@@ -0,0 +1,187 @@
+"""Locale × app coverage matrix computed with aggregate queries
+
+For every locale found in the localization tables and every app container,
+counts how many actions, parameters, actions with categories, actions with
+keywords and enum cases have strings in that locale. Each count is one
+GROUP BY over a localization table, so the whole matrix takes a handful of
+queries instead of one extraction per locale.
+
+Example:
+    conn = connect_db('Tools-prod.sqlite')
+    for row in get_locale_coverage(conn):
+        print(row['locale'], row['app'], row['actions_coverage'])
+"""
+
+import csv
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Tables whose locales make up the matrix
+LOCALE_TABLES = ('ToolLocalizations', 'ParameterLocalizations', 'Categories', 'SearchKeywords', 'EnumerationCases')
+
+# (total, localized) query per metric. Totals are grouped by app; localized
+# counts by locale and app. A metric is skipped when its table is missing.
+_TOOL_APP = """
+    JOIN Tools t ON t.rowId = {alias}.toolId
+    LEFT JOIN ContainerMetadata cm ON t.sourceContainerId = cm.rowId
+"""
+
+COVERAGE_QUERIES: Dict[str, Tuple[str, str, str]] = {
+    'actions': ('ToolLocalizations', """
+        SELECT cm.id AS app, COUNT(*)
+        FROM Tools t
+        LEFT JOIN ContainerMetadata cm ON t.sourceContainerId = cm.rowId
+        GROUP BY cm.id
+    """, f"""
+        SELECT tl.locale, cm.id AS app, COUNT(DISTINCT tl.toolId)
+        FROM ToolLocalizations tl
+        {_TOOL_APP.format(alias='tl')}
+        WHERE tl.localizationUsage = 'display' AND tl.name IS NOT NULL
+        GROUP BY tl.locale, cm.id
+    """),
+    'parameters': ('ParameterLocalizations', f"""
+        SELECT cm.id AS app, COUNT(*)
+        FROM Parameters p
+        {_TOOL_APP.format(alias='p')}
+        GROUP BY cm.id
+    """, f"""
+        SELECT pl.locale, cm.id AS app, COUNT(*)
+        FROM ParameterLocalizations pl
+        JOIN Parameters p ON p.toolId = pl.toolId AND p.key = pl.key
+        {_TOOL_APP.format(alias='p')}
+        WHERE pl.name IS NOT NULL
+        GROUP BY pl.locale, cm.id
+    """),
+    # Actions with categories in some locale, and in each locale
+    'categories': ('Categories', f"""
+        SELECT cm.id AS app, COUNT(DISTINCT c.toolId)
+        FROM Categories c
+        {_TOOL_APP.format(alias='c')}
+        GROUP BY cm.id
+    """, f"""
+        SELECT c.locale, cm.id AS app, COUNT(DISTINCT c.toolId)
+        FROM Categories c
+        {_TOOL_APP.format(alias='c')}
+        GROUP BY c.locale, cm.id
+    """),
+    'keywords': ('SearchKeywords', f"""
+        SELECT cm.id AS app, COUNT(DISTINCT k.toolId)
+        FROM SearchKeywords k
+        {_TOOL_APP.format(alias='k')}
+        GROUP BY cm.id
+    """, f"""
+        SELECT k.locale, cm.id AS app, COUNT(DISTINCT k.toolId)
+        FROM SearchKeywords k
+        {_TOOL_APP.format(alias='k')}
+        GROUP BY k.locale, cm.id
+    """),
+    # Distinct (type, case) pairs in some locale, and titled cases per locale
+    'enum_cases': ('EnumerationCases', """
+        SELECT cm.id AS app, COUNT(*)
+        FROM (SELECT DISTINCT typeId, id FROM EnumerationCases) ec
+        JOIN Types ty ON ty.rowId = ec.typeId
+        LEFT JOIN ContainerMetadata cm ON ty.sourceContainerId = cm.rowId
+        GROUP BY cm.id
+    """, """
+        SELECT ec.locale, cm.id AS app, COUNT(*)
+        FROM EnumerationCases ec
+        JOIN Types ty ON ty.rowId = ec.typeId
+        LEFT JOIN ContainerMetadata cm ON ty.sourceContainerId = cm.rowId
+        WHERE ec.title IS NOT NULL
+        GROUP BY ec.locale, cm.id
+    """),
+}
+
+METRICS = tuple(COVERAGE_QUERIES)
+
+
+def _existing_tables(conn: sqlite3.Connection) -> set:
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+    return {row[0] for row in rows}
+
+
+def discover_locales(conn: sqlite3.Connection) -> List[str]:
+    """Every locale present in the localization tables, sorted"""
+    tables = [table for table in LOCALE_TABLES if table in _existing_tables(conn)]
+    if not tables:
+        return []
+    union = ' UNION '.join(f"SELECT locale FROM {table}" for table in tables)
+    return [row[0] for row in conn.execute(f"SELECT locale FROM ({union}) WHERE locale IS NOT NULL ORDER BY locale")]
+
+
+def _app_order(app: Optional[str]) -> Tuple[bool, str]:
+    """Apps by bundle id, actions without a container last"""
+    return app is None, app or ''
+
+
+def get_locale_coverage(conn: sqlite3.Connection, locales: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Coverage of every locale in every app container.
+
+    Args:
+        conn: Database connection
+        locales: Only these locales (None = discover_locales())
+
+    Returns:
+        One row per (locale, app) ordered by locale then app (None last),
+        with <metric>_total, <metric>_localized and <metric>_coverage
+        (localized / total, None when total is 0) for each of METRICS.
+        Metrics whose table is missing are left out.
+    """
+    tables = _existing_tables(conn)
+    locales = discover_locales(conn) if locales is None else list(locales)
+
+    totals: Dict[str, Dict[Optional[str], int]] = {}
+    localized: Dict[str, Dict[Tuple[str, Optional[str]], int]] = {}
+    for metric, (table, total_sql, localized_sql) in COVERAGE_QUERIES.items():
+        if table not in tables:
+            continue
+        totals[metric] = {app: count for app, count in conn.execute(total_sql)}
+        localized[metric] = {(locale, app): count for locale, app, count in conn.execute(localized_sql)}
+
+    apps = sorted({app for counts in totals.values() for app in counts}, key=_app_order)
+    matrix = []
+    for locale in locales:
+        for app in apps:
+            row: Dict[str, Any] = {'locale': locale, 'app': app}
+            for metric in totals:
+                total = totals[metric].get(app, 0)
+                count = localized[metric].get((locale, app), 0)
+                row[f'{metric}_total'] = total
+                row[f'{metric}_localized'] = count
+                row[f'{metric}_coverage'] = round(count / total, 4) if total else None
+            matrix.append(row)
+    return matrix
+
+
+def summarize_by_locale(matrix: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Rows of get_locale_coverage() summed over apps, one per locale"""
+    by_locale: Dict[str, Dict[str, Any]] = {}
+    for row in matrix:
+        summary = by_locale.setdefault(row['locale'], {'locale': row['locale']})
+        for key, value in row.items():
+            if key.endswith(('_total', '_localized')):
+                summary[key] = summary.get(key, 0) + value
+    for summary in by_locale.values():
+        for key in [key for key in summary if key.endswith('_total')]:
+            metric = key[:-len('_total')]
+            total = summary[key]
+            summary[f'{metric}_coverage'] = round(summary[f'{metric}_localized'] / total, 4) if total else None
+    return list(by_locale.values())
+
+
+def export_coverage(matrix: List[Dict[str, Any]], output_path: str):
+    """Write the matrix as CSV (.csv) or JSON (anything else)"""
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix.lower() == '.csv':
+        fieldnames = list(matrix[0]) if matrix else ['locale', 'app']
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(matrix)
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(matrix, f, indent=2, ensure_ascii=False)
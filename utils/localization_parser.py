@@ -6,6 +6,7 @@ are not available in the database.
 """
 
 import re
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
 
 
@@ -19,6 +20,15 @@ KNOWN_ACRONYMS = {
     'WAN', 'WiFi', 'NFC', 'RFID', 'OCR', 'AI', 'ML', 'AR', 'VR', 'XR'
 }
 
+# Key detection patterns, compiled once (validation runs them on every string)
+VERSION_PATTERN = re.compile(r'_\d+\.\d+\.\d+_')
+KEY_SUFFIX_PATTERN = re.compile(r'_(description|name|parameter|intent|entity|type|title|representation)$', re.IGNORECASE)
+CONFIDENCE_SUFFIX_PATTERN = re.compile(r'_(description|intent|entity|type|parameter|representation|title)$', re.IGNORECASE)
+EMBEDDED_KEY_PATTERN = re.compile(r'\w+_\w+_\d+\.\d+\.\d+_\w+')
+
+# Distinct strings seen in one run (parameter names repeat across actions)
+KEY_CACHE_SIZE = 1 << 16
+
 
 def is_localization_key(text: str) -> bool:
     """
@@ -39,12 +49,18 @@ def is_localization_key(text: str) -> bool:
     if not text or not isinstance(text, str):
         return False
 
+    return _matches_key_patterns(text)
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _matches_key_patterns(text: str) -> bool:
+    """Pattern checks behind is_localization_key(), memoized per string"""
     # Pattern 1: Contains version numbers like _1.0.0_
-    if re.search(r'_\d+\.\d+\.\d+_', text):
+    if VERSION_PATTERN.search(text):
         return True
 
     # Pattern 2: Ends with common localization key suffixes
-    if re.search(r'_(description|name|parameter|intent|entity|type|title|representation)$', text, re.IGNORECASE):
+    if KEY_SUFFIX_PATTERN.search(text):
         return True
 
     # Pattern 3: All caps with underscores (likely constant case key)
@@ -56,7 +72,7 @@ def is_localization_key(text: str) -> bool:
 
     # Pattern 4: Contains embedded localization keys within text
     # Look for patterns like: text browser_something_1.0.0_entity more text
-    if re.search(r'\w+_\w+_\d+\.\d+\.\d+_\w+', text):
+    if EMBEDDED_KEY_PATTERN.search(text):
         return True
 
     # Pattern 5: Multiple underscores with no spaces (snake_case identifier style)
@@ -88,10 +104,10 @@ def get_localization_key_confidence(text: str) -> float:
     score = 0.0
 
     # Strong indicators
-    if re.search(r'_\d+\.\d+\.\d+_', text):
+    if VERSION_PATTERN.search(text):
         score += 0.6  # Version number is very strong indicator
 
-    if re.search(r'_(description|intent|entity|type|parameter|representation|title)$', text, re.IGNORECASE):
+    if CONFIDENCE_SUFFIX_PATTERN.search(text):
         score += 0.4  # Suffix match
 
     # Moderate indicators
@@ -0,0 +1,208 @@
+"""Single-pass extraction of several locales
+
+Running the extractor once per locale repeats every locale-independent query
+(parameters, accepted and output types) and every protobuf decode. Here the
+related rows of all actions are fetched once, with the strings of every
+requested locale pivoted into the same bulk queries, and each distinct
+parameter BLOB is decoded once. Building a locale's schemas is then only
+dictionary lookups and localization-key fixing.
+
+Example:
+    conn = connect_db('Tools-prod.sqlite')
+    actions = get_all_actions(conn, 'en')
+    by_locale = build_locale_schemas(conn, actions, ['en', 'de', 'fr', 'ja'])
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import AbstractSet, Any, Dict, List, Optional, Tuple
+
+from .db_utils import (
+    ACTION_STRING_COLUMNS,
+    get_bulk_action_strings,
+    get_bulk_app_names,
+    get_bulk_localized_lists,
+    get_bulk_output_types,
+    get_bulk_parameter_types,
+    get_bulk_parameters,
+)
+from .decode_pool import decode_unique_blobs
+from .schema_builder import build_action_schema, wants_type_info
+from .schema_model import ActionSchema
+from .string_table import StringTable
+
+# Strings of an action without a ToolLocalizations row in a locale
+_MISSING_STRINGS = dict.fromkeys(ACTION_STRING_COLUMNS)
+
+
+def parse_locales(spec: str) -> List[str]:
+    """
+    Parse a comma-separated locale list ('en,de,fr').
+
+    Raises:
+        ValueError: If the list is empty or repeats a locale
+    """
+    locales = [locale.strip() for locale in spec.split(',') if locale.strip()]
+    if not locales:
+        raise ValueError("No locales given")
+    if len(set(locales)) != len(locales):
+        raise ValueError(f"Locale listed twice: {spec}")
+    return locales
+
+
+def locale_output_path(path: str, locale: str) -> str:
+    """Per-locale output path (output/actions_complete.json -> output/actions_complete.de.json)"""
+    output = Path(path)
+    return str(output.with_name(f"{output.stem}.{locale}{output.suffix}"))
+
+
+class PrefetchedLookups:
+    """
+    build_action_schema() lookups answered from bulk queries.
+
+    Same methods as schema_builder.DatabaseLookups, for any of the
+    prefetched locales.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        locales: List[str],
+        tool_ids: Optional[List[int]] = None,
+        fields: Optional[AbstractSet[str]] = None,
+    ):
+        """
+        Args:
+            conn: Database connection
+            locales: Locales to fetch strings for
+            tool_ids: Only fetch rows of these actions (None = all)
+            fields: Only fetch what these schema fields need (None = all)
+        """
+        def wanted(*names: str) -> bool:
+            return fields is None or any(name in fields for name in names)
+
+        self.locales = locales
+        self._parameters = get_bulk_parameters(conn, locales, tool_ids) if wanted('parameters') else {}
+        self._parameter_types = get_bulk_parameter_types(conn, tool_ids) \
+            if wanted('parameters.accepted_types', 'parameters.type_details') else {}
+        self._output_types = get_bulk_output_types(conn, tool_ids) if wanted('output_types') else {}
+        self._categories = get_bulk_localized_lists(conn, 'Categories', locales, tool_ids) \
+            if wanted('categories') else {}
+        self._keywords = get_bulk_localized_lists(conn, 'SearchKeywords', locales, tool_ids) \
+            if wanted('keywords') else {}
+
+    def type_instances(self) -> List[bytes]:
+        """Distinct parameter typeInstance BLOBs of the prefetched actions"""
+        return list({
+            param['typeInstance']: None
+            for params in self._parameters.values()
+            for param in params
+            if param['typeInstance']
+        })
+
+    def parameters(self, tool_id: int, locale: str) -> List[Dict[str, Any]]:
+        return [dict(param, **param['localized'][locale]) for param in self._parameters.get(tool_id, [])]
+
+    def parameter_types(self, tool_id: int, key: str) -> List[str]:
+        return list(self._parameter_types.get((tool_id, key), []))
+
+    def output_types(self, tool_id: int) -> List[str]:
+        return list(self._output_types.get(tool_id, []))
+
+    def categories(self, tool_id: int, locale: str) -> Tuple[List[str], Optional[str]]:
+        values = list(self._categories.get((tool_id, locale), []))
+        return values, locale if values else None
+
+    def keywords(self, tool_id: int, locale: str) -> Tuple[List[str], Optional[str]]:
+        values = list(self._keywords.get((tool_id, locale), []))
+        return values, locale if values else None
+
+
+def localize_actions(
+    actions: List[Dict[str, Any]],
+    action_strings: Dict[int, Dict[str, Dict[str, Any]]],
+    app_names: Dict[str, Dict[str, Optional[str]]],
+    locale: str,
+) -> List[Dict[str, Any]]:
+    """
+    get_all_actions() rows with their strings switched to another locale.
+
+    Args:
+        actions: Rows from get_all_actions() or get_hidden_actions() (any locale)
+        action_strings: From get_bulk_action_strings()
+        app_names: From get_bulk_app_names()
+        locale: Locale to switch to
+
+    Returns:
+        Rows as get_all_actions(conn, locale) would return them
+    """
+    localized = []
+    for action in actions:
+        row = dict(action, **action_strings.get(action['rowId'], {}).get(locale, _MISSING_STRINGS))
+        row['app_name'] = app_names.get(action['container_id'], {}).get(locale)
+        localized.append(row)
+    return localized
+
+
+def build_locale_schemas(
+    conn: sqlite3.Connection,
+    actions: List[Dict[str, Any]],
+    locales: List[str],
+    include_protobuf: bool = True,
+    fix_localizations: bool = True,
+    decode_workers: int = 1,
+    decode_depth: Optional[int] = None,
+    fields: Optional[AbstractSet[str]] = None,
+    restrict: bool = True,
+    verbose: bool = False,
+    strings: Optional[StringTable] = None,
+) -> Dict[str, List[ActionSchema]]:
+    """
+    Build the schemas of some actions in several locales in one pass.
+
+    Each locale's list holds the models of build_action_schema() over
+    get_all_actions(conn, locale) for the same actions.
+
+    Args:
+        conn: Database connection
+        actions: Rows from get_all_actions() or get_hidden_actions()
+        locales: Locales to build
+        include_protobuf: Whether to decode protobuf BLOBs
+        fix_localizations: Whether to fix localization keys with smart parsing
+        decode_workers: Worker processes for protobuf decoding (1 = inline)
+        decode_depth: Nested message depth for parameter BLOBs (None = flat)
+        fields: Only build these schema fields (None = all)
+        restrict: Only fetch rows of these actions (False = whole catalog,
+            cheaper when the actions are most of it)
+        verbose: Verbose output
+        strings: String table to intern identifiers through (see
+            build_action_schema())
+
+    Returns:
+        Dictionary of locale -> schemas, in the order of actions
+    """
+    tool_ids = [action['rowId'] for action in actions] if restrict else None
+    lookups = PrefetchedLookups(conn, locales, tool_ids, fields)
+    action_strings = get_bulk_action_strings(conn, locales, tool_ids)
+    app_names = get_bulk_app_names(conn, locales)
+
+    # Every BLOB is decoded once, whatever the number of locales
+    blob_analyses = None
+    if include_protobuf and wants_type_info(fields):
+        blobs = lookups.type_instances()
+        if verbose:
+            print(f"🧵 Decoding {len(blobs)} unique parameter BLOBs with {decode_workers} worker(s)")
+        blob_analyses = decode_unique_blobs(blobs, 'type_instance', decode_workers, options={'decode_depth': decode_depth})
+
+    schemas = {}
+    for locale in locales:
+        if verbose:
+            print(f"🌍 Building {len(actions)} actions in {locale}")
+        schemas[locale] = [
+            ActionSchema.from_dict(build_action_schema(
+                conn, action, include_protobuf, False, fix_localizations, locale,
+                blob_analyses, decode_depth, fields, lookups, strings,
+            ))
+            for action in localize_actions(actions, action_strings, app_names, locale)
+        ]
+    return schemas
@@ -0,0 +1,181 @@
+"""Normalized output with shared type_info blocks
+
+In actions_complete.json every parameter embeds its full `type_info`
+analysis (strings, UTIs and the decoded fields with their hex payloads),
+even when hundreds of parameters share one typeInstance BLOB. The
+normalized format writes each distinct analysis once, in a `type_infos`
+table keyed by its digest, and a parameter's `type_info` holds that digest:
+
+    {
+      "format": "normalized",
+      "version": 1,
+      "bytes_format": "hex",
+      "type_infos": {"3f9a...": {"size": 26, "uti_types": [...], ...}},
+      "actions": [{"id": "...", "parameters": [{"key": "input", ..., "type_info": "3f9a..."}]}]
+    }
+
+Raw payloads (the `field_N_bytes` values of flat decoding) are written
+as-is ('hex'), base64-encoded ('base64', a third shorter) or left out
+('omit'). inflate_document() rebuilds the usual schemas. Parameters
+with the same analysis then share one dict, and base64 payloads turn
+back into hex. Omitted payloads can't be restored.
+"""
+
+import base64
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+NORMALIZED_FORMAT = 'normalized'
+NORMALIZED_VERSION = 1
+
+BYTES_FORMATS = ('hex', 'base64', 'omit')
+
+# Key suffix of raw payloads in flat decoding (see protobuf_parser.decode_protobuf_blob())
+_BYTES_SUFFIX = '_bytes'
+
+
+def type_info_digest(type_info: Dict[str, Any]) -> str:
+    """Content digest of a type_info analysis"""
+    canonical = json.dumps(type_info, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _convert_payloads(value: Any, convert: Callable[[str], Any]) -> Any:
+    """Copy of value with convert() applied to each '<name>_bytes' string (None drops it)"""
+    if isinstance(value, list):
+        return [_convert_payloads(item, convert) for item in value]
+    if not isinstance(value, dict):
+        return value
+    result = {}
+    for key, item in value.items():
+        if key.endswith(_BYTES_SUFFIX) and isinstance(item, str):
+            item = convert(item)
+            if item is None:
+                continue
+        else:
+            item = _convert_payloads(item, convert)
+        result[key] = item
+    return result
+
+
+def _hex_to_base64(payload: str) -> str:
+    return base64.b64encode(bytes.fromhex(payload)).decode('ascii')
+
+
+def _base64_to_hex(payload: str) -> str:
+    return base64.b64decode(payload).hex()
+
+
+def normalize_schemas(schemas: List[Dict[str, Any]], bytes_format: str = 'hex') -> Dict[str, Any]:
+    """
+    Normalize action schemas.
+
+    Args:
+        schemas: Schemas from build_action_schema()
+        bytes_format: Raw payloads as 'hex', 'base64' or 'omit'
+
+    Returns:
+        Normalized document (see the module docstring)
+
+    Raises:
+        ValueError: If bytes_format is unknown
+    """
+    if bytes_format not in BYTES_FORMATS:
+        raise ValueError(f"Unknown bytes format: {bytes_format} (expected one of {', '.join(BYTES_FORMATS)})")
+
+    type_infos: Dict[str, Dict[str, Any]] = {}
+    # Parameters built from shared BLOB analyses hold the same dict
+    digests_by_object: Dict[int, str] = {}
+
+    def reference(type_info: Dict[str, Any]) -> str:
+        digest = digests_by_object.get(id(type_info))
+        if digest is None:
+            digest = digests_by_object[id(type_info)] = type_info_digest(type_info)
+        if digest not in type_infos:
+            if bytes_format == 'hex':
+                type_infos[digest] = type_info
+            else:
+                type_infos[digest] = _convert_payloads(
+                    type_info, _hex_to_base64 if bytes_format == 'base64' else lambda payload: None
+                )
+        return digest
+
+    actions = []
+    for schema in schemas:
+        if 'parameters' in schema:
+            schema = dict(schema)
+            schema['parameters'] = [
+                dict(param, type_info=reference(param['type_info'])) if param.get('type_info') is not None else param
+                for param in schema['parameters']
+            ]
+        actions.append(schema)
+
+    return {
+        'format': NORMALIZED_FORMAT,
+        'version': NORMALIZED_VERSION,
+        'bytes_format': bytes_format,
+        'type_infos': type_infos,
+        'actions': actions,
+    }
+
+
+def is_normalized(document: Any) -> bool:
+    return isinstance(document, dict) and document.get('format') == NORMALIZED_FORMAT
+
+
+def inflate_document(document: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Action schemas of a normalized document, in the usual shape.
+
+    Raises:
+        ValueError: If the document isn't normalized or is a newer version
+    """
+    if not is_normalized(document):
+        raise ValueError("Not a normalized document")
+    if document.get('version', 0) > NORMALIZED_VERSION:
+        raise ValueError(f"Unsupported normalized version: {document['version']}")
+
+    type_infos = document['type_infos']
+    if document.get('bytes_format') == 'base64':
+        type_infos = {digest: _convert_payloads(info, _base64_to_hex) for digest, info in type_infos.items()}
+
+    schemas = []
+    for schema in document['actions']:
+        if 'parameters' in schema:
+            schema = dict(schema)
+            schema['parameters'] = [
+                dict(param, type_info=type_infos[param['type_info']]) if isinstance(param.get('type_info'), str) else param
+                for param in schema['parameters']
+            ]
+        schemas.append(schema)
+    return schemas
+
+
+def write_normalized(schemas: List[Dict[str, Any]], output_path: str, bytes_format: str = 'hex') -> Dict[str, int]:
+    """
+    Write schemas as a normalized JSON document.
+
+    Returns:
+        Counts: 'actions', 'parameters' with a type_info, distinct 'type_infos'
+    """
+    document = normalize_schemas(schemas, bytes_format)
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False, separators=(',', ':'))
+    return {
+        'actions': len(document['actions']),
+        'parameters': sum(
+            1 for schema in document['actions'] for param in schema.get('parameters', [])
+            if isinstance(param.get('type_info'), str)
+        ),
+        'type_infos': len(document['type_infos']),
+    }
+
+
+def load_normalized(path: str) -> List[Dict[str, Any]]:
+    """Inflated schemas of a file written by write_normalized()"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return inflate_document(json.load(f))
@@ -0,0 +1,220 @@
+"""Binary cache of parsed JSON outputs
+
+Parsing actions_complete.json dominates the start-up of every script that
+reads it. load_output() keeps a marshal-encoded copy of the parsed document
+next to the JSON file (actions_complete.json -> actions_complete.json.cache)
+and returns that on later runs, which is several times faster than
+json.load().
+
+A cache is used only while it matches its source:
+
+- size and mtime unchanged: trusted as is
+- size unchanged but mtime differs (touch, copy): the source is hashed and
+  the cache kept if the content hash still matches
+- anything else: the JSON is re-parsed and the cache rewritten
+
+marshal output is specific to the interpreter version, so the header also
+records it; a cache written by another Python is simply rebuilt.
+"""
+
+import gc
+import hashlib
+import json
+import marshal
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .json_stream import iter_ndjson
+
+CACHE_MAGIC = b'SCJC'
+CACHE_VERSION = 1
+
+_HASH_CHUNK = 1 << 20
+_PREFIX = struct.Struct('<4sI')
+
+
+def cache_path_for(path: str) -> str:
+    """Cache path of an output file (actions_complete.json -> actions_complete.json.cache)"""
+    return f"{path}.cache"
+
+
+def content_hash(path: str) -> str:
+    """BLAKE2b-128 of a file's bytes"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _interpreter() -> str:
+    return f"{sys.implementation.name}-{sys.version_info[0]}.{sys.version_info[1]}-marshal{marshal.version}"
+
+
+def _parse(path: str) -> Any:
+    """Parse a JSON document, or an NDJSON file into a list of records"""
+    with open(path, 'r', encoding='utf-8') as f:
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        f.seek(0)
+        if first != '{':
+            return json.load(f)
+        # A single object (e.g. a report) or one record per line
+        try:
+            return json.load(f)
+        except json.JSONDecodeError:
+            f.seek(0)
+            return list(iter_ndjson(f))
+
+
+def _read_header(cache_path: str) -> Optional[Dict[str, Any]]:
+    """Header of a cache file, or None if missing or unreadable"""
+    try:
+        with open(cache_path, 'rb') as f:
+            prefix = f.read(_PREFIX.size)
+            magic, header_length = _PREFIX.unpack(prefix)
+            if magic != CACHE_MAGIC:
+                return None
+            header = marshal.loads(f.read(header_length))
+    except (OSError, EOFError, ValueError, TypeError, struct.error):
+        return None
+    return header if isinstance(header, dict) else None
+
+
+def _read_payload(cache_path: str) -> Any:
+    with open(cache_path, 'rb') as f:
+        _, header_length = _PREFIX.unpack(f.read(_PREFIX.size))
+        f.seek(header_length, os.SEEK_CUR)
+        # marshal.load() on a file object reads in small pieces; loads() on
+        # the whole payload is several times faster
+        payload = f.read()
+
+    # Loading allocates one container per JSON object/array; collections
+    # triggered along the way would only rescan the half-built document
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return marshal.loads(payload)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def _share_strings(value: Any, memo: Dict[str, str]) -> Any:
+    """Copy of a parsed document with equal strings replaced by one object
+
+    marshal writes repeated objects as back-references, so a document whose
+    keys and common values ('public.text', 'Text', ...) are shared encodes
+    smaller and loads faster.
+    """
+    if isinstance(value, str):
+        return memo.setdefault(value, value)
+    if isinstance(value, dict):
+        return {memo.setdefault(key, key): _share_strings(item, memo) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_share_strings(item, memo) for item in value]
+    return value
+
+
+def _write_cache(cache_path: str, header: Dict[str, Any], data: Any) -> bool:
+    """Write the cache atomically; False if it couldn't be written"""
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        header_bytes = marshal.dumps(header)
+        payload = marshal.dumps(data)
+        with open(temp_path, 'wb') as f:
+            f.write(_PREFIX.pack(CACHE_MAGIC, len(header_bytes)))
+            f.write(header_bytes)
+            f.write(payload)
+        os.replace(temp_path, cache_path)
+        return True
+    except (OSError, ValueError):
+        # Read-only directory or a value marshal can't encode: run uncached
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return False
+
+
+def cache_status(path: str) -> str:
+    """
+    Describe whether the cache of an output file can be used.
+
+    Returns:
+        'fresh' (size and mtime match), 'touched' (content hash matches),
+        'stale' or 'missing'
+    """
+    header = _read_header(cache_path_for(path))
+    if header is None or header.get('version') != CACHE_VERSION or header.get('interpreter') != _interpreter():
+        return 'missing'
+
+    stat = os.stat(path)
+    if header.get('size') != stat.st_size:
+        return 'stale'
+    if header.get('mtime_ns') == stat.st_mtime_ns:
+        return 'fresh'
+    return 'touched' if header.get('hash') == content_hash(path) else 'stale'
+
+
+def load_output(path: str, use_cache: bool = True) -> Any:
+    """
+    Load a JSON output (or NDJSON records), through the binary cache.
+
+    Args:
+        path: Output file
+        use_cache: Read and maintain path.cache (False: plain parse)
+
+    Returns:
+        Parsed document
+
+    Raises:
+        FileNotFoundError: If the output doesn't exist
+        json.JSONDecodeError: If it isn't valid JSON
+    """
+    if not Path(path).exists():
+        raise FileNotFoundError(f"Output not found: {path}")
+
+    if not use_cache:
+        return _parse(path)
+
+    cache_path = cache_path_for(path)
+    status = cache_status(path)
+    stat = os.stat(path)
+
+    if status in ('fresh', 'touched'):
+        try:
+            data = _read_payload(cache_path)
+        except (OSError, EOFError, ValueError, TypeError):
+            pass  # Corrupt payload: rebuild below
+        else:
+            if status == 'touched':
+                # Same content under a new mtime: record the new mtime
+                header = _read_header(cache_path)
+                header['mtime_ns'] = stat.st_mtime_ns
+                _write_cache(cache_path, header, data)
+            return data
+
+    data = _parse(path)
+    header = {
+        'version': CACHE_VERSION,
+        'interpreter': _interpreter(),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'hash': content_hash(path),
+    }
+    _write_cache(cache_path, header, _share_strings(data, {}))
+    return data
+
+
+def clear_cache(path: str) -> bool:
+    """Remove the cache of an output file; True if one existed"""
+    try:
+        os.remove(cache_path_for(path))
+        return True
+    except FileNotFoundError:
+        return False
@@ -1,9 +1,18 @@
 """Protobuf parsing utilities for decoding BLOB fields"""
 
 import re
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Iterator, Optional, Tuple, Union
 import struct
 
+# Wire types defined by the protobuf encoding
+WIRE_VARINT = 0
+WIRE_64BIT = 1
+WIRE_LENGTH_DELIMITED = 2
+WIRE_32BIT = 5
+
+# bytes, bytearray or a (zero-copy) memoryview slice
+Buffer = Union[bytes, bytearray, memoryview]
+
 
 def sanitize_extracted_string(s: str) -> Optional[str]:
     """
@@ -218,6 +227,131 @@ def decode_varint(data: bytes) -> Tuple[int, int]:
     return value, consumed
 
 
+def read_varint(data: Buffer, pos: int) -> Tuple[int, int]:
+    """
+    Read a varint at an offset without copying the buffer.
+
+    Args:
+        data: Buffer containing the varint
+        pos: Offset of the first varint byte
+
+    Returns:
+        Tuple of (decoded_value, offset_after_varint)
+
+    Raises:
+        ValueError: If the varint is truncated or longer than 10 bytes
+    """
+    value = 0
+    shift = 0
+    end = len(data)
+
+    while True:
+        if pos >= end:
+            raise ValueError("Truncated varint")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not (byte & 0x80):
+            return value, pos
+        shift += 7
+        if shift >= 70:
+            raise ValueError("Varint longer than 10 bytes")
+
+
+def iter_wire_fields(data: Buffer) -> Iterator[Tuple[int, int, Any]]:
+    """
+    Walk the top-level fields of a protobuf message.
+
+    Unlike decode_protobuf_blob() this keeps every occurrence of a field and
+    leaves payloads uninterpreted: varints are ints, length-delimited and
+    fixed-width values are slices of the input (zero-copy for memoryviews).
+
+    Args:
+        data: Protobuf message bytes
+
+    Yields:
+        Tuples of (field_number, wire_type, value)
+
+    Raises:
+        ValueError: If the data is not well-formed wire format
+    """
+    pos = 0
+    end = len(data)
+
+    while pos < end:
+        tag, pos = read_varint(data, pos)
+        field_number = tag >> 3
+        wire_type = tag & 0x07
+
+        if field_number == 0:
+            raise ValueError("Field number 0 is invalid")
+
+        if wire_type == WIRE_VARINT:
+            value, pos = read_varint(data, pos)
+        elif wire_type == WIRE_LENGTH_DELIMITED:
+            length, pos = read_varint(data, pos)
+            if pos + length > end:
+                raise ValueError("Length-delimited field overruns buffer")
+            value = data[pos:pos + length]
+            pos += length
+        elif wire_type == WIRE_64BIT:
+            if pos + 8 > end:
+                raise ValueError("Truncated 64-bit field")
+            value = data[pos:pos + 8]
+            pos += 8
+        elif wire_type == WIRE_32BIT:
+            if pos + 4 > end:
+                raise ValueError("Truncated 32-bit field")
+            value = data[pos:pos + 4]
+            pos += 4
+        else:
+            # Groups (3/4) are deprecated and never seen in these BLOBs
+            raise ValueError(f"Unsupported wire type {wire_type}")
+
+        yield field_number, wire_type, value
+
+
+def is_text_payload(data: Buffer) -> bool:
+    """
+    Check whether a length-delimited payload is printable UTF-8 text.
+
+    Args:
+        data: Payload bytes
+
+    Returns:
+        True if the payload decodes as printable UTF-8
+    """
+    try:
+        return bytes(data).decode('utf-8').isprintable()
+    except UnicodeDecodeError:
+        return False
+
+
+def is_uti_like(s: str) -> bool:
+    """Check whether an extracted string looks like a UTI or bundle-scoped identifier"""
+    return '.' in s and ('public' in s or 'com.' in s)
+
+
+def is_wire_message(data: Buffer) -> bool:
+    """
+    Check whether bytes parse completely as a protobuf message.
+
+    Args:
+        data: Candidate message bytes
+
+    Returns:
+        True if every byte belongs to a well-formed field
+    """
+    if not data:
+        return False
+    try:
+        for _ in iter_wire_fields(data):
+            pass
+    except ValueError:
+        return False
+    return True
+
+
 def decode_protobuf_blob(blob: bytes) -> Dict[str, Any]:
     """
     Attempt to decode a protobuf BLOB without knowing the schema.
@@ -330,27 +464,36 @@ def analyze_requirements_blob(blob: bytes) -> Dict[str, Any]:
     return result
 
 
-def analyze_type_instance_blob(blob: bytes) -> Dict[str, Any]:
+def analyze_type_instance_blob(blob: bytes, decode_depth: Optional[int] = None) -> Dict[str, Any]:
     """
     Analyze a typeInstance BLOB from Parameters table.
     Often contains UTI types like "public.folder".
 
     Args:
         blob: Type instance BLOB
+        decode_depth: If set, 'decoded' is a nested message tree expanded to
+            this depth (see utils.lazy_message) instead of the flat
+            hex-encoded decoding
 
     Returns:
         Dictionary with analysis results
     """
+    if decode_depth is None:
+        decoded = decode_protobuf_blob(blob)
+    else:
+        from .lazy_message import decode_message_tree
+        decoded = decode_message_tree(blob, decode_depth)
+
     result = {
         'size': len(blob),
         'uti_types': [],
         'strings': extract_strings_from_blob(blob),
-        'decoded': decode_protobuf_blob(blob),
+        'decoded': decoded,
     }
 
     # Look for UTI patterns
     for s in result['strings']:
-        if '.' in s and ('public' in s or 'com.' in s):
+        if is_uti_like(s):
             result['uti_types'].append(s)
 
     return result
@@ -0,0 +1,213 @@
+"""Structural diff of two record collections keyed by id
+
+Two extractions of the same database version are mostly identical, so the
+diff works in two streaming passes over each input:
+
+1. Hash every record canonically (sorted keys, no whitespace) and keep only
+   id -> hash. Identical records are settled here without being compared.
+2. Re-read both inputs, holding on to the old side of the records whose
+   hashes differ and diffing each against its new version as it arrives.
+
+Memory is one hash per record plus the changed records, never two whole
+documents.
+"""
+
+import hashlib
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .json_stream import iter_records
+
+# List elements are matched by the first identity field they carry
+# (parameters by 'key', types/properties/enum cases by 'id')
+IDENTITY_FIELDS = ('key', 'id')
+
+
+def canonical_hash(record: Any) -> str:
+    """Hash a JSON value independently of key order and formatting"""
+    text = json.dumps(record, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _identity_field(old: List[Any], new: List[Any]) -> Optional[str]:
+    """Field that uniquely identifies the objects on both sides of a list diff, if any"""
+    if not all(isinstance(item, dict) for item in old + new):
+        return None
+    for field in IDENTITY_FIELDS:
+        unique = True
+        for items in (old, new):
+            values = [item.get(field) for item in items]
+            if None in values or len(set(map(str, values))) != len(values):
+                unique = False
+                break
+        if unique:
+            return field
+    return None
+
+
+def diff_values(old: Any, new: Any, path: str = '') -> List[Dict[str, Any]]:
+    """
+    List field-level differences between two JSON values.
+
+    Objects are compared key by key and lists of objects are matched by
+    identity field ('key' or 'id') when every element has a unique one,
+    by position otherwise. Matched elements that moved relative to each
+    other add a 'reordered' change at the list path, with the old and new
+    identity orders. Lists of scalars are reported as one change.
+
+    Args:
+        old: Old value
+        new: New value
+        path: Path of the values (e.g. 'parameters[input].name')
+
+    Returns:
+        List of {'path', 'change': 'added'|'removed'|'changed'|'reordered', 'old', 'new'}
+    """
+    if old == new:
+        return []
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = []
+        for key in old:
+            child = f"{path}.{key}" if path else key
+            if key not in new:
+                changes.append({'path': child, 'change': 'removed', 'old': old[key]})
+            else:
+                changes.extend(diff_values(old[key], new[key], child))
+        for key in new:
+            if key not in old:
+                child = f"{path}.{key}" if path else key
+                changes.append({'path': child, 'change': 'added', 'new': new[key]})
+        return changes
+
+    if isinstance(old, list) and isinstance(new, list):
+        field = _identity_field(old, new)
+        if field:
+            old_items = {str(item[field]): item for item in old}
+            new_items = {str(item[field]): item for item in new}
+            changes = []
+            # Additions and removals alone don't count as reordering
+            if [i for i in old_items if i in new_items] != [i for i in new_items if i in old_items]:
+                changes.append({'path': path, 'change': 'reordered', 'old': list(old_items), 'new': list(new_items)})
+            for identity, item in old_items.items():
+                child = f"{path}[{identity}]"
+                if identity not in new_items:
+                    changes.append({'path': child, 'change': 'removed', 'old': item})
+                else:
+                    changes.extend(diff_values(item, new_items[identity], child))
+            for identity, item in new_items.items():
+                if identity not in old_items:
+                    changes.append({'path': f"{path}[{identity}]", 'change': 'added', 'new': item})
+            return changes
+
+        if any(isinstance(item, (dict, list)) for item in old + new):
+            changes = []
+            for index in range(max(len(old), len(new))):
+                child = f"{path}[{index}]"
+                if index >= len(new):
+                    changes.append({'path': child, 'change': 'removed', 'old': old[index]})
+                elif index >= len(old):
+                    changes.append({'path': child, 'change': 'added', 'new': new[index]})
+                else:
+                    changes.extend(diff_values(old[index], new[index], child))
+            return changes
+
+    return [{'path': path, 'change': 'changed', 'old': old, 'new': new}]
+
+
+def _hash_records(records: Iterable[Dict[str, Any]], key: str, stats: Dict[str, int]) -> Dict[str, str]:
+    """Pass 1: id -> canonical hash (later duplicates win, as in a dict)"""
+    hashes: Dict[str, str] = {}
+    for record in records:
+        record_id = str(record.get(key))
+        if record_id in hashes:
+            stats['duplicate_keys'] += 1
+        hashes[record_id] = canonical_hash(record)
+    return hashes
+
+
+def diff_record_streams(
+    old_records: Callable[[], Iterable[Dict[str, Any]]],
+    new_records: Callable[[], Iterable[Dict[str, Any]]],
+    key: str = 'id',
+    field_diffs: bool = True,
+) -> Dict[str, Any]:
+    """
+    Diff two record collections keyed by a field.
+
+    Args:
+        old_records: Callable returning a fresh iterator over the old records
+            (called twice if field_diffs is set)
+        new_records: Same for the new records
+        key: Record identity field
+        field_diffs: Also compute field-level changes of changed records
+
+    Returns:
+        Dictionary with:
+            - added, removed: sorted ids
+            - changed: sorted ids, or id -> field changes if field_diffs
+            - unchanged: number of identical records
+            - old_count, new_count, duplicate_keys
+    """
+    stats = {'duplicate_keys': 0}
+    old_hashes = _hash_records(old_records(), key, stats)
+    new_hashes = _hash_records(new_records(), key, stats)
+
+    added = sorted(record_id for record_id in new_hashes if record_id not in old_hashes)
+    removed = sorted(record_id for record_id in old_hashes if record_id not in new_hashes)
+    changed_ids = sorted(
+        record_id for record_id, digest in new_hashes.items()
+        if record_id in old_hashes and old_hashes[record_id] != digest
+    )
+
+    result = {
+        'key': key,
+        'old_count': len(old_hashes),
+        'new_count': len(new_hashes),
+        'added': added,
+        'removed': removed,
+        'changed': changed_ids,
+        'unchanged': len(new_hashes) - len(added) - len(changed_ids),
+        'duplicate_keys': stats['duplicate_keys'],
+    }
+
+    if field_diffs and changed_ids:
+        pending = set(changed_ids)
+        # Keep the last occurrence of each id, consistent with pass 1
+        old_changed = {}
+        for record in old_records():
+            record_id = str(record.get(key))
+            if record_id in pending:
+                old_changed[record_id] = record
+
+        # New records are diffed as they stream past and never retained
+        changes = {}
+        for record in new_records():
+            record_id = str(record.get(key))
+            if record_id in pending:
+                changes[record_id] = diff_values(old_changed[record_id], record)
+
+        result['changed'] = {record_id: changes[record_id] for record_id in changed_ids}
+
+    return result
+
+
+def diff_files(old_path: str, new_path: str, key: str = 'id', field_diffs: bool = True) -> Dict[str, Any]:
+    """
+    Diff two output files (JSON arrays or NDJSON) record by record.
+
+    Args:
+        old_path: Old output file
+        new_path: New output file
+        key: Record identity field ('id' for actions and types)
+        field_diffs: Also compute field-level changes of changed records
+
+    Returns:
+        See diff_record_streams()
+    """
+    return diff_record_streams(
+        lambda: iter_records(old_path),
+        lambda: iter_records(new_path),
+        key,
+        field_diffs,
+    )
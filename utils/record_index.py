@@ -0,0 +1,227 @@
+"""NDJSON exports with a binary offset index for random access
+
+write_ndjson() writes one record per line and a sidecar index next to it
+(actions_complete.ndjson -> actions_complete.ndjson.idx) mapping each record
+id to the byte offset and length of its line. RecordIndex maps both files
+with mmap and bisects the index, so fetching one action or a range of ids
+costs O(log n) key comparisons and parses only the records returned.
+
+Index layout (little-endian):
+
+    header   magic b'SCIX', version u32, count u32, data file size u64
+    entries  count x (key offset u32, key length u32, line offset u64, line length u32),
+             sorted by the UTF-8 bytes of the key
+    keys     concatenated UTF-8 keys
+"""
+
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+INDEX_MAGIC = b'SCIX'
+INDEX_VERSION = 1
+
+_HEADER = struct.Struct('<4sIIQ')
+_ENTRY = struct.Struct('<IIQI')
+
+
+def index_path_for(data_path: str) -> str:
+    """Sidecar index path of an NDJSON file (actions_complete.ndjson -> actions_complete.ndjson.idx)"""
+    return f"{data_path}.idx"
+
+
+def write_ndjson(
+    records: Iterable[Dict[str, Any]],
+    path: str,
+    key: str = 'id',
+    index_path: Optional[str] = None,
+) -> int:
+    """
+    Write records as NDJSON plus a sorted offset index.
+
+    Args:
+        records: Records to write, in output order
+        path: NDJSON output path
+        key: Record identity field
+        index_path: Index path (default: index_path_for(path))
+
+    Returns:
+        Number of records written
+
+    Raises:
+        ValueError: If two records share the same key
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    entries: List[Tuple[bytes, int, int]] = []
+    offset = 0
+    with open(path, 'wb') as f:
+        for record in records:
+            line = json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+            f.write(line)
+            entries.append((str(record.get(key)).encode('utf-8'), offset, len(line)))
+            offset += len(line)
+
+    entries.sort()
+    for previous, current in zip(entries, entries[1:]):
+        if previous[0] == current[0]:
+            raise ValueError(f"Duplicate {key} in NDJSON export: {current[0].decode('utf-8')}")
+
+    table = bytearray()
+    keys = bytearray()
+    for record_key, line_offset, line_length in entries:
+        table += _ENTRY.pack(len(keys), len(record_key), line_offset, line_length)
+        keys += record_key
+
+    with open(index_path or index_path_for(str(path)), 'wb') as f:
+        f.write(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(entries), offset))
+        f.write(table)
+        f.write(keys)
+
+    return len(entries)
+
+
+class RecordIndex:
+    """
+    Random access to the records of an indexed NDJSON file.
+
+    Use as a context manager (or call close()) to release the mappings.
+
+    Example:
+        with RecordIndex('output/actions_complete.ndjson') as index:
+            action = index.get('is.workflow.actions.gettext')
+            for action in index.range('is.workflow.actions.a', 'is.workflow.actions.b'):
+                ...
+    """
+
+    def __init__(self, data_path: str, index_path: Optional[str] = None):
+        """
+        Args:
+            data_path: NDJSON file written by write_ndjson()
+            index_path: Sidecar index (default: index_path_for(data_path))
+
+        Raises:
+            FileNotFoundError: If either file is missing
+            ValueError: If the index is malformed or doesn't match the data file
+        """
+        index_path = index_path or index_path_for(data_path)
+        for required in (data_path, index_path):
+            if not Path(required).exists():
+                raise FileNotFoundError(f"Not found: {required}")
+
+        self._index_file = open(index_path, 'rb')
+        self._data_file = open(data_path, 'rb')
+        self._index = None
+        self._data = None
+        try:
+            self._index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(self._index) < _HEADER.size:
+                raise ValueError(f"Truncated record index: {index_path}")
+            magic, version, self._count, data_size = _HEADER.unpack_from(self._index, 0)
+            if magic != INDEX_MAGIC or version != INDEX_VERSION:
+                raise ValueError(f"Not a version {INDEX_VERSION} record index: {index_path}")
+            if Path(data_path).stat().st_size != data_size:
+                raise ValueError(f"Record index {index_path} is stale (data file size changed)")
+            self._keys_start = _HEADER.size + self._count * _ENTRY.size
+            # Empty files can't be mapped
+            if data_size:
+                self._data = mmap.mmap(self._data_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self) -> 'RecordIndex':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release the mappings and files"""
+        for mapping in (self._index, self._data):
+            if mapping is not None:
+                mapping.close()
+        self._index = self._data = None
+        self._index_file.close()
+        self._data_file.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: str) -> bool:
+        return self._find(key.encode('utf-8')) is not None
+
+    def _entry(self, position: int) -> Tuple[int, int, int, int]:
+        return _ENTRY.unpack_from(self._index, _HEADER.size + position * _ENTRY.size)
+
+    def _key(self, position: int) -> bytes:
+        key_offset, key_length, _, _ = self._entry(position)
+        start = self._keys_start + key_offset
+        return self._index[start:start + key_length]
+
+    def _bisect(self, key: bytes) -> int:
+        """First position whose key is >= key"""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _find(self, key: bytes) -> Optional[int]:
+        position = self._bisect(key)
+        if position < self._count and self._key(position) == key:
+            return position
+        return None
+
+    def _record(self, position: int) -> Dict[str, Any]:
+        _, _, line_offset, line_length = self._entry(position)
+        return json.loads(self._data[line_offset:line_offset + line_length])
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Fetch one record by id.
+
+        Args:
+            key: Record id
+            default: Returned when the id isn't indexed
+
+        Returns:
+            Parsed record, or default
+        """
+        position = self._find(key.encode('utf-8'))
+        return default if position is None else self._record(position)
+
+    def range(self, start: Optional[str] = None, stop: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the records with start <= id < stop in id order.
+
+        Args:
+            start: First id (default: from the beginning)
+            stop: Exclusive upper bound (default: to the end)
+
+        Yields:
+            Parsed records
+        """
+        position = self._bisect(start.encode('utf-8')) if start is not None else 0
+        end = self._bisect(stop.encode('utf-8')) if stop is not None else self._count
+        for current in range(position, end):
+            yield self._record(current)
+
+    def prefix(self, prefix: str) -> Iterator[Dict[str, Any]]:
+        """Yield the records whose id starts with prefix, in id order"""
+        encoded = prefix.encode('utf-8')
+        position = self._bisect(encoded)
+        while position < self._count and self._key(position).startswith(encoded):
+            yield self._record(position)
+            position += 1
+
+    def ids(self) -> Iterator[str]:
+        """Yield every indexed id in sorted order"""
+        for position in range(self._count):
+            yield self._key(position).decode('utf-8')
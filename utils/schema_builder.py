@@ -1,13 +1,13 @@
 """Schema building utilities for creating structured action/type schemas"""
 
-from typing import Dict, Any, List, Optional
+from typing import AbstractSet, Dict, Any, FrozenSet, Iterable, List, Optional, Tuple
 import sqlite3
 from .db_utils import (
+    Locale,
+    get_localized_list,
     get_action_parameters,
     get_parameter_types,
     get_action_output_types,
-    get_action_categories,
-    get_action_keywords,
     get_entity_properties,
     get_enum_cases,
     get_type_info,
@@ -18,6 +18,112 @@ from .protobuf_parser import (
 )
 from .validators import is_localization_key, parse_type_identifier
 from .localization_parser import generate_readable_name
+from .string_table import StringTable
+
+
+# Fields of build_action_schema() output, in output order
+ACTION_FIELDS = (
+    'id', 'name', 'name_metadata', 'description_summary', 'description_metadata',
+    'description_note', 'type', 'flags', 'visibility_flags', 'hidden', 'source_provider',
+    'app', 'deprecation', 'parameters', 'output_types', 'categories', 'keywords',
+    'localization_issues', 'string_locales',
+)
+PARAMETER_FIELDS = (
+    'key', 'name', 'name_metadata', 'description', 'description_metadata', 'sort_order',
+    'flags', 'accepted_types', 'localization_issues', 'string_locales', 'type_info', 'type_details',
+)
+
+# Named extraction levels, each a superset of the previous one
+FIELD_TIERS: Dict[str, FrozenSet[str]] = {}
+FIELD_TIERS['ids'] = frozenset({'id', 'type', 'visibility_flags', 'hidden', 'app'})
+FIELD_TIERS['localized'] = FIELD_TIERS['ids'] | {
+    'name', 'name_metadata', 'description_summary', 'description_metadata', 'description_note',
+    'flags', 'source_provider', 'deprecation', 'categories', 'keywords', 'localization_issues',
+    'string_locales',
+}
+FIELD_TIERS['parameters'] = FIELD_TIERS['localized'] | {'output_types', 'parameters'} | {
+    f'parameters.{name}' for name in PARAMETER_FIELDS if name != 'type_info'
+}
+FIELD_TIERS['blobs'] = FIELD_TIERS['parameters'] | {'parameters.type_info'}
+
+
+def parse_field_selection(spec: Optional[str]) -> Optional[FrozenSet[str]]:
+    """
+    Parse a field projection for build_action_schema().
+
+    The spec is a comma-separated list of tier names (FIELD_TIERS), action
+    fields (ACTION_FIELDS) and parameter fields ('parameters.key'). A bare
+    'parameters' selects every parameter field; 'id' is always included.
+
+    Args:
+        spec: Projection (None or '' = everything)
+
+    Returns:
+        Selected field names ('parameters.<field>' for parameter fields),
+        or None for everything
+
+    Raises:
+        ValueError: If the spec names an unknown tier or field
+    """
+    if not spec:
+        return None
+
+    selected = {'id'}
+    for item in (part.strip() for part in spec.split(',')):
+        if not item:
+            continue
+        if item in FIELD_TIERS:
+            selected |= FIELD_TIERS[item]
+        elif item == 'parameters':
+            selected |= {'parameters'} | {f'parameters.{name}' for name in PARAMETER_FIELDS}
+        elif item.startswith('parameters.') and item[len('parameters.'):] in PARAMETER_FIELDS:
+            selected |= {'parameters', item}
+        elif item in ACTION_FIELDS:
+            selected.add(item)
+        else:
+            raise ValueError(
+                f"Unknown field: {item} (expected a tier ({', '.join(FIELD_TIERS)}), "
+                f"one of {', '.join(ACTION_FIELDS)} or parameters.<{'|'.join(PARAMETER_FIELDS)}>)"
+            )
+    return frozenset(selected)
+
+
+def wants_type_info(fields: Optional[AbstractSet[str]]) -> bool:
+    """Whether a projection needs parameter BLOBs decoded"""
+    return fields is None or 'parameters.type_info' in fields
+
+
+class DatabaseLookups:
+    """
+    Per-action queries build_action_schema() gets its related rows from.
+
+    Other providers with the same methods (e.g. multi_locale.PrefetchedLookups)
+    can answer from memory instead.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def parameters(self, tool_id: int, locale: Locale) -> List[Dict[str, Any]]:
+        return get_action_parameters(self.conn, tool_id, locale)
+
+    def parameter_types(self, tool_id: int, key: str) -> List[str]:
+        return get_parameter_types(self.conn, tool_id, key)
+
+    def output_types(self, tool_id: int) -> List[str]:
+        return get_action_output_types(self.conn, tool_id)
+
+    def categories(self, tool_id: int, locale: Locale) -> Tuple[List[str], Optional[str]]:
+        """Categories and the locale they are in"""
+        return get_localized_list(self.conn, 'Categories', tool_id, locale)
+
+    def keywords(self, tool_id: int, locale: Locale) -> Tuple[List[str], Optional[str]]:
+        """Search keywords and the locale they are in"""
+        return get_localized_list(self.conn, 'SearchKeywords', tool_id, locale)
+
+
+def _keep(value):
+    return value
 
 
 def get_type_details(conn: sqlite3.Connection, type_id: str) -> Optional[Dict[str, Any]]:
@@ -68,7 +174,12 @@ def build_action_schema(
     include_protobuf: bool = True,
     include_type_info: bool = False,  # Disabled by default for speed
     fix_localizations: bool = True,  # NEW: Fix localization keys
-    locale: str = "en"
+    locale: Locale = "en",
+    blob_analyses: Optional[Dict[bytes, Dict[str, Any]]] = None,
+    decode_depth: Optional[int] = None,
+    fields: Optional[AbstractSet[str]] = None,
+    lookups: Optional[DatabaseLookups] = None,
+    strings: Optional[StringTable] = None
 ) -> Dict[str, Any]:
     """
     Build a complete schema for an action including all metadata.
@@ -79,16 +190,39 @@ def build_action_schema(
         include_protobuf: Whether to decode protobuf BLOBs
         include_type_info: Whether to enrich with type information
         fix_localizations: Whether to fix localization keys with smart parsing
-        locale: Language locale
+        locale: Language locale, or a fallback chain; with a chain the
+            schema and its parameters get 'string_locales' recording the
+            locale each string came from
+        blob_analyses: Pre-decoded typeInstance analyses keyed by BLOB
+            (see utils.decode_pool); BLOBs missing from it are decoded inline
+        decode_depth: Decode typeInstance BLOBs as nested message trees
+            expanded to this depth (None = flat hex decoding)
+        fields: Only build these fields (see parse_field_selection());
+            queries and decoding for the others are skipped. None = all
+        lookups: Where parameters, types, categories and keywords come
+            from (default: DatabaseLookups(conn))
+        strings: Per-run table to intern identifier values (type ids,
+            bundle ids, app names, categories, keywords, locales, the UTIs
+            and strings of type_info) through,
+            so schemas share one copy of each (None = no interning)
 
     Returns:
         Complete action schema
     """
     tool_id = action_data['rowId']
     action_id = action_data['id']
+    lookups = lookups or DatabaseLookups(conn)
+    # Rows from a fallback chain carry <column>_locale entries
+    chained = not isinstance(locale, str)
+    intern = strings.intern if strings is not None else _keep
+    intern_all = strings.intern_all if strings is not None else _keep
+
+    def wanted(*names: str) -> bool:
+        return fields is None or any(name in fields for name in names)
 
     # Fix name localization if enabled
-    name_result = generate_readable_name(action_data.get('name', '')) if fix_localizations else None
+    name_result = generate_readable_name(action_data.get('name', '')) \
+        if fix_localizations and wanted('name', 'name_metadata') else None
     if name_result and name_result['is_synthetic']:
         name = name_result['value']
         name_metadata = {
@@ -102,7 +236,8 @@ def build_action_schema(
         name_metadata = {'is_synthetic': False}
 
     # Fix description localization if enabled
-    desc_result = generate_readable_name(action_data.get('descriptionSummary', '')) if fix_localizations else None
+    desc_result = generate_readable_name(action_data.get('descriptionSummary', '')) \
+        if fix_localizations and wanted('description_summary', 'description_metadata') else None
     if desc_result and desc_result['is_synthetic']:
         description_summary = desc_result['value']
         description_metadata = {
@@ -122,14 +257,14 @@ def build_action_schema(
         'description_summary': description_summary,
         'description_metadata': description_metadata,
         'description_note': action_data.get('descriptionNote'),
-        'type': action_data.get('toolType'),
+        'type': intern(action_data.get('toolType')),
         'flags': action_data.get('flags'),
         'visibility_flags': action_data.get('visibilityFlags'),
         'hidden': action_data.get('visibilityFlags', 0) > 0,
-        'source_provider': action_data.get('sourceActionProvider'),
+        'source_provider': intern(action_data.get('sourceActionProvider')),
         'app': {
-            'bundle_id': action_data.get('container_id'),
-            'name': action_data.get('app_name'),
+            'bundle_id': intern(action_data.get('container_id')),
+            'name': intern(action_data.get('app_name')),
         },
         'deprecation': None,
         'parameters': [],
@@ -140,7 +275,7 @@ def build_action_schema(
     }
 
     # Flag localization issues at action level (only if not fixed)
-    if not fix_localizations:
+    if not fix_localizations and wanted('localization_issues'):
         if is_localization_key(action_data.get('name', '')):
             schema['localization_issues'].append('name_is_key')
         if is_localization_key(action_data.get('descriptionSummary', '')):
@@ -149,15 +284,16 @@ def build_action_schema(
     # Deprecation info
     if action_data.get('deprecationReplacementId'):
         schema['deprecation'] = {
-            'replacement_id': action_data.get('deprecationReplacementId'),
+            'replacement_id': intern(action_data.get('deprecationReplacementId')),
             'message': action_data.get('deprecationMessage'),
         }
 
     # Parameters
-    parameters = get_action_parameters(conn, tool_id, locale)
+    parameters = lookups.parameters(tool_id, locale) if wanted('parameters') else []
     for param in parameters:
         # Fix parameter name localization
-        param_name_result = generate_readable_name(param.get('name', '')) if fix_localizations else None
+        param_name_result = generate_readable_name(param.get('name', '')) \
+            if fix_localizations and wanted('parameters.name', 'parameters.name_metadata') else None
         if param_name_result and param_name_result['is_synthetic']:
             param_name = param_name_result['value']
             param_name_metadata = {
@@ -171,7 +307,8 @@ def build_action_schema(
             param_name_metadata = {'is_synthetic': False}
 
         # Fix parameter description localization
-        param_desc_result = generate_readable_name(param.get('description', '')) if fix_localizations else None
+        param_desc_result = generate_readable_name(param.get('description', '')) \
+            if fix_localizations and wanted('parameters.description', 'parameters.description_metadata') else None
         if param_desc_result and param_desc_result['is_synthetic']:
             param_description = param_desc_result['value']
             param_desc_metadata = {
@@ -185,46 +322,81 @@ def build_action_schema(
             param_desc_metadata = {'is_synthetic': False}
 
         param_schema = {
-            'key': param['key'],
+            'key': intern(param['key']),
             'name': param_name,
             'name_metadata': param_name_metadata,
             'description': param_description,
             'description_metadata': param_desc_metadata,
             'sort_order': param['sortOrder'],
             'flags': param['flags'],
-            'accepted_types': get_parameter_types(conn, tool_id, param['key']),
+            'accepted_types': intern_all(lookups.parameter_types(tool_id, param['key']))
+            if wanted('parameters.accepted_types') or (include_type_info and wanted('parameters.type_details'))
+            else [],
             'localization_issues': []
         }
 
         # Flag localization issues (only if not fixed)
-        if not fix_localizations:
+        if not fix_localizations and wanted('parameters.localization_issues'):
             if is_localization_key(param.get('name', '')):
                 param_schema['localization_issues'].append('name_is_key')
             if is_localization_key(param.get('description', '')):
                 param_schema['localization_issues'].append('description_is_key')
 
+        if chained:
+            param_schema['string_locales'] = {
+                'name': intern(param.get('name_locale')),
+                'description': intern(param.get('description_locale')),
+            }
+
         # Decode protobuf if requested
-        if include_protobuf and param.get('typeInstance'):
-            param_schema['type_info'] = analyze_type_instance_blob(param['typeInstance'])
+        if include_protobuf and param.get('typeInstance') and wanted('parameters.type_info'):
+            type_instance = param['typeInstance']
+            if blob_analyses is not None and type_instance in blob_analyses:
+                type_info = blob_analyses[type_instance]
+            else:
+                type_info = analyze_type_instance_blob(type_instance, decode_depth)
+            param_schema['type_info'] = strings.intern_type_info(type_info) if strings is not None else type_info
 
         # Enrich with type information
-        if include_type_info:
+        if include_type_info and wanted('parameters.type_details'):
             param_schema['type_details'] = []
             for type_id in param_schema['accepted_types']:
                 type_details = get_type_details(conn, type_id)
                 if type_details:
                     param_schema['type_details'].append(type_details)
 
+        if fields is not None:
+            param_schema = {key: value for key, value in param_schema.items() if f'parameters.{key}' in fields}
         schema['parameters'].append(param_schema)
 
     # Output types
-    schema['output_types'] = get_action_output_types(conn, tool_id)
+    if wanted('output_types'):
+        schema['output_types'] = intern_all(lookups.output_types(tool_id))
 
     # Categories
-    schema['categories'] = get_action_categories(conn, tool_id, locale)
+    categories_locale = keywords_locale = None
+    if wanted('categories'):
+        categories, categories_locale = lookups.categories(tool_id, locale)
+        schema['categories'] = intern_all(categories)
 
     # Keywords
-    schema['keywords'] = get_action_keywords(conn, tool_id, locale)
+    if wanted('keywords'):
+        keywords, keywords_locale = lookups.keywords(tool_id, locale)
+        schema['keywords'] = intern_all(keywords)
+
+    if chained:
+        schema['string_locales'] = {
+            'name': intern(action_data.get('name_locale')),
+            'description_summary': intern(action_data.get('descriptionSummary_locale')),
+            'description_note': intern(action_data.get('descriptionNote_locale')),
+            'deprecation_message': intern(action_data.get('deprecationMessage_locale')),
+            'app_name': intern(action_data.get('app_name_locale')),
+            'categories': intern(categories_locale),
+            'keywords': intern(keywords_locale),
+        }
+
+    if fields is not None:
+        schema = {key: value for key, value in schema.items() if key in fields}
 
     return schema
 
@@ -363,18 +535,18 @@ def classify_action_visibility(visibility_flags: int) -> Dict[str, Any]:
     })
 
 
-def summarize_action_collection(actions: List[Dict[str, Any]]) -> Dict[str, Any]:
+def summarize_action_collection(actions: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Generate summary statistics for a collection of actions.
 
     Args:
-        actions: List of action schemas
+        actions: Action schemas (read once)
 
     Returns:
         Summary statistics
     """
     summary = {
-        'total_count': len(actions),
+        'total_count': 0,
         'by_type': {},
         'by_visibility': {},
         'by_app': {},
@@ -385,6 +557,8 @@ def summarize_action_collection(actions: List[Dict[str, Any]]) -> Dict[str, Any]
     }
 
     for action in actions:
+        summary['total_count'] += 1
+
         # By type
         action_type = action.get('type', 'unknown')
         summary['by_type'][action_type] = summary['by_type'].get(action_type, 0) + 1
@@ -0,0 +1,219 @@
+"""Compact in-memory model of action, parameter and type schemas
+
+build_action_schema() returns nested dicts. Held for a whole catalog they
+cost far more memory than the data: every schema and parameter carries its
+own key table, a `name_metadata`/`description_metadata` dict that is almost
+always {'is_synthetic': False}, and fresh lists that are mostly empty.
+
+The classes here store the same data in __slots__ dataclasses:
+    - fields are slots instead of per-object dict entries
+    - non-synthetic metadata is the shared NOT_SYNTHETIC instance
+    - list fields are tuples (all empty ones are the same object)
+    - the app is a (bundle_id, name) tuple
+
+to_dict() gives back exactly the dict the builder produced, including field
+projections (see schema_builder.parse_field_selection()): fields the dict
+didn't have are MISSING in the model and left out again.
+
+The extractor holds its action schemas as ActionSchema models (every
+locale of a --locales run, the previous output of an --incremental one)
+and its exporters turn them back into dicts one at a time with
+schema_dicts().
+
+Example:
+    models = [ActionSchema.from_dict(build_action_schema(conn, a)) for a in actions]
+    write_ndjson(schema_dicts(models), 'output/actions_complete.ndjson')
+"""
+
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+
+class _Missing:
+    """Marker for fields a projected schema doesn't have"""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return 'MISSING'
+
+
+MISSING: Any = _Missing()
+
+_TUPLE_FIELDS = frozenset({
+    'accepted_types', 'localization_issues', 'output_types', 'categories', 'keywords',
+})
+
+
+def _to_model_value(name: str, value: Any) -> Any:
+    if name in _TUPLE_FIELDS:
+        return tuple(value)
+    if name.endswith('_metadata'):
+        return LocalizationMeta.from_dict(value)
+    return value
+
+
+def _to_dict_value(value: Any) -> Any:
+    if isinstance(value, tuple):
+        return list(value)
+    if isinstance(value, LocalizationMeta):
+        return value.to_dict()
+    return value
+
+
+def _from_dict(cls, data: Dict[str, Any], **converted: Any):
+    values = {
+        f.name: _to_model_value(f.name, data[f.name]) if f.name in data else MISSING
+        for f in fields(cls) if f.name not in converted
+    }
+    return cls(**values, **converted)
+
+
+def _to_dict(model, **converted: Any) -> Dict[str, Any]:
+    result = {}
+    for f in fields(model):
+        if f.name in converted:
+            value = converted[f.name]
+        else:
+            value = _to_dict_value(getattr(model, f.name))
+        if value is not MISSING:
+            result[f.name] = value
+    return result
+
+
+@dataclass(frozen=True, slots=True)
+class LocalizationMeta:
+    """
+    How a name or description was produced.
+
+    Synthetic values were generated from a localization key (see
+    localization_parser.generate_readable_name()); the rest came from the
+    database as-is and all share NOT_SYNTHETIC.
+    """
+
+    is_synthetic: bool = False
+    original_key: Optional[str] = None
+    confidence: Optional[float] = None
+    source: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LocalizationMeta':
+        if not data.get('is_synthetic'):
+            return NOT_SYNTHETIC
+        return cls(True, data.get('original_key'), data.get('confidence'), data.get('source'))
+
+    def to_dict(self) -> Dict[str, Any]:
+        if not self.is_synthetic:
+            return {'is_synthetic': False}
+        return {
+            'is_synthetic': True,
+            'original_key': self.original_key,
+            'confidence': self.confidence,
+            'source': self.source,
+        }
+
+
+NOT_SYNTHETIC = LocalizationMeta()
+
+
+@dataclass(slots=True)
+class ParameterSchema:
+    """One entry of ActionSchema.parameters (see build_action_schema())"""
+
+    key: str = MISSING
+    name: Optional[str] = MISSING
+    name_metadata: LocalizationMeta = MISSING
+    description: Optional[str] = MISSING
+    description_metadata: LocalizationMeta = MISSING
+    sort_order: Optional[int] = MISSING
+    flags: Optional[int] = MISSING
+    accepted_types: Tuple[str, ...] = MISSING
+    localization_issues: Tuple[str, ...] = MISSING
+    string_locales: Optional[Dict[str, Optional[str]]] = MISSING
+    # Analyses are shared between parameters with the same BLOB
+    type_info: Optional[Dict[str, Any]] = MISSING
+    type_details: Any = MISSING
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ParameterSchema':
+        return _from_dict(cls, data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return _to_dict(self)
+
+
+@dataclass(slots=True)
+class ActionSchema:
+    """Action schema as build_action_schema() returns it"""
+
+    id: str = MISSING
+    name: Optional[str] = MISSING
+    name_metadata: LocalizationMeta = MISSING
+    description_summary: Optional[str] = MISSING
+    description_metadata: LocalizationMeta = MISSING
+    description_note: Optional[str] = MISSING
+    type: Optional[str] = MISSING
+    flags: Optional[int] = MISSING
+    visibility_flags: Optional[int] = MISSING
+    hidden: bool = MISSING
+    source_provider: Optional[str] = MISSING
+    # (bundle_id, name)
+    app: Tuple[Optional[str], Optional[str]] = MISSING
+    deprecation: Optional[Dict[str, Any]] = MISSING
+    parameters: Tuple[ParameterSchema, ...] = MISSING
+    output_types: Tuple[str, ...] = MISSING
+    categories: Tuple[str, ...] = MISSING
+    keywords: Tuple[str, ...] = MISSING
+    localization_issues: Tuple[str, ...] = MISSING
+    string_locales: Optional[Dict[str, Optional[str]]] = MISSING
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ActionSchema':
+        converted = {}
+        if 'app' in data:
+            converted['app'] = (data['app']['bundle_id'], data['app']['name'])
+        else:
+            converted['app'] = MISSING
+        if 'parameters' in data:
+            converted['parameters'] = tuple(ParameterSchema.from_dict(param) for param in data['parameters'])
+        else:
+            converted['parameters'] = MISSING
+        return _from_dict(cls, data, **converted)
+
+    def to_dict(self) -> Dict[str, Any]:
+        converted = {'app': MISSING, 'parameters': MISSING}
+        if self.app is not MISSING:
+            converted['app'] = {'bundle_id': self.app[0], 'name': self.app[1]}
+        if self.parameters is not MISSING:
+            converted['parameters'] = [param.to_dict() for param in self.parameters]
+        return _to_dict(self, **converted)
+
+
+def schema_dicts(models: Iterable[ActionSchema]) -> Iterator[Dict[str, Any]]:
+    """The builder's dicts of models, converted as they are consumed"""
+    for model in models:
+        yield model.to_dict()
+
+
+@dataclass(slots=True)
+class TypeSchema:
+    """Type schema as build_type_schema() returns it"""
+
+    id: str = MISSING
+    name: Optional[str] = MISSING
+    name_with_determiner: Optional[str] = MISSING
+    kind: Optional[int] = MISSING
+    kind_name: str = MISSING
+    runtime_flags: Optional[int] = MISSING
+    container_id: Optional[str] = MISSING
+    # Entity types only
+    properties: Any = MISSING
+    # Enum types only
+    enum_cases: Any = MISSING
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TypeSchema':
+        return _from_dict(cls, data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return _to_dict(self)
@@ -0,0 +1,223 @@
+"""Interned strings and dictionary-encoded output
+
+Type ids, bundle ids, app names, categories, UTIs and locale codes repeat
+thousands of times across a catalog. Every database row and every decoded
+BLOB yields its own copy of them.
+
+StringTable keeps one canonical copy of each string for a run.
+build_action_schema() interns identifier fields and the strings of each
+type_info through it, so equal values in different schemas are the same
+object.
+
+The dictionary-encoded output format stores each distinct string of those
+fields once, in a `strings` array, and replaces the values in the records
+with integer indexes into it:
+
+    {
+      "format": "dictionary",
+      "version": 1,
+      "fields": ["type", "app.bundle_id", "parameters.accepted_types", ...],
+      "strings": ["appIntent", "com.apple.mobilenotes", "string", ...],
+      "records": [{"id": "...", "type": 0, "app": {"bundle_id": 1, ...}, ...}]
+    }
+
+Only the values under `fields` are encoded (dotted paths through objects;
+lists of objects are walked element by element). A value there can be a
+string, a list of strings or an object of strings, and any null stays
+null. decode_records() restores the original records exactly.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DICTIONARY_FORMAT = 'dictionary'
+DICTIONARY_VERSION = 1
+
+# Action schema fields whose strings repeat across the catalog
+ENCODED_FIELDS = (
+    'type',
+    'source_provider',
+    'app.bundle_id',
+    'app.name',
+    'deprecation.replacement_id',
+    'output_types',
+    'categories',
+    'keywords',
+    'localization_issues',
+    'string_locales',
+    'parameters.key',
+    'parameters.accepted_types',
+    'parameters.localization_issues',
+    'parameters.string_locales',
+    'parameters.type_info.uti_types',
+    'parameters.type_info.strings',
+    'parameters.type_info.decoded.strings',
+)
+
+
+class StringTable:
+    """
+    Canonical copies of strings, numbered in order of first appearance.
+
+    intern() returns the table's copy of a string (adding it if new);
+    index() returns its position in strings.
+    """
+
+    def __init__(self, strings: Iterable[str] = ()):
+        self.strings: List[str] = []
+        self._indexes: Dict[str, int] = {}
+        for value in strings:
+            self.index(value)
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._indexes
+
+    def index(self, value: str) -> int:
+        """Position of value in strings"""
+        position = self._indexes.get(value)
+        if position is None:
+            position = self._indexes[value] = len(self.strings)
+            self.strings.append(value)
+        return position
+
+    def intern(self, value: Optional[str]) -> Optional[str]:
+        """The table's copy of value (None stays None)"""
+        if value is None:
+            return None
+        return self.strings[self.index(value)]
+
+    def intern_all(self, values: Iterable[str]) -> List[str]:
+        """intern() of every value, as a list"""
+        return [self.intern(value) for value in values]
+
+    def intern_type_info(self, type_info: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Intern the string lists of a BLOB analysis in place.
+
+        Analyses are shared between parameters with the same BLOB, so the
+        dict is updated rather than copied; interning it again is a no-op.
+        """
+        for container in (type_info, type_info.get('decoded')):
+            if not isinstance(container, dict):
+                continue
+            for key in ('strings', 'uti_types'):
+                if isinstance(container.get(key), list):
+                    container[key] = self.intern_all(container[key])
+        return type_info
+
+
+def _field_tree(fields: Sequence[str]) -> Dict[str, Any]:
+    """Dotted paths as nested dicts; None marks an encoded value"""
+    tree: Dict[str, Any] = {}
+    for field in fields:
+        *parents, leaf = field.split('.')
+        node = tree
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[leaf] = None
+    return tree
+
+
+def _transform(value: Any, tree: Dict[str, Any], convert) -> Any:
+    """Copy of value with convert() applied to the values tree points at"""
+    if isinstance(value, list):
+        return [_transform(item, tree, convert) for item in value]
+    if not isinstance(value, dict):
+        return value
+    result = dict(value)
+    for key, subtree in tree.items():
+        if key in result:
+            result[key] = convert(result[key]) if subtree is None else _transform(result[key], subtree, convert)
+    return result
+
+
+def _convert_strings(value: Any, convert) -> Any:
+    """convert() of a string, of each string in a list or object values"""
+    if isinstance(value, list):
+        return [_convert_strings(item, convert) for item in value]
+    if isinstance(value, dict):
+        return {key: _convert_strings(item, convert) for key, item in value.items()}
+    if value is None:
+        return None
+    return convert(value)
+
+
+def encode_records(records: Iterable[Dict[str, Any]], fields: Sequence[str] = ENCODED_FIELDS) -> Dict[str, Any]:
+    """
+    Dictionary-encode records.
+
+    Args:
+        records: Records (e.g. action schemas)
+        fields: Dotted paths of the values to encode
+
+    Returns:
+        Dictionary-encoded document (see the module docstring)
+    """
+    table = StringTable()
+    tree = _field_tree(fields)
+
+    def encode(value: Any) -> Any:
+        return _convert_strings(value, table.index)
+
+    encoded = [_transform(record, tree, encode) for record in records]
+    return {
+        'format': DICTIONARY_FORMAT,
+        'version': DICTIONARY_VERSION,
+        'fields': list(fields),
+        'strings': table.strings,
+        'records': encoded,
+    }
+
+
+def is_dictionary_encoded(document: Any) -> bool:
+    return isinstance(document, dict) and document.get('format') == DICTIONARY_FORMAT
+
+
+def decode_records(document: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Records of a dictionary-encoded document, as they were before encoding.
+
+    Raises:
+        ValueError: If the document isn't dictionary-encoded or is a newer version
+    """
+    if not is_dictionary_encoded(document):
+        raise ValueError("Not a dictionary-encoded document")
+    if document.get('version', 0) > DICTIONARY_VERSION:
+        raise ValueError(f"Unsupported dictionary-encoded version: {document['version']}")
+
+    strings = document['strings']
+    tree = _field_tree(document['fields'])
+
+    def decode(value: Any) -> Any:
+        return _convert_strings(value, strings.__getitem__)
+
+    return [_transform(record, tree, decode) for record in document['records']]
+
+
+def write_dictionary_encoded(
+    records: List[Dict[str, Any]],
+    output_path: str,
+    fields: Sequence[str] = ENCODED_FIELDS,
+) -> Tuple[int, int]:
+    """
+    Write records as a compact dictionary-encoded JSON document.
+
+    Returns:
+        (record count, distinct string count)
+    """
+    document = encode_records(records, fields)
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False, separators=(',', ':'))
+    return len(document['records']), len(document['strings'])
+
+
+def load_dictionary_encoded(path: str) -> List[Dict[str, Any]]:
+    """Decoded records of a file written by write_dictionary_encoded()"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return decode_records(json.load(f))
@@ -0,0 +1,91 @@
+"""Multi-process validation of an output file
+
+The parent reads the output once, through the binary cache of output_cache
+or, without it, streamed record by record (see json_stream). Each worker
+gets only one chunk of schemas at a time and returns its ValidationReport;
+at most a few chunks per worker are in flight, so memory stays one catalog
+in the parent (none when streaming) plus the chunks, whatever the number of
+workers. The parent merges the partial reports in chunk order, which gives
+exactly the report of a sequential run whatever the number of workers or
+the chunk size.
+"""
+
+import multiprocessing
+from collections import deque
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .decode_pool import chunk_ranges
+from .json_stream import iter_records
+from .output_cache import load_output
+from .validators import ValidationReport
+
+# Schemas per task when the count isn't known up front (streamed input)
+DEFAULT_CHUNK_SIZE = 256
+
+# Chunks submitted ahead per worker
+_IN_FLIGHT_PER_WORKER = 2
+
+
+def _validate_chunk(schemas: List[Dict[str, Any]]) -> ValidationReport:
+    report = ValidationReport()
+    for schema in schemas:
+        report.add(schema)
+    return report
+
+
+def _chunks(schemas: Iterable[Dict[str, Any]], workers: int, chunk_size: Optional[int]) -> Iterator[List[Dict[str, Any]]]:
+    """Consecutive chunks of the schemas, sized from their count when it is known"""
+    if isinstance(schemas, list):
+        for start, end in chunk_ranges(len(schemas), workers, chunk_size):
+            yield schemas[start:end]
+        return
+    records = iter(schemas)
+    while True:
+        chunk = list(islice(records, chunk_size or DEFAULT_CHUNK_SIZE))
+        if not chunk:
+            return
+        yield chunk
+
+
+def validate_output_file(
+    path: str,
+    workers: int = 1,
+    chunk_size: Optional[int] = None,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """
+    Validate every schema of an output file, optionally across worker processes.
+
+    Args:
+        path: Output file (JSON array or NDJSON)
+        workers: Number of worker processes (<= 1 validates in-process)
+        chunk_size: Schemas per task (default: derived from workers, or
+            DEFAULT_CHUNK_SIZE when streaming)
+        use_cache: Load the output through its binary cache (False streams it)
+
+    Returns:
+        Validation report, identical to generate_validation_report()'s
+    """
+    if use_cache:
+        schemas = load_output(path, use_cache)
+        if not isinstance(schemas, list):
+            raise ValueError(f"Expected a list of action schemas in {path}")
+    else:
+        schemas = iter_records(path)
+
+    if workers <= 1:
+        return _validate_chunk(schemas).to_dict()
+
+    report = ValidationReport()
+    with multiprocessing.Pool(processes=workers) as pool:
+        # Results are merged in submission (= input) order
+        pending = deque()
+        for chunk in _chunks(schemas, workers, chunk_size):
+            pending.append(pool.apply_async(_validate_chunk, (chunk,)))
+            if len(pending) >= workers * _IN_FLIGHT_PER_WORKER:
+                report = report.merge(pending.popleft().get())
+        while pending:
+            report = report.merge(pending.popleft().get())
+
+    return report.to_dict()
@@ -0,0 +1,141 @@
+"""Persistent cache of per-schema validation results
+
+Between pipeline runs most action schemas don't change. ValidationCache keeps
+validate_action_schema() results in a sidecar SQLite database
+(actions_complete.json -> actions_complete.validation.sqlite) keyed by a
+canonical hash of the schema's validation inputs (validators.validation_inputs()),
+so only new or changed schemas are validated again.
+
+The cache is tied to a validator version: a hash of the source of
+validators.py and localization_parser.py. Editing either module changes the
+version and the cache starts over.
+
+Sidecar layout:
+    cache_info (key, value)            validator version
+    results    (input_hash, result)    validate_action_schema() result as JSON
+"""
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+from .validators import validate_action_schema, validation_inputs
+
+# Modules whose code decides validation results
+VALIDATOR_SOURCES = ('validators.py', 'localization_parser.py')
+
+CACHE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS cache_info (key TEXT PRIMARY KEY, value TEXT);
+    CREATE TABLE IF NOT EXISTS results (input_hash TEXT PRIMARY KEY, result TEXT);
+"""
+
+
+def validator_version() -> str:
+    """Hash of the validator source code"""
+    digest = hashlib.blake2b(digest_size=16)
+    for name in VALIDATOR_SOURCES:
+        digest.update((Path(__file__).parent / name).read_bytes())
+    return digest.hexdigest()
+
+
+def default_cache_path(output_path: str) -> str:
+    """Sidecar path for an output (actions_complete.json -> actions_complete.validation.sqlite)"""
+    path = Path(output_path)
+    return str(path.with_name(f"{path.stem}.validation.sqlite"))
+
+
+def input_hash(schema: Dict[str, Any]) -> str:
+    """Canonical hash of a schema's validation inputs"""
+    text = json.dumps(validation_inputs(schema), sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class ValidationCache:
+    """
+    validate_action_schema() with results remembered across runs.
+
+    Example:
+        with ValidationCache(default_cache_path(path)) as cache:
+            report = generate_validation_report(schemas, cache.validate)
+    """
+
+    def __init__(self, path: str, version: Optional[str] = None):
+        """
+        Args:
+            path: Sidecar database (created if missing)
+            version: Validator version (default: validator_version())
+        """
+        self.path = path
+        self.version = version or validator_version()
+        self.hits = 0
+        self.misses = 0
+
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(CACHE_SCHEMA)
+
+        row = self._conn.execute("SELECT value FROM cache_info WHERE key = 'validator_version'").fetchone()
+        if row is None or row[0] != self.version:
+            # Different validator: every cached result is suspect
+            self._conn.execute("DELETE FROM results")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_info VALUES ('validator_version', ?)", (self.version,)
+            )
+            self._conn.commit()
+
+        self._results: Dict[str, str] = dict(self._conn.execute("SELECT input_hash, result FROM results"))
+        self._new: Dict[str, str] = {}
+        self._used: Set[str] = set()
+
+    def __enter__(self) -> 'ValidationCache':
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        # Only prune after a complete run, never after a failure half-way
+        self.close(prune=exc_type is None)
+
+    def __len__(self) -> int:
+        return len(self._results) + len(self._new)
+
+    def validate(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate a schema, reusing the cached result if its inputs were seen before.
+
+        Args:
+            schema: Action schema
+
+        Returns:
+            validate_action_schema() result
+        """
+        key = input_hash(schema)
+        self._used.add(key)
+
+        cached = self._results.get(key) or self._new.get(key)
+        if cached is not None:
+            self.hits += 1
+            return json.loads(cached)
+
+        self.misses += 1
+        result = validate_action_schema(schema)
+        self._new[key] = json.dumps(result, ensure_ascii=False)
+        return result
+
+    def close(self, prune: bool = True):
+        """
+        Store new results and close the sidecar.
+
+        Args:
+            prune: Drop results no schema of this run used, so the cache
+                tracks the current catalog instead of growing forever
+        """
+        if self._conn is None:
+            return
+
+        with self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO results VALUES (?, ?)", self._new.items())
+            if prune:
+                unused = [(key,) for key in self._results if key not in self._used]
+                self._conn.executemany("DELETE FROM results WHERE input_hash = ?", unused)
+        self._conn.close()
+        self._conn = None
@@ -1,6 +1,6 @@
 """Validation utilities for checking data quality"""
 
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, Iterable, List, Optional
 import re
 from .localization_parser import (
     is_localization_key as parser_is_localization_key,
@@ -135,6 +135,36 @@ def validate_action_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+# Parameter fields validate_action_schema() looks at
+VALIDATED_PARAMETER_FIELDS = ('name', 'name_metadata', 'description', 'description_metadata', 'accepted_types')
+
+
+def validation_inputs(schema: Dict[str, Any]) -> List[Any]:
+    """
+    The parts of a schema that validate_action_schema() depends on.
+
+    Schemas with equal inputs validate identically, so this is what the
+    validation cache (utils.validation_cache) hashes instead of the whole
+    schema with its type_info dumps. Keep it in step with the checks above
+    and in calculate_quality_score().
+
+    Args:
+        schema: Action schema
+
+    Returns:
+        JSON-serializable list of the validated values
+    """
+    return [
+        schema.get('name'),
+        schema.get('name_metadata'),
+        schema.get('description_summary'),
+        schema.get('description_metadata'),
+        schema.get('hidden'),
+        bool(schema.get('categories')),
+        [[param.get(field) for field in VALIDATED_PARAMETER_FIELDS] for param in schema.get('parameters', [])],
+    ]
+
+
 def is_complex_type_identifier(type_id: str) -> bool:
     """
     Check if a type identifier is complex (contains namespace/app info).
@@ -291,78 +321,145 @@ def calculate_quality_score(schema: Dict[str, Any], issues: List[Dict], warnings
     return max(0.0, min(100.0, score))
 
 
-def generate_validation_report(schemas: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """
-    Generate validation report for a collection of schemas.
+QUALITY_BANDS = (
+    ('excellent', 90),  # 90-100
+    ('good', 75),       # 75-89
+    ('fair', 60),       # 60-74
+    ('poor', None),     # <60
+)
 
-    Args:
-        schemas: List of action schemas
+MAX_PROBLEMATIC_ACTIONS = 20
 
-    Returns:
-        Validation report
-    """
-    report = {
-        'total_schemas': len(schemas),
-        'valid_schemas': 0,
-        'schemas_with_issues': 0,
-        'schemas_with_warnings': 0,
-        'issues_by_type': {},
-        'warnings_by_type': {},
-        'quality_scores': {
-            'excellent': 0,  # 90-100
-            'good': 0,       # 75-89
-            'fair': 0,       # 60-74
-            'poor': 0,       # <60
-        },
-        'average_quality': 0.0,
-        'problematic_actions': [],
-    }
 
-    total_quality = 0.0
+def quality_band(quality: float) -> str:
+    """Band of a quality score ('excellent', 'good', 'fair' or 'poor')"""
+    for band, minimum in QUALITY_BANDS:
+        if minimum is None or quality >= minimum:
+            return band
 
-    for schema in schemas:
-        validation = validate_action_schema(schema)
 
+class ValidationReport:
+    """
+    Mergeable accumulator behind generate_validation_report().
+
+    Schemas are folded in one at a time with add(), so a report can be built
+    over a stream without holding the schemas. Two reports over consecutive
+    runs of schemas merge() into the report of the whole run: counters add
+    up, per-type counts keep first-seen order and the capped
+    problematic_actions list keeps the first entries in input order.
+    Quality scores are whole numbers, so their running total (and with it
+    the average) is exact however the run was split.
+    """
+
+    def __init__(self):
+        self.total_schemas = 0
+        self.valid_schemas = 0
+        self.schemas_with_issues = 0
+        self.schemas_with_warnings = 0
+        self.issues_by_type: Dict[str, int] = {}
+        self.warnings_by_type: Dict[str, int] = {}
+        self.quality_scores = {band: 0 for band, _ in QUALITY_BANDS}
+        self.total_quality = 0.0
+        self.problematic_actions: List[Dict[str, Any]] = []
+
+    def add(self, schema: Dict[str, Any], validation: Optional[Dict[str, Any]] = None):
+        """
+        Fold one schema into the report.
+
+        Args:
+            schema: Action schema
+            validation: Its validate_action_schema() result (computed if omitted)
+        """
+        if validation is None:
+            validation = validate_action_schema(schema)
+
+        self.total_schemas += 1
         if validation['valid']:
-            report['valid_schemas'] += 1
+            self.valid_schemas += 1
         else:
-            report['schemas_with_issues'] += 1
+            self.schemas_with_issues += 1
 
         if validation['warnings']:
-            report['schemas_with_warnings'] += 1
+            self.schemas_with_warnings += 1
 
-        # Count issues by type
         for issue in validation['issues']:
-            issue_type = issue['issue']
-            report['issues_by_type'][issue_type] = report['issues_by_type'].get(issue_type, 0) + 1
-
-        # Count warnings by type
+            self.issues_by_type[issue['issue']] = self.issues_by_type.get(issue['issue'], 0) + 1
         for warning in validation['warnings']:
-            warning_type = warning['issue']
-            report['warnings_by_type'][warning_type] = report['warnings_by_type'].get(warning_type, 0) + 1
+            self.warnings_by_type[warning['issue']] = self.warnings_by_type.get(warning['issue'], 0) + 1
 
-        # Quality score
         quality = validation['quality_score']
-        total_quality += quality
-
-        if quality >= 90:
-            report['quality_scores']['excellent'] += 1
-        elif quality >= 75:
-            report['quality_scores']['good'] += 1
-        elif quality >= 60:
-            report['quality_scores']['fair'] += 1
-        else:
-            report['quality_scores']['poor'] += 1
-            # Track problematic actions
-            if len(report['problematic_actions']) < 20:
-                report['problematic_actions'].append({
-                    'id': schema.get('id'),
-                    'name': schema.get('name'),
-                    'quality': quality,
-                    'issues': len(validation['issues']),
-                    'warnings': len(validation['warnings']),
-                })
+        self.total_quality += quality
+
+        band = quality_band(quality)
+        self.quality_scores[band] += 1
+
+        # Track problematic actions
+        if band == 'poor' and len(self.problematic_actions) < MAX_PROBLEMATIC_ACTIONS:
+            self.problematic_actions.append({
+                'id': schema.get('id'),
+                'name': schema.get('name'),
+                'quality': quality,
+                'issues': len(validation['issues']),
+                'warnings': len(validation['warnings']),
+            })
 
-    report['average_quality'] = total_quality / len(schemas) if schemas else 0.0
+    def merge(self, other: 'ValidationReport') -> 'ValidationReport':
+        """
+        Combine with the report of the schemas that follow this one's.
+
+        Args:
+            other: Report over the next run of schemas
+
+        Returns:
+            New report over both runs (the operands are left unchanged)
+        """
+        merged = ValidationReport()
+        for report in (self, other):
+            merged.total_schemas += report.total_schemas
+            merged.valid_schemas += report.valid_schemas
+            merged.schemas_with_issues += report.schemas_with_issues
+            merged.schemas_with_warnings += report.schemas_with_warnings
+            for issue_type, count in report.issues_by_type.items():
+                merged.issues_by_type[issue_type] = merged.issues_by_type.get(issue_type, 0) + count
+            for warning_type, count in report.warnings_by_type.items():
+                merged.warnings_by_type[warning_type] = merged.warnings_by_type.get(warning_type, 0) + count
+            for band, count in report.quality_scores.items():
+                merged.quality_scores[band] += count
+            merged.total_quality += report.total_quality
+            room = MAX_PROBLEMATIC_ACTIONS - len(merged.problematic_actions)
+            merged.problematic_actions.extend(report.problematic_actions[:room])
+        return merged
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Report dictionary in the generate_validation_report() format"""
+        return {
+            'total_schemas': self.total_schemas,
+            'valid_schemas': self.valid_schemas,
+            'schemas_with_issues': self.schemas_with_issues,
+            'schemas_with_warnings': self.schemas_with_warnings,
+            'issues_by_type': dict(self.issues_by_type),
+            'warnings_by_type': dict(self.warnings_by_type),
+            'quality_scores': dict(self.quality_scores),
+            'average_quality': self.total_quality / self.total_schemas if self.total_schemas else 0.0,
+            'problematic_actions': list(self.problematic_actions),
+        }
+
+
+def generate_validation_report(
+    schemas: Iterable[Dict[str, Any]],
+    validate: Callable[[Dict[str, Any]], Dict[str, Any]] = validate_action_schema,
+) -> Dict[str, Any]:
+    """
+    Generate validation report for a collection of schemas.
+
+    Args:
+        schemas: Action schemas (any iterable, e.g. utils.json_stream.iter_records())
+        validate: Per-schema validation (e.g. ValidationCache.validate)
 
-    return report
+    Returns:
+        Validation report
+    """
+    report = ValidationReport()
+    for schema in schemas:
+        report.add(schema, validate(schema))
+    return report.to_dict()
@@ -11,6 +11,13 @@ Options:
     --input FILE      Input JSON file (default: output/actions_complete.json)
     --report FILE     Output validation report
     --show-issues     Show actions with issues
+    --no-cache        Parse the JSON instead of using/refreshing the binary cache
+    --stream          Validate record by record in constant memory (JSON array
+                      or NDJSON input; no cache)
+    --workers N       Validate in N worker processes (same report as 1)
+    --validation-cache
+                      Reuse results for schemas validated in earlier runs
+                      (sidecar: actions_complete.validation.sqlite)
     -v, --verbose     Verbose output
 """
 
@@ -27,6 +34,10 @@ try:
 except ImportError:
     RICH_AVAILABLE = False
 
+from utils.json_stream import iter_records
+from utils.output_cache import load_output
+from utils.validate_pool import validate_output_file
+from utils.validation_cache import ValidationCache, default_cache_path
 from utils.validators import validate_action_schema, generate_validation_report, is_localization_key
 
 
@@ -38,19 +49,47 @@ def main():
     parser.add_argument('--input', default='output/actions_complete.json', help='Input JSON file')
     parser.add_argument('--report', help='Output validation report JSON')
     parser.add_argument('--show-issues', action='store_true', help='Show actions with issues')
+    parser.add_argument('--no-cache', action='store_true', help="Don't read or refresh the binary output cache")
+    parser.add_argument('--stream', action='store_true', help='Validate record by record in constant memory')
+    parser.add_argument('--workers', type=int, default=1, metavar='N', help='Validate in N worker processes (default: 1)')
+    parser.add_argument('--validation-cache', action='store_true', help='Reuse results of unchanged schemas from earlier runs')
     parser.add_argument('-v', '--verbose', action='store_true', help='Verbose output')
 
     args = parser.parse_args()
 
+    if args.workers > 1 and (args.stream or args.validation_cache):
+        print("❌ Error: --workers can't be combined with --stream or --validation-cache")
+        sys.exit(1)
+
     try:
-        # Load schemas
-        with open(args.input) as f:
-            schemas = json.load(f)
+        if args.stream or args.validation_cache:
+            if args.stream:
+                if not Path(args.input).exists():
+                    raise FileNotFoundError(f"Output not found: {args.input}")
+                print(f"\n📋 Validating actions from {args.input} (streaming)...\n")
+                schemas = iter_records(args.input)
+            else:
+                schemas = load_output(args.input, use_cache=not args.no_cache)
+                print(f"\n📋 Validating {len(schemas)} actions...\n")
+
+            if args.validation_cache:
+                with ValidationCache(default_cache_path(args.input)) as cache:
+                    report = generate_validation_report(schemas, cache.validate)
+                if args.verbose:
+                    print(f"♻️  Validation cache: {cache.hits} reused, {cache.misses} validated")
+            else:
+                report = generate_validation_report(schemas)
+        elif args.workers > 1:
+            print(f"\n📋 Validating actions from {args.input} in {args.workers} workers...\n")
+            report = validate_output_file(args.input, args.workers, use_cache=not args.no_cache)
+        else:
+            # Load schemas (through the binary cache next to the input)
+            schemas = load_output(args.input, use_cache=not args.no_cache)
 
-        print(f"\n📋 Validating {len(schemas)} actions...\n")
+            print(f"\n📋 Validating {len(schemas)} actions...\n")
 
-        # Generate report
-        report = generate_validation_report(schemas)
+            # Generate report
+            report = generate_validation_report(schemas)
 
         # Display summary
         if RICH_AVAILABLE: